@@ -90,6 +90,23 @@ def _load_base64(filepath: Path, fallback: str = "") -> str:
         return fallback
 
 
+def _load_photo_base64(filepath: Optional[Path]) -> str:
+    """Load a listing photo as a data URI, downsized to the PDF size class.
+
+    Embedding full-resolution MLS originals made the HTML (and the PDF)
+    several MB per photo; the 'pdf' variant is ~150 dpi at full page width.
+    Falls back to the original when no variant can be produced.
+    """
+    if not filepath or not filepath.exists():
+        return ""
+    try:
+        from apps.photos import derivatives
+        variant = derivatives.get_derivative(filepath, "pdf")
+    except ImportError:
+        variant = None
+    return _load_base64(variant or filepath)
+
+
 def _fetch_remote_as_base64(url: Optional[str], timeout: int = 6) -> str:
     """Fetch a remote image URL and return it as a base64 data URI.
 
@@ -106,6 +123,13 @@ def _fetch_remote_as_base64(url: Optional[str], timeout: int = 6) -> str:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
             data = resp.read()
             ctype = resp.headers.get("Content-Type", "image/jpeg").split(";")[0].strip()
+        try:
+            from apps.photos import derivatives
+            resized = derivatives.render(data, "pdf")
+        except ImportError:
+            resized = None
+        if resized:
+            data, ctype = resized, "image/jpeg"
         return f"data:{ctype};base64,{base64.b64encode(data).decode()}"
     except Exception as exc:
         logger.warning("PDF photo fetch failed for %s: %s", url, exc)
@@ -240,7 +264,7 @@ def _build_html(listing: dict, index: int = 0) -> str:
     # primary_photo CDN URL inline (covers Mountain Lakes / Carolina Smokies
     # listings whose photos aren't downloaded locally yet).
     photo_path = _find_local_photo(listing)
-    photo_b64 = _load_base64(photo_path) if photo_path else ""
+    photo_b64 = _load_photo_base64(photo_path)
     if not photo_b64:
         photo_b64 = _fetch_remote_as_base64(listing.get("primary_photo"))
 
@@ -11,8 +11,9 @@ import os
 import sqlite3
 import json
 import logging
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 
 from apps.automation import config
 from apps.automation.config import get_db_setting
@@ -258,6 +259,188 @@ def get_active_buyers() -> List[Dict[str, Any]]:
         conn.close()
 
 
+class BuyerCriteria:
+    """
+    A buyer's requirements, normalized once and reused for every listing.
+
+    score() returns exactly what calculate_match_score always has; the
+    lowercased location sets and the score bounds used by BuyerIndex are
+    computed here instead of per listing.
+    """
+
+    def __init__(self, buyer: Dict[str, Any], position: int = 0):
+        self.buyer = buyer
+        self.position = position
+        self.contact_id = str(buyer.get('id'))
+
+        self.has_price = bool(buyer.get('price_min') or buyer.get('price_max'))
+        self.price_min = buyer.get('price_min') or 0
+        self.price_max = buyer.get('price_max') or float('inf')
+        # Above this price the price criterion can't score anything
+        self.price_cap = max(self.price_max * 1.1, self.price_min * 0.9)
+
+        self.beds_min = buyer.get('beds_min')
+        self.baths_min = buyer.get('baths_min')
+        self.sqft_min = buyer.get('sqft_min')
+        self.acreage_min = buyer.get('acreage_min')
+
+        self.counties = {c.lower() for c in buyer.get('counties') or []}
+        self.cities = {c.lower() for c in buyer.get('cities') or []}
+        self.views = [(v, v.lower()) for v in buyer.get('views_required') or []]
+        self.water = [(w, w.lower()) for w in buyer.get('water_features') or []]
+
+        # Best possible beds + baths + sqft + acreage points
+        self.rest_max = ((20 if self.beds_min else 10) + (10 if self.baths_min else 5)
+                         + (10 if self.sqft_min else 5) + (10 if self.acreage_min else 5))
+
+    @property
+    def has_location(self) -> bool:
+        return bool(self.counties or self.cities)
+
+    def score(self, property: Dict[str, Any]) -> Tuple[int, List[str]]:
+        """Match score (0-100) and matching criteria for one property."""
+        score = 0
+        max_score = 100
+        matching_criteria = []
+
+        # Price match (30 points)
+        if self.has_price:
+            price = property.get('price') or 0
+            if self.price_min <= price <= self.price_max:
+                score += 30
+                matching_criteria.append('Price in range')
+            elif price < self.price_min * 0.9:
+                score += 15  # Under budget is okay
+                matching_criteria.append('Under budget')
+            elif price <= self.price_max * 1.1:
+                score += 10  # Slightly over is acceptable
+        else:
+            score += 15  # No price requirement, give partial credit
+
+        # Beds match (20 points)
+        if self.beds_min:
+            beds = property.get('beds') or 0
+            if beds >= self.beds_min:
+                score += 20
+                matching_criteria.append(f"{property['beds']}+ beds")
+            elif beds == self.beds_min - 1:
+                score += 10  # One less bed might work
+        else:
+            score += 10  # No requirement
+
+        # Baths match (10 points)
+        if self.baths_min:
+            if (property.get('baths') or 0) >= self.baths_min:
+                score += 10
+                matching_criteria.append(f"{property['baths']}+ baths")
+        else:
+            score += 5
+
+        # Location match (20 points)
+        if self.has_location:
+            if (property.get('county') or '').lower() in self.counties:
+                score += 20
+                matching_criteria.append(f"{property.get('county')} county")
+            elif (property.get('city') or '').lower() in self.cities:
+                score += 20
+                matching_criteria.append(f"{property.get('city')}")
+        else:
+            score += 10
+
+        # Size match (10 points)
+        if self.sqft_min:
+            if (property.get('sqft') or 0) >= self.sqft_min:
+                score += 10
+                matching_criteria.append(f"{property['sqft']:,} sqft")
+        else:
+            score += 5
+
+        # Acreage match (10 points)
+        if self.acreage_min:
+            if (property.get('acreage') or 0) >= self.acreage_min:
+                score += 10
+                matching_criteria.append(f"{property['acreage']} acres")
+        else:
+            score += 5
+
+        # Views bonus (optional but nice)
+        property_views = (property.get('views') or '').lower()
+        if property_views:
+            for view, view_lower in self.views:
+                if view_lower in property_views:
+                    matching_criteria.append(f"{view} views")
+                    break
+
+        # Water features bonus
+        property_water = (property.get('water_features') or '').lower()
+        if property_water:
+            for water, water_lower in self.water:
+                if water_lower in property_water:
+                    matching_criteria.append(f"{water}")
+                    break
+
+        # Normalize to 0-100
+        final_score = int((score / max_score) * 100)
+
+        return final_score, matching_criteria
+
+
+class _PriceTier:
+    """Buyers sharing a location outcome, split by whether price can lift them over the threshold."""
+
+    def __init__(self, members: List[BuyerCriteria], location_points: int, threshold: int):
+        self.always = []
+        capped = []
+        for c in members:
+            if not c.has_price:
+                if location_points + 15 + c.rest_max >= threshold:
+                    self.always.append(c)
+            elif location_points + c.rest_max >= threshold:
+                self.always.append(c)
+            elif location_points + 30 + c.rest_max >= threshold:
+                capped.append(c)
+        capped.sort(key=lambda c: c.price_cap)
+        self._caps = [c.price_cap for c in capped]
+        self._capped = capped
+
+    def candidates(self, price: float) -> List[BuyerCriteria]:
+        return self.always + self._capped[bisect_left(self._caps, price):]
+
+
+class BuyerIndex:
+    """
+    Buyers indexed by county, city and price ceiling.
+
+    candidates() returns every buyer whose best possible score for the
+    listing reaches the threshold: buyers whose county/city matches, plus
+    buyers without a location preference or with a miss who could still
+    get there on price, beds, baths, size and acreage. Scoring only these
+    gives the same matches as scoring every buyer.
+    """
+
+    def __init__(self, criteria: List[BuyerCriteria], threshold: int):
+        self.criteria = criteria
+        self.by_county: Dict[str, List[BuyerCriteria]] = {}
+        self.by_city: Dict[str, List[BuyerCriteria]] = {}
+        for c in criteria:
+            for county in c.counties:
+                self.by_county.setdefault(county, []).append(c)
+            for city in c.cities:
+                self.by_city.setdefault(city, []).append(c)
+        self._open = _PriceTier([c for c in criteria if not c.has_location], 10, threshold)
+        self._missed = _PriceTier([c for c in criteria if c.has_location], 0, threshold)
+
+    def candidates(self, listing: Dict[str, Any]) -> List[BuyerCriteria]:
+        price = listing.get('price') or 0
+        hits = {c.position: c for c in self.by_county.get((listing.get('county') or '').lower(), [])}
+        for c in self.by_city.get((listing.get('city') or '').lower(), []):
+            hits[c.position] = c
+        result = list(hits.values())
+        result.extend(self._open.candidates(price))
+        result.extend(c for c in self._missed.candidates(price) if c.position not in hits)
+        return result
+
+
 def calculate_match_score(property: Dict[str, Any], buyer: Dict[str, Any]) -> Tuple[int, List[str]]:
     """
     Calculate how well a property matches a buyer's requirements.
@@ -269,108 +452,7 @@ def calculate_match_score(property: Dict[str, Any], buyer: Dict[str, Any]) -> Tu
     Returns:
         Tuple of (match_score, list of matching criteria)
     """
-    score = 0
-    max_score = 0
-    matching_criteria = []
-
-    # Price match (30 points)
-    max_score += 30
-    if buyer.get('price_min') or buyer.get('price_max'):
-        price = property.get('price', 0)
-        price_min = buyer.get('price_min') or 0
-        price_max = buyer.get('price_max') or float('inf')
-
-        if price_min <= price <= price_max:
-            score += 30
-            matching_criteria.append('Price in range')
-        elif price < price_min * 0.9:
-            score += 15  # Under budget is okay
-            matching_criteria.append('Under budget')
-        elif price <= price_max * 1.1:
-            score += 10  # Slightly over is acceptable
-    else:
-        score += 15  # No price requirement, give partial credit
-
-    # Beds match (20 points)
-    max_score += 20
-    if buyer.get('beds_min'):
-        if property.get('beds', 0) >= buyer['beds_min']:
-            score += 20
-            matching_criteria.append(f"{property['beds']}+ beds")
-        elif property.get('beds', 0) == buyer['beds_min'] - 1:
-            score += 10  # One less bed might work
-    else:
-        score += 10  # No requirement
-
-    # Baths match (10 points)
-    max_score += 10
-    if buyer.get('baths_min'):
-        if property.get('baths', 0) >= buyer['baths_min']:
-            score += 10
-            matching_criteria.append(f"{property['baths']}+ baths")
-    else:
-        score += 5
-
-    # Location match (20 points)
-    max_score += 20
-    property_county = property.get('county', '').lower()
-    property_city = property.get('city', '').lower()
-
-    buyer_counties = [c.lower() for c in buyer.get('counties', [])]
-    buyer_cities = [c.lower() for c in buyer.get('cities', [])]
-
-    if buyer_counties or buyer_cities:
-        if property_county in buyer_counties:
-            score += 20
-            matching_criteria.append(f"{property.get('county')} county")
-        elif property_city in buyer_cities:
-            score += 20
-            matching_criteria.append(f"{property.get('city')}")
-        elif not buyer_counties and not buyer_cities:
-            score += 10  # No location requirement
-    else:
-        score += 10
-
-    # Size match (10 points)
-    max_score += 10
-    if buyer.get('sqft_min'):
-        if property.get('sqft', 0) >= buyer['sqft_min']:
-            score += 10
-            matching_criteria.append(f"{property['sqft']:,} sqft")
-    else:
-        score += 5
-
-    # Acreage match (10 points)
-    max_score += 10
-    if buyer.get('acreage_min'):
-        if property.get('acreage', 0) >= buyer['acreage_min']:
-            score += 10
-            matching_criteria.append(f"{property['acreage']} acres")
-    else:
-        score += 5
-
-    # Views bonus (optional but nice)
-    buyer_views = buyer.get('views_required', [])
-    property_views = property.get('views', '') or ''
-    if buyer_views and property_views:
-        for view in buyer_views:
-            if view.lower() in property_views.lower():
-                matching_criteria.append(f"{view} views")
-                break
-
-    # Water features bonus
-    buyer_water = buyer.get('water_features', [])
-    property_water = property.get('water_features', '') or ''
-    if buyer_water and property_water:
-        for water in buyer_water:
-            if water.lower() in property_water.lower():
-                matching_criteria.append(f"{water}")
-                break
-
-    # Normalize to 0-100
-    final_score = int((score / max_score) * 100) if max_score > 0 else 0
-
-    return final_score, matching_criteria
+    return BuyerCriteria(buyer).score(property)
 
 
 def check_already_alerted(contact_id: str, property_id: str) -> bool:
@@ -391,6 +473,35 @@ def check_already_alerted(contact_id: str, property_id: str) -> bool:
         conn.close()
 
 
+def load_alerted_pairs(property_ids: List[Any], alert_type: str = 'new_listing') -> Set[Tuple[str, str]]:
+    """
+    (contact_id, property_id) pairs already alerted for these properties.
+
+    One query per 500 properties, instead of check_already_alerted per
+    buyer/listing pair.
+    """
+    ids = sorted({str(p) for p in property_ids if p is not None})
+    pairs = set()
+    if not ids:
+        return pairs
+
+    conn = get_db_connection()
+
+    try:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute('''
+                SELECT contact_id, property_id FROM alert_log
+                WHERE alert_type = ?
+                AND property_id IN ({})
+            '''.format(','.join(['?' for _ in chunk])), [alert_type] + chunk).fetchall()
+            pairs.update((str(row['contact_id']), str(row['property_id'])) for row in rows)
+        return pairs
+
+    finally:
+        conn.close()
+
+
 def log_alert(alert_type: str, contact_id: str, property_id: str, email_to: str,
               status: str = 'sent', error_message: str = None) -> None:
     """Log an alert to prevent future duplicates."""
@@ -410,47 +521,71 @@ def log_alert(alert_type: str, contact_id: str, property_id: str, email_to: str,
         conn.close()
 
 
-def match_listings_to_buyers(listings: List[Dict], buyers: List[Dict]) -> Dict[str, List[Dict]]:
+def match_buyers(
+    listings: List[Dict],
+    buyers: List[Dict],
+    threshold: int,
+    alerted: Set[Tuple[str, str]],
+    is_price_drop: bool = False,
+) -> Dict[str, Dict]:
     """
-    Match new listings to buyers based on requirements.
+    Score listings against buyers in one pass over the listings.
+
+    Buyer criteria are compiled once and indexed; each listing is scored
+    only against BuyerIndex candidates, and already-alerted pairs are
+    skipped with a set lookup.
 
     Returns:
-        Dictionary mapping contact_id to list of matching properties
+        Dictionary mapping contact_id to dict with buyer and matched properties,
+        in buyer order, properties sorted best first
     """
-    matches = {}
-
-    # Get threshold from database settings
-    match_threshold = get_db_setting('new_listing_match_threshold', 60)
-    logger.info(f"Using match threshold: {match_threshold}")
-
-    for buyer in buyers:
-        buyer_matches = []
-
-        for listing in listings:
-            # Skip if already alerted
-            if check_already_alerted(buyer['id'], listing['id']):
+    criteria = [BuyerCriteria(buyer, position) for position, buyer in enumerate(buyers)]
+    index = BuyerIndex(criteria, threshold)
+
+    per_buyer: Dict[int, List[Dict]] = {}
+    for listing in listings:
+        listing_id = str(listing['id'])
+        for c in index.candidates(listing):
+            if (c.contact_id, listing_id) in alerted:
                 continue
 
-            score, criteria = calculate_match_score(listing, buyer)
+            score, matched = c.score(listing)
 
-            if score >= match_threshold:
+            if score >= threshold:
                 match = listing.copy()
                 match['match_score'] = score
-                match['matching_features'] = ', '.join(criteria)
-                match['is_price_drop'] = False  # Could enhance to detect
-                buyer_matches.append(match)
-
-        if buyer_matches:
-            # Sort by match score descending
-            buyer_matches.sort(key=lambda x: x['match_score'], reverse=True)
-            matches[buyer['id']] = {
-                'buyer': buyer,
-                'properties': buyer_matches
-            }
+                match['matching_features'] = ', '.join(matched)
+                match['is_price_drop'] = is_price_drop
+                per_buyer.setdefault(c.position, []).append(match)
+
+    sort_key = 'drop_pct' if is_price_drop else 'match_score'
+    matches = {}
+    for position in sorted(per_buyer):
+        buyer_matches = per_buyer[position]
+        buyer_matches.sort(key=lambda x: x[sort_key], reverse=True)
+        matches[buyers[position]['id']] = {
+            'buyer': buyers[position],
+            'properties': buyer_matches
+        }
 
     return matches
 
 
+def match_listings_to_buyers(listings: List[Dict], buyers: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Match new listings to buyers based on requirements.
+
+    Returns:
+        Dictionary mapping contact_id to list of matching properties
+    """
+    # Get threshold from database settings
+    match_threshold = get_db_setting('new_listing_match_threshold', 60)
+    logger.info(f"Using match threshold: {match_threshold}")
+
+    alerted = load_alerted_pairs([listing['id'] for listing in listings])
+    return match_buyers(listings, buyers, match_threshold, alerted)
+
+
 def build_criteria_summary(buyer: Dict) -> str:
     """Build a human-readable summary of buyer's criteria."""
     parts = []
@@ -604,38 +739,13 @@ def match_price_drops_to_buyers(drops: List[Dict], buyers: List[Dict]) -> Dict[s
     Returns:
         Dictionary mapping contact_id to dict with buyer and matched price drops
     """
-    matches = {}
-
     # Get threshold from database settings (lower threshold for price drops)
     match_threshold = get_db_setting('price_drop_match_threshold', 50)
     logger.info(f"Using price drop match threshold: {match_threshold}")
 
-    for buyer in buyers:
-        buyer_matches = []
-
-        for drop in drops:
-            # Check if already alerted for this property (any alert type)
-            if check_already_alerted(buyer['id'], drop['id']):
-                continue
-
-            score, criteria = calculate_match_score(drop, buyer)
-
-            if score >= match_threshold:
-                match = drop.copy()
-                match['match_score'] = score
-                match['matching_features'] = ', '.join(criteria)
-                match['is_price_drop'] = True
-                buyer_matches.append(match)
-
-        if buyer_matches:
-            # Sort by drop percentage descending (biggest drops first)
-            buyer_matches.sort(key=lambda x: x['drop_pct'], reverse=True)
-            matches[buyer['id']] = {
-                'buyer': buyer,
-                'properties': buyer_matches
-            }
-
-    return matches
+    # Skip properties this buyer was already alerted about as a new listing
+    alerted = load_alerted_pairs([drop['id'] for drop in drops])
+    return match_buyers(drops, buyers, match_threshold, alerted, is_price_drop=True)
 
 
 def send_price_drop_alerts() -> Dict[str, int]:
@@ -9,6 +9,7 @@ import logging
 from typing import List
 
 from apps.automation.rules import RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -22,47 +23,41 @@ def evaluate(db, settings: dict) -> List[RuleFiring]:
     Settings used:
         rule_activity_burst_threshold (int): Minimum events in 24h (default 3)
     """
+    return match(LeadSnapshot.load(db, settings), settings)
+
+
+def match(snapshot: LeadSnapshot, settings: dict) -> List[RuleFiring]:
+    """Apply the rule to an already-loaded snapshot (see evaluate for settings)."""
     threshold = settings.get('rule_activity_burst_threshold', 3)
     firings = []
 
-    with db._get_connection() as conn:
-        rows = conn.execute('''
-            SELECT
-                l.id as contact_id,
-                l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name,
-                l.fub_id,
-                COUNT(e.id) as event_count
-            FROM contact_events e
-            JOIN leads l ON e.contact_id = l.id
-            WHERE e.occurred_at::timestamptz >= NOW() - INTERVAL '1 day'
-              AND l.stage NOT IN ('trash', 'past_client')
-            GROUP BY e.contact_id, l.id, l.first_name, l.last_name, l.fub_id
-            HAVING COUNT(e.id) >= ?
-            ORDER BY event_count DESC
-        ''', (threshold,)).fetchall()
+    leads = sorted(
+        (lead for lead in snapshot.leads if lead.events_24h >= threshold and lead.events_24h > 0),
+        key=lambda lead: lead.events_24h, reverse=True,
+    )
 
-    for row in rows:
-        name = row['contact_name'].strip()
-        fub_id = row['fub_id']
+    for lead in leads:
+        name = lead.contact_name
+        fub_id = lead.fub_id
 
         # Email alert
         firings.append(RuleFiring(
-            contact_id=row['contact_id'],
+            contact_id=lead.contact_id,
             contact_name=name,
             fub_id=int(fub_id) if fub_id else None,
             action_type='email_agent',
-            action_detail=f'{name} had {row["event_count"]} events in the last 24 hours',
+            action_detail=f'{name} had {lead.events_24h} events in the last 24 hours',
         ))
 
         # FUB task (only if contact has fub_id)
         if fub_id:
             firings.append(RuleFiring(
-                contact_id=row['contact_id'],
+                contact_id=lead.contact_id,
                 contact_name=name,
                 fub_id=int(fub_id),
                 action_type='fub_task',
                 action_detail='Call - Activity Burst',
             ))
 
-    logger.info(f"[{RULE_NAME}] Found {len(rows)} contacts with {threshold}+ events in 24h")
+    logger.info(f"[{RULE_NAME}] Found {len(leads)} contacts with {threshold}+ events in 24h")
     return firings
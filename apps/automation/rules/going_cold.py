@@ -10,6 +10,7 @@ import logging
 from typing import List
 
 from apps.automation.rules import RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -24,39 +25,29 @@ def evaluate(db, settings: dict) -> List[RuleFiring]:
         rule_going_cold_days (int): Days of inactivity threshold (default 14)
         rule_going_cold_min_heat (int): Must have had heat above this (default 30)
     """
+    return match(LeadSnapshot.load(db, settings), settings)
+
+
+def match(snapshot: LeadSnapshot, settings: dict) -> List[RuleFiring]:
+    """Apply the rule to an already-loaded snapshot (see evaluate for settings)."""
     days = settings.get('rule_going_cold_days', 14)
     min_heat = settings.get('rule_going_cold_min_heat', 30)
     firings = []
 
-    with db._get_connection() as conn:
-        # Find contacts whose score_trend is 'cooling' or who have been inactive
-        # AND who previously had a heat_score above the threshold
-        rows = conn.execute('''
-            SELECT
-                l.id as contact_id,
-                l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name,
-                l.fub_id,
-                l.days_since_activity,
-                l.heat_score
-            FROM leads l
-            WHERE l.stage NOT IN ('trash', 'past_client')
-              AND l.days_since_activity >= ?
-              AND l.id IN (
-                  SELECT contact_id FROM contact_scoring_history
-                  WHERE heat_score >= ?
-              )
-            ORDER BY l.days_since_activity DESC
-        ''', (days, min_heat)).fetchall()
-
-    for row in rows:
-        name = row['contact_name'].strip()
-        fub_id = row['fub_id']
+    # Inactive for N+ days AND previously had a heat_score above the threshold
+    leads = sorted(
+        (lead for lead in snapshot.leads
+         if lead.days_since_activity is not None and lead.days_since_activity >= days
+         and lead.peak_heat is not None and lead.peak_heat >= min_heat),
+        key=lambda lead: lead.days_since_activity, reverse=True,
+    )
 
-        if fub_id:
+    for lead in leads:
+        if lead.fub_id:
             firings.append(RuleFiring(
-                contact_id=row['contact_id'],
-                contact_name=name,
-                fub_id=int(fub_id),
+                contact_id=lead.contact_id,
+                contact_name=lead.contact_name,
+                fub_id=int(lead.fub_id),
                 action_type='fub_task',
                 action_detail='Follow Up - Going Cold',
             ))
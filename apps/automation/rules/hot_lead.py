@@ -9,6 +9,7 @@ import logging
 from typing import List
 
 from apps.automation.rules import RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -22,45 +23,41 @@ def evaluate(db, settings: dict) -> List[RuleFiring]:
     Settings used:
         rule_hot_lead_threshold (int): Heat score threshold (default 70)
     """
+    return match(LeadSnapshot.load(db, settings), settings)
+
+
+def match(snapshot: LeadSnapshot, settings: dict) -> List[RuleFiring]:
+    """Apply the rule to an already-loaded snapshot (see evaluate for settings)."""
     threshold = settings.get('rule_hot_lead_threshold', 70)
     firings = []
 
-    with db._get_connection() as conn:
-        rows = conn.execute('''
-            SELECT
-                l.id as contact_id,
-                l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name,
-                l.fub_id,
-                l.heat_score,
-                l.priority_score
-            FROM leads l
-            WHERE l.heat_score >= ?
-              AND l.stage NOT IN ('trash', 'past_client')
-            ORDER BY l.heat_score DESC
-        ''', (threshold,)).fetchall()
+    leads = sorted(
+        (lead for lead in snapshot.leads if lead.heat_score is not None and lead.heat_score >= threshold),
+        key=lambda lead: lead.heat_score, reverse=True,
+    )
 
-    for row in rows:
-        name = row['contact_name'].strip()
-        fub_id = row['fub_id']
+    for lead in leads:
+        name = lead.contact_name
+        fub_id = lead.fub_id
 
         # Email alert
         firings.append(RuleFiring(
-            contact_id=row['contact_id'],
+            contact_id=lead.contact_id,
             contact_name=name,
             fub_id=int(fub_id) if fub_id else None,
             action_type='email_agent',
-            action_detail=f'{name} has heat score {row["heat_score"]:.0f} (threshold: {threshold})',
+            action_detail=f'{name} has heat score {lead.heat_score:.0f} (threshold: {threshold})',
         ))
 
         # FUB task
         if fub_id:
             firings.append(RuleFiring(
-                contact_id=row['contact_id'],
+                contact_id=lead.contact_id,
                 contact_name=name,
                 fub_id=int(fub_id),
                 action_type='fub_task',
                 action_detail='Call - Hot Lead',
             ))
 
-    logger.info(f"[{RULE_NAME}] Found {len(rows)} contacts with heat >= {threshold}")
+    logger.info(f"[{RULE_NAME}] Found {len(leads)} contacts with heat >= {threshold}")
     return firings
@@ -6,9 +6,11 @@ Actions: FUB task "Call - New Lead" (priority 1)
 """
 
 import logging
+from datetime import timedelta
 from typing import List
 
 from apps.automation.rules import RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -22,33 +24,27 @@ def evaluate(db, settings: dict) -> List[RuleFiring]:
     Settings used:
         rule_new_lead_hours (int): How recent is "new" in hours (default 24)
     """
+    return match(LeadSnapshot.load(db, settings), settings)
+
+
+def match(snapshot: LeadSnapshot, settings: dict) -> List[RuleFiring]:
+    """Apply the rule to an already-loaded snapshot (see evaluate for settings)."""
     hours = settings.get('rule_new_lead_hours', 24)
+    since = snapshot.now - timedelta(hours=hours)
     firings = []
 
-    with db._get_connection() as conn:
-        rows = conn.execute('''
-            SELECT
-                l.id as contact_id,
-                l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name,
-                l.fub_id,
-                l.source,
-                l.created_at
-            FROM leads l
-            WHERE l.stage = 'Lead'
-              AND l.created_at::timestamptz >= NOW() - (? || ' hours')::interval
-            ORDER BY l.created_at DESC
-        ''', (str(hours),)).fetchall()
-
-    for row in rows:
-        name = row['contact_name'].strip()
-        fub_id = row['fub_id']
-        source = row['source'] or 'Unknown'
-
-        if fub_id:
+    leads = sorted(
+        (lead for lead in snapshot.leads
+         if lead.stage == 'Lead' and lead.created_at is not None and lead.created_at >= since),
+        key=lambda lead: lead.created_at, reverse=True,
+    )
+
+    for lead in leads:
+        if lead.fub_id:
             firings.append(RuleFiring(
-                contact_id=row['contact_id'],
-                contact_name=name,
-                fub_id=int(fub_id),
+                contact_id=lead.contact_id,
+                contact_name=lead.contact_name,
+                fub_id=int(lead.fub_id),
                 action_type='fub_task',
                 action_detail='Call - New Lead',
             ))
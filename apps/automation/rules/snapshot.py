@@ -0,0 +1,156 @@
+"""
+Lead Snapshot
+
+One load of the lead state every rule reads, shared by all rules in a pass.
+Rule modules filter it in memory (their match() functions) instead of each
+running its own scan of leads.
+
+Only candidate leads are loaded: those outside trash/past_client that could
+satisfy at least one rule under the current settings. The exact conditions
+are applied by the rules themselves.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXCLUDED_STAGES = ('trash', 'past_client')
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse a stored timestamp to a naive UTC datetime (naive input = UTC, like ::timestamptz)."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value if isinstance(value, str) else str(value))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _date_floor(moment: datetime) -> str:
+    """Day before `moment` as YYYY-MM-DD: a text cutoff that every format of a later timestamp sorts after."""
+    return (moment - timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+@dataclass
+class LeadState:
+    """What the rules need to know about one lead."""
+    contact_id: str
+    contact_name: str
+    fub_id: Optional[str]
+    stage: Optional[str]
+    source: Optional[str]
+    created_at: Optional[datetime]            # parsed for stage 'Lead' only
+    heat_score: Optional[float]
+    priority_score: Optional[float]
+    days_since_activity: Optional[int]
+    score_trend: Optional[str]
+    events_24h: int = 0
+    peak_heat: Optional[float] = None          # highest heat_score in contact_scoring_history
+    latest_heat_delta: Optional[float] = None  # heat_delta of the newest history row
+
+
+class LeadSnapshot:
+    """
+    Candidate leads plus the event counts and scoring history the rules read.
+
+    Usage:
+        snapshot = LeadSnapshot.load(db, settings)
+        firings = hot_lead.match(snapshot, settings)
+    """
+
+    def __init__(self, leads: List[LeadState], now: datetime):
+        # Timestamps in a snapshot (and `now`) are naive UTC
+        self.leads = leads
+        self.now = now
+
+    @classmethod
+    def load(cls, db, settings: dict, now: Optional[datetime] = None) -> 'LeadSnapshot':
+        """
+        Load the snapshot. Thresholds come from the same settings the rules
+        use, so `settings` must be the dict later passed to match().
+        """
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is not None:
+            now = now.astimezone(timezone.utc).replace(tzinfo=None)
+        day_ago = now - timedelta(days=1)
+        new_since = now - timedelta(hours=settings.get('rule_new_lead_hours', 24))
+
+        with db._get_connection() as conn:
+            rows = conn.execute('''
+                SELECT id, first_name, last_name, fub_id, stage, source, created_at,
+                       heat_score, priority_score, days_since_activity, score_trend
+                FROM leads
+                WHERE stage NOT IN (?, ?)
+                  AND (
+                      heat_score >= ?
+                      OR days_since_activity >= ?
+                      OR score_trend = 'warming'
+                      OR (stage = 'Lead' AND created_at >= ?)
+                      OR id IN (SELECT contact_id FROM contact_events WHERE occurred_at >= ?)
+                  )
+            ''', (*EXCLUDED_STAGES,
+                  settings.get('rule_hot_lead_threshold', 70),
+                  settings.get('rule_going_cold_days', 14),
+                  _date_floor(new_since), _date_floor(day_ago))).fetchall()
+
+            leads = {}
+            for row in rows:
+                name = f"{row['first_name'] or ''} {row['last_name'] or ''}".strip()
+                leads[row['id']] = LeadState(
+                    contact_id=row['id'],
+                    contact_name=name,
+                    fub_id=row['fub_id'],
+                    stage=row['stage'],
+                    source=row['source'],
+                    # Only new_lead reads created_at, and only for stage 'Lead'
+                    created_at=parse_timestamp(row['created_at']) if row['stage'] == 'Lead' else None,
+                    heat_score=row['heat_score'],
+                    priority_score=row['priority_score'],
+                    days_since_activity=row['days_since_activity'],
+                    score_trend=row['score_trend'],
+                )
+
+            # Events in the last 24h (coarse text cutoff in SQL, exact in Python)
+            for row in conn.execute(
+                'SELECT contact_id, occurred_at FROM contact_events WHERE occurred_at >= ?',
+                (_date_floor(day_ago),)
+            ).fetchall():
+                lead = leads.get(row['contact_id'])
+                occurred = parse_timestamp(row['occurred_at'])
+                if lead is not None and occurred is not None and occurred >= day_ago:
+                    lead.events_24h += 1
+
+            # Peak heat and latest delta, only for leads going_cold/warming_lead can use
+            history = conn.execute('''
+                SELECT contact_id, heat_delta, peak_heat FROM (
+                    SELECT contact_id, heat_delta,
+                           MAX(heat_score) OVER (PARTITION BY contact_id) AS peak_heat,
+                           ROW_NUMBER() OVER (PARTITION BY contact_id ORDER BY recorded_at DESC) AS rn
+                    FROM contact_scoring_history
+                    WHERE contact_id IN (
+                        SELECT id FROM leads
+                        WHERE stage NOT IN (?, ?)
+                          AND (score_trend = 'warming' OR days_since_activity >= ?)
+                    )
+                ) h
+                WHERE rn = 1
+            ''', (*EXCLUDED_STAGES, settings.get('rule_going_cold_days', 14))).fetchall()
+            for row in history:
+                lead = leads.get(row['contact_id'])
+                if lead is not None:
+                    lead.peak_heat = row['peak_heat']
+                    lead.latest_heat_delta = row['heat_delta']
+
+        logger.info(f"Lead snapshot: {len(leads)} candidate leads, "
+                    f"{len(history)} with scoring history")
+        return cls(list(leads.values()), now)
@@ -10,6 +10,7 @@ import logging
 from typing import List
 
 from apps.automation.rules import RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -23,40 +24,32 @@ def evaluate(db, settings: dict) -> List[RuleFiring]:
     Settings used:
         rule_warming_lead_min_delta (int): Minimum heat_delta (default 15)
     """
+    return match(LeadSnapshot.load(db, settings), settings)
+
+
+def match(snapshot: LeadSnapshot, settings: dict) -> List[RuleFiring]:
+    """Apply the rule to an already-loaded snapshot (see evaluate for settings)."""
     min_delta = settings.get('rule_warming_lead_min_delta', 15)
     firings = []
 
-    with db._get_connection() as conn:
-        # Get the latest scoring history for warming leads
-        rows = conn.execute('''
-            SELECT
-                l.id as contact_id,
-                l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name,
-                l.fub_id,
-                l.heat_score,
-                h.heat_delta
-            FROM leads l
-            JOIN (
-                SELECT contact_id, heat_delta, trend_direction,
-                       ROW_NUMBER() OVER (PARTITION BY contact_id ORDER BY recorded_at DESC) as rn
-                FROM contact_scoring_history
-            ) h ON l.id = h.contact_id AND h.rn = 1
-            WHERE l.score_trend = 'warming'
-              AND h.heat_delta >= ?
-              AND l.stage NOT IN ('trash', 'past_client')
-            ORDER BY h.heat_delta DESC
-        ''', (min_delta,)).fetchall()
-
-    for row in rows:
-        name = row['contact_name'].strip()
-        delta = row['heat_delta']
+    # Latest scoring history row decides the delta
+    leads = sorted(
+        (lead for lead in snapshot.leads
+         if lead.score_trend == 'warming'
+         and lead.latest_heat_delta is not None and lead.latest_heat_delta >= min_delta),
+        key=lambda lead: lead.latest_heat_delta, reverse=True,
+    )
+
+    for lead in leads:
+        name = lead.contact_name
+        delta = lead.latest_heat_delta
 
         firings.append(RuleFiring(
-            contact_id=row['contact_id'],
+            contact_id=lead.contact_id,
             contact_name=name,
-            fub_id=int(row['fub_id']) if row['fub_id'] else None,
+            fub_id=int(lead.fub_id) if lead.fub_id else None,
             action_type='email_agent',
-            action_detail=f'{name} is warming up — heat delta +{delta:.0f} (score: {row["heat_score"]:.0f})',
+            action_detail=f'{name} is warming up — heat delta +{delta:.0f} (score: {lead.heat_score:.0f})',
         ))
 
     logger.info(f"[{RULE_NAME}] Found {len(firings)} warming contacts with delta >= {min_delta}")
@@ -3,19 +3,28 @@ Rules Engine
 
 Evaluates automation rules against lead data and dispatches actions.
 Handles cooldown checks, action dispatch (email, FUB tasks), and logging.
+
+A pass loads one LeadSnapshot and every rule's cooldowns up front, matches
+the rules in memory, and runs the resulting actions on a small thread pool.
 """
 
 import json
 import importlib
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 
 from apps.automation.rules import RULE_REGISTRY, RuleFiring
+from apps.automation.rules.snapshot import LeadSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Concurrent email/FUB actions (setting: rules_dispatch_workers)
+DEFAULT_DISPATCH_WORKERS = 4
+
 
 class RuleEngine:
     """
@@ -55,7 +64,11 @@ class RuleEngine:
 
     def evaluate_all(self) -> Dict[str, Any]:
         """
-        Evaluate all enabled rules.
+        Evaluate all enabled rules in one pass.
+
+        Loads one LeadSnapshot and the cooldown state for every enabled
+        rule up front, matches each rule in memory, then dispatches all
+        surviving firings through the worker pool.
 
         Returns:
             Summary dict with per-rule results and totals.
@@ -68,8 +81,7 @@ class RuleEngine:
             return {'status': 'disabled', 'rules': {}}
 
         results = {}
-        total_firings = 0
-        total_actions = 0
+        enabled = []
 
         for rule_name, rule_config in RULE_REGISTRY.items():
             # Check per-rule enabled flag
@@ -78,17 +90,16 @@ class RuleEngine:
                 logger.info(f"[{rule_name}] Skipped — disabled")
                 results[rule_name] = {'status': 'disabled', 'firings': 0, 'actions': 0}
                 continue
+            enabled.append(rule_name)
 
-            result = self.evaluate_rule(rule_name)
-            results[rule_name] = result
-            total_firings += result.get('firings', 0)
-            total_actions += result.get('actions', 0)
+        results.update(self._evaluate(enabled, settings))
+        results = {rule_name: results[rule_name] for rule_name in RULE_REGISTRY}
 
         return {
             'status': 'completed',
             'dry_run': self.dry_run,
-            'total_firings': total_firings,
-            'total_actions': total_actions,
+            'total_firings': sum(r.get('firings', 0) for r in results.values()),
+            'total_actions': sum(r.get('actions', 0) for r in results.values()),
             'rules': results,
             'timestamp': datetime.now().isoformat(),
         }
@@ -104,57 +115,109 @@ class RuleEngine:
             logger.error(f"Unknown rule: {rule_name}")
             return {'status': 'error', 'error': f'Unknown rule: {rule_name}'}
 
-        rule_config = RULE_REGISTRY[rule_name]
-        settings = self._get_settings()
+        return self._evaluate([rule_name], self._get_settings())[rule_name]
+
+    def _evaluate(self, rule_names: List[str], settings: dict) -> Dict[str, Dict[str, Any]]:
+        """Match rules against one shared snapshot and dispatch their firings."""
+        if not rule_names:
+            return {}
 
         try:
-            # Import the rule module
-            module = importlib.import_module(rule_config['module'])
-            evaluate_fn = module.evaluate
+            snapshot = LeadSnapshot.load(self.db, settings)
+            cooldowns = self.db.get_automation_cooldowns(rule_names)
+        except Exception as e:
+            logger.error(f"Error loading rule inputs: {e}", exc_info=True)
+            return {rule_name: {'status': 'error', 'error': str(e)} for rule_name in rule_names}
 
-            # Run the rule's evaluate function
-            raw_firings: List[RuleFiring] = evaluate_fn(self.db, settings)
+        results = {}
+        pending = []
+
+        for rule_name in rule_names:
+            try:
+                module = importlib.import_module(RULE_REGISTRY[rule_name]['module'])
+                raw_firings: List[RuleFiring] = module.match(snapshot, settings)
+            except Exception as e:
+                logger.error(f"[{rule_name}] Error evaluating rule: {e}", exc_info=True)
+                results[rule_name] = {'status': 'error', 'error': str(e)}
+                continue
 
             # Filter by cooldowns
-            firings = []
-            skipped_cooldown = 0
-            for firing in raw_firings:
-                if self.db.check_automation_cooldown(rule_name, firing.contact_id):
-                    skipped_cooldown += 1
-                    continue
-                firings.append(firing)
-
-            # Dispatch actions
-            actions_taken = 0
-            action_details = []
-
-            for firing in firings:
-                success = self._dispatch_action(rule_name, firing, settings)
-                if success:
-                    actions_taken += 1
-                    action_details.append({
-                        'contact': firing.contact_name,
-                        'action': firing.action_type,
-                        'detail': firing.action_detail,
-                    })
-
-            logger.info(
-                f"[{rule_name}] {len(raw_firings)} matches, "
-                f"{skipped_cooldown} cooldown skips, "
-                f"{actions_taken} actions taken"
-            )
-
-            return {
+            firings = [f for f in raw_firings if (rule_name, f.contact_id) not in cooldowns]
+            results[rule_name] = {
                 'status': 'completed',
                 'firings': len(firings),
-                'actions': actions_taken,
-                'skipped_cooldown': skipped_cooldown,
-                'details': action_details,
+                'actions': 0,
+                'skipped_cooldown': len(raw_firings) - len(firings),
+                'details': [],
+                'timing': {},
             }
+            pending.extend((rule_name, firing) for firing in firings)
+
+        # Dispatch actions
+        for rule_name, firing, success, elapsed in self._dispatch_all(pending, settings):
+            result = results[rule_name]
+            timing = result['timing'].setdefault(firing.action_type, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            timing['count'] += 1
+            timing['total_ms'] += elapsed * 1000
+            timing['max_ms'] = max(timing['max_ms'], elapsed * 1000)
+            if success:
+                result['actions'] += 1
+                result['details'].append({
+                    'contact': firing.contact_name,
+                    'action': firing.action_type,
+                    'detail': firing.action_detail,
+                    'elapsed_ms': round(elapsed * 1000, 1),
+                })
+
+        for rule_name, result in results.items():
+            if result['status'] != 'completed':
+                continue
+            timing = ', '.join(
+                f"{action} {t['count']}x avg {t['total_ms'] / t['count']:.0f}ms max {t['max_ms']:.0f}ms"
+                for action, t in result['timing'].items()
+            )
+            logger.info(
+                f"[{rule_name}] {result['firings'] + result['skipped_cooldown']} matches, "
+                f"{result['skipped_cooldown']} cooldown skips, "
+                f"{result['actions']} actions taken"
+                + (f" ({timing})" if timing and not self.dry_run else "")
+            )
 
-        except Exception as e:
-            logger.error(f"[{rule_name}] Error evaluating rule: {e}", exc_info=True)
-            return {'status': 'error', 'error': str(e)}
+        return results
+
+    def _dispatch_all(self, pending: List[tuple], settings: dict) -> List[tuple]:
+        """
+        Run firings through a bounded worker pool, logging each as it finishes.
+
+        Only the action itself (email send, FUB call) runs in a worker; the
+        automation_log write stays on this thread.
+
+        Returns:
+            (rule_name, firing, success, elapsed_seconds) in submission order.
+        """
+        if self.dry_run or not pending:
+            return [(rule_name, firing, self._dispatch_action(rule_name, firing, settings), 0.0)
+                    for rule_name, firing in pending]
+
+        workers = max(1, int(settings.get('rules_dispatch_workers', DEFAULT_DISPATCH_WORKERS)))
+        completed = []
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rules-dispatch') as pool:
+            futures = [
+                pool.submit(self._timed_action, rule_name, firing, settings)
+                for rule_name, firing in pending
+            ]
+            for (rule_name, firing), future in zip(pending, futures):
+                success, elapsed = future.result()
+                self._log_firing(rule_name, firing, success, settings)
+                completed.append((rule_name, firing, success, elapsed))
+
+        return completed
+
+    def _timed_action(self, rule_name: str, firing: RuleFiring, settings: dict) -> tuple:
+        started = time.perf_counter()
+        success = self._execute_action(rule_name, firing, settings)
+        return success, time.perf_counter() - started
 
     def _dispatch_action(self, rule_name: str, firing: RuleFiring, settings: dict) -> bool:
         """
@@ -162,15 +225,6 @@ class RuleEngine:
 
         Returns True if the action succeeded (or dry_run).
         """
-        # Calculate cooldown
-        cooldown_key = RULE_REGISTRY[rule_name].get('cooldown_key')
-        if cooldown_key:
-            cooldown_hours = settings.get(cooldown_key, 48)
-        else:
-            # new_lead: "once ever" = 10 year cooldown
-            cooldown_hours = 87600
-        cooldown_until = (datetime.now() + timedelta(hours=cooldown_hours)).isoformat()
-
         if self.dry_run:
             logger.info(
                 f"  [DRY RUN] {rule_name} → {firing.action_type}: "
@@ -178,23 +232,36 @@ class RuleEngine:
             )
             return True
 
-        success = False
+        success = self._execute_action(rule_name, firing, settings)
+        self._log_firing(rule_name, firing, success, settings)
+        return success
 
+    def _execute_action(self, rule_name: str, firing: RuleFiring, settings: dict) -> bool:
+        """Perform the firing's action. Returns True on success; never raises."""
         try:
             if firing.action_type == 'email_agent':
-                success = self._send_agent_email(rule_name, firing, settings)
+                return self._send_agent_email(rule_name, firing, settings)
             elif firing.action_type == 'fub_task':
-                success = self._create_fub_task(rule_name, firing, settings)
+                return self._create_fub_task(rule_name, firing, settings)
             elif firing.action_type == 'fub_note':
-                success = self._create_fub_note(rule_name, firing, settings)
+                return self._create_fub_note(rule_name, firing, settings)
             else:
                 logger.warning(f"Unknown action type: {firing.action_type}")
-                success = False
+                return False
         except Exception as e:
             logger.error(f"Action dispatch error: {e}", exc_info=True)
-            success = False
+            return False
+
+    def _log_firing(self, rule_name: str, firing: RuleFiring, success: bool, settings: dict) -> None:
+        """Log the firing (regardless of success) with the rule's cooldown."""
+        cooldown_key = RULE_REGISTRY[rule_name].get('cooldown_key')
+        if cooldown_key:
+            cooldown_hours = settings.get(cooldown_key, 48)
+        else:
+            # new_lead: "once ever" = 10 year cooldown
+            cooldown_hours = 87600
+        cooldown_until = (datetime.now() + timedelta(hours=cooldown_hours)).isoformat()
 
-        # Log the firing regardless of success
         self.db.log_automation_firing(
             rule_name=rule_name,
             contact_id=firing.contact_id,
@@ -205,8 +272,6 @@ class RuleEngine:
             success=success,
         )
 
-        return success
-
     def _send_agent_email(self, rule_name: str, firing: RuleFiring, settings: dict) -> bool:
         """Send an alert email to the agent. Returns True on success."""
         agent_email = settings.get('rules_agent_email', '') or os.getenv('AGENT_EMAIL', '')
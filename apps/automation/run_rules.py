@@ -96,6 +96,12 @@ def main():
             skipped = rule_result.get('skipped_cooldown', 0)
             logger.info(f"  {rule_name}: {firings} fired, {actions} actions, {skipped} cooldown skips")
 
+            if not args.dry_run:
+                for action, timing in rule_result.get('timing', {}).items():
+                    logger.info(f"    {action}: {timing['count']}x, "
+                                f"avg {timing['total_ms'] / timing['count']:.0f}ms, "
+                                f"max {timing['max_ms']:.0f}ms")
+
             # Show details in verbose/dry-run mode
             if (args.dry_run or args.verbose) and rule_result.get('details'):
                 for detail in rule_result['details']:
@@ -20,6 +20,7 @@ import argparse
 import json
 import logging
 import os
+import re
 import sqlite3
 import sys
 from datetime import datetime, timedelta
@@ -82,123 +83,277 @@ def get_due_searches(frequency: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def match_search_to_listings(filters: dict, since: str | None = None, limit: int = 20) -> list[dict]:
-    """Find listings matching saved search filters.
+# Columns a listing carries into the alert email
+LISTING_COLUMNS = (
+    'id', 'address', 'city', 'state', 'county', 'list_price', 'beds', 'baths',
+    'sqft', 'acreage', 'primary_photo', 'mls_number', 'property_type',
+    'days_on_market', 'status',
+)
 
-    Builds a SQL query from the saved search filter dict, using the same
-    logic as the public API's build_listing_filters().
+# Extra columns the predicates read but the email doesn't need
+_MATCH_COLUMNS = ('subdivision', 'public_remarks', 'created_at', 'updated_at')
 
-    Args:
-        filters: Dict of filter key/value pairs (from filters_json)
-        since: ISO timestamp; only return listings added/updated after this time
-        limit: Max listings to return
+# Numeric filters: (filter key, listing column, coercion)
+_MINIMUMS = (
+    ('min_price', 'list_price', int),
+    ('min_beds', 'beds', int),
+    ('min_baths', 'baths', float),
+    ('min_sqft', 'sqft', int),
+    ('min_acreage', 'acreage', float),
+)
 
-    Returns:
-        List of listing dicts
-    """
-    conditions = ["idx_opt_in = 1"]
-    params = []
+# Columns the free-text q filter searches
+_TEXT_COLUMNS = ('address', 'city', 'county', 'subdivision', 'public_remarks', 'mls_number')
 
-    status = filters.get('status', 'ACTIVE')
-    if status:
-        conditions.append("UPPER(status) = UPPER(?)")
-        params.append(status)
 
-    city = filters.get('city')
-    if city:
-        conditions.append("LOWER(city) = LOWER(?)")
-        params.append(city)
+def _stamp(value):
+    """Timestamps compare as ISO text, the way the TEXT columns do in SQL."""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
 
-    county = filters.get('county')
-    if county:
-        conditions.append("LOWER(county) = LOWER(?)")
-        params.append(county)
 
-    min_price = filters.get('min_price')
-    if min_price is not None:
-        try:
-            conditions.append("list_price >= ?")
-            params.append(int(min_price))
-        except (ValueError, TypeError):
-            pass
+def _lower(value):
+    return str(value).lower() if value is not None else None
 
-    max_price = filters.get('max_price')
-    if max_price is not None:
-        try:
-            conditions.append("list_price <= ?")
-            params.append(int(max_price))
-        except (ValueError, TypeError):
-            pass
 
-    min_beds = filters.get('min_beds')
-    if min_beds is not None:
-        try:
-            conditions.append("beds >= ?")
-            params.append(int(min_beds))
-        except (ValueError, TypeError):
-            pass
+def _upper(value):
+    return str(value).upper() if value is not None else None
 
-    min_baths = filters.get('min_baths')
-    if min_baths is not None:
-        try:
-            conditions.append("baths >= ?")
-            params.append(float(min_baths))
-        except (ValueError, TypeError):
-            pass
 
-    min_sqft = filters.get('min_sqft')
-    if min_sqft is not None:
-        try:
-            conditions.append("sqft >= ?")
-            params.append(int(min_sqft))
-        except (ValueError, TypeError):
-            pass
+def _like(pattern: str):
+    """Compile a LIKE pattern (% and _ wildcards) to a case-insensitive regex search."""
+    parts = []
+    for ch in pattern:
+        if ch == '%':
+            parts.append('.*')
+        elif ch == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(ch))
+    return re.compile('^' + ''.join(parts) + '$', re.IGNORECASE | re.DOTALL).match
 
-    min_acreage = filters.get('min_acreage')
-    if min_acreage is not None:
-        try:
-            conditions.append("acreage >= ?")
-            params.append(float(min_acreage))
-        except (ValueError, TypeError):
-            pass
-
-    property_type = filters.get('property_type')
-    if property_type:
-        conditions.append("property_type = ?")
-        params.append(property_type)
-
-    q = filters.get('q')
-    if q:
-        search_term = f"%{q}%"
-        conditions.append(
-            "(address LIKE ? OR city LIKE ? OR county LIKE ? "
-            "OR subdivision LIKE ? OR public_remarks LIKE ? OR mls_number LIKE ?)"
-        )
-        params.extend([search_term] * 6)
-
-    # Only include listings added or updated since last alert
+
+class _Listing:
+    """A listing row with the values predicates compare pre-normalized."""
+
+    __slots__ = ('row', 'email', 'status', 'city', 'county', 'changed')
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.email = {column: row.get(column) for column in LISTING_COLUMNS}
+        self.status = _upper(row.get('status'))
+        self.city = _lower(row.get('city'))
+        self.county = _lower(row.get('county'))
+        # created_at > since OR updated_at > since  <=>  max of the two > since
+        stamps = [s for s in (_stamp(row.get('created_at')), _stamp(row.get('updated_at'))) if s is not None]
+        self.changed = max(stamps) if stamps else None
+
+
+class SearchPredicate:
+    """A saved search's filters_json compiled once into an in-memory listing test.
+
+    Mirrors the SQL match_search_to_listings used to build, condition for
+    condition: missing listing values never match a filter, unparseable
+    numeric filters are ignored, and q is a case-insensitive LIKE over the
+    same six columns.
+    """
+
+    def __init__(self, filters: dict, since=None):
+        filters = filters or {}
+        status = filters.get('status', 'ACTIVE')
+        self.status = str(status).upper() if status else None
+        self.city = _lower(filters.get('city') or None)
+        self.county = _lower(filters.get('county') or None)
+        self.property_type = filters.get('property_type') or None
+        self.since = _stamp(since) or None
+
+        # (column, lowest allowed, highest allowed)
+        self.ranges = []
+        for key, column, coerce in _MINIMUMS:
+            value = filters.get(key)
+            if value is None:
+                continue
+            try:
+                self.ranges.append((column, coerce(value), None))
+            except (ValueError, TypeError):
+                pass
+        if filters.get('max_price') is not None:
+            try:
+                self.ranges.append(('list_price', None, int(filters['max_price'])))
+            except (ValueError, TypeError):
+                pass
+
+        q = filters.get('q')
+        self.text = _like(f"%{q}%") if q else None
+
+    def __call__(self, listing: _Listing) -> bool:
+        if self.since is not None and (listing.changed is None or listing.changed <= self.since):
+            return False
+        if self.status is not None and listing.status != self.status:
+            return False
+        if self.city is not None and listing.city != self.city:
+            return False
+        if self.county is not None and listing.county != self.county:
+            return False
+        row = listing.row
+        for column, low, high in self.ranges:
+            value = row.get(column)
+            if value is None or (low is not None and value < low) or (high is not None and value > high):
+                return False
+        if self.property_type is not None and row.get('property_type') != self.property_type:
+            return False
+        if self.text is not None and not any(
+            row.get(column) is not None and self.text(str(row[column])) for column in _TEXT_COLUMNS
+        ):
+            return False
+        return True
+
+
+class ListingPool:
+    """Changed listings, newest first, bucketed by status, city and county.
+
+    Each predicate walks the narrowest bucket its filters allow and stops at
+    its limit, so most searches only look at a slice of the scan.
+    """
+
+    def __init__(self, rows: list[dict]):
+        # ORDER BY created_at DESC; rows without a created_at go last
+        rows = sorted((r for r in rows if r.get('idx_opt_in') == 1),
+                      key=lambda r: _stamp(r.get('created_at')) or '', reverse=True)
+        self.listings = [_Listing(r) for r in rows]
+        self.by_status = {}
+        self.by_city = {}
+        self.by_county = {}
+        for listing in self.listings:
+            self.by_status.setdefault(listing.status, []).append(listing)
+            self.by_city.setdefault((listing.status, listing.city), []).append(listing)
+            self.by_county.setdefault((listing.status, listing.county), []).append(listing)
+
+    def candidates(self, predicate: SearchPredicate) -> list[_Listing]:
+        if predicate.status is None:
+            return self.listings
+        if predicate.city is not None:
+            return self.by_city.get((predicate.status, predicate.city), [])
+        if predicate.county is not None:
+            return self.by_county.get((predicate.status, predicate.county), [])
+        return self.by_status.get(predicate.status, [])
+
+    def match(self, predicate: SearchPredicate, limit: int = 20) -> list[dict]:
+        matches = []
+        for listing in self.candidates(predicate):
+            if predicate(listing):
+                matches.append(dict(listing.email))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+def load_changed_listings(since: str | None = None, statuses=None) -> list[dict]:
+    """One scan of the IDX listings added or updated after `since`.
+
+    Args:
+        since: Oldest cutoff among the searches being matched (None = all)
+        statuses: Upper-cased statuses to restrict to (None = any status)
+    """
+    conditions = ["idx_opt_in = 1"]
+    params = []
+    if statuses is not None:
+        statuses = sorted(statuses)
+        if not statuses:
+            return []
+        conditions.append(f"UPPER(status) IN ({','.join('?' for _ in statuses)})")
+        params.extend(statuses)
     if since:
         conditions.append("(created_at > ? OR updated_at > ?)")
         params.extend([since, since])
 
-    where = " AND ".join(conditions)
-    sql = f"""
-        SELECT id, address, city, state, county, list_price, beds, baths,
-               sqft, acreage, primary_photo, mls_number, property_type,
-               days_on_market, status
-        FROM listings
-        WHERE {where}
-        ORDER BY created_at DESC
-        LIMIT ?
-    """
-    params.append(limit)
-
+    columns = ', '.join(LISTING_COLUMNS + _MATCH_COLUMNS + ('idx_opt_in',))
     db = _get_db()
-    rows = db.execute(sql, params).fetchall()
-    db.close()
+    try:
+        rows = db.execute(
+            f"SELECT {columns} FROM listings WHERE {' AND '.join(conditions)}", params
+        ).fetchall()
+    finally:
+        db.close()
     return [dict(r) for r in rows]
 
 
+def parse_filters(search: dict) -> dict:
+    """The saved search's filters_json as a dict ({} if missing or invalid)."""
+    try:
+        filters = json.loads(search.get('filters_json') or '{}')
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return filters if isinstance(filters, dict) else {}
+
+
+def match_searches(searches: list[dict], limit: int = 20) -> dict:
+    """Match every saved search against one scan of the listings table.
+
+    Each search's cutoff is its last_alerted_at (or created_at). Listings
+    changed since the oldest cutoff are loaded once and every search's
+    compiled predicate runs against them in memory.
+
+    Returns:
+        {search id: [listing dicts, newest first, at most `limit`]}
+    """
+    predicates = {
+        search['id']: SearchPredicate(parse_filters(search),
+                                      since=search.get('last_alerted_at') or search.get('created_at'))
+        for search in searches
+    }
+    if not predicates:
+        return {}
+
+    cutoffs = [p.since for p in predicates.values()]
+    oldest = None if None in cutoffs else min(cutoffs)
+    statuses = None if any(p.status is None for p in predicates.values()) \
+        else {p.status for p in predicates.values()}
+
+    pool = ListingPool(load_changed_listings(oldest, statuses))
+    return {search_id: pool.match(predicate, limit) for search_id, predicate in predicates.items()}
+
+
+def mark_alerted(search_ids: list, alerted_at: str) -> None:
+    """Set last_alerted_at on every search in one UPDATE per 500 ids."""
+    ids = list(dict.fromkeys(search_ids))
+    if not ids:
+        return
+    db = _get_db()
+    try:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            db.execute(
+                f"UPDATE saved_searches SET last_alerted_at = ? "
+                f"WHERE id IN ({','.join('?' for _ in chunk)})",
+                [alerted_at] + chunk,
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def match_search_to_listings(filters: dict, since: str | None = None, limit: int = 20) -> list[dict]:
+    """Find listings matching one saved search's filters.
+
+    Uses the same compiled predicate as match_searches(); process_alerts
+    goes through that instead so all due searches share one scan.
+
+    Args:
+        filters: Dict of filter key/value pairs (from filters_json)
+        since: ISO timestamp; only return listings added/updated after this time
+        limit: Max listings to return
+
+    Returns:
+        List of listing dicts
+    """
+    predicate = SearchPredicate(filters, since=since)
+    statuses = None if predicate.status is None else {predicate.status}
+    pool = ListingPool(load_changed_listings(predicate.since, statuses))
+    return pool.match(predicate, limit)
+
+
 def send_search_alert(user_email: str, user_name: str, search: dict, listings: list[dict]) -> bool:
     """Send a saved search alert email to a buyer.
 
@@ -278,29 +433,19 @@ def process_alerts(frequency: str) -> int:
     logger.info(f"Processing {len(searches)} {frequency} saved search alerts")
     sent_count = 0
 
+    # Stamp with the scan time so listings changed mid-run land in the next window
+    alerted_at = datetime.now().isoformat()
+    matches = match_searches(searches)
+    alerted = []
+
     for search in searches:
         try:
-            filters = {}
-            try:
-                filters = json.loads(search.get('filters_json') or '{}')
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-            # Use last_alerted_at as the "since" cutoff, or created_at as fallback
-            since = search.get('last_alerted_at') or search.get('created_at')
-
-            listings = match_search_to_listings(filters, since=since)
+            listings = matches[search['id']]
 
             if not listings:
                 logger.debug(f"No new matches for search '{search['name']}' (id={search['id']})")
                 # Still update last_alerted_at so we don't re-check the same window
-                db = _get_db()
-                db.execute(
-                    'UPDATE saved_searches SET last_alerted_at = ? WHERE id = ?',
-                    [datetime.now().isoformat(), search['id']]
-                )
-                db.commit()
-                db.close()
+                alerted.append(search['id'])
                 continue
 
             user_email = search.get('user_email')
@@ -310,13 +455,7 @@ def process_alerts(frequency: str) -> int:
 
             if sent:
                 sent_count += 1
-                db = _get_db()
-                db.execute(
-                    'UPDATE saved_searches SET last_alerted_at = ? WHERE id = ?',
-                    [datetime.now().isoformat(), search['id']]
-                )
-                db.commit()
-                db.close()
+                alerted.append(search['id'])
                 logger.info(f"Sent alert for '{search['name']}' to {user_email}: {len(listings)} listings")
             else:
                 logger.warning(f"Failed to send alert for search '{search['name']}' to {user_email}")
@@ -324,6 +463,7 @@ def process_alerts(frequency: str) -> int:
         except Exception as e:
             logger.error(f"Error processing search '{search.get('name', '?')}': {e}")
 
+    mark_alerted(alerted, alerted_at)
     return sent_count
 
 
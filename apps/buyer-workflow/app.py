@@ -408,6 +408,8 @@ def intake_save():
         values = [v for k, v in data.items() if k != 'id'] + [form_id]
         db.execute(f'UPDATE intake_forms SET {set_clause} WHERE id = ?', values)
 
+    from src.core import contact_intelligence
+    contact_intelligence.refresh(db, [lead_id], sweep=False)
     db.commit()
 
     flash('Intake form saved successfully', 'success')
@@ -1145,7 +1147,14 @@ def showing_add_properties(showing_id):
 
 @app.route('/showings/<showing_id>/optimize-route', methods=['POST'])
 def showing_optimize_route(showing_id):
-    """Optimize the showing route order using nearest neighbor algorithm."""
+    """Optimize the showing route order from the meeting point.
+
+    Optional JSON body: {"windows": {property_id: {"earliest": "HH:MM",
+    "latest": "HH:MM"}}}. Windows only apply when the showing has a
+    scheduled_time to start the clock from.
+    """
+    from src.core import route_planner
+
     db = get_db()
     props_db = get_properties_db()
 
@@ -1155,7 +1164,7 @@ def showing_optimize_route(showing_id):
 
     # Get showing_properties from dreams.db
     show_props = db.execute('''
-        SELECT id, property_id, stop_order FROM showing_properties
+        SELECT id, property_id, stop_order, time_at_property FROM showing_properties
         WHERE showing_id = ?
         ORDER BY stop_order
     ''', (showing_id,)).fetchall()
@@ -1171,64 +1180,49 @@ def showing_optimize_route(showing_id):
     ''', prop_ids).fetchall()
     props_dict = {p['id']: dict(p) for p in props_data}
 
-    # Merge showing_properties with property data
-    properties = []
+    # Stops with coordinates get routed; the rest keep their relative order
+    # after them
+    with_coords, without_coords = [], []
     for sp in show_props:
-        prop = props_dict.get(sp['property_id'])
-        if prop:
-            properties.append({
-                'id': sp['id'],
-                'property_id': sp['property_id'],
-                'stop_order': sp['stop_order'],
-                'address': prop['address'],
-                'latitude': prop['latitude'],
-                'longitude': prop['longitude'],
-            })
-
-    # Filter to properties with coordinates
-    with_coords = [p for p in properties if p['latitude'] and p['longitude']]
+        prop = props_dict.get(sp['property_id']) or {}
+        if prop.get('latitude') and prop.get('longitude'):
+            with_coords.append(dict(sp, latitude=prop['latitude'], longitude=prop['longitude']))
+        else:
+            without_coords.append(dict(sp))
 
     if len(with_coords) < 2:
         return jsonify({'error': 'Need at least 2 properties with coordinates'}), 400
 
-    # Simple nearest neighbor optimization
-    # Start with meeting point if available, otherwise first property
-    start_lat = showing['meeting_address'] if showing['meeting_address'] else None
-
-    optimized = []
-    remaining = with_coords.copy()
-
-    # Start with first property (or could use meeting point)
-    current = remaining.pop(0)
-    optimized.append(current)
-
-    while remaining:
-        # Find nearest unvisited property
-        nearest = min(remaining, key=lambda p: _haversine(
-            current['latitude'], current['longitude'],
-            p['latitude'], p['longitude']
-        ))
-        remaining.remove(nearest)
-        optimized.append(nearest)
-        current = nearest
+    start = _meeting_point_coords(db, showing)
+    start_minute = _parse_minutes(showing['scheduled_time'])
+    windows = None
+    if start_minute is not None:
+        requested = (request.get_json(silent=True) or {}).get('windows') or {}
+        windows = [_parse_window(requested.get(p['property_id'])) for p in with_coords]
+
+    plan = route_planner.plan_route(
+        [(p['latitude'], p['longitude']) for p in with_coords],
+        start=start,
+        durations=[p['time_at_property'] for p in with_coords],
+        windows=windows,
+        start_minute=start_minute or 0,
+    )
+    optimized = [with_coords[i] for i in plan.order]
 
-    # Update stop orders
+    # Write all stop orders (and arrival times, when the showing has a start
+    # time) in one batch
+    updates = []
     for i, prop in enumerate(optimized):
-        db.execute('''
-            UPDATE showing_properties SET stop_order = ? WHERE id = ?
-        ''', (i + 1, prop['id']))
-
-    # Calculate total distance
-    total_distance = 0
-    for i in range(len(optimized) - 1):
-        total_distance += _haversine(
-            optimized[i]['latitude'], optimized[i]['longitude'],
-            optimized[i+1]['latitude'], optimized[i+1]['longitude']
-        )
+        arrival = _format_minutes(plan.arrivals[i]) if start_minute is not None else None
+        updates.append((i + 1, arrival, prop['id']))
+    for i, prop in enumerate(without_coords, start=len(optimized)):
+        updates.append((i + 1, None, prop['id']))
+    db.executemany('''
+        UPDATE showing_properties SET stop_order = ?, scheduled_time = ? WHERE id = ?
+    ''', updates)
 
-    # Estimate drive time (assume 30mph average in mountains)
-    drive_time_hours = total_distance / 30
-    drive_time_minutes = int(drive_time_hours * 60)
+    total_distance = plan.total_distance
+    drive_time_minutes = int(plan.drive_minutes)
 
     # Update showing with route info
     db.execute('''
@@ -1243,25 +1237,49 @@ def showing_optimize_route(showing_id):
         'success': True,
         'total_distance': round(total_distance, 1),
         'drive_time_minutes': drive_time_minutes,
-        'order': [p['property_id'] for p in optimized]
+        'late_minutes': round(plan.late_minutes),
+        'started_from_meeting_point': start is not None,
+        'order': [p['property_id'] for p in optimized] + [p['property_id'] for p in without_coords],
     })
 
 
-def _haversine(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in miles."""
-    from math import radians, sin, cos, sqrt, atan2
+def _meeting_point_coords(db, showing):
+    """Geocode the showing's meeting address through the shared cache."""
+    from src.core import route_planner
 
-    R = 3959  # Earth's radius in miles
+    if not showing['meeting_address']:
+        return None
+    try:
+        from src.services.spatial_data_service import SpatialDataService
+        geocoder = route_planner.geocoder_for(SpatialDataService())
+    except ImportError:
+        geocoder = None
+    address = showing['meeting_address']
+    coords = route_planner.geocode(db, [(address, '', 'NC')], geocoder=geocoder)
+    db.commit()
+    return coords.get(route_planner.normalize_address(address, '', 'NC'))
 
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
 
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
+def _parse_minutes(value):
+    """'HH:MM' -> minutes since midnight, or None."""
+    try:
+        hours, minutes = str(value).split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except (TypeError, ValueError):
+        return None
+
 
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+def _format_minutes(value):
+    """Minutes since midnight -> 'HH:MM'."""
+    value = int(round(value))
+    return f"{value // 60 % 24:02d}:{value % 60:02d}"
 
-    return R * c
+
+def _parse_window(window):
+    """{'earliest': 'HH:MM', 'latest': 'HH:MM'} -> (minutes, minutes) or None."""
+    if not isinstance(window, dict):
+        return None
+    return (_parse_minutes(window.get('earliest')), _parse_minutes(window.get('latest')))
 
 
 @app.route('/showings/<showing_id>/google-maps-url')
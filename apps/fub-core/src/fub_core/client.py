@@ -38,6 +38,7 @@ class FUBClient:
 
         self.logger = logger
         self.cache = cache
+        self.request_count = 0  # GETs issued, including retries
 
         if self.logger:
             self.logger.info("FUB API client initialized")
@@ -48,6 +49,7 @@ class FUBClient:
             try:
                 if self.logger:
                     self.logger.debug(f"GET {url} (attempt {attempt + 1}/{max_retries})")
+                self.request_count += 1
                 response = self.session.get(url, params=params, timeout=30)
 
                 if response.status_code == 429:
@@ -163,6 +165,8 @@ class FUBClient:
             Deduplicated list of people dicts, each tagged with '_contact_group'
         """
         pond_group_map = pond_group_map or {}
+        # Compare as strings: callers build this from events or from the DB
+        event_person_ids = {str(pid) for pid in (event_person_ids or ())}
         seen_ids = set()
         all_people = []
 
@@ -195,8 +199,8 @@ class FUBClient:
 
             if event_person_ids and len(people) > pond_cap:
                 # Split into active (has events) and inactive
-                active = [p for p in people if p.get("id") in event_person_ids and p.get("id") not in seen_ids]
-                inactive = [p for p in people if p.get("id") not in event_person_ids and p.get("id") not in seen_ids]
+                active = [p for p in people if str(p.get("id")) in event_person_ids and p.get("id") not in seen_ids]
+                inactive = [p for p in people if str(p.get("id")) not in event_person_ids and p.get("id") not in seen_ids]
 
                 # Take all active up to cap, fill remainder with inactive
                 to_add = active[:pond_cap]
@@ -226,6 +230,32 @@ class FUBClient:
     def fetch_events(self, limit: int = 100) -> List[Dict]:
         return self.fetch_collection("/events", "events", {"limit": limit})
 
+    # Collection path and response key per activity resource
+    ACTIVITY_COLLECTIONS = {
+        "calls": ("/calls", "calls"),
+        "textMessages": ("/textMessages", "textmessages"),
+        "emails": ("/emails", "emails"),
+        "events": ("/events", "events"),
+    }
+
+    def fetch_activity_since(self, resource: str, created_after: Optional[str]) -> List[Dict]:
+        """
+        Fetch account-wide activity created after a timestamp.
+
+        Used by the incremental sync instead of the per-person text/email
+        fan-out: one paginated listing per resource, sized by new activity.
+
+        Args:
+            resource: One of ACTIVITY_COLLECTIONS ('calls', 'textMessages', 'emails', 'events')
+            created_after: ISO timestamp or YYYY-MM-DD; None fetches everything
+
+        Returns:
+            List of activity dicts
+        """
+        path, key = self.ACTIVITY_COLLECTIONS[resource]
+        params = {"createdAfter": created_after} if created_after else {}
+        return self.fetch_collection(path, key, params, use_cache=False)
+
     def fetch_text_messages_for_person(self, person_id: str) -> List[Dict]:
         params = {"personId": person_id, "limit": 100}
         try:
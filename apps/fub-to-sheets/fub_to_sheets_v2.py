@@ -10,7 +10,6 @@ Date: December 2024
 import os
 import sys
 import time
-import math
 import json
 from collections import defaultdict
 from datetime import date, datetime, timezone, timedelta
@@ -160,6 +159,14 @@ class Config:
     MAX_PARALLEL_WORKERS = int(os.getenv("MAX_PARALLEL_WORKERS", "5"))
     ENABLE_STAGE_SYNC = os.getenv("ENABLE_STAGE_SYNC", "false").lower() == "true"
 
+    # Activity ingest: "full" refetches all calls/events and every person's
+    # texts/emails, then rebuilds the persisted per-person aggregates.
+    # "incremental" fetches only activity created since the stored high-water
+    # marks and applies it as deltas (falls back to full until marks exist).
+    # Schedule an occasional full run: contacts that join the targeted groups
+    # only have texts/emails from before the last full run counted by it.
+    FUB_INGEST_MODE = os.getenv("FUB_INGEST_MODE", "full").lower()
+
     # Caching
     ENABLE_CACHE = os.getenv("ENABLE_CACHE", "true").lower() == "true"
     CACHE_MAX_AGE_MINUTES = int(os.getenv("CACHE_MAX_AGE_MINUTES", "30"))
@@ -897,7 +904,7 @@ def build_person_stats(
     emails: List[Dict] = None,
     excluded_pids: Set[str] = None
 ) -> Dict[str, Dict]:
-    """Build per-person statistics from activities.
+    """Build per-person statistics from a complete activity history.
 
     Args:
         excluded_pids: Person IDs to exclude from IDX event counting.
@@ -905,252 +912,24 @@ def build_person_stats(
             shares will NOT be counted. Calls/texts/emails are still counted
             since those are real interactions, not cookie-based attribution.
     """
-    logger.info("Building person statistics...")
-    emails = emails or []
-    excluded_pids = excluded_pids or set()
-    excluded_event_count = 0
-
-    stats = defaultdict(lambda: {
-        "calls_outbound": 0,
-        "calls_inbound": 0,
-        "texts_total": 0,
-        "texts_inbound": 0,
-        "emails_received": 0,
-        "emails_sent": 0,
-        "emails_auto_sent": 0,         # Automated outbound (drip, bulk, system)
-        "emails_manual_sent": 0,       # Personal outbound
-        "website_visits": 0,
-        "website_visits_last_7": 0,
-        "properties_viewed": 0,
-        "properties_viewed_last_7": 0,
-        "properties_favorited": 0,
-        "properties_shared": 0,
-        "last_website_visit": None,
-        "last_inbound_at": None,       # Most recent inbound comm (any channel)
-        "avg_price_viewed": None,
-        "price_view_std_dev": 0.0,
-    })
-
-    now = datetime.now(timezone.utc)
-    seven_days_ago = now - timedelta(days=7)
-
-    # Process calls
-    for call in calls:
-        pid = call.get("personId")
-        if not pid:
-            continue
-
-        pid = str(pid)  # Convert to string for consistency
-
-        # FUB uses 'isIncoming' not 'direction'
-        is_incoming = call.get("isIncoming")
-        if is_incoming is True:
-            stats[pid]["calls_inbound"] += 1
-            # Track last inbound timestamp
-            call_ts = call.get("created") or call.get("timestamp")
-            if call_ts:
-                prev = stats[pid]["last_inbound_at"]
-                if prev is None or call_ts > prev:
-                    stats[pid]["last_inbound_at"] = call_ts
-        elif is_incoming is False:
-            stats[pid]["calls_outbound"] += 1
-
-    # Process texts
-    for text in texts:
-        pid = text.get("personId")
-        if not pid:
-            continue
-
-        stats[pid]["texts_total"] += 1
-
-        is_incoming_text = text.get("isIncoming")
-        direction = text.get("direction", "").lower()
-        if is_incoming_text is True or direction == "inbound":
-            stats[pid]["texts_inbound"] += 1
-            text_ts = text.get("created") or text.get("sent")
-            if text_ts:
-                prev = stats[pid]["last_inbound_at"]
-                if prev is None or text_ts > prev:
-                    stats[pid]["last_inbound_at"] = text_ts
-
-    # Process emails
-    # FUB emails use relatedPeople[].personId and status field
-    for email in emails:
-        # Extract personId from relatedPeople array
-        related_people = email.get("relatedPeople", [])
-        if not related_people:
-            continue
-
-        pid = related_people[0].get("personId")
-        if not pid:
-            continue
-
-        pid = str(pid)
-
-        # FUB uses status: 'Sent' for outbound, 'Received' for inbound
-        status = email.get("status", "").lower()
-        if status == "received":
-            stats[pid]["emails_received"] += 1
-            email_ts = email.get("created") or email.get("date")
-            if email_ts:
-                prev = stats[pid]["last_inbound_at"]
-                if prev is None or email_ts > prev:
-                    stats[pid]["last_inbound_at"] = email_ts
-        elif status == "sent":
-            stats[pid]["emails_sent"] += 1
-            # Classify as automated or manual
-            campaign = email.get("campaignOrigin") or ""
-            action_plan = email.get("actionPlanId")
-            template_id = email.get("emailTemplateId")
-            if campaign or action_plan:
-                stats[pid]["emails_auto_sent"] += 1
-            else:
-                stats[pid]["emails_manual_sent"] += 1
-
-    # Process events (with scoring guard: skip excluded people)
-    for event in events:
-        pid = event.get("personId")
-        if not pid:
-            continue
-
-        # Ensure pid is string for consistency
-        pid = str(pid)
-
-        # Guard: Skip IDX events from excluded people (stale cookie prevention)
-        if pid in excluded_pids:
-            excluded_event_count += 1
-            continue
-
-        # Normalize event type (FUB uses "Viewed Property" not "property_viewed")
-        event_type_raw = event.get("type", "")
-        event_type = event_type_raw.lower().replace(" ", "_")
-        event_time = parse_datetime_safe(event.get("created"))
-
-        if event_type == "visited_website":
-            stats[pid]["website_visits"] += 1
-            if event_time and event_time >= seven_days_ago:
-                stats[pid]["website_visits_last_7"] += 1
-            if event_time:
-                if stats[pid]["last_website_visit"] is None or event_time > stats[pid]["last_website_visit"]:
-                    stats[pid]["last_website_visit"] = event_time
-
-        elif event_type == "viewed_property":
-            stats[pid]["properties_viewed"] += 1
-            if event_time and event_time >= seven_days_ago:
-                stats[pid]["properties_viewed_last_7"] += 1
-
-        elif event_type == "saved_property":
-            stats[pid]["properties_favorited"] += 1
-
-        elif event_type == "saved_property_search":
-            stats[pid]["properties_shared"] += 1
-
-    # Calculate average price and std dev per person
-    for event in events:
-        pid = event.get("personId")
-        if not pid:
-            continue
-
-        pid = str(pid)
-
-        # Guard: Skip excluded people
-        if pid in excluded_pids:
-            continue
-
-        event_type = event.get("type", "").lower().replace(" ", "_")
-
-        if event_type != "viewed_property":
-            continue
-
-        # Extract price from property object
-        property_obj = event.get("property", {})
-        if isinstance(property_obj, dict):
-            price = property_obj.get("price")
-        else:
-            price = None
+    from src.core import fub_activity
 
-        if price:
-            try:
-                price_val = float(price)
-                # Track prices for this person
-                if "price_list" not in stats[pid]:
-                    stats[pid]["price_list"] = []
-                stats[pid]["price_list"].append(price_val)
-            except (ValueError, TypeError):
-                pass
-
-    # Compute avg and std dev
-    for pid, data in stats.items():
-        prices = data.get("price_list", [])
-        if prices:
-            avg = sum(prices) / len(prices)
-            data["avg_price_viewed"] = avg
-
-            if len(prices) > 1:
-                variance = sum((p - avg) ** 2 for p in prices) / len(prices)
-                data["price_view_std_dev"] = math.sqrt(variance)
-
-        # Convert datetime to string for serialization
-        if data["last_website_visit"]:
-            data["last_website_visit"] = data["last_website_visit"].isoformat()
-
-    # === INTENT SIGNAL DETECTION ===
-    # Track property views for repeat detection
-    property_views_by_person = defaultdict(lambda: defaultdict(int))
-    activity_timestamps_by_person = defaultdict(list)
-
-    for event in events:
-        pid = event.get("personId")
-        if not pid:
-            continue
-
-        # Guard: Skip excluded people
-        if str(pid) in excluded_pids:
-            continue
-
-        event_time = parse_datetime_safe(event.get("created"))
-        event_type = event.get("type", "")
+    activity = fub_activity.accumulate(calls, texts, emails or [], events)
+    return person_stats_from_activity(activity, excluded_pids)
 
-        # Track property views per property
-        if event_type == "viewed_property":
-            property_obj = event.get("property", {})
-            if isinstance(property_obj, dict):
-                property_id = property_obj.get("id")
-                if property_id:
-                    property_views_by_person[pid][property_id] += 1
-
-        # Track all activity timestamps for burst detection
-        if event_time:
-            activity_timestamps_by_person[pid].append(event_time)
-
-    # Compute intent signals
-    for pid, data in stats.items():
-        # Signal 1: Repeat property views
-        if pid in property_views_by_person:
-            max_views = max(property_views_by_person[pid].values()) if property_views_by_person[pid] else 0
-            data["repeat_property_views"] = max_views >= 2
-            data["max_property_view_count"] = max_views
-        else:
-            data["repeat_property_views"] = False
-            data["max_property_view_count"] = 0
-
-        # Signal 2: High favorite count
-        data["high_favorite_count"] = data.get("properties_favorited", 0) >= 3
 
-        # Signal 3: Recent activity burst (3+ actions in 24 hours)
-        data["recent_activity_burst"] = False
-        if pid in activity_timestamps_by_person:
-            timestamps = sorted(activity_timestamps_by_person[pid], reverse=True)
-            if len(timestamps) >= 3:
-                # Check if top 3 most recent are within 24 hours
-                most_recent = timestamps[0]
-                third_most_recent = timestamps[2]
-                time_diff = (most_recent - third_most_recent).total_seconds() / 3600  # hours
-                data["recent_activity_burst"] = time_diff <= 24
+def person_stats_from_activity(activity: Dict, excluded_pids: Set[str] = None) -> Dict[str, Dict]:
+    """Build per-person statistics from activity aggregates.
 
-        # Signal 4: Property sharing activity
-        data["active_property_sharing"] = data.get("properties_shared", 0) >= 2
+    The aggregates come from src.core.fub_activity: either accumulated from
+    a full refetch, or loaded from fub_person_activity after an incremental
+    run applied its deltas. Both produce the same stats.
+    """
+    from src.core import fub_activity
 
+    logger.info("Building person statistics...")
+    excluded_pids = excluded_pids or set()
+    stats = fub_activity.person_stats(activity, excluded_pids)
 
     # DEBUG: Show sample stats
     if stats:
@@ -1168,14 +947,16 @@ def build_person_stats(
         logger.info(f"  avg_price_viewed: {sample_stats.get('avg_price_viewed', 'None')}")
         logger.info(f"=== END DEBUG ===")
 
-
+    excluded_event_count = sum(
+        agg.counts["events_total"] for pid, agg in activity.items() if pid in excluded_pids
+    )
     if excluded_event_count > 0:
         logger.info(
             f"⛔ Excluded {excluded_event_count} events from "
             f"{len(excluded_pids)} filtered people in person stats"
         )
     logger.info(f"✓ Built statistics for {len(stats)} people")
-    return dict(stats)
+    return stats
 
 
 def compute_daily_activity_stats(
@@ -2407,9 +2188,8 @@ def sync_communications_to_sqlite(
     """
     import uuid
 
-    calls_synced = 0
-    texts_synced = 0
-    emails_synced = 0
+    # Built up front and written with one batched insert (ON CONFLICT DO NOTHING)
+    records: List[Dict] = []
 
     # Process calls
     for call in calls:
@@ -2443,18 +2223,17 @@ def sync_communications_to_sqlite(
             # Get status
             status = call.get("outcome") or call.get("status") or "completed"
 
-            if db.insert_communication(
-                comm_id=comm_id,
-                contact_id=person_id,
-                comm_type="call",
-                direction=direction,
-                occurred_at=occurred_at,
-                duration_seconds=duration,
-                fub_id=str(fub_id) if fub_id else None,
-                fub_user_name=agent_name,
-                status=status
-            ):
-                calls_synced += 1
+            records.append({
+                "id": comm_id,
+                "contact_id": person_id,
+                "comm_type": "call",
+                "direction": direction,
+                "occurred_at": occurred_at,
+                "duration_seconds": duration,
+                "fub_id": str(fub_id) if fub_id else None,
+                "fub_user_name": agent_name,
+                "status": status,
+            })
 
         except Exception as e:
             logger.debug(f"Error syncing call: {e}")
@@ -2510,21 +2289,20 @@ def sync_communications_to_sqlite(
             else:
                 text_type = "manual"
 
-            if db.insert_communication(
-                comm_id=comm_id,
-                contact_id=person_id,
-                comm_type="text",
-                direction=direction,
-                occurred_at=occurred_at,
-                fub_id=str(fub_id) if fub_id else None,
-                fub_user_name=agent_name,
-                status=delivery_status or "delivered",
-                email_from=str(from_number) if from_number else None,
-                email_to=str(to_number) if to_number else None,
-                snippet=message_body if message_body else None,
-                email_type=text_type if text_type else None,
-            ):
-                texts_synced += 1
+            records.append({
+                "id": comm_id,
+                "contact_id": person_id,
+                "comm_type": "text",
+                "direction": direction,
+                "occurred_at": occurred_at,
+                "fub_id": str(fub_id) if fub_id else None,
+                "fub_user_name": agent_name,
+                "status": delivery_status or "delivered",
+                "email_from": str(from_number) if from_number else None,
+                "email_to": str(to_number) if to_number else None,
+                "snippet": message_body if message_body else None,
+                "email_type": text_type if text_type else None,
+            })
 
         except Exception as e:
             logger.debug(f"Error syncing text: {e}")
@@ -2602,27 +2380,31 @@ def sync_communications_to_sqlite(
             else:
                 email_type = "manual"
 
-            if db.insert_communication(
-                comm_id=comm_id,
-                contact_id=person_id,
-                comm_type="email",
-                direction=direction,
-                occurred_at=occurred_at,
-                fub_id=str(fub_id) if fub_id else None,
-                fub_user_name=agent_name,
-                status="delivered",
-                email_from=email_from if email_from else None,
-                email_to=email_to if email_to else None,
-                subject=subject if subject else None,
-                snippet=body if body else None,
-                email_type=email_type if email_type else None,
-                fub_email_id=str(fub_id) if fub_id else None,
-            ):
-                emails_synced += 1
+            records.append({
+                "id": comm_id,
+                "contact_id": person_id,
+                "comm_type": "email",
+                "direction": direction,
+                "occurred_at": occurred_at,
+                "fub_id": str(fub_id) if fub_id else None,
+                "fub_user_name": agent_name,
+                "status": "delivered",
+                "email_from": email_from if email_from else None,
+                "email_to": email_to if email_to else None,
+                "subject": subject if subject else None,
+                "snippet": body if body else None,
+                "email_type": email_type if email_type else None,
+                "fub_email_id": str(fub_id) if fub_id else None,
+            })
 
         except Exception as e:
             logger.debug(f"Error syncing email: {e}")
 
+    inserted = db.insert_communications_batch(records)
+    calls_synced = inserted.get("call", 0)
+    texts_synced = inserted.get("text", 0)
+    emails_synced = inserted.get("email", 0)
+
     logger.info(f"✓ Communications synced: {calls_synced} calls, {texts_synced} texts, {emails_synced} emails")
     return calls_synced, texts_synced
 
@@ -2645,7 +2427,7 @@ def sync_events_to_sqlite(
     """
     import uuid
 
-    events_synced = 0
+    records: List[Dict] = []
     events_excluded = 0
     excluded_pids = excluded_pids or set()
 
@@ -2704,21 +2486,22 @@ def sync_events_to_sqlite(
                     except (ValueError, TypeError):
                         property_price = None
 
-            if db.insert_event(
-                event_id=event_id,
-                contact_id=person_id,
-                event_type=event_type,
-                occurred_at=occurred_at,
-                property_address=property_address,
-                property_price=property_price,
-                property_mls=str(property_mls) if property_mls else None,
-                fub_event_id=str(fub_event_id) if fub_event_id else None
-            ):
-                events_synced += 1
+            records.append({
+                "id": event_id,
+                "contact_id": person_id,
+                "event_type": event_type,
+                "occurred_at": occurred_at,
+                "property_address": property_address,
+                "property_price": property_price,
+                "property_mls": str(property_mls) if property_mls else None,
+                "fub_event_id": str(fub_event_id) if fub_event_id else None,
+            })
 
         except Exception as e:
             logger.debug(f"Error syncing event: {e}")
 
+    events_synced = db.insert_events_batch(records)
+
     if events_excluded > 0:
         logger.info(
             f"⛔ Skipped {events_excluded} events from "
@@ -3321,6 +3104,146 @@ def migrate_next_actions_to_contact_actions(db, contact_rows: List[List]):
 # MAIN EXECUTION
 # =========================================================================
 
+# =========================================================================
+# ACTIVITY INGEST
+# =========================================================================
+
+class ActivityIngest:
+    """Fetch one run's FUB activity and keep the persisted aggregates current.
+
+    Full mode refetches the complete history and rebuilds
+    fub_person_activity from it. Incremental mode asks FUB only for activity
+    created since the high-water marks in fub_sync_state, merges it into the
+    stored aggregates, and advances the marks in the same transaction.
+    """
+
+    def __init__(self, fub: FUBClient, db, mode: str):
+        from src.core import fub_activity
+
+        self.fub = fub
+        self.db = db
+        self.states = None
+        self.incremental = False
+        self.fetched: Dict[str, List[Dict]] = {}
+
+        from src.core.pg_adapter import is_postgres
+        if db is not None and not is_postgres():
+            # Alembic creates the activity tables on PostgreSQL
+            with db._get_connection() as conn:
+                fub_activity.ensure_tables(conn)
+                conn.commit()
+
+        if mode != "incremental":
+            return
+        if db is None:
+            logger.warning("Incremental ingest needs the database (SQLITE_SYNC_ENABLED); running a full fetch")
+            return
+        with db._get_connection() as conn:
+            self.states = fub_activity.load_sync_state(conn)
+            conn.commit()
+        missing = [r for r, state in self.states.items() if state.high_water is None]
+        if missing:
+            logger.info(f"No high-water marks yet for {', '.join(missing)}; running a full fetch to seed them")
+        else:
+            self.incremental = True
+            logger.info("Incremental ingest: fetching activity since stored high-water marks")
+
+    def fetch_events(self) -> List[Dict]:
+        if self.incremental:
+            # The daily report covers all of yesterday, so always reach back that far
+            yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%dT00:00:00Z")
+            since = min(self.states["events"].created_after(), yesterday)
+            events = self.fub.fetch_activity_since("events", since)
+        else:
+            events = self.fub.fetch_events()
+        self.fetched["events"] = events
+        return events
+
+    def event_person_ids(self) -> Set[str]:
+        """People with website activity (for the capped pond)."""
+        ids = {str(e["personId"]) for e in self.fetched.get("events", []) if e.get("personId")}
+        if self.incremental:
+            from src.core import fub_activity
+            with self.db._get_connection() as conn:
+                ids |= fub_activity.active_event_person_ids(conn)
+        return ids
+
+    def fetch_communications(self, people: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Calls, texts and emails to persist this run.
+
+        Incremental texts/emails come from account-wide listings; all of
+        them feed the aggregates, but only the fetched people's are returned
+        for contact_communications, as in a full run.
+        """
+        if not self.incremental:
+            calls = self.fub.fetch_calls()
+            texts = self.fub.fetch_text_messages_parallel(people)
+            emails = self.fub.fetch_emails_parallel(people)
+            self.fetched.update(calls=calls, textMessages=texts, emails=emails)
+            return calls, texts, emails
+
+        for resource in ("calls", "textMessages", "emails"):
+            self.fetched[resource] = self.fub.fetch_activity_since(
+                resource, self.states[resource].created_after()
+            )
+
+        from src.core.fub_activity import email_person_id
+        people_ids = {str(p.get("id")) for p in people if p.get("id")}
+        texts = [t for t in self.fetched["textMessages"] if str(t.get("personId")) in people_ids]
+        emails = [e for e in self.fetched["emails"] if email_person_id(e) in people_ids]
+        return self.fetched["calls"], texts, emails
+
+    def update_activity(self, person_ids: Set[str]) -> Dict:
+        """Fold this run's activity into the aggregates; return the ones to score."""
+        from src.core import fub_activity
+
+        if not self.incremental:
+            activity = fub_activity.accumulate(
+                self.fetched["calls"], self.fetched["textMessages"],
+                self.fetched["emails"], self.fetched["events"],
+            )
+            if self.db is not None:
+                try:
+                    with self.db._get_connection() as conn:
+                        fub_activity.replace_all(conn, activity)
+                        fub_activity.save_sync_state(conn, {
+                            r: fub_activity.mark_all_applied(r, self.fetched[r])
+                            for r in fub_activity.RESOURCES
+                        })
+                        conn.commit()
+                    logger.info(f"✓ Rebuilt activity aggregates for {len(activity)} people")
+                except Exception as e:
+                    logger.warning(f"Could not persist activity aggregates: {e}")
+            return activity
+
+        new_items, states = {}, {}
+        for resource in fub_activity.RESOURCES:
+            new_items[resource], states[resource] = fub_activity.select_new(
+                resource, self.fetched[resource], self.states[resource]
+            )
+        deltas = fub_activity.accumulate(
+            new_items["calls"], new_items["textMessages"],
+            new_items["emails"], new_items["events"],
+        )
+        # Today's event people too, so the anomaly checks see their totals
+        wanted = set(person_ids) | {
+            str(e["personId"]) for e in self.fetched["events"] if e.get("personId")
+        }
+        with self.db._get_connection() as conn:
+            touched = fub_activity.apply_deltas(conn, deltas)
+            fub_activity.save_sync_state(conn, states)
+            conn.commit()
+            activity = fub_activity.load_activity(conn, wanted)
+        self.states = states
+
+        logger.info(
+            "✓ Applied new activity: "
+            + ", ".join(f"{len(new_items[r])} {r}" for r in fub_activity.RESOURCES)
+            + f" ({touched} people updated)"
+        )
+        return activity
+
+
 def main():
     """Main execution function"""
     start_time = time.time()
@@ -3370,9 +3293,11 @@ def main():
         user_lookup = {u['id']: u['name'] for u in users if u.get('id') and u.get('name')}
         logger.info(f"✓ Fetched {len(users)} team members")
 
+        ingest = ActivityIngest(fub, db, Config.FUB_INGEST_MODE)
+
         # Fetch events first — we need active person IDs for the capped pond filter
-        events = fub.fetch_events()
-        event_person_ids = {e.get("personId") for e in events if e.get("personId")}
+        events = ingest.fetch_events()
+        event_person_ids = ingest.event_person_ids()
         logger.info(f"✓ {len(event_person_ids)} unique people with website activity")
 
         # Targeted people fetch:
@@ -3415,13 +3340,12 @@ def main():
         else:
             logger.info("No exclusion filters configured")
         
-        calls = fub.fetch_calls()
-        texts = fub.fetch_text_messages_parallel(people)
-        emails = fub.fetch_emails_parallel(people)
+        calls, texts, emails = ingest.fetch_communications(people)
         # events already fetched above (needed for targeted people fetch)
 
         # Build lookups
         people_by_id = {str(p.get("id")): p for p in people if p.get("id")}
+        activity = ingest.update_activity(set(people_by_id))
 
         # === SCORING GUARDS ===
         # Guard 1 & 2: Build exclusion set from stage and tags
@@ -3429,9 +3353,8 @@ def main():
         scoring_excluded_pids, exclusion_reasons = build_scoring_exclusions(people_by_id)
 
         # Compute statistics (order matters: person_stats needed for anomaly detection)
-        person_stats = build_person_stats(
-            calls, texts, events, emails,
-            excluded_pids=scoring_excluded_pids
+        person_stats = person_stats_from_activity(
+            activity, excluded_pids=scoring_excluded_pids
         )
 
         # Guard 3: Ghost activity detection across full event window
@@ -3453,7 +3376,7 @@ def main():
         all_filtered_pids = scoring_excluded_pids | suspicious_pids
 
         # Guard: Zero out event-based stats for suspicious people
-        # Their events were counted in build_person_stats (before anomaly detection),
+        # Their events were counted in person_stats (before anomaly detection),
         # so we need to neutralize them to prevent inflated heat scores.
         if suspicious_pids:
             for pid in suspicious_pids:
@@ -3612,6 +3535,14 @@ def main():
             except Exception as e:
                 logger.error(f"Enhanced FUB data sync failed: {e}")
 
+            # Refresh the Mission Control rollup for contacts queued by the
+            # writes above (plus any whose 24h/7d windows have lapsed)
+            try:
+                refreshed = db.refresh_contact_intelligence()
+                logger.info(f"✓ Contact intelligence refreshed: {refreshed} contacts")
+            except Exception as e:
+                logger.warning(f"Contact intelligence refresh failed: {e}")
+
         # Re-fetch new contacts from freshly-synced DB for accurate email report
         try:
             if db is None:
@@ -3626,6 +3557,8 @@ def main():
         # Send email report (now with fresh data)
         send_top_priority_email(contact_rows, top_priority, daily_stats)
 
+        fub_api_calls = fub.request_count
+
         # Complete scoring run with final stats
         if scoring_run_id and db:
             try:
@@ -3649,6 +3582,7 @@ def main():
         logger.info(f"  Total contacts: {len(contact_rows)}")
         logger.info(f"  Call list: {len(call_list_rows)} contacts")
         logger.info(f"  Top priority: {len(top_priority)} contacts")
+        logger.info(f"  FUB API requests: {fub.request_count} ({'incremental' if ingest.incremental else 'full'} ingest)")
         logger.info(f"  Runtime: {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
         logger.info("=" * 70)
 
@@ -39,6 +39,8 @@ from apps.navica.field_mapper import (
     map_reso_to_member,
     ensure_listing_columns,
 )
+from src.core.listing_service import DedupTracker
+from src.core.response_cache import bump_sync_generation
 
 MLS_SOURCE = 'MountainLakesMLS'
 
@@ -76,6 +78,9 @@ class HiveSyncEngine:
     def __init__(self, db_path: str = None):
         self.mls_source = MLS_SOURCE
         self.client: Optional[HiveClient] = None
+        # address_keys whose cross-MLS dedup winner may have changed
+        # since the last refresh
+        self._dedup = DedupTracker()
 
         conn = self._get_connection()
         try:
@@ -202,6 +207,7 @@ class HiveSyncEngine:
                     "updated_at = ? WHERE id = ?",
                     [now, existing_dict['id']],
                 )
+                self._dedup.track(existing_dict, {})
                 logger.info(f"Deleted: {mls_number} (DeletedInSource, was {existing_dict.get('status')})")
                 if existing_dict.get('status') != 'DELETED':
                     self._record_changes(conn, [{
@@ -270,6 +276,7 @@ class HiveSyncEngine:
                 set_clause = ", ".join([f"{k} = ?" for k in update_data])
                 values = list(update_data.values()) + [existing_dict['id']]
                 conn.execute(f"UPDATE listings SET {set_clause} WHERE id = ?", values)
+                self._dedup.track(existing_dict, listing)
             return 'updated'
         else:
             listing['captured_at'] = now
@@ -282,6 +289,7 @@ class HiveSyncEngine:
                 f"INSERT INTO listings ({', '.join(columns)}) VALUES ({placeholders})",
                 list(insert_data.values()),
             )
+            self._dedup.track(None, listing)
             return 'created'
 
     # ---------------------------------------------------------------
@@ -348,6 +356,7 @@ class HiveSyncEngine:
                     if (i + 1) % 100 == 0:
                         logger.info(f"Processed {i + 1}/{len(properties)}...")
                         if not dry_run:
+                            self._dedup.refresh(conn)
                             conn.commit()
 
                 except Exception as e:
@@ -360,6 +369,7 @@ class HiveSyncEngine:
                         conn.rollback()
 
             if not dry_run:
+                self._dedup.refresh(conn)
                 conn.commit()
                 self._save_sync_state({
                     'last_sync': datetime.now(timezone.utc).isoformat(),
@@ -367,6 +377,8 @@ class HiveSyncEngine:
                     'status_filter': status,
                     'records_synced': len(properties),
                 })
+                bump_sync_generation(conn)
+                conn.commit()
 
         finally:
             conn.close()
@@ -458,6 +470,7 @@ class HiveSyncEngine:
                     if (i + 1) % 100 == 0:
                         logger.info(f"Processed {i + 1}/{stats['fetched']}...")
                         if not dry_run:
+                            self._dedup.refresh(conn)
                             conn.commit()
 
                 except Exception as e:
@@ -470,12 +483,15 @@ class HiveSyncEngine:
                         conn.rollback()
 
             if not dry_run:
+                self._dedup.refresh(conn)
                 conn.commit()
                 self._save_sync_state({
                     'last_sync': datetime.now(timezone.utc).isoformat(),
                     'sync_type': 'incremental',
                     'records_synced': stats['fetched'],
                 })
+                bump_sync_generation(conn)
+                conn.commit()
 
         finally:
             conn.close()
@@ -235,6 +235,7 @@ class MLSGridClient:
                     retry_after = response.headers.get('Retry-After')
                     wait_time = int(retry_after) if retry_after else min(2 ** attempt * 5, 120)
                     logger.warning(f"Rate limited (429). Waiting {wait_time}s before retry.")
+                    self.throttle.pause(wait_time)  # hold every other MLS Grid caller too
                     time.sleep(wait_time)
                     self.stats['retries'] += 1
                     continue
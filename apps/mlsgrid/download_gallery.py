@@ -29,6 +29,9 @@ from urllib.parse import urlparse
 import requests
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.photos import storage  # noqa: E402
 DB_PATH = PROJECT_ROOT / 'data' / 'dreams.db'
 PHOTOS_DIR = PROJECT_ROOT / 'data' / 'photos' / 'mlsgrid'
 
@@ -54,27 +57,22 @@ def download_single(url: str, filepath: Path) -> dict:
         return {'status': 'skipped', 'size': filepath.stat().st_size}
 
     try:
-        resp = requests.get(url, timeout=30, stream=True)
+        resp = requests.get(url, timeout=30)
         resp.raise_for_status()
 
         content_type = resp.headers.get('Content-Type', '')
         if 'image' not in content_type and content_type:
             return {'status': 'error', 'error': f'Not an image: {content_type}'}
 
-        with open(filepath, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        size = filepath.stat().st_size
-        if size == 0:
-            filepath.unlink()
+        if not resp.content:
             return {'status': 'error', 'error': 'Empty file'}
 
-        return {'status': 'downloaded', 'size': size}
+        # Atomic write that also records the file in the photo manifest
+        storage.save_atomic(filepath.parent, filepath.name, resp.content,
+                            media_key=urlparse(url).path or None)
+        return {'status': 'downloaded', 'size': len(resp.content)}
 
-    except requests.RequestException as e:
-        if filepath.exists():
-            filepath.unlink()
+    except (requests.RequestException, OSError) as e:
         return {'status': 'error', 'error': str(e)}
 
 
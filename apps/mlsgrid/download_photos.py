@@ -26,6 +26,9 @@ from urllib.parse import urlparse
 import requests
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from apps.photos import storage  # noqa: E402
 DB_PATH = PROJECT_ROOT / 'data' / 'dreams.db'
 PHOTOS_DIR = PROJECT_ROOT / 'data' / 'photos' / 'mlsgrid'
 
@@ -73,7 +76,7 @@ def download_photo(mls_number: str, url: str, dest_dir: Path) -> dict:
         }
 
     try:
-        resp = requests.get(url, timeout=30, stream=True)
+        resp = requests.get(url, timeout=30)
         resp.raise_for_status()
 
         # Check content type
@@ -81,22 +84,14 @@ def download_photo(mls_number: str, url: str, dest_dir: Path) -> dict:
         if 'image' not in content_type and content_type:
             return {'mls': mls_number, 'status': 'error', 'error': f'Not an image: {content_type}'}
 
-        # Write to file
-        with open(filepath, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        size = filepath.stat().st_size
-        if size == 0:
-            filepath.unlink()
+        if not resp.content:
             return {'mls': mls_number, 'status': 'error', 'error': 'Empty file'}
 
-        return {'mls': mls_number, 'status': 'downloaded', 'size': size, 'path': str(filepath)}
+        # Atomic write that also records the file in the photo manifest
+        storage.save_atomic(dest_dir, filename, resp.content, media_key=parsed.path or None)
+        return {'mls': mls_number, 'status': 'downloaded', 'size': len(resp.content), 'path': str(filepath)}
 
-    except requests.RequestException as e:
-        # Clean up partial file
-        if filepath.exists():
-            filepath.unlink()
+    except (requests.RequestException, OSError) as e:
         return {'mls': mls_number, 'status': 'error', 'error': str(e)}
 
 
@@ -51,6 +51,8 @@ from apps.navica.field_mapper import (
     extract_photos,
     parse_timestamp,
 )
+from src.core.listing_service import DedupTracker
+from src.core.response_cache import bump_sync_generation
 
 
 MLS_SOURCE = 'CanopyMLS'
@@ -96,6 +98,9 @@ class MLSGridSyncEngine:
         self.mls_source = MLS_SOURCE
         self.client = None
         self._photos_updated_count = 0
+        # address_keys whose cross-MLS dedup winner may have changed
+        # since the last refresh
+        self._dedup = DedupTracker()
 
         # Ensure database tables exist.
         # On PostgreSQL, schema is managed by scripts/migrate_to_postgres.py.
@@ -345,6 +350,7 @@ class MLSGridSyncEngine:
                 if dry_run:
                     return 'deleted'
                 now = datetime.now().isoformat()
+                self._dedup.track(existing_dict, {})
                 conn.execute(
                     "UPDATE listings SET status = 'DELETED', idx_opt_in = 0, "
                     "updated_at = ? WHERE id = ?",
@@ -382,6 +388,7 @@ class MLSGridSyncEngine:
             self._record_changes(conn, changes)
 
         now = datetime.now().isoformat()
+        self._dedup.track(existing_dict, listing)
 
         if existing:
             # ----- Improvement 3: PhotosChangeTimestamp tracking -----
@@ -844,6 +851,7 @@ class MLSGridSyncEngine:
 
                     # Commit every 10 records and yield briefly
                     if not dry_run and (i + 1) % 10 == 0:
+                        self._dedup.refresh(conn)
                         conn.commit()
                         import time as _time_mod
                         _time_mod.sleep(0.05)  # 50ms yield
@@ -871,6 +879,7 @@ class MLSGridSyncEngine:
             stats['photos_updated'] = self._photos_updated_count
 
             if not dry_run:
+                self._dedup.refresh(conn)
                 conn.commit()
 
                 # Save sync state
@@ -883,6 +892,7 @@ class MLSGridSyncEngine:
 
                 # Log sync
                 self._log_sync(conn, 'mlsgrid_full_sync', stats)
+                bump_sync_generation(conn)
                 conn.commit()
 
         finally:
@@ -1034,6 +1044,7 @@ class MLSGridSyncEngine:
                     # (public contact form, event tracking) can grab the
                     # lock during brief gaps.
                     if not dry_run and (i + 1) % 10 == 0:
+                        self._dedup.refresh(conn)
                         conn.commit()
 
                     if (i + 1) % 100 == 0:
@@ -1055,6 +1066,7 @@ class MLSGridSyncEngine:
             stats['photos_downloaded'] = photos_downloaded
 
             if not dry_run:
+                self._dedup.refresh(conn)
                 conn.commit()
 
                 self._save_sync_state({
@@ -1064,6 +1076,7 @@ class MLSGridSyncEngine:
                 })
 
                 self._log_sync(conn, 'mlsgrid_incremental_sync', stats)
+                bump_sync_generation(conn)
                 conn.commit()
 
         finally:
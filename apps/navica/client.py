@@ -31,10 +31,12 @@ Usage:
 
 import json
 import os
+import queue
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from urllib.parse import urlencode
 
 import requests
@@ -58,6 +60,52 @@ def load_env():
                     os.environ.setdefault(key.strip(), value.strip().strip('"\''))
 
 
+def prefetch_pages(pages: Iterator[List[Dict]], depth: int = 1) -> Iterator[List[Dict]]:
+    """
+    Drive a page iterator on a background thread, keeping up to `depth`
+    pages buffered ahead of the consumer.
+
+    Exceptions raised while fetching are re-raised in the consumer at the
+    point the failed page would have been yielded. If the consumer stops
+    early, the producer is signalled and stops after its in-flight page.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put(('page', page)):
+                    return
+        except BaseException as e:  # re-raised in the consumer thread
+            put(('error', e))
+            return
+        put(('done', None))
+
+    worker = threading.Thread(target=produce, name='navica-prefetch', daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, item = buffer.get()
+            if kind == 'page':
+                yield item
+            elif kind == 'error':
+                raise item
+            else:
+                return
+    finally:
+        stop.set()
+
+
 class NavicaAPIError(Exception):
     """Base exception for Navica API errors."""
     pass
@@ -302,16 +350,19 @@ class NavicaClient:
         response = self._request('GET', url)
         return response.json()
 
-    def get_all_pages(
+    def iter_pages(
         self,
         endpoint: str,
         params: Dict[str, str] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None,
         max_records: Optional[int] = None,
         page_size: int = 200,
-    ) -> List[Dict]:
+    ) -> Iterator[List[Dict]]:
         """
-        Fetch all pages of results using limit/offset pagination.
+        Yield each page of results as it arrives (limit/offset pagination).
+
+        Same stop conditions as get_all_pages, but only one page is held
+        at a time so callers can process records while paging continues.
 
         Args:
             endpoint: API resource endpoint (e.g., '/listing')
@@ -320,8 +371,8 @@ class NavicaClient:
             max_records: Stop after fetching this many records (safety limit)
             page_size: Records per page (max 200, API-enforced)
 
-        Returns:
-            List of all records across all pages
+        Yields:
+            List of records for each page
         """
         if params is None:
             params = {}
@@ -329,7 +380,7 @@ class NavicaClient:
         page_size = min(page_size, self.MAX_PAGE_SIZE)
         params['limit'] = str(page_size)
 
-        all_results = []
+        fetched = 0
         offset = 0
         page = 0
         server_total = None
@@ -340,12 +391,12 @@ class NavicaClient:
             try:
                 data = self.get(endpoint, params)
             except NavicaAPIError as e:
-                # Navica API has a max offset of 10,000. If we hit it, return
-                # whatever we've accumulated so far instead of losing everything.
-                if 'offset' in str(e).lower() and all_results:
+                # Navica API has a max offset of 10,000. If we hit it, stop
+                # with whatever we've yielded so far instead of losing everything.
+                if 'offset' in str(e).lower() and fetched:
                     logger.warning(
                         f"Hit API offset limit at offset={offset}. "
-                        f"Returning {len(all_results)} records fetched so far."
+                        f"Stopping after {fetched} records fetched so far."
                     )
                     break
                 raise
@@ -358,63 +409,81 @@ class NavicaClient:
             if server_total is None:
                 server_total = data.get('total', 0)
 
-            all_results.extend(results)
+            full_page = len(results) >= page_size
+            if max_records and fetched + len(results) > max_records:
+                results = results[:max_records - fetched]
+            fetched += len(results)
             page += 1
 
-            logger.info(f"Page {page}: {len(results)} records (total fetched: {len(all_results)}/{server_total})")
+            logger.info(f"Page {page}: {len(results)} records (total fetched: {fetched}/{server_total})")
 
             if progress_callback:
-                progress_callback(page, len(all_results))
+                progress_callback(page, fetched)
+
+            self.stats['records_fetched'] = fetched
+            yield results
 
             # Stop conditions
-            if len(results) < page_size:
+            if not full_page:
                 break  # Last page (fewer results than requested)
 
-            if max_records and len(all_results) >= max_records:
+            if max_records and fetched >= max_records:
                 logger.info(f"Reached max_records limit ({max_records}). Stopping pagination.")
-                all_results = all_results[:max_records]
                 break
 
-            if server_total and len(all_results) >= server_total:
+            if server_total and fetched >= server_total:
                 break  # Fetched everything
 
             offset += page_size
 
-        logger.info(f"Fetched {len(all_results)} records in {page} pages (server total: {server_total})")
-        self.stats['records_fetched'] = len(all_results)
+        logger.info(f"Fetched {fetched} records in {page} pages (server total: {server_total})")
+
+    def get_all_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_records: Optional[int] = None,
+        page_size: int = 200,
+    ) -> List[Dict]:
+        """
+        Fetch all pages of results using limit/offset pagination.
+
+        Args:
+            endpoint: API resource endpoint (e.g., '/listing')
+            params: Query parameters (filters, fields, order)
+            progress_callback: Optional fn(page_num, total_records) called per page
+            max_records: Stop after fetching this many records (safety limit)
+            page_size: Records per page (max 200, API-enforced)
+
+        Returns:
+            List of all records across all pages
+        """
+        all_results = []
+        for results in self.iter_pages(
+            endpoint, params,
+            progress_callback=progress_callback,
+            max_records=max_records,
+            page_size=page_size,
+        ):
+            all_results.extend(results)
         return all_results
 
     # ---------------------------------------------------------------
     # Resource-specific fetch methods
     # ---------------------------------------------------------------
 
-    def fetch_properties(
+    def _property_params(
         self,
         status: Optional[str] = None,
         property_type: Optional[str] = None,
         select_fields: Optional[List[str]] = None,
         city: Optional[str] = None,
         county: Optional[str] = None,
-        max_records: Optional[int] = None,
         order: Optional[str] = None,
         **extra_filters,
-    ) -> List[Dict]:
-        """
-        Fetch property listings from Navica API.
-
-        Args:
-            status: Filter by StandardStatus (Active, Pending, Closed, etc.)
-            property_type: Filter by PropertyType (Residential, Land, etc.)
-            select_fields: Specific fields to return
-            city: Filter by City
-            county: Filter by CountyOrParish
-            max_records: Stop after this many records
-            order: Sort order (e.g., 'ModificationTimestamp desc')
-            **extra_filters: Additional field=value filters
-
-        Returns:
-            List of property records
-        """
+    ) -> Dict[str, str]:
+        """Build /listing query params and log the active filters."""
         params = {}
 
         if status:
@@ -436,9 +505,75 @@ class NavicaClient:
         filter_desc = {k: v for k, v in params.items() if k not in ('fields', 'order', 'limit', 'offset')}
         if filter_desc:
             logger.info(f"  Filters: {filter_desc}")
+        return params
 
+    def fetch_properties(
+        self,
+        status: Optional[str] = None,
+        property_type: Optional[str] = None,
+        select_fields: Optional[List[str]] = None,
+        city: Optional[str] = None,
+        county: Optional[str] = None,
+        max_records: Optional[int] = None,
+        order: Optional[str] = None,
+        **extra_filters,
+    ) -> List[Dict]:
+        """
+        Fetch property listings from Navica API.
+
+        Args:
+            status: Filter by StandardStatus (Active, Pending, Closed, etc.)
+            property_type: Filter by PropertyType (Residential, Land, etc.)
+            select_fields: Specific fields to return
+            city: Filter by City
+            county: Filter by CountyOrParish
+            max_records: Stop after this many records
+            order: Sort order (e.g., 'ModificationTimestamp desc')
+            **extra_filters: Additional field=value filters
+
+        Returns:
+            List of property records
+        """
+        params = self._property_params(
+            status=status, property_type=property_type, select_fields=select_fields,
+            city=city, county=county, order=order, **extra_filters,
+        )
         return self.get_all_pages('/listing', params, max_records=max_records)
 
+    def iter_property_pages(
+        self,
+        status: Optional[str] = None,
+        property_type: Optional[str] = None,
+        select_fields: Optional[List[str]] = None,
+        city: Optional[str] = None,
+        county: Optional[str] = None,
+        max_records: Optional[int] = None,
+        order: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        prefetch: bool = True,
+        **extra_filters,
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream property listings one page at a time.
+
+        Takes the same filters as fetch_properties. With prefetch=True the
+        next page is requested on a background thread while the caller
+        processes the current one, so network wait overlaps DB work.
+
+        Yields:
+            List of property records per page
+        """
+        params = self._property_params(
+            status=status, property_type=property_type, select_fields=select_fields,
+            city=city, county=county, order=order, **extra_filters,
+        )
+        pages = self.iter_pages(
+            '/listing', params,
+            progress_callback=progress_callback,
+            max_records=max_records,
+        )
+        return prefetch_pages(pages) if prefetch else pages
+
     def fetch_agents(
         self,
         member_status: Optional[str] = None,
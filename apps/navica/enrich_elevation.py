@@ -2,6 +2,9 @@
 """
 Enrich listings with elevation data from the USGS Elevation Point Query Service (EPQS).
 
+Points are resolved through apps/navica/terrain.py: local DEM tiles when
+DREAMS_DEM_DIR has coverage, then the on-disk elevation cache, then EPQS.
+
 Usage:
     python3 -m apps.navica.enrich_elevation           # Enrich listings missing elevation
     python3 -m apps.navica.enrich_elevation --all      # Re-enrich all listings
@@ -9,43 +12,18 @@ Usage:
 """
 
 import argparse
-import json
-import sqlite3
-import sys
 import time
-import urllib.request
-import urllib.error
 from pathlib import Path
 
+import numpy as np
+
 # Resolve project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "dreams.db"
 
-USGS_EPQS_URL = "https://epqs.nationalmap.gov/v1/json"
-REQUEST_DELAY = 0.15  # seconds between requests (polite rate limiting)
-
-
-def get_elevation(lat: float, lon: float, retries: int = 3) -> int | None:
-    """Query USGS EPQS for elevation in feet at a given lat/lon, with retries."""
-    url = f"{USGS_EPQS_URL}?x={lon}&y={lat}&units=Feet&wkid=4326&includeDate=false"
-    for attempt in range(retries):
-        req = urllib.request.Request(url, headers={"User-Agent": "myDREAMS/1.0"})
-        try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read())
-                value = data.get("value")
-                if value is not None and value != -1000000:
-                    return round(float(value))
-                return None
-        except (urllib.error.URLError, json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"  Error for ({lat}, {lon}): {e}")
-            return None
-        except (TimeoutError, OSError):
-            if attempt < retries - 1:
-                time.sleep(2 * (attempt + 1))
-                continue
-            print(f"  Timeout for ({lat}, {lon}) after {retries} attempts")
-            return None
+from apps.navica.terrain import TerrainSampler
+
+CHUNK_SIZE = 500  # listings sampled and written per batch
 
 
 def enrich_listings(all_listings: bool = False, test_mode: bool = False):
@@ -81,36 +59,36 @@ def enrich_listings(all_listings: bool = False, test_mode: bool = False):
         conn.close()
         return
 
+    # Local DEM tiles first, then the shared elevation cache (which
+    # enrich_views also reads), then EPQS for whatever is left.
+    sampler = TerrainSampler()
+    started = time.monotonic()
     success = 0
     errors = 0
 
-    for i, row in enumerate(rows, 1):
-        lat, lon = row["latitude"], row["longitude"]
-        label = f"{row['address'] or 'Unknown'}, {row['city'] or ''}"
-
-        elevation = get_elevation(lat, lon)
-
-        if elevation is not None:
-            conn.execute(
-                "UPDATE listings SET elevation_feet = ? WHERE id = ?",
-                (elevation, row["id"]),
-            )
-            success += 1
-            print(f"  [{i}/{total}] {label}: {elevation:,} ft")
-        else:
-            errors += 1
-            print(f"  [{i}/{total}] {label}: FAILED")
-
-        # Commit every 50 records
-        if i % 50 == 0:
-            conn.commit()
-
-        # Rate limiting
-        if i < total:
-            time.sleep(REQUEST_DELAY)
-
-    conn.commit()
-    conn.close()
+    try:
+        for start in range(0, total, CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            lats = np.array([row["latitude"] for row in chunk], dtype=float)
+            lons = np.array([row["longitude"] for row in chunk], dtype=float)
+            feet = sampler.elevations(lats, lons)
+
+            batch = [
+                (int(round(value)), row["id"])
+                for value, row in zip(feet, chunk) if not np.isnan(value)
+            ]
+            if batch:
+                conn.executemany("UPDATE listings SET elevation_feet = ? WHERE id = ?", batch)
+                conn.commit()
+            success += len(batch)
+            errors += len(chunk) - len(batch)
+
+            done = start + len(chunk)
+            print(f"  [{done}/{total}] {success} enriched, {errors} failed "
+                  f"({time.monotonic() - started:.0f}s, {sampler.stats})")
+    finally:
+        sampler.close()
+        conn.close()
 
     print(f"\nDone: {success} enriched, {errors} failed out of {total}")
 
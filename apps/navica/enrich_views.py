@@ -8,6 +8,10 @@ view_potential score (1-10).
 
 Scoring: 60% elevation advantage + 40% directional dominance.
 
+Terrain comes from apps/navica/terrain.py (local DEM tiles, then the
+on-disk elevation cache, then USGS EPQS), sampled a chunk of listings
+at a time.
+
 Usage:
     python3 -m apps.navica.enrich_views           # Enrich listings missing view data
     python3 -m apps.navica.enrich_views --all      # Re-enrich all listings
@@ -15,72 +19,27 @@ Usage:
 """
 
 import argparse
-import json
-import math
-import sqlite3
 import sys
 import time
-import urllib.request
-import urllib.error
 from pathlib import Path
 
+import numpy as np
+
 # Resolve project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "dreams.db"
 
-USGS_EPQS_URL = "https://epqs.nationalmap.gov/v1/json"
-REQUEST_DELAY = 0.15  # seconds between API calls
+from apps.navica.terrain import TerrainSampler, offset_points, view_potential_scores
+
 SAMPLE_RADIUS_KM = 1.0  # radius for surrounding points
 NUM_DIRECTIONS = 8  # N, NE, E, SE, S, SW, W, NW
+MIN_VALID_SAMPLES = 4  # need at least 4 surrounding samples for a meaningful score
+CHUNK_SIZE = 500  # listings sampled, scored and written per batch
 
 # Direction bearings in degrees (clockwise from north)
 BEARINGS = [0, 45, 90, 135, 180, 225, 270, 315]
 
 
-def offset_point(lat: float, lon: float, bearing_deg: float, distance_km: float) -> tuple[float, float]:
-    """Calculate a new lat/lon given a starting point, bearing, and distance.
-
-    Uses the haversine-based destination formula.
-    """
-    R = 6371.0  # Earth radius in km
-    d = distance_km / R
-
-    lat_r = math.radians(lat)
-    lon_r = math.radians(lon)
-    brg_r = math.radians(bearing_deg)
-
-    new_lat = math.asin(
-        math.sin(lat_r) * math.cos(d) + math.cos(lat_r) * math.sin(d) * math.cos(brg_r)
-    )
-    new_lon = lon_r + math.atan2(
-        math.sin(brg_r) * math.sin(d) * math.cos(lat_r),
-        math.cos(d) - math.sin(lat_r) * math.sin(new_lat),
-    )
-
-    return (math.degrees(new_lat), math.degrees(new_lon))
-
-
-def get_elevation(lat: float, lon: float, retries: int = 3) -> float | None:
-    """Query USGS EPQS for elevation in feet at a given lat/lon, with retries."""
-    url = f"{USGS_EPQS_URL}?x={lon}&y={lat}&units=Feet&wkid=4326&includeDate=false"
-    for attempt in range(retries):
-        req = urllib.request.Request(url, headers={"User-Agent": "myDREAMS/1.0"})
-        try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read())
-                value = data.get("value")
-                if value is not None and value != -1000000:
-                    return float(value)
-                return None
-        except (urllib.error.URLError, json.JSONDecodeError, ValueError, KeyError):
-            return None
-        except (TimeoutError, OSError):
-            if attempt < retries - 1:
-                time.sleep(2 * (attempt + 1))
-                continue
-            return None
-
-
 def calculate_view_potential(listing_elev: float, surrounding_elevs: list[float | None]) -> int:
     """Calculate view potential score (1-10) from listing elevation vs surrounding terrain.
 
@@ -122,32 +81,11 @@ def calculate_view_potential(listing_elev: float, surrounding_elevs: list[float
     return max(1, min(10, round(raw)))
 
 
-def enrich_listing_view(lat: float, lon: float, listing_elev: float) -> int | None:
-    """Sample 8 surrounding points and calculate view potential for one listing.
-
-    Returns view_potential score (1-10) or None on failure.
-    """
-    surrounding = []
-
-    for bearing in BEARINGS:
-        pt_lat, pt_lon = offset_point(lat, lon, bearing, SAMPLE_RADIUS_KM)
-        elev = get_elevation(pt_lat, pt_lon)
-        surrounding.append(elev)
-        time.sleep(REQUEST_DELAY)
-
-    # Need at least 4 valid samples for a meaningful score
-    valid_count = sum(1 for e in surrounding if e is not None)
-    if valid_count < 4:
-        return None
-
-    return calculate_view_potential(listing_elev, surrounding)
-
-
 def enrich_listings(all_listings: bool = False, test_mode: bool = False, include_inactive: bool = False):
     """Fetch view potential for listings that have elevation but no view score.
 
     By default, only enriches ACTIVE and PENDING listings. Use --include-inactive
-    to also process SOLD, EXPIRED, etc. (this will take a long time).
+    to also process SOLD, EXPIRED, etc.
     """
     from src.core.pg_adapter import get_db
     conn = get_db()
@@ -180,33 +118,35 @@ def enrich_listings(all_listings: bool = False, test_mode: bool = False, include
     if total == 0:
         return
 
+    # Terrain for all 8 bearings of a whole chunk is sampled in one call:
+    # local DEM tiles first, then the elevation cache, then EPQS.
+    sampler = TerrainSampler()
+    started = time.monotonic()
     success = 0
     errors = 0
-    batch = []  # Collect updates, write in batches
-
-    for i, row in enumerate(rows, 1):
-        lat, lon = row["latitude"], row["longitude"]
-        elev = row["elevation_feet"]
-        label = f"{row['address'] or 'Unknown'}, {row['city'] or ''}"
-
-        score = enrich_listing_view(lat, lon, float(elev))
-
-        if score is not None:
-            batch.append((score, row["id"]))
-            success += 1
-            print(f"  [{i}/{total}] {label}: elev={elev}ft, view={score}/10")
-        else:
-            errors += 1
-            print(f"  [{i}/{total}] {label}: FAILED (not enough surrounding data)")
-
-        # Write batch every 50 records (short-lived connection)
-        if len(batch) >= 50:
-            _flush_batch(batch)
-            batch = []
 
-    # Final flush
-    if batch:
-        _flush_batch(batch)
+    try:
+        for start in range(0, total, CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            lats = np.array([row["latitude"] for row in chunk], dtype=float)
+            lons = np.array([row["longitude"] for row in chunk], dtype=float)
+            elevs = np.array([row["elevation_feet"] for row in chunk], dtype=float)
+
+            pt_lats, pt_lons = offset_points(lats, lons, BEARINGS, SAMPLE_RADIUS_KM)
+            surrounding = sampler.elevations(pt_lats, pt_lons).reshape(pt_lats.shape)
+            scores = view_potential_scores(elevs, surrounding, min_valid=MIN_VALID_SAMPLES)
+
+            batch = [(int(score), row["id"]) for score, row in zip(scores, chunk) if score]
+            if batch:
+                _flush_batch(batch)
+            success += len(batch)
+            errors += len(chunk) - len(batch)
+
+            done = start + len(chunk)
+            print(f"  [{done}/{total}] {success} scored, {errors} without enough terrain data "
+                  f"({time.monotonic() - started:.0f}s, {sampler.stats})")
+    finally:
+        sampler.close()
 
     print(f"\nDone: {success} enriched, {errors} failed out of {total}")
 
@@ -215,8 +155,7 @@ def _flush_batch(batch: list[tuple]):
     """Write a batch of view_potential updates with a short-lived DB connection."""
     from src.core.pg_adapter import get_db
     conn = get_db()
-    for score, listing_id in batch:
-        conn.execute("UPDATE listings SET view_potential = ? WHERE id = ?", (score, listing_id))
+    conn.executemany("UPDATE listings SET view_potential = ? WHERE id = ?", batch)
     conn.commit()
     conn.close()
 
@@ -50,6 +50,8 @@ from apps.navica.field_mapper import (
     ensure_listing_columns,
     parse_timestamp,
 )
+from src.core.listing_service import DedupTracker
+from src.core.response_cache import bump_sync_generation
 
 
 def load_env():
@@ -93,6 +95,10 @@ class NavicaSyncEngine:
         'CanopyMLS': 'Canopy MLS',
     }
 
+    # Listings per set-based upsert batch (one prefetch SELECT plus grouped
+    # INSERT/UPDATE writes per batch). 0 or 1 selects the per-row path.
+    UPSERT_BATCH_SIZE = 500
+
     def __init__(
         self,
         db_path: str = None,
@@ -114,6 +120,9 @@ class NavicaSyncEngine:
         self.dataset_code = dataset_code or 'nav27'
         self.mls_source = mls_source or self.DATASET_MLS_MAP.get(self.dataset_code, 'NavicaMLS')
         self.client = None
+        # address_keys whose cross-MLS dedup winner may have changed
+        # since the last refresh
+        self._dedup = DedupTracker()
 
         # Ensure database tables exist
         self._ensure_tables()
@@ -373,6 +382,39 @@ class NavicaSyncEngine:
     # Upsert logic
     # ---------------------------------------------------------------
 
+    def _prefetch_existing(self, conn, mls_numbers: List[str]) -> Dict[str, Dict]:
+        """Load existing listings for a batch of MLS numbers in one query."""
+        if not mls_numbers:
+            return {}
+        placeholders = ', '.join(['?' for _ in mls_numbers])
+        rows = conn.execute(
+            f"SELECT * FROM listings WHERE mls_source = ? AND mls_number IN ({placeholders})",
+            [self.mls_source] + list(mls_numbers)
+        ).fetchall()
+        return {row['mls_number']: dict(row) for row in rows}
+
+    @staticmethod
+    def _update_data(listing: Dict, now: str) -> Dict:
+        """Column values for updating an existing listing (non-None only)."""
+        update_data = {
+            k: v for k, v in listing.items()
+            if v is not None and k not in ('id', 'captured_at')
+        }
+        update_data['updated_at'] = now
+
+        _photo_fields = {'primary_photo', 'photos', 'photo_count', 'photos_change_timestamp'}
+        if _photo_fields & set(update_data.keys()):
+            update_data['gallery_status'] = 'pending'
+        return update_data
+
+    @staticmethod
+    def _insert_data(listing: Dict, now: str) -> Dict:
+        """Column values for inserting a new listing (non-None only)."""
+        listing['captured_at'] = now
+        listing['updated_at'] = now
+        listing.setdefault('gallery_status', 'pending')
+        return {k: v for k, v in listing.items() if v is not None}
+
     def _upsert_listing(
         self,
         conn,
@@ -407,37 +449,23 @@ class NavicaSyncEngine:
             self._record_changes(conn, changes)
 
         now = datetime.now().isoformat()
+        self._dedup.track(existing_dict, listing)
 
         if existing:
             # Update existing: only update non-None values
-            update_data = {
-                k: v for k, v in listing.items()
-                if v is not None and k not in ('id', 'captured_at')
-            }
-            update_data['updated_at'] = now
+            update_data = self._update_data(listing, now)
+            set_clause = ", ".join([f"{k} = ?" for k in update_data.keys()])
+            values = list(update_data.values())
+            values.append(existing['id'])
 
-            _photo_fields = {'primary_photo', 'photos', 'photo_count', 'photos_change_timestamp'}
-            if _photo_fields & set(update_data.keys()):
-                update_data['gallery_status'] = 'pending'
-
-            if update_data:
-                set_clause = ", ".join([f"{k} = ?" for k in update_data.keys()])
-                values = list(update_data.values())
-                values.append(existing['id'])
-
-                conn.execute(
-                    f"UPDATE listings SET {set_clause} WHERE id = ?",
-                    values
-                )
+            conn.execute(
+                f"UPDATE listings SET {set_clause} WHERE id = ?",
+                values
+            )
             return 'updated'
         else:
             # Insert new listing
-            listing['captured_at'] = now
-            listing['updated_at'] = now
-            listing.setdefault('gallery_status', 'pending')
-
-            # Filter out None values
-            insert_data = {k: v for k, v in listing.items() if v is not None}
+            insert_data = self._insert_data(listing, now)
 
             columns = list(insert_data.keys())
             placeholders = ', '.join(['?' for _ in columns])
@@ -449,6 +477,233 @@ class NavicaSyncEngine:
             )
             return 'created'
 
+    def _upsert_batch(
+        self,
+        conn,
+        listings: List[Dict],
+        dry_run: bool = False,
+    ) -> List[str]:
+        """
+        Set-based upsert for a batch of listings with distinct MLS numbers.
+
+        Existing rows are prefetched with one query and diffed in memory.
+        Inserts and updates are grouped by column set and written with
+        executemany, which pg_adapter pages into a handful of round trips.
+        Raises on any write failure; the caller falls back to per-row
+        upserts so a bad row cannot sink its siblings.
+
+        Returns one of 'created', 'updated' or 'skipped' per listing.
+        """
+        existing_by_mls = self._prefetch_existing(
+            conn, [listing['mls_number'] for listing in listings if listing.get('mls_number')]
+        )
+
+        now = datetime.now().isoformat()
+        results = []
+        changes = []
+        inserts: Dict[tuple, List[list]] = {}
+        updates: Dict[tuple, List[list]] = {}
+
+        for listing in listings:
+            mls_number = listing.get('mls_number')
+            if not mls_number:
+                results.append('skipped')
+                continue
+
+            existing = existing_by_mls.get(mls_number)
+            changes.extend(self._detect_changes(conn, listing, existing))
+            if not dry_run:
+                self._dedup.track(existing, listing)
+
+            if existing:
+                results.append('updated')
+                if not dry_run:
+                    update_data = self._update_data(listing, now)
+                    updates.setdefault(tuple(update_data.keys()), []).append(
+                        list(update_data.values()) + [existing['id']]
+                    )
+            else:
+                results.append('created')
+                if not dry_run:
+                    insert_data = self._insert_data(listing, now)
+                    inserts.setdefault(tuple(insert_data.keys()), []).append(
+                        list(insert_data.values())
+                    )
+
+        if dry_run:
+            return results
+
+        if changes:
+            self._record_changes(conn, changes)
+
+        for columns, rows in inserts.items():
+            placeholders = ', '.join(['?' for _ in columns])
+            conn.executemany(
+                f"INSERT INTO listings ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+
+        for columns, rows in updates.items():
+            set_clause = ", ".join([f"{k} = ?" for k in columns])
+            conn.executemany(
+                f"UPDATE listings SET {set_clause} WHERE id = ?",
+                rows
+            )
+
+        return results
+
+    @staticmethod
+    def _count_result(stats: Dict, result: str):
+        if result == 'created':
+            stats['created'] += 1
+        elif result == 'updated':
+            stats['updated'] += 1
+        else:
+            stats['skipped'] += 1
+
+    def _upsert_rows(self, conn, listings: List[Dict], stats: Dict, dry_run: bool = False):
+        """Upsert listings one at a time, each isolated in its own savepoint."""
+        for i, listing in enumerate(listings):
+            savepoint = f"sync_row_{i}"
+            try:
+                conn.execute(f"SAVEPOINT {savepoint}")
+                result = self._upsert_listing(conn, listing, dry_run=dry_run)
+                self._count_result(stats, result)
+                conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+            except Exception as e:
+                logger.error(f"Error processing {listing.get('mls_number')}: {e}")
+                stats['errors'] += 1
+                # Roll back JUST this row's savepoint so sibling rows
+                # already committed in this transaction survive. One bad
+                # row (e.g. integer overflow on LotSizeSquareFeet) no
+                # longer poisons every subsequent row in the batch.
+                try:
+                    conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+                except Exception:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+
+    def _flush_batch(self, conn, listings: List[Dict], stats: Dict, dry_run: bool = False):
+        """Write a batch set-based, falling back to per-row upserts on failure."""
+        if not listings:
+            return
+
+        # Ensure schema has all columns this batch needs.
+        # DDL (ALTER TABLE) issues an implicit commit on Postgres,
+        # which releases any open savepoint. So we commit first,
+        # then open the batch savepoint AFTER the DDL commit.
+        batch_columns = set().union(*(listing.keys() for listing in listings))
+        if batch_columns - self._known_listing_columns:
+            for listing in listings:
+                if set(listing.keys()) - self._known_listing_columns:
+                    self._known_listing_columns = ensure_listing_columns(
+                        conn, listing, self._known_listing_columns
+                    )
+            conn.commit()
+
+        if len(listings) == 1:
+            self._upsert_rows(conn, listings, stats, dry_run=dry_run)
+            return
+
+        try:
+            conn.execute("SAVEPOINT sync_batch")
+            results = self._upsert_batch(conn, listings, dry_run=dry_run)
+            conn.execute("RELEASE SAVEPOINT sync_batch")
+        except Exception as e:
+            logger.warning(
+                f"Batch upsert of {len(listings)} listings failed ({e}); "
+                f"retrying row by row"
+            )
+            try:
+                conn.execute("ROLLBACK TO SAVEPOINT sync_batch")
+                conn.execute("RELEASE SAVEPOINT sync_batch")
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            self._upsert_rows(conn, listings, stats, dry_run=dry_run)
+            return
+
+        for result in results:
+            self._count_result(stats, result)
+
+    def _sync_properties(
+        self,
+        conn,
+        properties,
+        stats: Dict,
+        dry_run: bool = False,
+        batch_size: int = None,
+        fetched_mls_numbers: set = None,
+    ) -> int:
+        """
+        Map raw RESO records and upsert them into listings.
+
+        With batch_size > 1, listings are written through _flush_batch in
+        groups of batch_size (prefetch + grouped writes). With batch_size
+        of 0 or 1 every listing takes the per-row path.
+
+        Returns the number of records processed.
+        """
+        from src.core.regions import is_in_scope
+
+        if batch_size is None:
+            batch_size = self.UPSERT_BATCH_SIZE
+        batch_size = max(batch_size, 1)
+        commit_every = batch_size if batch_size > 1 else 100
+
+        pending: List[Dict] = []
+        pending_mls = set()
+        processed = 0
+        since_commit = 0
+
+        def flush():
+            nonlocal since_commit
+            self._flush_batch(conn, pending, stats, dry_run=dry_run)
+            self._dedup.refresh(conn)
+            since_commit += len(pending)
+            pending.clear()
+            pending_mls.clear()
+            if since_commit >= commit_every:
+                if not dry_run:
+                    conn.commit()  # Periodic commit
+                since_commit = 0
+
+        for prop in properties:
+            processed += 1
+            try:
+                listing = map_reso_to_listing(prop, self.mls_source)
+            except Exception as e:
+                logger.error(f"Error processing {prop.get('ListingId')}: {e}")
+                stats['errors'] += 1
+                continue
+
+            # Out-of-scope filter (see src/core/regions.py).
+            if not is_in_scope(listing.get('county')):
+                stats['out_of_scope_skipped'] = stats.get('out_of_scope_skipped', 0) + 1
+                continue
+
+            mls_number = listing.get('mls_number')
+            if mls_number and fetched_mls_numbers is not None:
+                fetched_mls_numbers.add(mls_number)
+
+            # A repeated MLS number must see the earlier row's write.
+            if mls_number in pending_mls:
+                flush()
+            pending.append(listing)
+            if mls_number:
+                pending_mls.add(mls_number)
+
+            if len(pending) >= batch_size:
+                flush()
+
+        flush()
+        return processed
+
     def _upsert_agent(self, conn: sqlite3.Connection, agent: Dict):
         """Upsert an agent/member record."""
         if not agent.get('member_key'):
@@ -558,27 +813,36 @@ class NavicaSyncEngine:
         with that same status — never against the full Active set when the fetch
         was Pending-only.
         """
+        from src.core.pg_adapter import iter_rows
+
         if not fetched_mls_numbers:
             return 0
         if status_filter:
-            rows = conn.execute(
-                "SELECT mls_number FROM listings WHERE mls_source = ? AND UPPER(status) = UPPER(?)",
+            rows = iter_rows(
+                conn,
+                "SELECT mls_number, address_key FROM listings WHERE mls_source = ? AND UPPER(status) = UPPER(?)",
                 (self.mls_source, status_filter)
-            ).fetchall()
+            )
         else:
-            rows = conn.execute(
-                "SELECT mls_number FROM listings WHERE mls_source = ? AND UPPER(status) = 'ACTIVE'",
+            rows = iter_rows(
+                conn,
+                "SELECT mls_number, address_key FROM listings WHERE mls_source = ? AND UPPER(status) = 'ACTIVE'",
                 (self.mls_source,)
-            ).fetchall()
-        stale = [r['mls_number'] for r in rows if r['mls_number'] not in fetched_mls_numbers]
+            )
+        stale = []
+        for r in rows:
+            if r['mls_number'] not in fetched_mls_numbers:
+                stale.append(r['mls_number'])
+                self._dedup.add(r['address_key'])
         if not stale:
             return 0
         logger.warning(f"Reconciliation: {len(stale)} NavicaMLS listings not in full sync — marking WITHDRAWN")
-        for mls_number in stale:
-            conn.execute(
-                "UPDATE listings SET status = 'WITHDRAWN', updated_at = ? WHERE mls_source = ? AND mls_number = ?",
-                (datetime.now(timezone.utc).isoformat(), self.mls_source, mls_number)
-            )
+        now = datetime.now(timezone.utc).isoformat()
+        conn.executemany(
+            "UPDATE listings SET status = 'WITHDRAWN', updated_at = ? WHERE mls_source = ? AND mls_number = ?",
+            [(now, self.mls_source, mls_number) for mls_number in stale]
+        )
+        self._dedup.refresh(conn)
         conn.commit()
         return len(stale)
 
@@ -594,6 +858,7 @@ class NavicaSyncEngine:
         city: str = None,
         dry_run: bool = False,
         max_records: int = None,
+        batch_size: int = None,
     ) -> Dict[str, Any]:
         """
         Run a full sync (all matching records from scratch).
@@ -605,6 +870,8 @@ class NavicaSyncEngine:
             city: Filter by city
             dry_run: Preview without database changes
             max_records: Limit total records fetched
+            batch_size: Listings per set-based upsert (default
+                UPSERT_BATCH_SIZE; 0 = row by row)
 
         Returns:
             Stats dict with counts and timing
@@ -626,117 +893,84 @@ class NavicaSyncEngine:
 
         logger.info(f"Starting full sync (feed={self.feed}, status={status})")
 
-        try:
-            fetch_kwargs = dict(
-                status=status,
-                county=county,
-                city=city,
-                max_records=max_records,
-            )
-            # API accepts a single PropertyType filter, not a list
-            if property_types and len(property_types) == 1:
-                fetch_kwargs['property_type'] = property_types[0]
-            properties = self.client.fetch_properties(**fetch_kwargs)
-        except NavicaAPIError as e:
-            logger.error(f"Failed to fetch properties: {e}")
-            stats['errors'] += 1
-            return stats
-
-        stats['fetched'] = len(properties)
-        logger.info(f"Fetched {len(properties)} properties from Navica API")
-
-        if not properties:
-            logger.info("No properties to sync")
-            return stats
+        fetch_kwargs = dict(
+            status=status,
+            county=county,
+            city=city,
+            max_records=max_records,
+        )
+        # API accepts a single PropertyType filter, not a list
+        if property_types and len(property_types) == 1:
+            fetch_kwargs['property_type'] = property_types[0]
 
         if dry_run:
             logger.info("DRY RUN: No database changes will be made")
 
+        # Pages are streamed: page N is mapped and upserted while page N+1
+        # is fetched in the background, so only ~2 pages are ever in memory.
         fetched_mls_numbers = set()
+        fetch_error = None
         conn = self._get_connection()
         try:
-            for i, prop in enumerate(properties):
-                savepoint = f"sync_row_{i}"
-                try:
-                    listing = map_reso_to_listing(prop, self.mls_source)
-
-                    # Out-of-scope filter (see src/core/regions.py).
-                    from src.core.regions import is_in_scope
-                    if not is_in_scope(listing.get('county')):
-                        stats['out_of_scope_skipped'] = stats.get('out_of_scope_skipped', 0) + 1
-                        continue
-
-                    if listing.get('mls_number'):
-                        fetched_mls_numbers.add(listing['mls_number'])
-
-                    # Ensure schema has all columns this listing needs.
-                    # DDL (ALTER TABLE) issues an implicit commit on Postgres,
-                    # which releases any open savepoint. So we commit first,
-                    # then open the per-row savepoint AFTER the DDL commit.
-                    if set(listing.keys()) - self._known_listing_columns:
-                        self._known_listing_columns = ensure_listing_columns(
-                            conn, listing, self._known_listing_columns
-                        )
+            try:
+                for page in self.client.iter_property_pages(**fetch_kwargs):
+                    stats['fetched'] += len(page)
+                    self._sync_properties(
+                        conn, page, stats,
+                        dry_run=dry_run,
+                        batch_size=batch_size,
+                        fetched_mls_numbers=fetched_mls_numbers,
+                    )
+                    if not dry_run:
                         conn.commit()
+                    logger.info(f"Processed {stats['fetched']} properties...")
+            except NavicaAPIError as e:
+                logger.error(f"Failed to fetch properties: {e}")
+                stats['errors'] += 1
+                fetch_error = str(e)
 
-                    conn.execute(f"SAVEPOINT {savepoint}")
-
-                    result = self._upsert_listing(conn, listing, dry_run=dry_run)
-
-                    if result == 'created':
-                        stats['created'] += 1
-                    elif result == 'updated':
-                        stats['updated'] += 1
-                    else:
-                        stats['skipped'] += 1
-
-                    conn.execute(f"RELEASE SAVEPOINT {savepoint}")
-
-                    if (i + 1) % 100 == 0:
-                        logger.info(f"Processed {i + 1}/{len(properties)}...")
-                        if not dry_run:
-                            conn.commit()  # Periodic commit
+            logger.info(f"Fetched {stats['fetched']} properties from Navica API")
 
-                except Exception as e:
-                    logger.error(f"Error processing {prop.get('ListingId')}: {e}")
-                    stats['errors'] += 1
-                    # Roll back JUST this row's savepoint so sibling rows
-                    # already committed in this transaction survive. One bad
-                    # row (e.g. integer overflow on LotSizeSquareFeet) no
-                    # longer poisons every subsequent row in the batch.
-                    try:
-                        conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
-                        conn.execute(f"RELEASE SAVEPOINT {savepoint}")
-                    except Exception:
-                        # Savepoint not open (e.g. DDL path committed before
-                        # the savepoint was set); fall back to full rollback.
-                        try:
-                            conn.rollback()
-                        except Exception:
-                            pass
+            if not stats['fetched']:
+                if not fetch_error:
+                    logger.info("No properties to sync")
+                return stats
 
             if not dry_run:
                 conn.commit()
 
-                # Reconcile: any listing with the same status not seen in this fetch is stale.
-                # Pass status so a Pending-only sync doesn't mark Active listings WITHDRAWN.
-                if fetched_mls_numbers:
-                    reconcile_result = self._reconcile_stale_listings(conn, fetched_mls_numbers, status_filter=status)
-                    stats['stale_withdrawn'] = reconcile_result
-                    logger.info(f"Reconciliation: marked {reconcile_result} stale NavicaMLS listings as WITHDRAWN")
-
-                # Save sync state
-                self._save_sync_state({
-                    'last_sync': datetime.now(timezone.utc).isoformat(),
-                    'sync_type': 'full',
-                    'records_synced': len(properties),
-                    'status_filter': status,
-                    'feed': self.feed,
-                })
-
-                # Log sync
-                self._log_sync(conn, 'navica_full_sync', stats)
-                conn.commit()
+                if fetch_error:
+                    # Partial fetch: rows written so far are kept, but the
+                    # fetched set is incomplete, so skip reconciliation and
+                    # don't advance the sync state.
+                    logger.warning(
+                        f"Full sync aborted after {stats['fetched']} records; "
+                        f"skipping reconciliation"
+                    )
+                    self._log_sync(conn, 'navica_full_sync', stats, error=fetch_error)
+                    bump_sync_generation(conn)
+                    conn.commit()
+                else:
+                    # Reconcile: any listing with the same status not seen in this fetch is stale.
+                    # Pass status so a Pending-only sync doesn't mark Active listings WITHDRAWN.
+                    if fetched_mls_numbers:
+                        reconcile_result = self._reconcile_stale_listings(conn, fetched_mls_numbers, status_filter=status)
+                        stats['stale_withdrawn'] = reconcile_result
+                        logger.info(f"Reconciliation: marked {reconcile_result} stale NavicaMLS listings as WITHDRAWN")
+
+                    # Save sync state
+                    self._save_sync_state({
+                        'last_sync': datetime.now(timezone.utc).isoformat(),
+                        'sync_type': 'full',
+                        'records_synced': stats['fetched'],
+                        'status_filter': status,
+                        'feed': self.feed,
+                    })
+
+                    # Log sync
+                    self._log_sync(conn, 'navica_full_sync', stats)
+                    bump_sync_generation(conn)
+                    conn.commit()
 
         finally:
             conn.close()
@@ -768,6 +1002,7 @@ class NavicaSyncEngine:
         status: str = None,
         dry_run: bool = False,
         max_records: int = None,
+        batch_size: int = None,
     ) -> Dict[str, Any]:
         """
         Run incremental sync (only records modified since last sync).
@@ -779,6 +1014,8 @@ class NavicaSyncEngine:
             status: Optional status filter
             dry_run: Preview without database changes
             max_records: Safety limit on records
+            batch_size: Listings per set-based upsert (default
+                UPSERT_BATCH_SIZE; 0 = row by row)
 
         Returns:
             Stats dict
@@ -809,108 +1046,67 @@ class NavicaSyncEngine:
             logger.warning("No previous sync state found. Falling back to last 24 hours.")
             modified_since = datetime.now(timezone.utc) - timedelta(hours=24)
 
-        try:
-            # Navica API doesn't support server-side ModificationTimestamp filtering,
-            # so we fetch all current listings and filter client-side below.
-            properties = self.client.fetch_properties(
-                status=status,
-                max_records=max_records,
-            )
-        except NavicaAPIError as e:
-            logger.error(f"Failed to fetch properties: {e}")
-            stats['errors'] += 1
-            return stats
-
-        api_total = len(properties)
-        logger.info(f"Fetched {api_total} properties from API")
-
-        # Client-side timestamp filter: only process records changed since last sync.
+        # Navica API doesn't support server-side ModificationTimestamp filtering,
+        # so we stream all current listings and filter client-side per page.
         # Use a 2-minute buffer to cover clock skew between our server and Navica's.
-        if modified_since:
-            if modified_since.tzinfo is None:
-                modified_since = modified_since.replace(tzinfo=timezone.utc)
-            cutoff = modified_since - timedelta(minutes=2)
-            properties = [
-                p for p in properties
-                if self._ts_after(p.get('ModificationTimestamp'), cutoff)
-            ]
-            logger.info(
-                f"After timestamp filter: {len(properties)} changed properties "
-                f"(of {api_total} fetched, since {modified_since.isoformat()})"
-            )
-
-        stats['fetched'] = len(properties)
-
-        if not properties:
-            logger.info("No changes since last sync")
-            # Still update the sync state timestamp
-            if not dry_run:
-                self._save_sync_state({
-                    'last_sync': datetime.now(timezone.utc).isoformat(),
-                    'sync_type': 'incremental',
-                    'records_synced': 0,
-                    'feed': self.feed,
-                })
-            return stats
+        if modified_since.tzinfo is None:
+            modified_since = modified_since.replace(tzinfo=timezone.utc)
+        cutoff = modified_since - timedelta(minutes=2)
 
+        api_total = 0
+        fetch_error = None
         conn = self._get_connection()
         try:
-            for i, prop in enumerate(properties):
-                savepoint = f"sync_row_{i}"
-                try:
-                    listing = map_reso_to_listing(prop, self.mls_source)
-
-                    # Out-of-scope filter (see src/core/regions.py).
-                    from src.core.regions import is_in_scope
-                    if not is_in_scope(listing.get('county')):
-                        stats['out_of_scope_skipped'] = stats.get('out_of_scope_skipped', 0) + 1
-                        continue
-
-                    # Ensure schema has all columns this listing needs.
-                    # DDL (ALTER TABLE) issues an implicit commit on Postgres,
-                    # which releases any open savepoint. So we commit first,
-                    # then open the per-row savepoint AFTER the DDL commit.
-                    if set(listing.keys()) - self._known_listing_columns:
-                        self._known_listing_columns = ensure_listing_columns(
-                            conn, listing, self._known_listing_columns
+            try:
+                for page in self.client.iter_property_pages(
+                    status=status,
+                    max_records=max_records,
+                ):
+                    api_total += len(page)
+                    changed = [
+                        p for p in page
+                        if self._ts_after(p.get('ModificationTimestamp'), cutoff)
+                    ]
+                    stats['fetched'] += len(changed)
+                    if changed:
+                        self._sync_properties(
+                            conn, changed, stats,
+                            dry_run=dry_run,
+                            batch_size=batch_size,
                         )
-                        conn.commit()
-
-                    conn.execute(f"SAVEPOINT {savepoint}")
-
-                    result = self._upsert_listing(conn, listing, dry_run=dry_run)
-
-                    if result == 'created':
-                        stats['created'] += 1
-                    elif result == 'updated':
-                        stats['updated'] += 1
-                    else:
-                        stats['skipped'] += 1
-
-                    conn.execute(f"RELEASE SAVEPOINT {savepoint}")
-
-                    if (i + 1) % 100 == 0:
-                        logger.info(f"Processed {i + 1}/{len(properties)}...")
                         if not dry_run:
                             conn.commit()
+            except NavicaAPIError as e:
+                logger.error(f"Failed to fetch properties: {e}")
+                stats['errors'] += 1
+                fetch_error = str(e)
 
-                except Exception as e:
-                    logger.error(f"Error processing {prop.get('ListingId')}: {e}")
-                    stats['errors'] += 1
-                    # Roll back JUST this row's savepoint so sibling rows
-                    # already committed in this transaction survive. One bad
-                    # row (e.g. integer overflow on LotSizeSquareFeet) no
-                    # longer poisons every subsequent row in the batch.
-                    try:
-                        conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
-                        conn.execute(f"RELEASE SAVEPOINT {savepoint}")
-                    except Exception:
-                        # Savepoint not open (e.g. DDL path committed before
-                        # the savepoint was set); fall back to full rollback.
-                        try:
-                            conn.rollback()
-                        except Exception:
-                            pass
+            logger.info(
+                f"After timestamp filter: {stats['fetched']} changed properties "
+                f"(of {api_total} fetched, since {modified_since.isoformat()})"
+            )
+
+            if fetch_error:
+                # Keep whatever was written, but leave last_sync where it was
+                # so the next run re-covers the window we didn't finish.
+                if not dry_run and stats['fetched']:
+                    conn.commit()
+                    self._log_sync(conn, 'navica_incremental_sync', stats, error=fetch_error)
+                    bump_sync_generation(conn)
+                    conn.commit()
+                return stats
+
+            if not stats['fetched']:
+                logger.info("No changes since last sync")
+                # Still update the sync state timestamp
+                if not dry_run:
+                    self._save_sync_state({
+                        'last_sync': datetime.now(timezone.utc).isoformat(),
+                        'sync_type': 'incremental',
+                        'records_synced': 0,
+                        'feed': self.feed,
+                    })
+                return stats
 
             if not dry_run:
                 conn.commit()
@@ -918,11 +1114,12 @@ class NavicaSyncEngine:
                 self._save_sync_state({
                     'last_sync': datetime.now(timezone.utc).isoformat(),
                     'sync_type': 'incremental',
-                    'records_synced': len(properties),
+                    'records_synced': stats['fetched'],
                     'feed': self.feed,
                 })
 
                 self._log_sync(conn, 'navica_incremental_sync', stats)
+                bump_sync_generation(conn)
                 conn.commit()
 
         finally:
@@ -1181,6 +1378,9 @@ Examples:
                         help='Preview without database changes')
     parser.add_argument('--max-records', type=int,
                         help='Maximum records to fetch (safety limit)')
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help='Listings per batched upsert '
+                             f'(default: {NavicaSyncEngine.UPSERT_BATCH_SIZE}; 0 = row by row)')
     parser.add_argument('--cross-listings', action='store_true',
                         help='Run cross-listing detection only')
     parser.add_argument('--verbose', '-v', action='store_true',
@@ -1244,12 +1444,14 @@ Examples:
             city=args.city,
             dry_run=args.dry_run,
             max_records=args.max_records,
+            batch_size=args.batch_size,
         )
     elif args.incremental:
         stats = engine.run_incremental_sync(
             status=args.status,
             dry_run=args.dry_run,
             max_records=args.max_records,
+            batch_size=args.batch_size,
         )
 
     print_stats(stats)
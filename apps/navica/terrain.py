@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Shared terrain sampling for the elevation and view-potential enrichers.
+
+Elevations come from, in order:
+
+1. Local DEM tiles (DREAMS_DEM_DIR). These are USGS 1/3 arc-second
+   GridFloat tiles (`*.flt` plus a `.hdr` sidecar, as distributed by The
+   National Map). Each tile is memory-mapped with NumPy and sampled
+   bilinearly for a whole array of points at once, with no HTTP.
+2. The on-disk elevation cache (DREAMS_TERRAIN_CACHE, SQLite). It is
+   keyed by lat/lon rounded to CACHE_DECIMALS, about 11 m.
+3. USGS EPQS point queries, run on a small thread pool. Answers,
+   including "no data here", are written back to the cache, so a
+   re-enrich never asks for the same point twice.
+
+Also here: the vectorized bearing/offset math and the view-potential
+score. Both work over (n_listings, n_bearings) arrays.
+
+Usage:
+    sampler = TerrainSampler()
+    feet = sampler.elevations(lats, lons)      # np.ndarray, NaN = unknown
+    sampler.close()
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+USGS_EPQS_URL = "https://epqs.nationalmap.gov/v1/json"
+EARTH_RADIUS_KM = 6371.0
+METERS_TO_FEET = 3.28084
+
+DEM_DIR = os.getenv("DREAMS_DEM_DIR", str(PROJECT_ROOT / "data" / "dem"))
+DEM_UNITS = os.getenv("DREAMS_DEM_UNITS", "meters")  # USGS 3DEP ships meters
+CACHE_PATH = os.getenv("DREAMS_TERRAIN_CACHE", str(PROJECT_ROOT / "data" / "terrain_cache.db"))
+CACHE_DECIMALS = 4
+EPQS_WORKERS = int(os.getenv("DREAMS_EPQS_WORKERS", "4"))
+
+
+# ---------------------------------------------------------------------------
+# Geometry and scoring (vectorized)
+# ---------------------------------------------------------------------------
+
+def offset_points(lats, lons, bearings_deg, distance_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Destination points for every (origin, bearing) pair.
+
+    Same haversine destination formula as the old scalar offset_point.
+    Returns (lat, lon) arrays of shape (len(lats), len(bearings_deg)).
+    """
+    lat_r = np.radians(np.asarray(lats, dtype=float))[:, None]
+    lon_r = np.radians(np.asarray(lons, dtype=float))[:, None]
+    brg_r = np.radians(np.asarray(bearings_deg, dtype=float))[None, :]
+    d = distance_km / EARTH_RADIUS_KM
+
+    new_lat = np.arcsin(
+        np.sin(lat_r) * math.cos(d) + np.cos(lat_r) * math.sin(d) * np.cos(brg_r)
+    )
+    new_lon = lon_r + np.arctan2(
+        np.sin(brg_r) * math.sin(d) * np.cos(lat_r),
+        math.cos(d) - np.sin(lat_r) * np.sin(new_lat),
+    )
+    return np.degrees(new_lat), np.degrees(new_lon)
+
+
+def view_potential_scores(listing_elev, surrounding, min_valid: int = 1) -> np.ndarray:
+    """View potential (1-10) per row of surrounding (n, k) elevations.
+
+    60% elevation advantage over the mean of the valid samples plus 40%
+    directional dominance, identical to the scalar scoring it replaces.
+    NaN marks a missing sample. Rows with fewer than min_valid samples
+    score 0, meaning "not enough data".
+    """
+    listing_elev = np.asarray(listing_elev, dtype=float)
+    surrounding = np.asarray(surrounding, dtype=float)
+    valid = ~np.isnan(surrounding)
+    n_valid = valid.sum(axis=1)
+    safe_n = np.maximum(n_valid, 1)
+
+    avg = np.where(valid, surrounding, 0.0).sum(axis=1) / safe_n
+    adv = listing_elev - avg
+
+    # -100ft or below = 0, 0ft = 3, +100ft = 6, +300ft = 9, +500ft+ = 10
+    adv_score = np.select(
+        [adv <= -100, adv <= 0, adv <= 100, adv <= 300],
+        [
+            0.0,
+            3.0 * (1 + adv / 100),
+            3.0 + 3.0 * (adv / 100),
+            6.0 + 3.0 * ((adv - 100) / 200),
+        ],
+        default=np.minimum(10.0, 9.0 + (adv - 300) / 200),
+    )
+
+    higher = (valid & (listing_elev[:, None] > np.where(valid, surrounding, np.inf))).sum(axis=1)
+    dir_score = higher / safe_n * 10
+
+    raw = adv_score * 0.6 + dir_score * 0.4
+    scores = np.clip(np.round(raw), 1, 10).astype(int)
+    return np.where(n_valid >= max(min_valid, 1), scores, 0)
+
+
+# ---------------------------------------------------------------------------
+# DEM tiles
+# ---------------------------------------------------------------------------
+
+class DemTile:
+    """One memory-mapped GridFloat tile."""
+
+    def __init__(self, flt_path: Path):
+        header = {}
+        for line in flt_path.with_suffix(".hdr").read_text().splitlines():
+            parts = line.split()
+            if len(parts) >= 2:
+                header[parts[0].lower()] = parts[1]
+
+        self.path = flt_path
+        self.ncols = int(header["ncols"])
+        self.nrows = int(header["nrows"])
+        self.cellsize = float(header["cellsize"])
+        if "xllcenter" in header:
+            self.x0 = float(header["xllcenter"]) - self.cellsize / 2
+            self.y0 = float(header["yllcenter"]) - self.cellsize / 2
+        else:
+            self.x0 = float(header["xllcorner"])
+            self.y0 = float(header["yllcorner"])
+        self.x1 = self.x0 + self.ncols * self.cellsize
+        self.y1 = self.y0 + self.nrows * self.cellsize
+        self.nodata = float(header.get("nodata_value", -9999))
+        byteorder = header.get("byteorder", "LSBFIRST").upper()
+        dtype = np.dtype("<f4" if byteorder.startswith("LSB") else ">f4")
+        self.data = np.memmap(flt_path, dtype=dtype, mode="r", shape=(self.nrows, self.ncols))
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return (lons >= self.x0) & (lons < self.x1) & (lats > self.y0) & (lats <= self.y1)
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Bilinear elevation in tile units; NaN where any neighbour is nodata."""
+        col = np.clip((lons - self.x0) / self.cellsize - 0.5, 0, self.ncols - 1)
+        row = np.clip((self.y1 - lats) / self.cellsize - 0.5, 0, self.nrows - 1)
+        c0 = np.minimum(np.floor(col).astype(np.int64), self.ncols - 2 if self.ncols > 1 else 0)
+        r0 = np.minimum(np.floor(row).astype(np.int64), self.nrows - 2 if self.nrows > 1 else 0)
+        c1 = np.minimum(c0 + 1, self.ncols - 1)
+        r1 = np.minimum(r0 + 1, self.nrows - 1)
+        fc = col - c0
+        fr = row - r0
+
+        v00 = self.data[r0, c0].astype(float)
+        v01 = self.data[r0, c1].astype(float)
+        v10 = self.data[r1, c0].astype(float)
+        v11 = self.data[r1, c1].astype(float)
+        out = (v00 * (1 - fc) * (1 - fr) + v01 * fc * (1 - fr)
+               + v10 * (1 - fc) * fr + v11 * fc * fr)
+        bad = (v00 == self.nodata) | (v01 == self.nodata) | (v10 == self.nodata) | (v11 == self.nodata)
+        out[bad] = np.nan
+        return out
+
+
+def load_dem_tiles(dem_dir) -> List[DemTile]:
+    if not dem_dir:
+        return []
+    dem_dir = Path(dem_dir)
+    if not dem_dir.is_dir():
+        return []
+    tiles = []
+    for flt in sorted(dem_dir.glob("**/*.flt")):
+        try:
+            tiles.append(DemTile(flt))
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Skipping DEM tile {flt}: {e}")
+    return tiles
+
+
+# ---------------------------------------------------------------------------
+# EPQS
+# ---------------------------------------------------------------------------
+
+class EpqsError(Exception):
+    """Transient EPQS failure; the point should be retried on a later run."""
+
+
+def query_epqs(lat: float, lon: float, retries: int = 3) -> Optional[float]:
+    """USGS EPQS elevation in feet, or None where EPQS has no data.
+
+    Raises EpqsError when the service could not be reached, so transient
+    failures are never cached as "no data".
+    """
+    url = f"{USGS_EPQS_URL}?x={lon}&y={lat}&units=Feet&wkid=4326&includeDate=false"
+    for attempt in range(retries):
+        req = urllib.request.Request(url, headers={"User-Agent": "myDREAMS/1.0"})
+        try:
+            with urllib.request.urlopen(req, timeout=15) as resp:
+                data = json.loads(resp.read())
+                value = data.get("value")
+                if value is not None and float(value) != -1000000:
+                    return float(value)
+                return None
+        except (json.JSONDecodeError, ValueError, KeyError):
+            return None
+        except (urllib.error.URLError, TimeoutError, OSError) as e:
+            if attempt < retries - 1:
+                time.sleep(2 * (attempt + 1))
+                continue
+            raise EpqsError(str(e))
+
+
+# ---------------------------------------------------------------------------
+# Sampler
+# ---------------------------------------------------------------------------
+
+class TerrainSampler:
+    """Batch elevation lookups: DEM tiles, then on-disk cache, then EPQS."""
+
+    def __init__(
+        self,
+        dem_dir: Optional[str] = DEM_DIR,
+        cache_path: Optional[str] = CACHE_PATH,
+        http_fallback: bool = True,
+        workers: int = EPQS_WORKERS,
+        epqs=query_epqs,
+    ):
+        self.tiles = load_dem_tiles(dem_dir)
+        self.dem_units_to_feet = 1.0 if DEM_UNITS.lower().startswith("f") else METERS_TO_FEET
+        self.http_fallback = http_fallback
+        self.workers = max(1, workers)
+        self.epqs = epqs
+        self.stats: Dict[str, int] = {"dem": 0, "cache": 0, "epqs": 0, "missing": 0}
+
+        self.cache = None
+        if cache_path:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self.cache = sqlite3.connect(cache_path)
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS elevation_cache ("
+                "lat_key INTEGER NOT NULL, lon_key INTEGER NOT NULL, "
+                "feet REAL, fetched_at REAL, "
+                "PRIMARY KEY (lat_key, lon_key))"
+            )
+            self.cache.commit()
+
+        if self.tiles:
+            logger.info(f"Loaded {len(self.tiles)} DEM tiles from {dem_dir}")
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    @staticmethod
+    def _keys(lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        scale = 10 ** CACHE_DECIMALS
+        return np.round(lats * scale).astype(np.int64), np.round(lons * scale).astype(np.int64)
+
+    def _from_dem(self, lats, lons, out):
+        for tile in self.tiles:
+            mask = np.isnan(out) & tile.contains(lats, lons)
+            if mask.any():
+                out[mask] = tile.sample(lats[mask], lons[mask]) * self.dem_units_to_feet
+
+    def _from_cache(self, lat_keys, lon_keys) -> Dict[Tuple[int, int], Optional[float]]:
+        if self.cache is None or not len(lat_keys):
+            return {}
+        pairs = list({(int(a), int(b)) for a, b in zip(lat_keys, lon_keys)})
+        self.cache.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS wanted (lat_key INTEGER, lon_key INTEGER)"
+        )
+        self.cache.execute("DELETE FROM wanted")
+        self.cache.executemany("INSERT INTO wanted VALUES (?, ?)", pairs)
+        rows = self.cache.execute(
+            "SELECT c.lat_key, c.lon_key, c.feet FROM elevation_cache c "
+            "JOIN wanted w ON w.lat_key = c.lat_key AND w.lon_key = c.lon_key"
+        ).fetchall()
+        return {(r[0], r[1]): r[2] for r in rows}
+
+    def _from_epqs(self, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[float]]:
+        scale = 10 ** CACHE_DECIMALS
+
+        def fetch(key):
+            try:
+                return key, self.epqs(key[0] / scale, key[1] / scale), True
+            except EpqsError as e:
+                logger.debug(f"EPQS failed at {key}: {e}")
+                return key, None, False
+
+        found = {}
+        fetched = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for key, feet, ok in pool.map(fetch, keys):
+                if ok:
+                    found[key] = feet
+                    fetched.append((key[0], key[1], feet, time.time()))
+
+        if self.cache is not None and fetched:
+            self.cache.executemany(
+                "INSERT OR REPLACE INTO elevation_cache (lat_key, lon_key, feet, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                fetched,
+            )
+            self.cache.commit()
+        return found
+
+    def elevations(self, lats, lons) -> np.ndarray:
+        """Elevation in feet for each point; NaN where nothing knows it."""
+        lats = np.asarray(lats, dtype=float).ravel()
+        lons = np.asarray(lons, dtype=float).ravel()
+        out = np.full(lats.shape, np.nan)
+        if not len(out):
+            return out
+
+        self._from_dem(lats, lons, out)
+        self.stats["dem"] += int((~np.isnan(out)).sum())
+
+        todo = np.flatnonzero(np.isnan(out))
+        if len(todo):
+            lat_keys, lon_keys = self._keys(lats[todo], lons[todo])
+            known = self._from_cache(lat_keys, lon_keys)
+            self.stats["cache"] += len(known)
+
+            missing = sorted({
+                (int(a), int(b)) for a, b in zip(lat_keys, lon_keys)
+                if (int(a), int(b)) not in known
+            })
+            if missing and self.http_fallback:
+                known.update(self._from_epqs(missing))
+                self.stats["epqs"] += len(missing)
+
+            for idx, a, b in zip(todo, lat_keys, lon_keys):
+                feet = known.get((int(a), int(b)))
+                if feet is not None:
+                    out[idx] = feet
+
+        self.stats["missing"] += int(np.isnan(out).sum())
+        return out
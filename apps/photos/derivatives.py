@@ -0,0 +1,202 @@
+"""
+Resized photo variants (derivatives).
+
+Originals are MLS JPEGs of up to several MB. Serving them to a search
+results card or embedding them in a PDF wastes bandwidth, render time and
+file size, so every consumer asks for a size class instead:
+
+  thumb  320px  map popups, thumbnail strips
+  card   640px  search results, collections
+  hero  1600px  listing detail and gallery
+  pdf   1100px  WeasyPrint reports (~150 dpi across a letter page)
+
+Each size class is produced as JPEG and WebP. Variants are named by the
+original's content hash and kept in a sharded cache directory:
+
+  {PHOTOS_BASE}/_derived/ab/cd/abcd...{hash}_card.webp
+
+so a re-downloaded photo with new bytes gets new variants, and identical
+bytes under two names share them. The primary photo's common variants
+are generated at download time (manager.download_for_listing); anything
+else is generated on first request by get_derivative().
+
+Pillow is optional: without it (or if the derived directory isn't
+writable) callers get None and fall back to the original file.
+"""
+
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow ships with weasyprint
+    Image = None
+    ImageOps = None
+
+from apps.photos import manifest, storage
+from apps.photos.manifest import content_hash
+
+logger = logging.getLogger(__name__)
+
+# size class -> (longest edge in px, quality)
+SIZE_CLASSES = {
+    "thumb": (320, 70),
+    "card": (640, 75),
+    "hero": (1600, 82),
+    "pdf": (1100, 72),
+}
+
+# format -> (extension, mime type)
+FORMATS = {
+    "jpeg": (".jpg", "image/jpeg"),
+    "webp": (".webp", "image/webp"),
+}
+
+# Variants written alongside a freshly downloaded primary photo
+EAGER_SIZES = ("thumb", "card", "pdf")
+
+DERIVED_DIR = os.getenv("DREAMS_PHOTO_DERIVED_DIR")
+DERIVED_DIRNAME = "_derived"
+
+# (path, size, mtime) -> content hash, so a warm process doesn't re-read
+# originals just to find their variants
+_DIGEST_CACHE_SIZE = 50000
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def available() -> bool:
+    """True if Pillow is installed and variants can be produced."""
+    return Image is not None
+
+
+def derived_root() -> Path:
+    """Directory holding all variants."""
+    if DERIVED_DIR:
+        return Path(DERIVED_DIR)
+    return storage._get_base() / DERIVED_DIRNAME
+
+
+def derived_path(digest: str, size: str, fmt: str = "jpeg") -> Path:
+    """Cache path for one variant, sharded two levels deep by hash."""
+    ext = FORMATS[fmt][0]
+    return derived_root() / digest[:2] / digest[2:4] / f"{digest}_{size}{ext}"
+
+
+def mime_type(fmt: str) -> str:
+    return FORMATS[fmt][1]
+
+
+def render(data: bytes, size: str, fmt: str = "jpeg") -> Optional[bytes]:
+    """Resize image bytes to a size class. Never upscales.
+
+    Returns None if Pillow is missing or the image can't be decoded.
+    """
+    if Image is None:
+        return None
+    edge, quality = SIZE_CLASSES[size]
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            source_format = img.format
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            fits = max(img.size) <= edge
+            img.thumbnail((edge, edge), Image.LANCZOS)
+            out = io.BytesIO()
+            if fmt == "webp":
+                img.save(out, "WEBP", quality=quality, method=4)
+            else:
+                img.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    except Exception as e:
+        logger.warning(f"Could not render {size}/{fmt} variant: {e}")
+        return None
+    rendered = out.getvalue()
+    # A small original can come out larger after re-encoding
+    if fits and fmt == "jpeg" and source_format == "JPEG" and len(rendered) >= len(data):
+        return data
+    return rendered
+
+
+def generate(
+    data: bytes,
+    sizes: Iterable[str] = tuple(SIZE_CLASSES),
+    formats: Iterable[str] = tuple(FORMATS),
+    digest: Optional[str] = None,
+) -> Dict[Tuple[str, str], Path]:
+    """Write variants of `data` that don't exist yet.
+
+    Returns:
+        {(size, fmt): path} for every variant now on disk
+    """
+    paths = {}
+    if Image is None:
+        return paths
+    digest = digest or content_hash(data)
+    for size in sizes:
+        for fmt in formats:
+            path = derived_path(digest, size, fmt)
+            if not path.exists():
+                rendered = render(data, size, fmt)
+                if rendered is None:
+                    continue
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    storage.save_atomic(path.parent, path.name, rendered, record=False)
+                except OSError as e:
+                    logger.warning(f"Could not write variant {path.name}: {e}")
+                    continue
+            paths[(size, fmt)] = path
+    return paths
+
+
+def _digest_for(original: Path) -> Tuple[str, Optional[bytes]]:
+    """Content hash of a file, from the photo manifest or a per-process
+    cache when its size/mtime are unchanged.
+
+    Returns the bytes too when the file had to be read.
+    """
+    st = original.stat()
+    entry = manifest.for_directory(original.parent).entry(original.name)
+    if entry and entry.hash and (entry.size, entry.mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return entry.hash, None
+    key = (str(original), st.st_size, st.st_mtime_ns)
+    with _digest_lock:
+        digest = _digests.get(key)
+        if digest:
+            _digests.move_to_end(key)
+            return digest, None
+    data = original.read_bytes()
+    digest = content_hash(data)
+    with _digest_lock:
+        _digests[key] = digest
+        if len(_digests) > _DIGEST_CACHE_SIZE:
+            _digests.popitem(last=False)
+    return digest, data
+
+
+def get_derivative(original: Path, size: str, fmt: str = "jpeg") -> Optional[Path]:
+    """Path to a variant of an original photo, generating it if needed.
+
+    Returns None when the size/format is unknown, Pillow is missing or the
+    variant can't be produced; callers then use the original.
+    """
+    if Image is None or size not in SIZE_CLASSES or fmt not in FORMATS:
+        return None
+    try:
+        digest, data = _digest_for(original)
+        path = derived_path(digest, size, fmt)
+        if path.exists():
+            return path
+        if data is None:
+            data = original.read_bytes()
+        return generate(data, sizes=(size,), formats=(fmt,), digest=digest).get((size, fmt))
+    except OSError as e:
+        logger.warning(f"Variant lookup failed for {original}: {e}")
+        return None
+
@@ -21,13 +21,14 @@ import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import urlparse
 
 # Ensure project root is importable
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
-from apps.photos import storage, downloader
+from apps.photos import storage, downloader, derivatives
 from apps.photos.adapters.mlsgrid import MLSGridPhotoAdapter
 from apps.photos.adapters.navica import NavicaPhotoAdapter
 
@@ -119,7 +120,12 @@ def download_for_listing(
         # Download
         data = downloader.download_photo(url)
         if data:
-            storage.save_atomic(photos_dir, filename, data)
+            storage.save_atomic(photos_dir, filename, data,
+                                media_key=urlparse(url).path or None)
+            if i == 0:
+                # Search cards, map popups and PDFs all use the primary;
+                # have their variants ready before the first request.
+                derivatives.generate(data, sizes=derivatives.EAGER_SIZES)
             source_name = storage.SOURCE_DIRS.get(
                 (mls_source or "").lower().replace(" ", ""), "mlsgrid"
             )
@@ -176,9 +182,11 @@ def update_db_photo_paths(
     gallery_status is the source of truth.
 
     If `conn` is provided, runs on that connection and does NOT commit or
-    close — caller owns the transaction boundary. If None (default), opens
-    a new connection, commits, and closes it. Loop callers should pass
-    a shared conn to avoid N open/close cycles per N rows.
+    close — caller owns the transaction boundary; a failure rolls back to
+    a savepoint, so the caller's earlier writes and any held cursor
+    survive. If None (default), opens a new connection, commits, and
+    closes it. Loop callers should pass a shared conn to avoid N
+    open/close cycles per N rows.
     """
     if not result.local_urls:
         return
@@ -188,6 +196,8 @@ def update_db_photo_paths(
         if owns_conn:
             from src.core.pg_adapter import get_db
             conn = get_db()
+        else:
+            conn.execute("SAVEPOINT photo_paths")
         primary_local = (
             result.local_urls[0]
             if result.local_urls and result.local_urls[0].startswith("/api/")
@@ -232,6 +242,8 @@ def update_db_photo_paths(
         if owns_conn:
             conn.commit()
             conn.close()
+        else:
+            conn.execute("RELEASE SAVEPOINT photo_paths")
         try:
             from src.core.listing_service import invalidate_photo_dir_cache
             invalidate_photo_dir_cache(storage.get_source_dir(mls_source))
@@ -239,12 +251,19 @@ def update_db_photo_paths(
             pass
     except Exception as e:
         logger.warning(f"Failed to update photo paths for {mls_number}: {e}")
-        if conn is not None:
-            try: conn.rollback()
-            except Exception: pass
-        if owns_conn and conn is not None:
-            try: conn.close()
-            except Exception: pass
+        if owns_conn:
+            if conn is not None:
+                try: conn.rollback()
+                except Exception: pass
+                try: conn.close()
+                except Exception: pass
+        else:
+            try:
+                conn.execute("ROLLBACK TO SAVEPOINT photo_paths")
+                conn.execute("RELEASE SAVEPOINT photo_paths")
+            except Exception:
+                try: conn.rollback()
+                except Exception: pass
 
 
 def run_photo_fill(
@@ -264,7 +283,7 @@ def run_photo_fill(
 
     For Navica/MountainLakes: CDN URLs don't expire, so this always works.
     """
-    from src.core.pg_adapter import get_db
+    from src.core.pg_adapter import get_db, iter_rows
 
     report = HygieneReport()
 
@@ -276,25 +295,30 @@ def run_photo_fill(
         # Find listings whose gallery is not yet ready. gallery_status is
         # the spec's source of truth; photo_local_path is deprecated.
         # County filter (defense in depth — see src/core/regions.py).
+        # Rows are streamed through a server-side cursor held across the
+        # periodic commits (withhold), so the backlog is never loaded whole.
         from src.core.regions import WNC_COUNTIES
         counties_csv = ", ".join(f"'{c}'" for c in sorted(WNC_COUNTIES))
-        rows = conn.execute(
+        limit_clause = f" LIMIT {int(limit)}" if limit else ""
+        rows = iter_rows(
+            conn,
             f"SELECT mls_number, mls_source, primary_photo, photos "
             f"FROM listings "
             f"WHERE UPPER(status) = ? AND mls_source = ? "
             f"AND (gallery_status IS NULL OR gallery_status != 'ready') "
             f"AND county IN ({counties_csv}) "
-            f"ORDER BY list_date DESC",
+            f"ORDER BY list_date DESC{limit_clause}",
             [status.upper(), mls_source],
-        ).fetchall()
-
-        if limit:
-            rows = rows[:limit]
+            withhold=True,
+        )
+        # Commit the DECLARE before any per-row work: a rollback in the
+        # first batch would otherwise take the held cursor with it.
+        conn.commit()
 
-        logger.info(f"Photo fill: {len(rows)} {mls_source} listings need photos")
-        report.total_checked = len(rows)
+        logger.info(f"Photo fill: scanning {mls_source} listings that need photos")
 
         for i, row in enumerate(rows):
+            report.total_checked += 1
             mls_num = row[0] if isinstance(row, (list, tuple)) else row["mls_number"]
             source = row[1] if isinstance(row, (list, tuple)) else row["mls_source"]
 
@@ -372,7 +396,7 @@ def run_photo_fill(
                     except Exception: pass
 
             if (i + 1) % 100 == 0:
-                logger.info(f"  Photo fill progress: {i + 1}/{len(rows)} "
+                logger.info(f"  Photo fill progress: {i + 1} "
                              f"(downloaded={report.downloaded}, failed={report.failed})")
 
         # Final commit for any rows since the last 50-row boundary.
@@ -0,0 +1,420 @@
+"""
+Per-source photo manifest.
+
+Serving code used to find a listing's local photos by probing the disk:
+storage.gallery_urls stat()ed up to 99 indices x 4 extensions per
+listing, and listing_service scanned the whole source directory (tens of
+thousands of files) into a set every 60 seconds in every process. Each
+source directory now carries a manifest, `.manifest.jsonl`, listing every
+photo file with its size, mtime, content hash and source media key:
+
+  {"op":"put","f":"CAR4363555_01.jpg","s":412233,"t":1760...,"h":"9f2c...","k":"..."}
+  {"op":"del","f":"CAR4363555_07.jpg"}
+
+It is an append-only journal. storage.save_atomic appends a `put` after
+every rename, under a flock on `.manifest.lock`, so concurrent writers
+(cron, sync engines, backfill scripts) never interleave lines. Readers
+keep an in-memory {mls: {index: filename}} map per process and only read
+the bytes appended since their last look (at most every REFRESH_SECONDS),
+so resolving a listing's primary and gallery URLs is a dict lookup.
+
+`rebuild` compacts the journal from disk (reusing hashes for files whose
+size and mtime haven't changed) and swaps it in with a rename; readers
+notice the new inode and reload. Until a directory's manifest has been
+built once, writers leave it alone and readers fall back to disk probes.
+Once it exists it is authoritative: a listing with no entries has no
+photos, without touching the disk. Every writer goes through save_atomic
+and every delete through forget(); anything changed behind their back
+shows up in `verify` and is picked up by `rebuild`.
+
+Usage:
+    python3 -m apps.photos.manifest verify                 # all sources
+    python3 -m apps.photos.manifest verify --source navica --hash
+    python3 -m apps.photos.manifest rebuild --source mlsgrid
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".manifest.jsonl"
+LOCK_NAME = ".manifest.lock"
+REFRESH_SECONDS = 1.0
+
+# Extension preference when one position has several files on disk
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+_FILENAME_RE = re.compile(r"^(?P<mls>.+?)(?:_(?P<index>\d{2}))?(?P<ext>\.(?:jpg|jpeg|png|webp))$")
+
+
+class ManifestEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    hash: Optional[str]
+    media_key: Optional[str]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def parse_filename(filename: str):
+    """'CAR1_03.jpg' -> ('CAR1', 3); primary -> index 0; None if not a photo name."""
+    m = _FILENAME_RE.match(filename)
+    if not m:
+        return None
+    return m.group("mls"), int(m.group("index") or 0)
+
+
+def _ext_rank(filename: str) -> int:
+    return PHOTO_EXTENSIONS.index(os.path.splitext(filename)[1])
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+class PhotoManifest:
+    """In-memory view of one source directory's manifest journal."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._reset()
+        self._checked = 0.0
+
+    def _reset(self):
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._by_mls: Dict[str, Dict[int, List[str]]] = {}
+        self._inode = None
+        self._offset = 0
+
+    def _put(self, filename: str, entry: ManifestEntry):
+        parsed = parse_filename(filename)
+        if not parsed:
+            return
+        if filename not in self._entries:
+            mls, index = parsed
+            self._by_mls.setdefault(mls, {}).setdefault(index, []).append(filename)
+        self._entries[filename] = entry
+
+    def _delete(self, filename: str):
+        if self._entries.pop(filename, None) is None:
+            return
+        mls, index = parse_filename(filename)
+        slots = self._by_mls.get(mls, {})
+        names = slots.get(index, [])
+        if filename in names:
+            names.remove(filename)
+        if not names:
+            slots.pop(index, None)
+        if not slots:
+            self._by_mls.pop(mls, None)
+
+    def _apply(self, line: bytes):
+        try:
+            rec = json.loads(line)
+            if rec["op"] == "put":
+                self._put(rec["f"], ManifestEntry(rec["s"], rec["t"], rec.get("h"), rec.get("k")))
+            elif rec["op"] == "del":
+                self._delete(rec["f"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Skipping bad manifest line in {self.path}: {e}")
+
+    def refresh(self, force: bool = False) -> bool:
+        """Pick up lines appended since the last read. False if there's no manifest.
+
+        Call with self._lock held.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked < REFRESH_SECONDS:
+            return self._inode is not None
+        self._checked = now
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._reset()
+            return False
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                # First read, or rebuild swapped in a new file
+                self._reset()
+                self._inode = st.st_ino
+            if st.st_size > self._offset:
+                f.seek(self._offset)
+                chunk = f.read(st.st_size - self._offset)
+                end = chunk.rfind(b"\n") + 1     # a writer may be mid-line
+                for line in chunk[:end].splitlines():
+                    if line:
+                        self._apply(line)
+                self._offset += end
+        return True
+
+    def files(self, mls: str) -> Optional[Dict[int, str]]:
+        """{index: filename} for a listing (0 = primary), or None without a manifest."""
+        with self._lock:
+            if not self.refresh():
+                return None
+            slots = self._by_mls.get(mls) or {}
+            return {index: min(names, key=_ext_rank) for index, names in slots.items()}
+
+    def entry(self, filename: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            if not self.refresh():
+                return None
+            return self._entries.get(filename)
+
+    def snapshot(self) -> Optional[Dict[str, ManifestEntry]]:
+        """All entries, freshly read; None without a manifest."""
+        with self._lock:
+            if not self.refresh(force=True):
+                return None
+            return dict(self._entries)
+
+
+_manifests: Dict[str, PhotoManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def for_directory(directory: Path) -> PhotoManifest:
+    """Shared per-process PhotoManifest for a source directory."""
+    key = str(directory)
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is None:
+            manifest = _manifests[key] = PhotoManifest(directory)
+        return manifest
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+
+@contextmanager
+def _locked(directory: Path):
+    fd = os.open(directory / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def _line(op: str, filename: str, entry: Optional[ManifestEntry] = None) -> str:
+    rec = {"op": op, "f": filename}
+    if entry is not None:
+        rec.update(s=entry.size, t=entry.mtime_ns, h=entry.hash, k=entry.media_key)
+    return json.dumps(rec, separators=(",", ":")) + "\n"
+
+
+def _append(directory: Path, lines: Iterable[str]) -> bool:
+    payload = "".join(lines).encode()
+    path = directory / MANIFEST_NAME
+    with _locked(directory):
+        # Only extend a manifest that rebuild has created; a partial one
+        # would hide every photo written before it.
+        if not path.exists():
+            return False
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+    return True
+
+
+def record(directory: Path, filename: str, data: Optional[bytes] = None,
+           media_key: Optional[str] = None) -> bool:
+    """Note a photo file just written to `directory`. Called by storage.save_atomic.
+
+    Returns False if the name isn't a photo name or the directory has no
+    manifest yet.
+    """
+    directory = Path(directory)
+    if not parse_filename(filename) or not (directory / MANIFEST_NAME).exists():
+        return False
+    path = directory / filename
+    st = path.stat()
+    digest = content_hash(data) if data is not None else _hash_file(path)
+    return _append(directory, [_line("put", filename, ManifestEntry(st.st_size, st.st_mtime_ns, digest, media_key))])
+
+
+def forget(directory: Path, filenames: Iterable[str]) -> bool:
+    """Note photo files removed from `directory`."""
+    lines = [_line("del", name) for name in filenames if parse_filename(name)]
+    return bool(lines) and _append(Path(directory), lines)
+
+
+# =============================================================================
+# Verify / rebuild
+# =============================================================================
+
+@dataclass
+class VerifyReport:
+    directory: str
+    tracked: int = 0
+    on_disk: int = 0
+    missing: List[str] = field(default_factory=list)      # in manifest, not on disk
+    untracked: List[str] = field(default_factory=list)    # on disk, not in manifest
+    changed: List[str] = field(default_factory=list)      # size (or hash) differs
+    has_manifest: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return self.has_manifest and not (self.missing or self.untracked or self.changed)
+
+
+def _scan(directory: Path) -> Dict[str, os.stat_result]:
+    found = {}
+    with os.scandir(directory) as it:
+        for e in it:
+            if parse_filename(e.name) and e.is_file():
+                found[e.name] = e.stat()
+    return found
+
+
+def verify(directory: Path, check_hash: bool = False) -> VerifyReport:
+    """Compare a directory's manifest with what's on disk."""
+    directory = Path(directory)
+    report = VerifyReport(directory=str(directory))
+    entries = PhotoManifest(directory).snapshot()
+    disk = _scan(directory)
+    report.on_disk = len(disk)
+    if entries is None:
+        report.has_manifest = False
+        report.untracked = sorted(disk)
+        return report
+    report.tracked = len(entries)
+    report.missing = sorted(set(entries) - set(disk))
+    report.untracked = sorted(set(disk) - set(entries))
+    for name in sorted(set(entries) & set(disk)):
+        entry = entries[name]
+        if entry.size != disk[name].st_size:
+            report.changed.append(name)
+        elif check_hash and entry.hash != _hash_file(directory / name):
+            report.changed.append(name)
+    return report
+
+
+def _entry_for(directory: Path, name: str, st: os.stat_result,
+               prior: Optional[ManifestEntry], check_hash: bool) -> ManifestEntry:
+    """Entry for a file on disk, reusing prior's hash when size and mtime match."""
+    if (prior and prior.hash and not check_hash
+            and (prior.size, prior.mtime_ns) == (st.st_size, st.st_mtime_ns)):
+        return prior
+    return ManifestEntry(st.st_size, st.st_mtime_ns, _hash_file(directory / name),
+                         prior.media_key if prior else None)
+
+
+def rebuild(directory: Path, check_hash: bool = False) -> int:
+    """Rewrite a directory's manifest from disk. Returns the number of entries.
+
+    Hashes are carried over for files whose size and mtime match the old
+    manifest (all files are re-hashed with check_hash). The slow scan runs
+    unlocked; writes that land meanwhile are caught by a second, stat-only
+    pass under the lock, so the swap never drops a concurrent download.
+    """
+    directory = Path(directory)
+    old = PhotoManifest(directory)
+    with old._lock:
+        old.refresh(force=True)
+        previous = dict(old._entries)
+
+    entries = {}
+    for name, st in _scan(directory).items():
+        entries[name] = _entry_for(directory, name, st, previous.get(name), check_hash)
+
+    with _locked(directory):
+        # Catch files written, replaced or deleted during the scan; the
+        # journal has their hashes if they went through save_atomic.
+        with old._lock:
+            old.refresh(force=True)
+            journal = dict(old._entries)
+        current = {}
+        for name, st in _scan(directory).items():
+            entry = entries.get(name)
+            if entry is None or (entry.size, entry.mtime_ns) != (st.st_size, st.st_mtime_ns):
+                entry = _entry_for(directory, name, st, journal.get(name) or entry, False)
+            current[name] = entry
+        lines = [_line("put", name, current[name]) for name in sorted(current)]
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.writelines(lines)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, directory / MANIFEST_NAME)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+    return len(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from apps.photos import storage
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild per-source photo manifests")
+    parser.add_argument("command", choices=("verify", "rebuild"))
+    parser.add_argument("--source", type=str, default=None,
+                        help="Source directory (mlsgrid, navica); default all")
+    parser.add_argument("--hash", action="store_true",
+                        help="Re-hash every file instead of trusting size/mtime")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    sources = [args.source] if args.source else sorted(set(storage.SOURCE_DIRS.values()))
+    ok = True
+    for source in sources:
+        directory = storage.get_source_dir(source)
+        if args.command == "rebuild":
+            count = rebuild(directory, check_hash=args.hash)
+            logger.info(f"{source}: manifest rebuilt with {count} photos")
+            continue
+        report = verify(directory, check_hash=args.hash)
+        ok = ok and report.ok
+        if not report.has_manifest:
+            logger.warning(f"{source}: no manifest ({report.on_disk} photos on disk) — run rebuild")
+            continue
+        logger.info(f"{source}: {report.tracked} tracked, {report.on_disk} on disk, "
+                    f"{len(report.missing)} missing, {len(report.untracked)} untracked, "
+                    f"{len(report.changed)} changed")
+        for label, names in (("missing", report.missing), ("untracked", report.untracked),
+                             ("changed", report.changed)):
+            for name in names[:20]:
+                logger.info(f"  {label}: {name}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    _PROJECT_ROOT = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(_PROJECT_ROOT))
+    sys.exit(main())
@@ -7,13 +7,18 @@ URL generation. Today: local disk. Tomorrow: could wrap S3/Supabase Storage.
 Every photo lives at: {PHOTOS_BASE}/{source}/{mls_number}.{ext}
   Primary: CAR4363555.jpg
   Gallery: CAR4363555_01.jpg, CAR4363555_02.jpg, ...
+
+Each source directory's files are indexed in its manifest (manifest.py);
+existence checks and URL lookups read that instead of probing the disk.
 """
 
 import logging
 import os
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from apps.photos import manifest
 
 logger = logging.getLogger(__name__)
 
@@ -75,63 +80,88 @@ def primary_path(mls_source: str, mls_number: str) -> Path:
     return get_source_dir(mls_source) / primary_filename(mls_number)
 
 
-def primary_exists(mls_source: str, mls_number: str) -> bool:
-    """Check if primary photo exists on disk (any extension)."""
-    d = get_source_dir(mls_source)
-    for ext in (".jpg", ".jpeg", ".png", ".webp"):
-        if (d / f"{mls_number}{ext}").exists():
-            return True
-    return False
+def _source_name(mls_source: str) -> str:
+    key = (mls_source or "").lower().replace(" ", "")
+    return SOURCE_DIRS.get(key, key)
 
 
-def primary_url(mls_source: str, mls_number: str) -> Optional[str]:
-    """Return the serving URL if primary photo exists, else None."""
-    d = get_source_dir(mls_source)
-    key = (mls_source or "").lower().replace(" ", "")
-    source_name = SOURCE_DIRS.get(key, key)
+def _probe_files(d: Path, mls_number: str, primary_only: bool = False) -> Dict[int, str]:
+    """Disk probe for directories whose manifest hasn't been built yet."""
+    found = {}
     for ext in (".jpg", ".jpeg", ".png", ".webp"):
         if (d / f"{mls_number}{ext}").exists():
-            return f"/api/public/photos/{source_name}/{mls_number}{ext}"
-    return None
-
-
-def gallery_urls(mls_source: str, mls_number: str) -> List[str]:
-    """Scan disk for all gallery photos, return serving URLs."""
-    d = get_source_dir(mls_source)
-    key = (mls_source or "").lower().replace(" ", "")
-    source_name = SOURCE_DIRS.get(key, key)
-    urls = []
-
-    # Primary first
-    p_url = primary_url(mls_source, mls_number)
-    if p_url:
-        urls.append(p_url)
-
-    # Gallery files: _01, _02, ...
+            found[0] = f"{mls_number}{ext}"
+            break
+    if primary_only:
+        return found
+    # Gallery files: _01, _02, ... until 5 consecutive misses
     consecutive_misses = 0
     for i in range(1, 100):
-        found = False
         for ext in (".jpg", ".jpeg", ".png", ".webp"):
             fname = gallery_filename(mls_number, i, ext)
             if (d / fname).exists():
-                urls.append(f"/api/public/photos/{source_name}/{fname}")
-                found = True
+                found[i] = fname
+                consecutive_misses = 0
                 break
-        if not found:
+        else:
             consecutive_misses += 1
             if consecutive_misses >= 5:
                 break
-        else:
-            consecutive_misses = 0
+    return found
+
+
+def local_files(mls_source: str, mls_number: str, primary_only: bool = False) -> Dict[int, str]:
+    """{index: filename} of a listing's photos on disk (0 = primary).
+
+    Answered from the directory's manifest once it exists, so a listing
+    without photos costs a dict lookup rather than ~400 stat() calls;
+    directories without one are probed on disk.
+    """
+    d = get_source_dir(mls_source)
+    files = manifest.for_directory(d).files(mls_number)
+    if files is None:
+        files = _probe_files(d, mls_number, primary_only)
+    return files
+
+
+def primary_exists(mls_source: str, mls_number: str) -> bool:
+    """Check if primary photo exists on disk (any extension)."""
+    return 0 in local_files(mls_source, mls_number, primary_only=True)
 
-    return urls
+
+def primary_url(mls_source: str, mls_number: str) -> Optional[str]:
+    """Return the serving URL if primary photo exists, else None."""
+    fname = local_files(mls_source, mls_number, primary_only=True).get(0)
+    if fname:
+        return f"/api/public/photos/{_source_name(mls_source)}/{fname}"
+    return None
+
+
+def gallery_urls(mls_source: str, mls_number: str) -> List[str]:
+    """Serving URLs for all local photos, primary first."""
+    source_name = _source_name(mls_source)
+    files = local_files(mls_source, mls_number)
+    return [f"/api/public/photos/{source_name}/{files[i]}" for i in sorted(files)]
 
 
-def save_atomic(directory: Path, filename: str, data: bytes) -> Path:
+def save_atomic(directory: Path, filename: str, data: bytes,
+                media_key: Optional[str] = None, record: bool = True) -> Path:
     """Write photo bytes to disk atomically (temp file + rename).
 
     Prevents serving partial downloads. See docs/DECISIONS.md D2.
+    The write is then recorded in the directory's manifest (with
+    `media_key`, the MLS MediaKey or CDN path) unless record=False.
     """
+    filepath = _write_atomic(directory, filename, data)
+    if record:
+        try:
+            manifest.record(directory, filename, data, media_key=media_key)
+        except Exception as e:
+            logger.warning(f"Manifest update failed for {filename}: {e}")
+    return filepath
+
+
+def _write_atomic(directory: Path, filename: str, data: bytes) -> Path:
     filepath = directory / filename
     try:
         fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
@@ -43,6 +43,7 @@ except ImportError:
     )
 from services.notion_sync_service import NotionSyncService
 from services.idx_validation_service import IDXValidationService
+from services.event_ingest_service import EventIngestService
 
 # Load environment variables
 load_dotenv(PROJECT_ROOT / '.env')
@@ -128,6 +129,17 @@ def check_api_key():
 
     return None
 
+# Optional request-scoped connection affinity (DREAMS_PG_POOL_PIN=1): every
+# pg_adapter connection opened during a request shares one pooled connection.
+from src.core.pg_adapter import pin_thread_connection, pool_config, unpin_thread_connection
+
+if pool_config()['pin']:
+    app.before_request(pin_thread_connection)
+
+    @app.teardown_request
+    def _unpin_db_connection(exc=None):
+        unpin_thread_connection()
+
 # Register blueprints
 app.register_blueprint(health_bp)
 app.register_blueprint(properties_bp, url_prefix='/api/v1')
@@ -177,11 +189,13 @@ if _LIMITER_AVAILABLE:
 # Initialize services
 notion_sync_service = None
 idx_validation_service = None
+event_ingest_service = None
 
 def init_services():
     """Initialize background services."""
     global notion_sync_service
     global idx_validation_service
+    global event_ingest_service
 
     notion_api_key = os.getenv('NOTION_API_KEY')
     notion_db_id = os.getenv('NOTION_PROPERTIES_DB_ID')
@@ -206,6 +220,12 @@ def init_services():
     idx_validation_service.start_background_validation(interval_seconds=300)  # Every 5 minutes
     print(f"IDX validation service started (every 5 min)")
 
+    # Drain the public website event queue (POST /api/public/events)
+    from routes.public_writes import _get_fub
+    event_ingest_service = EventIngestService(db=db, fub=_get_fub())
+    event_ingest_service.start_background_ingest(interval_seconds=2)
+    print("Event ingest service started (every 2s)")
+
 
 @app.route('/')
 def index():
@@ -32,6 +32,7 @@ def db_health():
     Answers the question that silently went unanswered for days on PRD:
     "Are we actually reading/writing PostgreSQL?"
     """
+    from src.core.monitoring import pool_health
     from src.core.pg_adapter import active_backend, get_db
     backend = active_backend()
     out = {
@@ -52,9 +53,28 @@ def db_health():
             pass
     except Exception as e:
         out['error'] = type(e).__name__
+    if backend == 'postgres':
+        out['pool'] = pool_health()
     return jsonify(out)
 
 
+@health_bp.route('/health/db/pool')
+def db_pool_health():
+    """Connection-pool occupancy, checkout wait histogram and exhaustion counts."""
+    from src.core.monitoring import pool_health
+    from src.core.pg_adapter import active_backend, pool_config
+    if active_backend() != 'postgres':
+        return jsonify({'backend': 'sqlite', 'pool': None})
+    return jsonify({'backend': 'postgres', 'config': pool_config(), 'pool': pool_health()})
+
+
+@health_bp.route('/health/cache')
+def response_cache_health():
+    """Public API response cache and map index size, counters and sync generation."""
+    from routes.public import map_index_stats, response_cache_stats
+    return jsonify({**response_cache_stats(), 'map_index': map_index_stats()})
+
+
 @health_bp.route('/health/notion')
 def notion_health():
     """Check Notion connection status."""
@@ -4,8 +4,10 @@ Property CRUD endpoints.
 
 import os
 import sys
+import time
 import uuid
 import json
+import logging
 from pathlib import Path
 from datetime import datetime
 from flask import Blueprint, request, jsonify
@@ -18,6 +20,8 @@ from src.core.database import DREAMSDatabase
 
 properties_bp = Blueprint('properties', __name__)
 
+logger = logging.getLogger(__name__)
+
 
 def get_db():
     """Get database connection."""
@@ -42,6 +46,73 @@ def normalize_status(status: str) -> str:
     return status_map.get(status, status.title())
 
 
+def build_property_data(data: dict, property_id: str, existing_id, now: str) -> dict:
+    """Map an extension/import payload onto listings columns (None values included)."""
+    source = data.get('source')
+    return {
+        'id': property_id,
+        'mls_number': data.get('mls_number'),
+        'mls_source': data.get('mls_source'),
+        'parcel_id': data.get('parcel_id'),
+        'zillow_id': data.get('source_id') if source == 'zillow' else data.get('zillow_id'),
+        'realtor_id': data.get('source_id') if source == 'realtor' else data.get('realtor_id'),
+        'redfin_id': data.get('redfin_id'),
+        'address': data.get('address'),
+        'city': data.get('city'),
+        'state': data.get('state'),
+        'zip': data.get('zip'),
+        'county': data.get('county'),
+        'price': data.get('price'),
+        'beds': data.get('beds'),
+        'baths': data.get('baths'),
+        'sqft': data.get('sqft'),
+        'acreage': data.get('lot_acres') or data.get('acreage'),
+        'year_built': data.get('year_built'),
+        'property_type': data.get('property_type'),
+        'style': data.get('style'),
+        'status': normalize_status(data.get('status', 'Active')),
+        'days_on_market': data.get('days_on_market'),
+        'listing_agent_name': data.get('listing_agent_name'),
+        'listing_agent_phone': data.get('listing_agent_phone'),
+        'listing_agent_email': data.get('listing_agent_email'),
+        'listing_brokerage': data.get('listing_brokerage'),
+        'hoa_fee': data.get('hoa_fee'),
+        'tax_assessed_value': data.get('tax_assessed_value'),
+        'tax_annual_amount': data.get('tax_annual_amount'),
+        'zestimate': data.get('zestimate'),
+        'rent_zestimate': data.get('rent_zestimate'),
+        'page_views': data.get('page_views'),
+        'favorites_count': data.get('favorites_count'),
+        'heating': data.get('heating'),
+        'cooling': data.get('cooling'),
+        'garage': data.get('garage'),
+        'sewer': data.get('sewer'),
+        'roof': data.get('roof'),
+        'stories': data.get('stories'),
+        'subdivision': data.get('subdivision'),
+        'latitude': data.get('latitude'),
+        'longitude': data.get('longitude'),
+        'school_elementary_rating': data.get('school_elementary_rating'),
+        'school_middle_rating': data.get('school_middle_rating'),
+        'school_high_rating': data.get('school_high_rating'),
+        'zillow_url': data.get('url') if source == 'zillow' else data.get('zillow_url'),
+        'realtor_url': data.get('url') if source == 'realtor' else data.get('realtor_url'),
+        'redfin_url': data.get('url') if source == 'redfin' else data.get('redfin_url'),
+        'photo_urls': json.dumps(data.get('photo_urls')) if isinstance(data.get('photo_urls'), list) else data.get('photo_urls'),
+        'primary_photo': data.get('primary_photo'),
+        'virtual_tour_url': data.get('virtual_tour_url'),
+        'source': source,
+        'added_for': data.get('added_for'),
+        'added_by': data.get('added_by'),
+        'captured_by': data.get('added_by'),
+        'notes': data.get('notes'),
+        'sync_status': 'pending',
+        'idx_validation_status': 'pending' if not existing_id else None,
+        'created_at': now if not existing_id else None,
+        'updated_at': now
+    }
+
+
 @properties_bp.route('/properties', methods=['POST'])
 def create_property():
     """
@@ -121,69 +192,7 @@ def create_property():
         # Prepare property data
         property_id = existing_id or str(uuid.uuid4())
         now = datetime.now().isoformat()
-
-        property_data = {
-            'id': property_id,
-            'mls_number': data.get('mls_number'),
-            'mls_source': data.get('mls_source'),
-            'parcel_id': data.get('parcel_id'),
-            'zillow_id': data.get('source_id') if source == 'zillow' else data.get('zillow_id'),
-            'realtor_id': data.get('source_id') if source == 'realtor' else data.get('realtor_id'),
-            'redfin_id': data.get('redfin_id'),
-            'address': data.get('address'),
-            'city': data.get('city'),
-            'state': data.get('state'),
-            'zip': data.get('zip'),
-            'county': data.get('county'),
-            'price': data.get('price'),
-            'beds': data.get('beds'),
-            'baths': data.get('baths'),
-            'sqft': data.get('sqft'),
-            'acreage': data.get('lot_acres') or data.get('acreage'),
-            'year_built': data.get('year_built'),
-            'property_type': data.get('property_type'),
-            'style': data.get('style'),
-            'status': normalize_status(data.get('status', 'Active')),
-            'days_on_market': data.get('days_on_market'),
-            'listing_agent_name': data.get('listing_agent_name'),
-            'listing_agent_phone': data.get('listing_agent_phone'),
-            'listing_agent_email': data.get('listing_agent_email'),
-            'listing_brokerage': data.get('listing_brokerage'),
-            'hoa_fee': data.get('hoa_fee'),
-            'tax_assessed_value': data.get('tax_assessed_value'),
-            'tax_annual_amount': data.get('tax_annual_amount'),
-            'zestimate': data.get('zestimate'),
-            'rent_zestimate': data.get('rent_zestimate'),
-            'page_views': data.get('page_views'),
-            'favorites_count': data.get('favorites_count'),
-            'heating': data.get('heating'),
-            'cooling': data.get('cooling'),
-            'garage': data.get('garage'),
-            'sewer': data.get('sewer'),
-            'roof': data.get('roof'),
-            'stories': data.get('stories'),
-            'subdivision': data.get('subdivision'),
-            'latitude': data.get('latitude'),
-            'longitude': data.get('longitude'),
-            'school_elementary_rating': data.get('school_elementary_rating'),
-            'school_middle_rating': data.get('school_middle_rating'),
-            'school_high_rating': data.get('school_high_rating'),
-            'zillow_url': data.get('url') if source == 'zillow' else data.get('zillow_url'),
-            'realtor_url': data.get('url') if source == 'realtor' else data.get('realtor_url'),
-            'redfin_url': data.get('url') if source == 'redfin' else data.get('redfin_url'),
-            'photo_urls': json.dumps(data.get('photo_urls')) if isinstance(data.get('photo_urls'), list) else data.get('photo_urls'),
-            'primary_photo': data.get('primary_photo'),
-            'virtual_tour_url': data.get('virtual_tour_url'),
-            'source': source,
-            'added_for': data.get('added_for'),
-            'added_by': data.get('added_by'),
-            'captured_by': data.get('added_by'),
-            'notes': data.get('notes'),
-            'sync_status': 'pending',
-            'idx_validation_status': 'pending' if not existing_id else None,
-            'created_at': now if not existing_id else None,
-            'updated_at': now
-        }
+        property_data = build_property_data(data, property_id, existing_id, now)
 
         # Remove None values for cleaner insert
         property_data = {k: v for k, v in property_data.items() if v is not None}
@@ -214,42 +223,219 @@ def create_property():
         }), 500
 
 
+# Larger imports should be split client-side; one pass over 10k items is a few seconds
+MAX_BATCH_SIZE = 10000
+# Items per prefetch query (each key type adds up to this many parameters)
+PREFETCH_CHUNK = 1000
+
+
+def _match_keys(data: dict) -> list:
+    """(kind, value) keys to look a payload up by, in create_property's priority order."""
+    keys = []
+    if data.get('source') == 'zillow' and data.get('source_id'):
+        keys.append(('zillow_id', str(data['source_id'])))
+    if data.get('redfin_id'):
+        keys.append(('redfin_id', str(data['redfin_id'])))
+    if data.get('mls_number'):
+        keys.append(('mls_number', str(data['mls_number'])))
+    address = str(data['address']).lower()
+    if data.get('city'):
+        keys.append(('address_city', (address, str(data['city']).lower())))
+    else:
+        keys.append(('address', address))
+    return keys
+
+
+def _row_keys(row: dict) -> list:
+    """(kind, value) keys a written listings row will match on, as _prefetch_listings indexes it."""
+    keys = [(kind, str(row[kind])) for kind in ('zillow_id', 'redfin_id', 'mls_number')
+            if row.get(kind) is not None]
+    if row.get('address') is not None:
+        address = str(row['address']).lower()
+        keys.append(('address', address))
+        if row.get('city') is not None:
+            keys.append(('address_city', (address, str(row['city']).lower())))
+    return keys
+
+
+def _prefetch_listings(conn, items: list) -> dict:
+    """
+    Existing listing ids for every match key in the batch.
+
+    One query per PREFETCH_CHUNK items, OR-ing an IN list per key type,
+    instead of up to four lookups per item.
+    """
+    index = {'zillow_id': {}, 'redfin_id': {}, 'mls_number': {}, 'address_city': {}, 'address': {}}
+    for start in range(0, len(items), PREFETCH_CHUNK):
+        wanted = {'zillow_id': set(), 'redfin_id': set(), 'mls_number': set(), 'address': set()}
+        for _, keys in items[start:start + PREFETCH_CHUNK]:
+            for kind, value in keys:
+                if kind in ('address', 'address_city'):
+                    wanted['address'].add(value if kind == 'address' else value[0])
+                else:
+                    wanted[kind].add(value)
+
+        clauses, params = [], []
+        for kind, values in wanted.items():
+            if values:
+                column = 'LOWER(address)' if kind == 'address' else kind
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(sorted(values))
+
+        rows = conn.execute(
+            f"SELECT id, zillow_id, redfin_id, mls_number, LOWER(address) AS address_key, "
+            f"LOWER(city) AS city_key FROM listings WHERE {' OR '.join(clauses)}",
+            params
+        ).fetchall()
+        for row in rows:
+            for kind in ('zillow_id', 'redfin_id', 'mls_number'):
+                if row[kind] is not None:
+                    index[kind].setdefault(str(row[kind]), row['id'])
+            if row['address_key'] is not None:
+                index['address'].setdefault(row['address_key'], row['id'])
+                if row['city_key'] is not None:
+                    index['address_city'].setdefault((row['address_key'], row['city_key']), row['id'])
+    return index
+
+
+def _write_properties(conn, rows: list, valid_columns: set) -> list:
+    """
+    Upsert listings rows in one transaction; returns an error (or None) per row.
+
+    Rows are grouped by column set and written with executemany under one
+    savepoint. If that fails, the batch is replayed row by row, each in its
+    own savepoint, so one bad row only fails itself.
+    """
+    def upsert(group_rows):
+        groups = {}
+        for row in group_rows:
+            data = {k: v for k, v in row.items() if k in valid_columns}
+            groups.setdefault(tuple(data), []).append(list(data.values()))
+        for columns, values in groups.items():
+            update_clause = ', '.join(f"{c} = excluded.{c}" for c in columns if c != 'id')
+            conn.executemany(f'''
+                INSERT INTO listings ({', '.join(columns)})
+                VALUES ({', '.join('?' for _ in columns)})
+                ON CONFLICT(id) DO UPDATE SET {update_clause}
+            ''', values)
+
+    try:
+        conn.execute("SAVEPOINT properties_batch")
+        upsert(rows)
+        conn.execute("RELEASE SAVEPOINT properties_batch")
+        return [None] * len(rows)
+    except Exception as e:
+        logger.warning(f"Batch write of {len(rows)} properties failed ({e}); retrying row by row")
+        conn.execute("ROLLBACK TO SAVEPOINT properties_batch")
+        conn.execute("RELEASE SAVEPOINT properties_batch")
+
+    errors = []
+    for row in rows:
+        try:
+            conn.execute("SAVEPOINT properties_row")
+            upsert([row])
+            conn.execute("RELEASE SAVEPOINT properties_row")
+            errors.append(None)
+        except Exception as e:
+            conn.execute("ROLLBACK TO SAVEPOINT properties_row")
+            conn.execute("RELEASE SAVEPOINT properties_row")
+            errors.append(str(e))
+    return errors
+
+
 @properties_bp.route('/properties/batch', methods=['POST'])
 def batch_create_properties():
     """
     Create or update multiple properties.
 
-    Expects JSON body with 'properties' array.
+    Expects JSON body with 'properties' array (up to MAX_BATCH_SIZE items).
+    Each item is matched and mapped exactly as POST /properties does, but
+    existing listings are resolved with a few set-based queries and every
+    write goes through one transaction.
+
+    Returns per-item results in payload order:
+        {index, id, created} on success, {index, error} on failure
+    plus created/updated/failed counts and timing_ms per phase.
     """
-    data = request.get_json()
+    started = time.perf_counter()
+    data = request.get_json(silent=True)
 
-    if not data or 'properties' not in data:
+    if not isinstance(data, dict) or not isinstance(data.get('properties'), list):
         return jsonify({
             'success': False,
             'error': {'code': 'INVALID_JSON', 'message': 'Expected {properties: [...]}'}
         }), 400
 
     properties = data['properties']
-    results = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    if len(properties) > MAX_BATCH_SIZE:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'BATCH_TOO_LARGE',
+                'message': f'At most {MAX_BATCH_SIZE} properties per batch (got {len(properties)})'
+            }
+        }), 413
 
+    results = [None] * len(properties)
+    valid = []
     for i, prop in enumerate(properties):
-        try:
-            # Reuse single property logic
-            with properties_bp.test_request_context(
-                '/properties',
-                method='POST',
-                json=prop
-            ):
-                # This is a simplified approach - in production, extract the logic
-                pass
-            results['created'] += 1
-        except Exception as e:
-            results['failed'] += 1
-            results['errors'].append({'index': i, 'error': 'Failed to process property'})
+        if not isinstance(prop, dict):
+            results[i] = {'index': i, 'error': 'Property must be an object'}
+        elif not prop.get('address'):
+            results[i] = {'index': i, 'error': 'Missing required fields: address'}
+        else:
+            valid.append((i, _match_keys(prop)))
+    timing = {'validate': time.perf_counter() - started}
+
+    try:
+        db = get_db()
+        with db._get_connection() as conn:
+            phase = time.perf_counter()
+            index = _prefetch_listings(conn, valid) if valid else {}
+            now = datetime.now().isoformat()
+            rows = []
+            for i, keys in valid:
+                existing_id = next((index[kind][value] for kind, value in keys if value in index[kind]), None)
+                property_id = existing_id or str(uuid.uuid4())
+                row = build_property_data(properties[i], property_id, existing_id, now)
+                # Later items in the same batch match the listings written by
+                # earlier ones on every key the row is stored under, not just
+                # the keys this payload was looked up by.
+                for kind, value in keys + _row_keys(row):
+                    index[kind].setdefault(value, property_id)
+                rows.append({k: v for k, v in row.items() if v is not None})
+                results[i] = {'index': i, 'id': property_id, 'created': existing_id is None}
+            timing['resolve'] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            errors = _write_properties(conn, rows, db._get_listings_columns(conn)) if rows else []
+            conn.commit()
+            timing['write'] = time.perf_counter() - phase
+    except Exception as e:
+        logger.error(f"Batch property import failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': 'An internal error occurred'}
+        }), 500
+
+    for (i, _), error in zip(valid, errors):
+        if error:
+            results[i] = {'index': i, 'error': 'Failed to save property'}
+
+    failed = [r for r in results if 'error' in r]
+    created = sum(1 for r in results if r.get('created') is True)
+    timing['total'] = time.perf_counter() - started
 
     return jsonify({
-        'success': results['failed'] == 0,
-        'data': results
+        'success': not failed,
+        'data': {
+            'created': created,
+            'updated': len(results) - len(failed) - created,
+            'failed': len(failed),
+            'errors': failed,
+            'results': results,
+            'timing_ms': {phase: round(seconds * 1000, 1) for phase, seconds in timing.items()},
+        }
     })
 
 
@@ -8,6 +8,7 @@ the public-facing property search. They expose only IDX-compliant fields
 Endpoints:
     GET /public/listings          - Search/filter listings with pagination
     GET /public/listings/map      - Lightweight marker data for map view
+    GET /public/listings/map/clusters - Clustered, columnar markers by bbox/zoom
     GET /public/listings/:id      - Single listing detail (photos served locally)
     GET /public/areas             - Distinct cities/counties with listing counts
     GET /public/stats             - Aggregate stats (total listings, price ranges)
@@ -20,9 +21,10 @@ import sqlite3
 import sys
 import threading
 from datetime import datetime
+from functools import wraps
 from pathlib import Path
 from urllib.parse import urlparse
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, Response, request, jsonify, send_file, send_from_directory
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -30,7 +32,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from src.core.listing_service import (
     ListingService, ListingFilters,
     MLS_DISPLAY_NAMES, PHOTOS_DIRS,
-    localize_photo, compute_dom, row_to_dict,
+    localize_photo, compute_dom, row_to_dict, decode_cursor,
+)
+from src.core.map_index import MapIndex
+from src.core.response_cache import (
+    CachedResponse, ResponseCache, current_sync_generation,
 )
 
 logger = logging.getLogger(__name__)
@@ -104,6 +110,64 @@ def _get_public_filters() -> ListingFilters:
     return ListingFilters.from_request(request.args, defaults=PUBLIC_FILTER_DEFAULTS)
 
 
+# ---------------------------------------------------------------------------
+# Response cache (search, map, stats, areas)
+# ---------------------------------------------------------------------------
+#
+# These endpoints only change when a sync run commits. Successful JSON
+# responses are kept per (path, normalized args) until the sync generation
+# moves; see src/core/response_cache.py. DREAMS_RESPONSE_CACHE=0 disables.
+
+_response_cache = ResponseCache()
+
+
+def _response_cache_key() -> tuple:
+    args = tuple(sorted(
+        (k, v) for k, values in request.args.lists() for v in values if v != ''
+    ))
+    return (request.path, args)
+
+
+def _cached_public(view):
+    """Serve a GET view from _response_cache, honoring If-None-Match."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if os.getenv('DREAMS_RESPONSE_CACHE', '1') == '0':
+            return view(*args, **kwargs)
+
+        key = _response_cache_key()
+        generation = current_sync_generation()
+        entry = _response_cache.get(key, generation)
+        cache_status = 'HIT'
+
+        if entry is None:
+            cache_status = 'MISS'
+            rv = view(*args, **kwargs)
+            response = rv if isinstance(rv, Response) else None
+            if response is None or response.status_code != 200 or response.direct_passthrough:
+                return rv
+            entry = CachedResponse(
+                generation, response.get_data(), response.status_code, response.mimetype
+            )
+            _response_cache.put(key, entry)
+
+        if request.if_none_match.contains_weak(entry.etag.strip('"')):
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+        response.headers['ETag'] = entry.etag
+        # Clients may keep the body but must revalidate; a 304 is cheap.
+        response.headers['Cache-Control'] = 'public, no-cache'
+        response.headers['X-Cache'] = cache_status
+        return response
+    return wrapper
+
+
+def response_cache_stats() -> dict:
+    """Hit/miss/eviction counters for /health/cache."""
+    return {**_response_cache.stats(), 'generation': current_sync_generation()}
+
+
 # ---------------------------------------------------------------------------
 # Gallery priority trigger (replaces prior synchronous CDN fallback)
 # ---------------------------------------------------------------------------
@@ -169,6 +233,7 @@ def _suppress_address(listing: dict) -> None:
 # ---------------------------------------------------------------------------
 
 @public_bp.route('/listings', methods=['GET'])
+@_cached_public
 def search_listings():
     """
     Search and filter listings with pagination.
@@ -190,6 +255,10 @@ def search_listings():
         order       - Sort direction: asc or desc (default: desc)
         page        - Page number (default: 1)
         limit       - Results per page (default: 24, max: 100)
+        cursor      - pagination.next_cursor from the previous response.
+                      Pages by keyset instead of page number, so deep pages
+                      cost the same as the first. Sort/order are carried
+                      in the cursor; page is ignored.
     """
     try:
         filters = _get_public_filters()
@@ -197,14 +266,24 @@ def search_listings():
         sort_dir = request.args.get('order', 'desc')
         page = max(1, request.args.get('page', 1, type=int))
         limit = min(100, max(1, request.args.get('limit', 24, type=int)))
+        cursor = request.args.get('cursor') or None
 
         # Query with idx_address_display for suppression check
         query_fields = PUBLIC_LIST_FIELDS + ['idx_address_display']
 
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'error': {'code': 'INVALID_CURSOR', 'message': 'Invalid pagination cursor'}
+                }), 400
+
         result = _service.search_listings(
             filters, fields=query_fields,
             sort=sort_col, order=sort_dir,
-            page=page, limit=limit,
+            page=page, limit=limit, cursor=cursor,
         )
 
         # Public-specific post-processing
@@ -219,6 +298,7 @@ def search_listings():
                 'limit': result.limit,
                 'total': result.total,
                 'pages': result.pages,
+                'next_cursor': result.next_cursor,
             },
         })
 
@@ -230,6 +310,7 @@ def search_listings():
 
 
 @public_bp.route('/listings/map', methods=['GET'])
+@_cached_public
 def map_listings():
     """
     Lightweight marker data for the map search view.
@@ -265,6 +346,60 @@ def map_listings():
         }), 500
 
 
+_map_index = MapIndex(_service)
+
+
+def map_index_stats() -> dict:
+    """Point/cell counts and freshness of the map index for /health/cache."""
+    return _map_index.stats()
+
+
+def _parse_bbox(raw: str):
+    """'west,south,east,north' -> tuple of floats, or None if absent."""
+    if not raw:
+        return None
+    west, south, east, north = (float(v) for v in raw.split(','))
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError('bbox out of range')
+    return west, south, east, north
+
+
+@public_bp.route('/listings/map/clusters', methods=['GET'])
+def map_clusters():
+    """
+    Pre-clustered map markers for a viewport, from the in-memory map index.
+
+    Query parameters (plus all /listings filters):
+        bbox  - west,south,east,north in degrees (default: everything)
+        zoom  - map zoom level 0-22 (default: 10); below the cluster
+                cutoff nearby markers are merged into clusters
+
+    No 2,000-marker cap. Clusters and points come back columnar — one
+    array per field, index i across arrays is one marker:
+        {"clusters": {"lat": [], "lng": [], "count": [], "min_price": [], "max_price": []},
+         "points": {"id": [], "lat": [], "lng": [], "list_price": [], ...}}
+    """
+    try:
+        try:
+            bbox = _parse_bbox(request.args.get('bbox', ''))
+            zoom = min(22, max(0, int(request.args.get('zoom', 10))))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'INVALID_VIEWPORT', 'message': 'bbox must be west,south,east,north; zoom an integer'}
+            }), 400
+
+        result = _map_index.query(_get_public_filters(), bbox, zoom)
+        return jsonify({'success': True, **result})
+
+    except Exception as e:
+        logger.error(f"Map cluster query failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': 'Failed to retrieve map clusters'}
+        }), 500
+
+
 @public_bp.route('/listings/<listing_id>', methods=['GET'])
 def get_listing(listing_id):
     """
@@ -502,7 +637,7 @@ def get_shared_collection(share_token):
             for row in rows:
                 d = dict(row)
                 d['days_on_market'] = compute_dom(d)
-                localize_photo(d)
+                localize_photo(d, primary_size='card')
                 listings.append(d)
 
             conn.execute(
@@ -532,6 +667,7 @@ def get_shared_collection(share_token):
 
 
 @public_bp.route('/areas', methods=['GET'])
+@_cached_public
 def list_areas():
     """
     Get distinct cities and counties with listing counts.
@@ -572,12 +708,9 @@ def list_areas():
         # Match the public grid's filter + dedup so area counts don't
         # promise more listings than the user will actually see after
         # clicking through (PHOTO_PIPELINE_SPEC invariant #4 + the
-        # cross-MLS dedup rule from listing_service.DEDUP_CONDITION).
-        from src.core.listing_service import DEDUP_CONDITION
-        dedup_cond = DEDUP_CONDITION.replace(
-            "AND dup.id != listings.id",
-            "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-        )
+        # cross-MLS dedup rule from listing_service.dedup_condition).
+        from src.core.listing_service import dedup_condition
+        dedup_cond = dedup_condition(idx_only=True)
 
         query = (
             f"SELECT {area_type} as name, COUNT(*) as listing_count, "
@@ -620,6 +753,7 @@ def list_areas():
 
 
 @public_bp.route('/filtered-stats', methods=['GET'])
+@_cached_public
 def filtered_stats():
     """
     Get stats for the current search filters.
@@ -641,15 +775,8 @@ def filtered_stats():
         # dedup=True). Without this, filtered-stats over-counts Canopy
         # duplicates of Navica/MountainLakes originals. Observed gap on
         # 2026-04-24: stats=274 vs grid=230 for Franklin (44 duplicates).
-        from src.core.listing_service import DEDUP_CONDITION
-        if filters.require_idx:
-            dedup_cond = DEDUP_CONDITION.replace(
-                "AND dup.id != listings.id",
-                "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-            )
-        else:
-            dedup_cond = DEDUP_CONDITION
-        conditions.append(dedup_cond)
+        from src.core.listing_service import dedup_condition
+        conditions.append(dedup_condition(filters.require_idx))
         where = " AND ".join(conditions) if conditions else "1=1"
 
         conn = _service._get_connection()
@@ -725,6 +852,7 @@ def filtered_stats():
 
 
 @public_bp.route('/stats', methods=['GET'])
+@_cached_public
 def listing_stats():
     """
     Get aggregate listing statistics.
@@ -756,11 +884,8 @@ def listing_stats():
         # what a user sees when they actually browse. Raw COUNT(*) here
         # used to inflate "active_listings" by both invisible-on-grid
         # rows AND cross-MLS duplicates.
-        from src.core.listing_service import DEDUP_CONDITION
-        dedup_cond = DEDUP_CONDITION.replace(
-            "AND dup.id != listings.id",
-            "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-        )
+        from src.core.listing_service import dedup_condition
+        dedup_cond = dedup_condition(idx_only=True)
         # gallery_status='ready' is status-agnostic — applies to both
         # ACTIVE and PENDING listings. But the CASE-branched fields
         # (active_listings, min_price, etc.) are scoped to ACTIVE, so
@@ -935,11 +1060,8 @@ def autocomplete():
         # status='ACTIVE', zone='1,2', idx_opt_in=1, gallery_status='ready')
         # plus the cross-MLS dedup. Note the old code used zone IN (1,2,3);
         # that's now canonical (1,2) matching the rest of the public API.
-        from src.core.listing_service import DEDUP_CONDITION
-        dedup_cond = DEDUP_CONDITION.replace(
-            "AND dup.id != listings.id",
-            "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-        )
+        from src.core.listing_service import dedup_condition
+        dedup_cond = dedup_condition(idx_only=True)
         _PUBLIC_BASE = (
             "idx_opt_in = 1 AND (gallery_status = 'ready' OR (primary_photo IS NOT NULL AND primary_photo != '' AND SUBSTR(primary_photo, 1, 19) = '/api/public/photos/')) "
             "AND status = 'ACTIVE' AND zone IN (1,2) "
@@ -1177,7 +1299,7 @@ def get_featured_collection(slug):
             for row in rows:
                 d = dict(row)
                 d['days_on_market'] = compute_dom(d)
-                localize_photo(d)
+                localize_photo(d, primary_size='card')
                 listings.append(d)
 
             conn.execute(
@@ -1220,8 +1342,11 @@ def serve_photo(source, filename):
     """
     Serve locally-downloaded MLS photos.
 
-    URL pattern: /api/public/photos/{source}/{mls_number}.jpg
+    URL pattern: /api/public/photos/{source}/{mls_number}.jpg[?size=card]
     Sources: mlsgrid (Canopy), navica (Carolina Smokies / Mountain Lakes)
+
+    With ?size= (thumb, card, hero, pdf) a resized variant is served, as
+    WebP when the client accepts it; the original is the fallback.
     """
     photos_dir = PHOTOS_DIRS.get(source)
     if not photos_dir or not photos_dir.is_dir():
@@ -1235,7 +1360,25 @@ def serve_photo(source, filename):
     if not filepath.exists():
         return jsonify({'error': 'Not found'}), 404
 
+    size = request.args.get('size')
+    if size:
+        from apps.photos import derivatives
+        fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+        variant = derivatives.get_derivative(filepath, size, fmt)
+        if variant:
+            response = send_file(str(variant), mimetype=derivatives.mime_type(fmt))
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+            response.headers['Vary'] = 'Accept'
+            return response
+
     response = send_from_directory(str(photos_dir), safe_name)
+    if size:
+        # Variant couldn't be built (unknown size, Pillow missing, bad
+        # image); keep the original briefly so the sized URL recovers
+        # once a variant can be made.
+        response.headers['Cache-Control'] = 'public, max-age=300'
+        response.headers['Vary'] = 'Accept'
+        return response
     # Photos are immutable once downloaded; cache aggressively
     response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
     return response
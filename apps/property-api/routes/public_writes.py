@@ -6,7 +6,8 @@ distinction is that everything here accepts user-submitted data and writes
 to the database. These endpoints are:
 
   - POST /api/public/contacts  — contact form / request-info / save-listing
-  - POST /api/public/events    — (Phase C) behavioral event ingestion
+  - POST /api/public/events    — (Phase C) behavioral event ingestion,
+                                  queued and drained by a background worker
 
 Design rules:
   1. Zero authentication. Anyone on the internet can hit these. That means
@@ -40,6 +41,7 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 from apps.integrations.fub import FUBAdapter  # noqa: E402
+from src.core import event_ingest  # noqa: E402
 from src.core.database import DREAMSDatabase  # noqa: E402
 
 logger = logging.getLogger("dreams.public_writes")
@@ -441,61 +443,12 @@ def _lookup_listing_for_fub(listing_id: str) -> Optional[Dict[str, Any]]:
     try:
         db = _get_db()
         with db._get_connection() as conn:
-            # Try matching by id OR by mls_number since the frontend may pass either.
-            row = conn.execute(
-                """
-                SELECT address, city, state, zip, mls_number,
-                       list_price, beds, baths, sqft, acreage, property_type
-                FROM listings
-                WHERE id = ? OR mls_number = ?
-                LIMIT 1
-                """,
-                (listing_id, listing_id),
-            ).fetchone()
-        if not row:
-            return None
-        (street, city, state, zipc, mls, price, beds, baths, area, lot, ptype) = row
+            # The frontend may pass either an id or an mls_number.
+            return event_ingest.listing_properties(conn, [listing_id]).get(str(listing_id))
     except Exception as e:
         logger.warning("listing lookup failed for %s: %s", listing_id, e)
         return None
 
-    property_obj: Dict[str, Any] = {}
-    if street:
-        property_obj["street"] = street
-    if city:
-        property_obj["city"] = city
-    if state:
-        property_obj["state"] = state
-    if zipc is not None:
-        property_obj["code"] = str(zipc)
-    if mls:
-        property_obj["mlsNumber"] = mls
-    if price:
-        property_obj["price"] = float(price)
-    if beds is not None:
-        try:
-            property_obj["bedrooms"] = int(beds)
-        except (TypeError, ValueError):
-            pass
-    if baths is not None:
-        try:
-            property_obj["bathrooms"] = float(baths)
-        except (TypeError, ValueError):
-            pass
-    if area is not None:
-        try:
-            property_obj["area"] = int(area)
-        except (TypeError, ValueError):
-            pass
-    if lot is not None:
-        try:
-            property_obj["lot"] = float(lot)
-        except (TypeError, ValueError):
-            pass
-    if ptype:
-        property_obj["type"] = ptype
-    return property_obj or None
-
 
 # ---------------------------------------------------------------------------
 # Event tracking endpoint (Phase C — "be our own Real Geeks")
@@ -513,14 +466,21 @@ _VALID_CLIENT_EVENTS = {
 }
 
 
+_MAX_PAGE_FIELD_LEN = 2000
+
+# Set once this process has made sure the queue table exists.
+_event_queue_ready = False
+
+
 @public_writes_bp.route("/events", methods=["POST"])
 def track_public_event():
     """
     Ingest a behavioral event from the public website.
 
     This is the Real Geeks replacement. The public site fires events for
-    property views, saves, searches, and page visits. We store locally
-    AND forward to FUB's /v1/events endpoint.
+    property views, saves, searches, and page visits. The request only
+    queues the event; the property-api ingest worker stores it locally and
+    forwards it to FUB's /v1/events endpoint (see src/core/event_ingest).
 
     Request body:
         {
@@ -532,9 +492,10 @@ def track_public_event():
         }
 
     Response:
-        200: {ok: true}
+        202: {ok: true, fub: "queued"}
         400: {ok: false, error: "..."}
     """
+    global _event_queue_ready
     data = request.get_json(silent=True) or {}
 
     event_key = (data.get("event") or "").strip().lower()
@@ -554,65 +515,29 @@ def track_public_event():
 
     fub_event_type = _VALID_CLIENT_EVENTS[event_key]
 
-    # Look up property data if listing_id provided
-    property_obj = None
-    property_address = None
-    property_price = None
-    property_mls = None
-    if listing_id:
-        property_obj = _lookup_listing_for_fub(listing_id)
-        if property_obj:
-            property_address = property_obj.get("street")
-            property_price = property_obj.get("price")
-            property_mls = property_obj.get("mlsNumber")
-
-    # Match email to existing contact
-    contact_id = None
-    try:
-        db = _get_db()
-        with db._get_connection() as conn:
-            row = conn.execute(
-                "SELECT id FROM leads WHERE LOWER(email) = ? LIMIT 1", (email,)
-            ).fetchone()
-            if row:
-                contact_id = row[0]
-    except Exception:
-        pass
-
-    # Store locally in contact_events
-    now = datetime.now().isoformat()
-    event_id = f"web_{uuid.uuid4().hex[:12]}"
-
     try:
         db = _get_db()
         with db._get_connection() as conn:
-            conn.execute(
-                """INSERT INTO contact_events
-                   (id, contact_id, event_type, occurred_at,
-                    property_address, property_price, property_mls, imported_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (event_id, contact_id, fub_event_type, now,
-                 property_address, property_price, property_mls, now),
+            if not _event_queue_ready:
+                event_ingest.ensure_tables(conn)
+            event_ingest.enqueue(
+                conn,
+                fub_event_type,
+                email,
+                listing_id=str(listing_id)[:_MAX_PAGE_FIELD_LEN] if listing_id else None,
+                page_url=str(page_url)[:_MAX_PAGE_FIELD_LEN] if page_url else None,
+                page_title=str(page_title)[:_MAX_PAGE_FIELD_LEN] if page_title else None,
             )
             conn.commit()
+        _event_queue_ready = True
     except Exception as e:
-        logger.warning("Event store failed: %s", e)
+        logger.warning("Event enqueue failed: %s", e)
+        return jsonify({"ok": False, "error": "Could not record event"}), 503
 
-    # Forward to FUB (best-effort)
-    fub_result = _get_fub().create_event(
-        event_type=fub_event_type,
-        source="wncmountain.homes",
-        person=FUBAdapter.build_person_dict(email=email),
-        property=property_obj,
-        page_url=page_url,
-        page_title=page_title,
-    )
-
-    fub_status = "skipped" if fub_result.skipped else ("ok" if fub_result.ok else "failed")
-    logger.info("track_event: %s email=%s listing=%s fub=%s",
-                fub_event_type, email[:20], listing_id, fub_status)
+    logger.info("track_event: %s email=%s listing=%s queued",
+                fub_event_type, email[:20], listing_id)
 
-    return jsonify({"ok": True, "fub": fub_status}), 200
+    return jsonify({"ok": True, "fub": "queued"}), 202
 
 
 # ---------------------------------------------------------------------------
@@ -621,9 +546,15 @@ def track_public_event():
 
 @public_writes_bp.route("/writes/health", methods=["GET"])
 def public_writes_health():
-    """Expose FUB adapter status for dashboards / monitoring."""
+    """Expose FUB adapter and event queue status for dashboards / monitoring."""
+    try:
+        with _get_db()._get_connection() as conn:
+            event_queue = event_ingest.status(conn)
+    except Exception as e:
+        event_queue = {"error": str(e)}
     return jsonify({
         "ok": True,
         "fub": _get_fub().healthcheck(),
         "turnstile_enabled": bool(os.getenv("TURNSTILE_SECRET_KEY")),
+        "event_queue": event_queue,
     })
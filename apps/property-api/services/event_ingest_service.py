@@ -0,0 +1,89 @@
+"""
+Event Ingest Service
+
+Background service that drains the public website event queue: stores
+events in contact_events and forwards them to FUB (src/core/event_ingest).
+Queue depth and lag are read from the database, so any gunicorn worker can
+report them at /api/public/writes/health.
+"""
+
+import threading
+import logging
+
+from src.core import event_ingest
+
+logger = logging.getLogger(__name__)
+
+
+class EventIngestService:
+    """
+    Drains public_event_queue in batches.
+    Runs as a background thread.
+    """
+
+    def __init__(self, db, fub, batch_size: int = event_ingest.BATCH_SIZE,
+                 workers: int = event_ingest.FUB_WORKERS):
+        """
+        Initialize the ingest service.
+
+        Args:
+            db: DREAMSDatabase instance
+            fub: FUBAdapter used to forward events
+            batch_size: Events claimed per drain pass
+            workers: Concurrent FUB create_event calls
+        """
+        self.db = db
+        self.fub = fub
+        self.batch_size = batch_size
+        self.workers = workers
+        self.email_cache = event_ingest.LeadEmailCache()
+        self._ingest_thread = None
+        self._stop_event = threading.Event()
+
+    def start_background_ingest(self, interval_seconds: float = 2.0):
+        """Start background ingest thread."""
+        with self.db._get_connection() as conn:
+            event_ingest.ensure_tables(conn)
+            conn.commit()
+
+        def ingest_loop():
+            while not self._stop_event.is_set():
+                try:
+                    count = self.drain_due_events()
+                    if count > 0:
+                        logger.info(f"Ingested {count} public events")
+                except Exception as e:
+                    logger.error(f"Event ingest error: {e}")
+
+                # Wait for interval or stop signal
+                self._stop_event.wait(interval_seconds)
+
+        self._ingest_thread = threading.Thread(target=ingest_loop, daemon=True)
+        self._ingest_thread.start()
+        logger.info(f"Event ingest service started (interval: {interval_seconds}s)")
+
+    def stop(self):
+        """Stop the background ingest thread."""
+        self._stop_event.set()
+        if self._ingest_thread:
+            self._ingest_thread.join(timeout=10)
+
+    def drain_due_events(self) -> int:
+        """
+        Process due events until a batch comes back short.
+
+        Returns:
+            Number of events claimed
+        """
+        claimed = 0
+        while not self._stop_event.is_set():
+            stats = event_ingest.drain(
+                self.db, self.fub,
+                batch_size=self.batch_size,
+                workers=self.workers,
+                email_cache=self.email_cache,
+            )
+            claimed += stats['claimed']
+            if stats['claimed'] < self.batch_size:
+                break
+        return claimed
@@ -33,6 +33,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Load environment variables from .env file
 load_dotenv(PROJECT_ROOT / '.env')
 
+from src.core import contact_intelligence
 from src.core.database import DREAMSDatabase
 from src.core.listing_service import (
     ListingService, ListingFilters, SearchResult,
@@ -359,6 +360,19 @@ def _close_request_db(exc=None):
             pass
 
 
+# Optional request-scoped connection affinity (DREAMS_PG_POOL_PIN=1): the
+# several DREAMSDatabase calls a dashboard page makes share one pooled
+# connection instead of a getconn/putconn per helper.
+from src.core.pg_adapter import pin_thread_connection, pool_config, unpin_thread_connection
+
+if pool_config()['pin']:
+    app.before_request(pin_thread_connection)
+
+    @app.teardown_request
+    def _unpin_db_connection(exc=None):
+        unpin_thread_connection()
+
+
 def enrich_properties_with_idx_photos(properties: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Add IDX photo URLs to properties that don't have photos from Notion."""
     # Collect MLS numbers for properties without photos
@@ -699,8 +713,9 @@ def home():
     # ===== V3 MISSION CONTROL =====
     if not use_v2 and INTELLIGENCE_AVAILABLE:
         try:
-            # Enriched contacts with subquery-computed intelligence fields
+            # Enriched contacts with rollup intelligence fields (contact_intelligence)
             contacts = db.get_morning_briefing_contacts(user_id=CURRENT_USER_ID, limit=30)
+            intelligence_status = db.get_contact_intelligence_status()
 
             # Generate intelligence briefings for each contact
             contacts = generate_briefings(contacts)
@@ -794,6 +809,7 @@ def home():
                                  active_pursuits=active_pursuits,
                                  buyer_activity_recent=buyer_activity_recent,
                                  expiring_listings=expiring_listings,
+                                 intelligence_status=intelligence_status,
                                  current_user_id=CURRENT_USER_ID,
                                  refresh_time=datetime.now(tz=ET).strftime('%B %d, %Y %I:%M %p'))
         except Exception as e:
@@ -3245,6 +3261,31 @@ def showings_plan_route():
         prop['_duration'] = stop['duration']
         properties.append(prop)
 
+    # Fill in coordinates for stops that still lack them from the shared
+    # geocode cache, so the browser doesn't geocode the same addresses on
+    # every upload. Only addresses never seen before hit the geocoder.
+    missing = [p for p in properties if not (p.get('latitude') and p.get('longitude'))]
+    if missing:
+        from src.core import route_planner
+        try:
+            from src.services.spatial_data_service import SpatialDataService
+            geocoder = route_planner.geocoder_for(SpatialDataService(rate_limit_delay=0.2))
+        except ImportError:
+            geocoder = None
+        lookups = [(p['_csv_address'], p['_csv_city'] or p.get('city') or '', p.get('state') or 'NC')
+                   for p in missing]
+        try:
+            coords = route_planner.geocode(conn, lookups, geocoder=geocoder)
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Geocode cache lookup failed: {e}")
+            conn.rollback()
+            coords = {}
+        for prop, lookup in zip(missing, lookups):
+            found = coords.get(route_planner.normalize_address(*lookup))
+            if found:
+                prop['latitude'], prop['longitude'] = found
+
     today = datetime.now(ET).strftime('%Y-%m-%d')
     home_address = os.getenv('AGENT_HOME_ADDRESS', '')
 
@@ -5716,6 +5757,7 @@ def contact_intake_save(contact_id):
                 set_clause = ', '.join([f'{k} = ?' for k in data.keys() if k != 'id'])
                 values = [v for k, v in data.items() if k != 'id'] + [form_id]
                 conn.execute(f'UPDATE intake_forms SET {set_clause} WHERE id = ?', values)
+            contact_intelligence.refresh(conn, [contact_id], sweep=False)
             conn.commit()
     except Exception as e:
         logger.error(f"Error saving intake form: {e}")
@@ -18,12 +18,26 @@ MCP Tools Exposed:
     - get_stats: Get database statistics
     - match_leads_to_property: Find leads matching a property
     - get_lead_details: Get comprehensive lead information
+    - get_server_stats: Per-tool latency, cache hits and pool usage
+
+The server keeps a small read-only PostgreSQL connection pool for its
+lifetime, and caches the output of the expensive report tools
+(get_stats, get_call_list, match_leads_to_property) for
+DREAMS_MCP_CACHE_TTL seconds. Each tool call's latency is logged to
+stderr and summarised by get_server_stats.
 """
 
 import json
+import logging
 import os
+import re
 import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -38,6 +52,13 @@ from mcp.types import (
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DB_PATH = os.getenv('DREAMS_DB_PATH', str(PROJECT_ROOT / 'data' / 'dreams.db'))
 DATABASE_URL = os.getenv('DATABASE_URL', '').strip()
+POOL_MAX = max(int(os.getenv('DREAMS_MCP_POOL_MAX', '3')), 1)
+CACHE_TTL = float(os.getenv('DREAMS_MCP_CACHE_TTL', '60'))
+CACHE_MAX_ENTRIES = 128
+CACHED_TOOLS = {"get_stats", "get_call_list", "match_leads_to_property"}
+MATCH_LIMIT = 20
+
+logger = logging.getLogger("dreams-db")
 
 # Initialize MCP server
 server = Server("dreams-db")
@@ -47,6 +68,7 @@ _PG_AVAILABLE = False
 try:
     import psycopg2
     import psycopg2.extras
+    import psycopg2.pool
     _PG_AVAILABLE = True
 except ImportError:
     pass
@@ -65,21 +87,69 @@ def _use_postgres() -> bool:
     return bool(DATABASE_URL) and _PG_AVAILABLE
 
 
+# Same tokenizer as src/core/pg_adapter.py: a single-quoted literal, a bare
+# ?, or a bare %. ? outside literals becomes %s and every % is doubled, since
+# psycopg2 formats the whole query string when params are passed.
+_PLACEHOLDER_TOKEN_RE = re.compile(r"'(?:[^']|'')*'?|[?%]")
+
+
+@lru_cache(maxsize=256)
+def _translate_placeholders(query: str) -> str:
+    return _PLACEHOLDER_TOKEN_RE.sub(
+        lambda m: '%s' if m.group(0) == '?' else m.group(0).replace('%', '%%'), query)
+
+
+_pool = None
+
+
+def _get_pool():
+    """The server's read-only connection pool, opened on first use."""
+    global _pool
+    if _pool is None:
+        _pool = psycopg2.pool.ThreadedConnectionPool(
+            1, POOL_MAX, DATABASE_URL, options="-c default_transaction_read_only=on")
+    return _pool
+
+
+def _checkout():
+    conn = _get_pool().getconn()
+    if conn.closed:
+        _get_pool().putconn(conn, close=True)
+        conn = _get_pool().getconn()
+    conn.autocommit = True
+    return conn
+
+
 class PgConnWrapper:
-    """Wraps a psycopg2 connection so conn.execute() works like sqlite3."""
+    """Wraps a pooled psycopg2 connection so conn.execute() works like sqlite3."""
 
-    def __init__(self, conn):
-        self._conn = conn
+    def __init__(self):
+        self._conn = _checkout()
 
-    def execute(self, query, params=None):
-        # Translate ? placeholders to %s
-        query = query.replace('?', '%s')
-        cur = self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    def _execute(self, query, params):
+        # DictCursor rows support both row[0] and row['name'], like sqlite3.Row
+        cur = self._conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
         cur.execute(query, params)
         return cur
 
+    def execute(self, query, params=None):
+        query = _translate_placeholders(query)
+        params = tuple(params) if params else ()
+        try:
+            return self._execute(query, params)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            if not self._conn.closed:
+                raise
+            # The pooled connection died while idle (server restart, timeout); retry once
+            _get_pool().putconn(self._conn, close=True)
+            self._conn = _checkout()
+            return self._execute(query, params)
+
     def close(self):
-        self._conn.close()
+        """Return the connection to the pool (discarding it if it broke)."""
+        if self._conn is not None:
+            _get_pool().putconn(self._conn, close=bool(self._conn.closed))
+            self._conn = None
 
     def __enter__(self):
         return self
@@ -89,16 +159,76 @@ class PgConnWrapper:
 
 
 def get_connection():
-    """Get a read-only database connection (PostgreSQL or SQLite)."""
+    """Get a read-only database connection (pooled PostgreSQL or SQLite)."""
     if _use_postgres():
-        conn = psycopg2.connect(DATABASE_URL, options="-c default_transaction_read_only=on")
-        conn.autocommit = True
-        return PgConnWrapper(conn)
+        return PgConnWrapper()
     conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+@contextmanager
+def db_connection():
+    """get_connection() that is always closed (returned to the pool), even on error."""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def pool_status() -> dict:
+    if _pool is None:
+        return {}
+    return {"max": POOL_MAX, "in_use": len(_pool._used), "idle": len(_pool._pool)}
+
+
+class ToolCache:
+    """TTL cache of tool output, keyed by tool name and arguments."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(name: str, arguments: dict) -> tuple:
+        return name, json.dumps(arguments or {}, sort_keys=True, default=str)
+
+    def get(self, name: str, arguments: dict) -> Optional[str]:
+        key = self._key(name, arguments)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return text
+
+    def put(self, name: str, arguments: dict, text: str):
+        if self.ttl <= 0:
+            return
+        key = self._key(name, arguments)
+        self._entries[key] = (time.monotonic() + self.ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache = ToolCache(CACHE_TTL, CACHE_MAX_ENTRIES)
+_tool_stats: dict[str, dict] = {}
+
+
+def _record_call(name: str, elapsed_ms: float, cached: bool):
+    stats = _tool_stats.setdefault(name, {"calls": 0, "cache_hits": 0, "total_ms": 0.0, "max_ms": 0.0})
+    stats["calls"] += 1
+    stats["cache_hits"] += int(cached)
+    stats["total_ms"] += elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    logger.info("%s: %.1fms%s", name, elapsed_ms, " (cached)" if cached else "")
+
+
 def rows_to_dicts(rows) -> list[dict]:
     """Convert Row objects to dictionaries."""
     if not rows:
@@ -419,6 +549,18 @@ Returns leads sorted by priority with contact info and context.
                     }
                 }
             }
+        ),
+        Tool(
+            name="get_server_stats",
+            description="""Report this server's own performance.
+
+Per-tool call counts, average/max latency and cache hits since startup,
+plus connection pool usage.
+""",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
@@ -431,35 +573,43 @@ Returns leads sorted by priority with contact info and context.
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
 
-    try:
-        if name == "query_leads":
-            result = await query_leads(arguments)
-        elif name == "query_properties":
-            result = await query_properties(arguments)
-        elif name == "query_activities":
-            result = await query_activities(arguments)
-        elif name == "run_sql":
-            result = await run_sql(arguments)
-        elif name == "get_stats":
-            result = await get_stats()
-        elif name == "get_lead_details":
-            result = await get_lead_details(arguments)
-        elif name == "match_leads_to_property":
-            result = await match_leads_to_property(arguments)
-        elif name == "get_call_list":
-            result = await get_call_list(arguments)
-        else:
-            result = f"Unknown tool: {name}"
-    except Exception as e:
-        result = f"Error: {str(e)}"
-
+    started = time.perf_counter()
+    result = _cache.get(name, arguments) if name in CACHED_TOOLS else None
+    cached = result is not None
+
+    if not cached:
+        try:
+            if name == "query_leads":
+                result = await query_leads(arguments)
+            elif name == "query_properties":
+                result = await query_properties(arguments)
+            elif name == "query_activities":
+                result = await query_activities(arguments)
+            elif name == "run_sql":
+                result = await run_sql(arguments)
+            elif name == "get_stats":
+                result = await get_stats()
+            elif name == "get_lead_details":
+                result = await get_lead_details(arguments)
+            elif name == "match_leads_to_property":
+                result = await match_leads_to_property(arguments)
+            elif name == "get_call_list":
+                result = await get_call_list(arguments)
+            elif name == "get_server_stats":
+                result = await get_server_stats()
+            else:
+                result = f"Unknown tool: {name}"
+            if name in CACHED_TOOLS:
+                _cache.put(name, arguments, result)
+        except Exception as e:
+            result = f"Error: {str(e)}"
+
+    _record_call(name, (time.perf_counter() - started) * 1000, cached)
     return [TextContent(type="text", text=result)]
 
 
 async def query_leads(args: dict) -> str:
     """Query leads with filters."""
-    conn = get_connection()
-
     query = """
         SELECT
             id, first_name, last_name, email, phone,
@@ -513,16 +663,14 @@ async def query_leads(args: dict) -> str:
     limit = min(args.get("limit", 25), 100)
     query += f" LIMIT {limit}"
 
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
+    with db_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
 
     return format_results(rows_to_dicts(rows), limit)
 
 
 async def query_properties(args: dict) -> str:
     """Query properties with filters."""
-    conn = get_connection()
-
     query = """
         SELECT
             id, address, city, state, zip, county,
@@ -585,16 +733,14 @@ async def query_properties(args: dict) -> str:
     limit = min(args.get("limit", 25), 100)
     query += f" LIMIT {limit}"
 
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
+    with db_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
 
     return format_results(rows_to_dicts(rows), limit)
 
 
 async def query_activities(args: dict) -> str:
     """Query lead activities."""
-    conn = get_connection()
-
     query = """
         SELECT
             e.id, e.contact_id, e.event_type, e.event_source,
@@ -624,8 +770,8 @@ async def query_activities(args: dict) -> str:
     limit = min(args.get("limit", 50), 200)
     query += f" LIMIT {limit}"
 
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
+    with db_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
 
     return format_results(rows_to_dicts(rows), limit)
 
@@ -653,8 +799,6 @@ async def run_sql(args: dict) -> str:
         if ch == ';' and not in_quote:
             return "Error: Multi-statement queries are not allowed."
 
-    conn = get_connection()
-
     try:
         limit = min(args.get("limit", 100), 500)
 
@@ -662,56 +806,45 @@ async def run_sql(args: dict) -> str:
         if "LIMIT" not in sql.upper():
             sql += f" LIMIT {limit}"
 
-        rows = conn.execute(sql).fetchall()
-        conn.close()
+        with db_connection() as conn:
+            rows = conn.execute(sql).fetchall()
 
         return format_results(rows_to_dicts(rows), limit)
     except Exception as e:
-        conn.close()
         return f"SQL Error: {str(e)}"
 
 
-async def get_stats() -> str:
-    """Get database statistics."""
-    conn = get_connection()
-
-    stats = {}
-
-    # Lead counts
-    stats["total_leads"] = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
-    stats["active_leads"] = conn.execute("SELECT COUNT(*) FROM leads WHERE stage NOT IN ('trash', 'closed')").fetchone()[0]
-    stats["hot_leads"] = conn.execute("SELECT COUNT(*) FROM leads WHERE heat_score >= 70").fetchone()[0]
-
-    # Property counts (from listings table, canonical source)
-    stats["total_properties"] = conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
-    stats["active_listings"] = conn.execute("SELECT COUNT(*) FROM listings WHERE LOWER(status) = 'active'").fetchone()[0]
-    stats["pending_listings"] = conn.execute("SELECT COUNT(*) FROM listings WHERE LOWER(status) = 'pending'").fetchone()[0]
-
-    # Activity counts
-    stats["total_events"] = conn.execute("SELECT COUNT(*) FROM contact_events").fetchone()[0]
-    _cutoff_7d = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-    stats["events_last_7_days"] = conn.execute(
-        "SELECT COUNT(*) FROM contact_events WHERE occurred_at >= ?", (_cutoff_7d,)
-    ).fetchone()[0]
-
-    # Communication counts
-    stats["total_calls"] = conn.execute("SELECT COUNT(*) FROM contact_communications WHERE comm_type = 'call'").fetchone()[0]
-    stats["total_texts"] = conn.execute("SELECT COUNT(*) FROM contact_communications WHERE comm_type = 'text'").fetchone()[0]
+STATS_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM leads) AS total_leads,
+        (SELECT COUNT(*) FROM leads WHERE stage NOT IN ('trash', 'closed')) AS active_leads,
+        (SELECT COUNT(*) FROM leads WHERE heat_score >= 70) AS hot_leads,
+        (SELECT COUNT(*) FROM listings) AS total_properties,
+        (SELECT COUNT(*) FROM listings WHERE LOWER(status) = 'active') AS active_listings,
+        (SELECT COUNT(*) FROM listings WHERE LOWER(status) = 'pending') AS pending_listings,
+        (SELECT COUNT(*) FROM contact_events) AS total_events,
+        (SELECT COUNT(*) FROM contact_events WHERE occurred_at >= ?) AS events_last_7_days,
+        (SELECT COUNT(*) FROM contact_communications WHERE comm_type = 'call') AS total_calls,
+        (SELECT COUNT(*) FROM contact_communications WHERE comm_type = 'text') AS total_texts,
+        (SELECT COUNT(*) FROM contact_scoring_history) AS scoring_snapshots
+"""
 
-    # Scoring history
-    stats["scoring_snapshots"] = conn.execute("SELECT COUNT(*) FROM contact_scoring_history").fetchone()[0]
 
-    # Recent activity
-    recent = conn.execute("""
-        SELECT stage, COUNT(*) as count
-        FROM leads
-        GROUP BY stage
-        ORDER BY count DESC
-    """).fetchall()
+async def get_stats() -> str:
+    """Get database statistics."""
+    cutoff_7d = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+
+    # Every count in one round trip, then the stage breakdown
+    with db_connection() as conn:
+        stats = dict(conn.execute(STATS_QUERY, (cutoff_7d,)).fetchone())
+        recent = conn.execute("""
+            SELECT stage, COUNT(*) as count
+            FROM leads
+            GROUP BY stage
+            ORDER BY count DESC
+        """).fetchall()
     stats["leads_by_stage"] = {row[0]: row[1] for row in recent}
 
-    conn.close()
-
     # Format output
     lines = ["=== DREAMS Database Statistics ===", ""]
     lines.append("LEADS:")
@@ -737,53 +870,48 @@ async def get_stats() -> str:
 
 async def get_lead_details(args: dict) -> str:
     """Get comprehensive lead details."""
-    conn = get_connection()
+    with db_connection() as conn:
+        # Find the lead
+        if args.get("lead_id"):
+            lead = conn.execute("SELECT * FROM leads WHERE id = ? OR fub_id = ?",
+                               (args["lead_id"], args["lead_id"])).fetchone()
+        elif args.get("email"):
+            lead = conn.execute("SELECT * FROM leads WHERE email = ?",
+                               (args["email"],)).fetchone()
+        elif args.get("name"):
+            lead = conn.execute("SELECT * FROM leads WHERE first_name LIKE ? OR last_name LIKE ?",
+                               (f"%{args['name']}%", f"%{args['name']}%")).fetchone()
+        else:
+            return "Error: Provide lead_id, email, or name to search."
 
-    # Find the lead
-    if args.get("lead_id"):
-        lead = conn.execute("SELECT * FROM leads WHERE id = ? OR fub_id = ?",
-                           (args["lead_id"], args["lead_id"])).fetchone()
-    elif args.get("email"):
-        lead = conn.execute("SELECT * FROM leads WHERE email = ?",
-                           (args["email"],)).fetchone()
-    elif args.get("name"):
-        lead = conn.execute("SELECT * FROM leads WHERE first_name LIKE ? OR last_name LIKE ?",
-                           (f"%{args['name']}%", f"%{args['name']}%")).fetchone()
-    else:
-        conn.close()
-        return "Error: Provide lead_id, email, or name to search."
+        if not lead:
+            return "Lead not found."
 
-    if not lead:
-        conn.close()
-        return "Lead not found."
-
-    lead_dict = dict(lead)
-    lead_id = lead_dict["id"]
-
-    # Get recent activities
-    activities = conn.execute("""
-        SELECT event_type, property_address, occurred_at
-        FROM contact_events
-        WHERE contact_id = ?
-        ORDER BY occurred_at DESC
-        LIMIT 10
-    """, (lead_id,)).fetchall()
-
-    # Get communications
-    comms = conn.execute("""
-        SELECT comm_type, direction, agent_name, occurred_at
-        FROM contact_communications
-        WHERE contact_id = ?
-        ORDER BY occurred_at DESC
-        LIMIT 5
-    """, (lead_id,)).fetchall()
-
-    # Get requirements
-    requirements = conn.execute("""
-        SELECT * FROM contact_requirements WHERE contact_id = ?
-    """, (lead_id,)).fetchone()
-
-    conn.close()
+        lead_dict = dict(lead)
+        lead_id = lead_dict["id"]
+
+        # Get recent activities
+        activities = conn.execute("""
+            SELECT event_type, property_address, occurred_at
+            FROM contact_events
+            WHERE contact_id = ?
+            ORDER BY occurred_at DESC
+            LIMIT 10
+        """, (lead_id,)).fetchall()
+
+        # Get communications
+        comms = conn.execute("""
+            SELECT comm_type, direction, agent_name, occurred_at
+            FROM contact_communications
+            WHERE contact_id = ?
+            ORDER BY occurred_at DESC
+            LIMIT 5
+        """, (lead_id,)).fetchall()
+
+        # Get requirements
+        requirements = conn.execute("""
+            SELECT * FROM contact_requirements WHERE contact_id = ?
+        """, (lead_id,)).fetchone()
 
     # Format output
     lines = [f"=== Lead Details: {lead_dict.get('first_name', '')} {lead_dict.get('last_name', '')} ===", ""]
@@ -808,16 +936,16 @@ async def get_lead_details(args: dict) -> str:
     if requirements:
         req = dict(requirements)
         lines.append("REQUIREMENTS:")
-        if req.get('min_price') or req.get('max_price'):
-            lines.append(f"  Price: ${req.get('min_price', 0):,} - ${req.get('max_price', 0):,}")
-        if req.get('min_beds'):
-            lines.append(f"  Beds: {req.get('min_beds')}+")
-        if req.get('min_baths'):
-            lines.append(f"  Baths: {req.get('min_baths')}+")
-        if req.get('preferred_cities'):
-            lines.append(f"  Cities: {req.get('preferred_cities')}")
-        if req.get('preferred_counties'):
-            lines.append(f"  Counties: {req.get('preferred_counties')}")
+        if req.get('price_min') or req.get('price_max'):
+            lines.append(f"  Price: ${req.get('price_min') or 0:,} - ${req.get('price_max') or 0:,}")
+        if req.get('beds_min'):
+            lines.append(f"  Beds: {req.get('beds_min')}+")
+        if req.get('baths_min'):
+            lines.append(f"  Baths: {req.get('baths_min')}+")
+        if req.get('cities'):
+            lines.append(f"  Cities: {req.get('cities')}")
+        if req.get('counties'):
+            lines.append(f"  Counties: {req.get('counties')}")
         lines.append("")
 
     if activities:
@@ -834,84 +962,92 @@ async def get_lead_details(args: dict) -> str:
     return "\n".join(lines)
 
 
-async def match_leads_to_property(args: dict) -> str:
-    """Find leads whose requirements match a property."""
-    conn = get_connection()
+def _like_escape(text: str) -> str:
+    return text.replace('!', '!!').replace('%', '!%').replace('_', '!_')
 
-    price = args.get("price", 0)
-    city = args.get("city", "")
-    beds = args.get("beds", 0)
-    min_score = args.get("min_match_score", 50)
 
-    # Find leads with matching requirements
-    query = """
-        SELECT
-            l.id, l.first_name, l.last_name, l.email, l.phone,
-            l.heat_score, l.priority_score,
-            r.min_price, r.max_price, r.min_beds, r.preferred_cities
-        FROM leads l
-        LEFT JOIN contact_requirements r ON l.id = r.contact_id
-        WHERE l.stage NOT IN ('trash', 'closed')
-        AND l.type IN ('buyer', 'both')
+def match_leads(conn, price, city: str, beds, min_score: int, limit: Optional[int] = MATCH_LIMIT) -> list[dict]:
     """
+    Score active buyer leads against a property in SQL; best matches first.
 
-    leads = conn.execute(query).fetchall()
-    conn.close()
+    Points: price within the lead's range 40 (else 20 if within 110% of
+    their max), preferred city 30, beds 20, heat >= 50 adds 10. Missing
+    requirements count as unconstrained. Only leads scoring min_score or
+    more leave the database.
+    """
+    max_price = "COALESCE(NULLIF(r.price_max, 0), 999999999)"
+    params = [price, price, price, price]
+    if city:
+        city_points = "CASE WHEN LOWER(COALESCE(r.cities, '')) LIKE ? ESCAPE '!' THEN 30 ELSE 0 END"
+        params.append(f"%{_like_escape(city.lower())}%")
+    else:
+        city_points = "0"
+    params += [beds, min_score]
+    total = "price_points + city_points + beds_points + heat_points"
+
+    query = f"""
+        SELECT * FROM (
+            SELECT
+                l.id, l.first_name, l.last_name, l.email, l.phone, l.heat_score,
+                CASE WHEN COALESCE(r.price_min, 0) <= ? AND ? <= {max_price} THEN 40
+                     WHEN ? > 0 AND {max_price} > 0 AND ? <= {max_price} * 1.1 THEN 20
+                     ELSE 0 END AS price_points,
+                {city_points} AS city_points,
+                CASE WHEN ? >= COALESCE(r.beds_min, 0) THEN 20 ELSE 0 END AS beds_points,
+                CASE WHEN COALESCE(l.heat_score, 0) >= 50 THEN 10 ELSE 0 END AS heat_points
+            FROM leads l
+            LEFT JOIN contact_requirements r ON l.id = r.contact_id
+            WHERE l.stage NOT IN ('trash', 'closed')
+            AND l.type IN ('buyer', 'both')
+        ) scored
+        WHERE {total} >= ?
+        ORDER BY {total} DESC, COALESCE(heat_score, 0) DESC, id
+    """
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
 
     matches = []
-    for lead in leads:
-        lead_dict = dict(lead)
-        score = 0
+    for row in rows_to_dicts(conn.execute(query, params).fetchall()):
         reasons = []
-
-        # Price match (40 points)
-        min_p = lead_dict.get("min_price") or 0
-        max_p = lead_dict.get("max_price") or 999999999
-        if min_p <= price <= max_p:
-            score += 40
+        if row["price_points"] == 40:
             reasons.append("price in range")
-        elif price > 0 and max_p > 0:
-            # Partial credit if close
-            if price <= max_p * 1.1:
-                score += 20
-                reasons.append("price slightly over budget")
-
-        # Location match (30 points)
-        pref_cities = lead_dict.get("preferred_cities") or ""
-        if city and city.lower() in pref_cities.lower():
-            score += 30
+        elif row["price_points"] == 20:
+            reasons.append("price slightly over budget")
+        if row["city_points"]:
             reasons.append("city match")
-
-        # Beds match (20 points)
-        min_beds = lead_dict.get("min_beds") or 0
-        if beds >= min_beds:
-            score += 20
+        if row["beds_points"]:
             reasons.append("beds match")
-
-        # Activity bonus (10 points)
-        if lead_dict.get("heat_score", 0) >= 50:
-            score += 10
+        if row["heat_points"]:
             reasons.append("active buyer")
 
-        if score >= min_score:
-            matches.append({
-                "lead_id": lead_dict["id"],
-                "name": f"{lead_dict.get('first_name', '')} {lead_dict.get('last_name', '')}",
-                "email": lead_dict.get("email"),
-                "phone": lead_dict.get("phone"),
-                "heat_score": lead_dict.get("heat_score", 0),
-                "match_score": score,
-                "reasons": ", ".join(reasons)
-            })
+        matches.append({
+            "lead_id": row["id"],
+            "name": f"{row.get('first_name', '')} {row.get('last_name', '')}",
+            "email": row.get("email"),
+            "phone": row.get("phone"),
+            "heat_score": row.get("heat_score", 0),
+            "match_score": row["price_points"] + row["city_points"] + row["beds_points"] + row["heat_points"],
+            "reasons": ", ".join(reasons)
+        })
+    return matches
+
+
+async def match_leads_to_property(args: dict) -> str:
+    """Find leads whose requirements match a property."""
+    price = args.get("price", 0)
+    city = args.get("city", "")
+    beds = args.get("beds", 0)
+    min_score = args.get("min_match_score", 50)
 
-    # Sort by match score
-    matches.sort(key=lambda x: x["match_score"], reverse=True)
+    with db_connection() as conn:
+        matches = match_leads(conn, price, city, beds, min_score)
 
     if not matches:
         return "No matching leads found."
 
     lines = [f"=== Matching Leads (min score: {min_score}) ===", ""]
-    for i, m in enumerate(matches[:20], 1):
+    for i, m in enumerate(matches, 1):
         lines.append(f"{i}. {m['name']} (Score: {m['match_score']})")
         lines.append(f"   Email: {m['email']}, Phone: {m['phone']}")
         lines.append(f"   Heat: {m['heat_score']}, Reasons: {m['reasons']}")
@@ -922,8 +1058,6 @@ async def match_leads_to_property(args: dict) -> str:
 
 async def get_call_list(args: dict) -> str:
     """Generate priority call list."""
-    conn = get_connection()
-
     limit = args.get("limit", 20)
     min_priority = args.get("min_priority", 30)
 
@@ -942,8 +1076,8 @@ async def get_call_list(args: dict) -> str:
         LIMIT ?
     """
 
-    leads = conn.execute(query, (min_priority, limit)).fetchall()
-    conn.close()
+    with db_connection() as conn:
+        leads = conn.execute(query, (min_priority, limit)).fetchall()
 
     if not leads:
         return f"No leads with priority >= {min_priority} found."
@@ -967,18 +1101,46 @@ async def get_call_list(args: dict) -> str:
     return "\n".join(lines)
 
 
+async def get_server_stats() -> str:
+    """Per-tool latency and cache hits since startup, plus pool usage."""
+    lines = ["=== dreams-db MCP Server ===", ""]
+    lines.append(f"Cache TTL: {CACHE_TTL:.0f}s ({', '.join(sorted(CACHED_TOOLS))})")
+    pool = pool_status()
+    if pool:
+        lines.append(f"Pool: {pool['in_use']} in use, {pool['idle']} idle (max {pool['max']})")
+    lines.append("")
+
+    if not _tool_stats:
+        lines.append("No tool calls yet.")
+    for name, stats in sorted(_tool_stats.items()):
+        lines.append(f"{name}: {stats['calls']} calls, avg {stats['total_ms'] / stats['calls']:.1f}ms, "
+                     f"max {stats['max_ms']:.1f}ms, {stats['cache_hits']} cached")
+
+    return "\n".join(lines)
+
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    # stdout carries the MCP protocol; logs go to stderr
+    logging.basicConfig(
+        level=os.getenv('DREAMS_MCP_LOG_LEVEL', 'INFO'),
+        stream=sys.stderr,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        if _pool is not None:
+            _pool.closeall()
 
 
 if __name__ == "__main__":
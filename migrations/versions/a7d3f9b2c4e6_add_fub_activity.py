@@ -0,0 +1,66 @@
+"""add fub_person_activity and fub_sync_state for incremental FUB ingest
+
+Revision ID: a7d3f9b2c4e6
+Revises: f3a8c5e1d7b2
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9b2c4e6'
+down_revision: Union[str, Sequence[str], None] = 'f3a8c5e1d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-resource high-water marks and per-person aggregates.
+
+    src/core/fub_activity reads and writes both without creating them.
+    The first fub-to-sheets run after this fills them with a full fetch.
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS fub_sync_state ("
+        "resource TEXT PRIMARY KEY, "
+        "high_water TEXT, "
+        "recent_ids TEXT, "
+        "items_applied INTEGER NOT NULL DEFAULT 0, "
+        "updated_at TEXT)"
+    )
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS fub_person_activity ("
+        "person_id TEXT PRIMARY KEY, "
+        "calls_inbound INTEGER NOT NULL DEFAULT 0, "
+        "calls_outbound INTEGER NOT NULL DEFAULT 0, "
+        "texts_total INTEGER NOT NULL DEFAULT 0, "
+        "texts_inbound INTEGER NOT NULL DEFAULT 0, "
+        "emails_received INTEGER NOT NULL DEFAULT 0, "
+        "emails_sent INTEGER NOT NULL DEFAULT 0, "
+        "emails_auto_sent INTEGER NOT NULL DEFAULT 0, "
+        "emails_manual_sent INTEGER NOT NULL DEFAULT 0, "
+        "events_total INTEGER NOT NULL DEFAULT 0, "
+        "website_visits INTEGER NOT NULL DEFAULT 0, "
+        "properties_viewed INTEGER NOT NULL DEFAULT 0, "
+        "properties_favorited INTEGER NOT NULL DEFAULT 0, "
+        "properties_shared INTEGER NOT NULL DEFAULT 0, "
+        "last_inbound_at TEXT, "
+        "last_website_visit TEXT, "
+        "price_count INTEGER NOT NULL DEFAULT 0, "
+        "price_mean REAL, "
+        "price_m2 REAL, "
+        "property_views TEXT, "
+        "recent_visits TEXT, "
+        "recent_views TEXT, "
+        "latest_events TEXT, "
+        "updated_at TEXT)"
+    )
+
+
+def downgrade() -> None:
+    """Drop both tables; incremental ingest needs this revision reapplied."""
+    op.execute("DROP TABLE IF EXISTS fub_person_activity")
+    op.execute("DROP TABLE IF EXISTS fub_sync_state")
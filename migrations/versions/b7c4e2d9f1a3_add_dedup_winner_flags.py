@@ -0,0 +1,82 @@
+"""add precomputed cross-MLS dedup winner flags to listings
+
+Revision ID: b7c4e2d9f1a3
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4e2d9f1a3'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# listing_service.DEDUP_CONDITION as of this revision, frozen so later
+# edits to the live query can't change what this backfill computes.
+_SOURCE_RANK = (
+    "CASE {t}.mls_source WHEN 'NavicaMLS' THEN 1 WHEN 'MountainLakesMLS' THEN 2 "
+    "WHEN 'CanopyMLS' THEN 3 ELSE 4 END"
+)
+_WINNER = (
+    "(address_key IS NULL OR NOT EXISTS ("
+    "SELECT 1 FROM listings dup "
+    "WHERE dup.address_key = listings.address_key "
+    "AND dup.property_type = listings.property_type "
+    "AND dup.id != listings.id{idx} "
+    "AND UPPER(dup.status) = UPPER(listings.status) "
+    "AND ("
+    f"  {_SOURCE_RANK.format(t='dup')} < {_SOURCE_RANK.format(t='listings')}"
+    "  OR ("
+    f"    {_SOURCE_RANK.format(t='dup')} = {_SOURCE_RANK.format(t='listings')}"
+    "    AND dup.updated_at > listings.updated_at"
+    "  )"
+    ")))"
+)
+BACKFILL_SQL = (
+    "UPDATE listings SET "
+    f"is_dedup_winner = CASE WHEN {_WINNER.format(idx='')} THEN 1 ELSE 0 END, "
+    f"is_idx_dedup_winner = CASE WHEN {_WINNER.format(idx=' AND dup.idx_opt_in = 1')} THEN 1 ELSE 0 END"
+)
+
+
+def upgrade() -> None:
+    """Add is_dedup_winner / is_idx_dedup_winner and backfill them.
+
+    The public grid, map and counts used to evaluate ListingService's
+    correlated DEDUP_CONDITION subquery per candidate row. The sync
+    engines now maintain its result in these flags (see
+    listing_service.refresh_dedup_winners) and reads filter on them.
+    Default 1 means "not yet refreshed, show it" — the same answer the
+    subquery gives for a listing with no competing duplicate.
+    """
+    for column in ('is_dedup_winner', 'is_idx_dedup_winner'):
+        op.add_column(
+            'listings',
+            sa.Column(column, sa.Integer(), nullable=False, server_default='1'),
+        )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_listings_dedup_group "
+        "ON listings (address_key, property_type)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_listings_idx_dedup_winner "
+        "ON listings (is_idx_dedup_winner, status)"
+    )
+
+    # One-shot backfill; the sync engines keep the flags current from here
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Drop the dedup winner flags."""
+    op.execute("DROP INDEX IF EXISTS idx_listings_idx_dedup_winner")
+    op.execute("DROP INDEX IF EXISTS idx_listings_dedup_group")
+    op.drop_column('listings', 'is_idx_dedup_winner')
+    op.drop_column('listings', 'is_dedup_winner')
@@ -0,0 +1,52 @@
+"""add public_event_queue and a LOWER(email) index on leads
+
+Revision ID: c3e8a1f5d204
+Revises: b7c4e2d9f1a3
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a1f5d204'
+down_revision: Union[str, Sequence[str], None] = 'b7c4e2d9f1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the queue behind POST /api/public/events.
+
+    The endpoint now only appends to public_event_queue; the property-api
+    background worker (src/core/event_ingest.drain) stores the events and
+    forwards them to FUB. The worker resolves emails with LOWER(email) IN
+    (...), which idx_leads_email_lower serves.
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS public_event_queue ("
+        "id TEXT PRIMARY KEY, "
+        "event_type TEXT NOT NULL, "
+        "email TEXT NOT NULL, "
+        "listing_id TEXT, "
+        "page_url TEXT, "
+        "page_title TEXT, "
+        "occurred_at TEXT NOT NULL, "
+        "stored INTEGER NOT NULL DEFAULT 0, "
+        "attempts INTEGER NOT NULL DEFAULT 0, "
+        "next_attempt_at TEXT, "
+        "last_error TEXT)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_public_event_queue_due "
+        "ON public_event_queue (next_attempt_at, occurred_at)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_leads_email_lower ON leads (LOWER(email))")
+
+
+def downgrade() -> None:
+    """Drop the queue (losing anything still in it) and the email index."""
+    op.execute("DROP TABLE IF EXISTS public_event_queue")
+    op.execute("DROP INDEX IF EXISTS idx_leads_email_lower")
@@ -0,0 +1,39 @@
+"""add geocode_cache for showing route planning
+
+Revision ID: d5f2b8c6e3a7
+Revises: c3e8a1f5d204
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f2b8c6e3a7'
+down_revision: Union[str, Sequence[str], None] = 'c3e8a1f5d204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the address -> coordinates cache used by src/core/route_planner.
+
+    Keys are route_planner.normalize_address() strings; rows with NULL
+    coordinates record failed lookups so they aren't retried on every
+    route-planner upload.
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS geocode_cache ("
+        "address_key TEXT PRIMARY KEY, "
+        "latitude REAL, "
+        "longitude REAL, "
+        "source TEXT, "
+        "geocoded_at TEXT NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the cache; it refills on demand."""
+    op.execute("DROP TABLE IF EXISTS geocode_cache")
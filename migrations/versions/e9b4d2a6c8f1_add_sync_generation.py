@@ -0,0 +1,36 @@
+"""add sync_generation for public API response cache invalidation
+
+Revision ID: e9b4d2a6c8f1
+Revises: d5f2b8c6e3a7
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4d2a6c8f1'
+down_revision: Union[str, Sequence[str], None] = 'd5f2b8c6e3a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-scope generation counter behind src/core/response_cache.
+
+    Sync engines bump it after each committed run; property-api workers
+    poll it and drop their cached responses when it moves.
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS sync_generation ("
+        "scope TEXT PRIMARY KEY, "
+        "generation INTEGER NOT NULL DEFAULT 0, "
+        "updated_at TEXT)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the counter; readers treat a missing table as generation 0."""
+    op.execute("DROP TABLE IF EXISTS sync_generation")
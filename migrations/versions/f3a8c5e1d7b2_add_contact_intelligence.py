@@ -0,0 +1,63 @@
+"""add contact_intelligence rollup for the Mission Control briefing
+
+Revision ID: f3a8c5e1d7b2
+Revises: e9b4d2a6c8f1
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c5e1d7b2'
+down_revision: Union[str, Sequence[str], None] = 'e9b4d2a6c8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create contact_intelligence and its refresh queue.
+
+    The briefing and call-list queries LEFT JOIN the rollup instead of
+    running per-lead correlated subqueries. Fill it afterwards with
+    `python3 scripts/contact_intelligence.py --rebuild`; until then the
+    joined columns read as empty.
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS contact_intelligence ("
+        "contact_id TEXT PRIMARY KEY, "
+        "property_views_24h INTEGER NOT NULL DEFAULT 0, "
+        "property_views_7d INTEGER NOT NULL DEFAULT 0, "
+        "favorites_7d INTEGER NOT NULL DEFAULT 0, "
+        "property_view_count INTEGER NOT NULL DEFAULT 0, "
+        "last_comm_at TEXT, "
+        "pending_action_due TEXT, "
+        "pending_action_desc TEXT, "
+        "has_intake INTEGER NOT NULL DEFAULT 0, "
+        "intake_need_type TEXT, "
+        "financing_status TEXT, "
+        "pre_approval_amount INTEGER, "
+        "intake_count INTEGER NOT NULL DEFAULT 0, "
+        "has_recent_package INTEGER NOT NULL DEFAULT 0, "
+        "heat_delta REAL, "
+        "expires_at TEXT, "
+        "refreshed_at TEXT)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contact_intelligence_expires "
+        "ON contact_intelligence (expires_at)"
+    )
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS contact_intelligence_queue ("
+        "contact_key TEXT PRIMARY KEY, "
+        "queued_at TEXT)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the rollup and queue; rebuild() recreates them from source tables."""
+    op.execute("DROP TABLE IF EXISTS contact_intelligence_queue")
+    op.execute("DROP INDEX IF EXISTS idx_contact_intelligence_expires")
+    op.execute("DROP TABLE IF EXISTS contact_intelligence")
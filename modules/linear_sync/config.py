@@ -31,6 +31,10 @@ class Config:
         self.FUB_POLL_INTERVAL = int(os.getenv('FUB_POLL_INTERVAL', '30'))
         self.DEAL_CACHE_REFRESH = int(os.getenv('DEAL_CACHE_REFRESH', '300'))
 
+        # Poller HTTP: max in-flight requests per API
+        self.FUB_MAX_CONCURRENCY = int(os.getenv('FUB_MAX_CONCURRENCY', '4'))
+        self.LINEAR_MAX_CONCURRENCY = int(os.getenv('LINEAR_MAX_CONCURRENCY', '4'))
+
         # Database
         self.DB_PATH = PROJECT_ROOT / 'data' / 'linear_sync.db'
 
@@ -226,6 +226,33 @@ class Database:
             ).fetchone()
             return dict(row) if row else None
 
+    def get_mappings_by_fub_tasks(self, fub_task_ids: list[int], origin: str = None) -> dict[int, dict]:
+        """Get mappings for many FUB task IDs, keyed by fub_task_id."""
+        ids = sorted(set(fub_task_ids))
+        mappings = {}
+        with self.connection() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                sql = (f"SELECT * FROM linear_sync_issue_map "
+                       f"WHERE fub_task_id IN ({', '.join('?' for _ in chunk)})")
+                params = list(chunk)
+                if origin:
+                    sql += " AND origin = ?"
+                    params.append(origin)
+                for row in conn.execute(sql, params).fetchall():
+                    mappings[row['fub_task_id']] = dict(row)
+        return mappings
+
+    def get_oldest_fub_updated_at(self, origin: str = 'fub') -> Optional[str]:
+        """Earliest fub_updated_at among mappings of the given origin."""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT MIN(fub_updated_at) AS oldest FROM linear_sync_issue_map "
+                "WHERE origin = ? AND fub_updated_at IS NOT NULL AND fub_updated_at != ''",
+                (origin,)
+            ).fetchone()
+            return row['oldest'] if row else None
+
     def get_mappings_by_person(self, fub_person_id: int) -> list[dict]:
         """Get all mappings for a person."""
         with self.connection() as conn:
@@ -8,12 +8,36 @@ import re
 from typing import Optional
 import httpx
 
+from src.core.async_http import AsyncAPI
+
 from .config import config
 from .models import FUBTask, FUBPerson, FUBDeal
 
 logger = logging.getLogger(__name__)
 
 
+def _updated_since(tasks: list[FUBTask], since: str, truncated: bool) -> list[FUBTask]:
+    """Tasks newer than `since`; when paging stopped early, only the fully listed ones.
+
+    Pages are requested in ascending `updated` order, so a truncated listing
+    is complete up to its last timestamp except for that timestamp itself,
+    which may continue on the next page. Dropping those tasks keeps the
+    caller's high-water mark from moving past anything it hasn't seen.
+    """
+    # Guard against the filter being ignored: keep only tasks actually newer than `since`
+    tasks = [t for t in tasks if not t.updated or t.updated > since]
+    if not truncated:
+        return tasks
+
+    stamps = [t.updated for t in tasks if t.updated]
+    if stamps != sorted(stamps):
+        logger.error(f"FUB tasks updated since {since} were not returned in updated order; "
+                     "nothing from the truncated listing is used")
+        return []
+    last = stamps[-1] if stamps else None
+    return [t for t in tasks if last and t.updated and t.updated < last]
+
+
 class FUBClient:
     """HTTP client for Follow Up Boss API."""
 
@@ -21,7 +45,8 @@ class FUBClient:
         self.base_url = config.FUB_BASE_URL
         self.api_key = config.FUB_API_KEY
 
-    def _get_headers(self) -> dict:
+    @staticmethod
+    def _get_headers() -> dict:
         """Get request headers."""
         headers = {
             'Content-Type': 'application/json',
@@ -109,6 +134,37 @@ class FUBClient:
         tasks = data.get('tasks', [])
         return [FUBTask.from_api(t) for t in tasks]
 
+    def get_tasks_updated_since(
+        self,
+        since: str,
+        include_completed: bool = True,
+        page_size: int = 100,
+        max_pages: int = 50,
+    ) -> list[FUBTask]:
+        """Get tasks updated after `since` (ISO timestamp), oldest change first.
+
+        Stops after max_pages; the rest are listed by the next call from the
+        newest timestamp returned (see _updated_since).
+        """
+        tasks = []
+        truncated = False
+        for page in range(max_pages):
+            params = {'limit': page_size, 'offset': page * page_size,
+                      'updatedAfter': since, 'sort': 'updated'}
+            if not include_completed:
+                params['status'] = 'incomplete'
+
+            data = self._request('GET', 'tasks', params=params)
+            batch = data.get('tasks', [])
+            tasks.extend(FUBTask.from_api(t) for t in batch)
+            if len(batch) < page_size:
+                break
+        else:
+            truncated = True
+            logger.warning(f"Stopped paging FUB tasks updated since {since} after {max_pages} pages")
+
+        return _updated_since(tasks, since, truncated)
+
     def create_task(
         self,
         person_id: int,
@@ -271,5 +327,81 @@ class FUBClient:
         return data.get('stages', [])
 
 
+class AsyncFUBClient:
+    """Async FUB client for the poller's read paths (shared pool, bounded concurrency)."""
+
+    def __init__(self):
+        self.api = AsyncAPI(
+            config.FUB_BASE_URL,
+            name='FUB',
+            headers=FUBClient._get_headers(),
+            auth=(config.FUB_API_KEY, ''),
+            max_concurrency=config.FUB_MAX_CONCURRENCY,
+        )
+
+    async def get_task(self, task_id: int) -> Optional[FUBTask]:
+        """Get a specific task by ID."""
+        try:
+            data = await self.api.request_json('GET', f'tasks/{task_id}')
+            return FUBTask.from_api(data) if data else None
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    async def get_tasks(
+        self,
+        person_id: Optional[int] = None,
+        include_completed: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[FUBTask]:
+        """Get tasks with optional filters."""
+        params = {'limit': limit, 'offset': offset}
+        if person_id:
+            params['personId'] = person_id
+        if not include_completed:
+            params['status'] = 'incomplete'
+
+        data = await self.api.request_json('GET', 'tasks', params=params)
+        return [FUBTask.from_api(t) for t in data.get('tasks', [])]
+
+    async def get_tasks_updated_since(
+        self,
+        since: str,
+        include_completed: bool = True,
+        page_size: int = 100,
+        max_pages: int = 50,
+    ) -> list[FUBTask]:
+        """Get tasks updated after `since` (ISO timestamp), oldest change first.
+
+        Stops after max_pages; the rest are listed by the next call from the
+        newest timestamp returned (see _updated_since).
+        """
+        tasks = []
+        truncated = False
+        for page in range(max_pages):
+            params = {'limit': page_size, 'offset': page * page_size,
+                      'updatedAfter': since, 'sort': 'updated'}
+            if not include_completed:
+                params['status'] = 'incomplete'
+
+            data = await self.api.request_json('GET', 'tasks', params=params)
+            batch = data.get('tasks', [])
+            tasks.extend(FUBTask.from_api(t) for t in batch)
+            if len(batch) < page_size:
+                break
+        else:
+            truncated = True
+            logger.warning(f"Stopped paging FUB tasks updated since {since} after {max_pages} pages")
+
+        return _updated_since(tasks, since, truncated)
+
+    async def get_deals_for_person(self, person_id: int) -> list[FUBDeal]:
+        """Get all deals for a specific person."""
+        data = await self.api.request_json('GET', 'deals', params={'limit': 100, 'personId': person_id})
+        return [FUBDeal.from_api(d) for d in data.get('deals', [])]
+
+
 # Module-level singleton
 fub_client = FUBClient()
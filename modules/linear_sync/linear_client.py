@@ -1,9 +1,12 @@
 """Linear GraphQL API client."""
 
+import asyncio
 import logging
 from typing import Optional
 import httpx
 
+from src.core.async_http import AsyncAPI
+
 from .config import config
 from .models import (
     LinearIssue,
@@ -17,6 +20,120 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+def _graphql_data(result: dict) -> dict:
+    """The data of a GraphQL response, raising on errors."""
+    if 'errors' in result:
+        errors = result['errors']
+        logger.error(f"GraphQL errors: {errors}")
+        raise Exception(f"GraphQL error: {errors[0].get('message', str(errors))}")
+    return result.get('data', {})
+
+
+def _issues_query(
+    team_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    state_type: Optional[str] = None,
+    label_ids: Optional[list[str]] = None,
+    updated_after: Optional[str] = None,
+    include_completed: bool = False,
+) -> str:
+    """GetIssues query text for the given filters (takes $first)."""
+    # Build filter
+    filters = []
+
+    if team_id:
+        filters.append(f'team: {{ id: {{ eq: "{team_id}" }} }}')
+
+    if project_id:
+        filters.append(f'project: {{ id: {{ eq: "{project_id}" }} }}')
+
+    if state_type:
+        filters.append(f'state: {{ type: {{ eq: "{state_type}" }} }}')
+    elif not include_completed:
+        # Exclude completed and canceled by default
+        filters.append('state: { type: { nin: ["completed", "canceled"] } }')
+
+    if label_ids:
+        label_filter = ', '.join(f'{{ id: {{ eq: "{lid}" }} }}' for lid in label_ids)
+        filters.append(f'labels: {{ or: [{label_filter}] }}')
+
+    if updated_after:
+        filters.append(f'updatedAt: {{ gte: "{updated_after}" }}')
+
+    filter_str = ', '.join(filters) if filters else ''
+
+    return f"""
+    query GetIssues($first: Int!) {{
+        issues(first: $first, filter: {{ {filter_str} }}, orderBy: updatedAt) {{
+            nodes {{
+                id
+                identifier
+                title
+                description
+                priority
+                state {{
+                    id
+                    name
+                    type
+                }}
+                team {{
+                    id
+                    name
+                }}
+                project {{
+                    id
+                    name
+                }}
+                assignee {{
+                    id
+                }}
+                dueDate
+                completedAt
+                canceledAt
+                createdAt
+                updatedAt
+                labels {{
+                    nodes {{
+                        id
+                        name
+                    }}
+                }}
+                parent {{
+                    id
+                }}
+            }}
+        }}
+    }}
+    """
+
+
+_ISSUES_BY_IDS_QUERY = """
+query GetIssuesByIds($ids: [ID!], $first: Int!) {
+    issues(first: $first, filter: { id: { in: $ids } }, includeArchived: true) {
+        nodes {
+            id
+            identifier
+            title
+            priority
+            state {
+                id
+                name
+                type
+            }
+            team {
+                id
+                name
+            }
+            dueDate
+            completedAt
+            canceledAt
+            updatedAt
+        }
+    }
+}
+"""
+
+
 class LinearClient:
     """GraphQL client for Linear API."""
 
@@ -44,14 +161,7 @@ class LinearClient:
                 headers=self._get_headers(),
             )
             response.raise_for_status()
-            result = response.json()
-
-            if 'errors' in result:
-                errors = result['errors']
-                logger.error(f"GraphQL errors: {errors}")
-                raise Exception(f"GraphQL error: {errors[0].get('message', str(errors))}")
-
-            return result.get('data', {})
+            return _graphql_data(response.json())
 
     # =========================================================================
     # VIEWER / AUTH
@@ -738,74 +848,7 @@ class LinearClient:
         limit: int = 50,
     ) -> list[LinearIssue]:
         """Query issues with filters."""
-        # Build filter
-        filters = []
-
-        if team_id:
-            filters.append(f'team: {{ id: {{ eq: "{team_id}" }} }}')
-
-        if project_id:
-            filters.append(f'project: {{ id: {{ eq: "{project_id}" }} }}')
-
-        if state_type:
-            filters.append(f'state: {{ type: {{ eq: "{state_type}" }} }}')
-        elif not include_completed:
-            # Exclude completed and canceled by default
-            filters.append('state: { type: { nin: ["completed", "canceled"] } }')
-
-        if label_ids:
-            label_filter = ', '.join(f'{{ id: {{ eq: "{lid}" }} }}' for lid in label_ids)
-            filters.append(f'labels: {{ or: [{label_filter}] }}')
-
-        if updated_after:
-            filters.append(f'updatedAt: {{ gte: "{updated_after}" }}')
-
-        filter_str = ', '.join(filters) if filters else ''
-
-        query = f"""
-        query GetIssues($first: Int!) {{
-            issues(first: $first, filter: {{ {filter_str} }}, orderBy: updatedAt) {{
-                nodes {{
-                    id
-                    identifier
-                    title
-                    description
-                    priority
-                    state {{
-                        id
-                        name
-                        type
-                    }}
-                    team {{
-                        id
-                        name
-                    }}
-                    project {{
-                        id
-                        name
-                    }}
-                    assignee {{
-                        id
-                    }}
-                    dueDate
-                    completedAt
-                    canceledAt
-                    createdAt
-                    updatedAt
-                    labels {{
-                        nodes {{
-                            id
-                            name
-                        }}
-                    }}
-                    parent {{
-                        id
-                    }}
-                }}
-            }}
-        }}
-        """
-
+        query = _issues_query(team_id, project_id, state_type, label_ids, updated_after, include_completed)
         data = self._request(query, {'first': limit})
         nodes = data.get('issues', {}).get('nodes', [])
         return [LinearIssue.from_api(i) for i in nodes]
@@ -1020,6 +1063,18 @@ class LinearClient:
     # SYNC HELPERS
     # =========================================================================
 
+    def get_issues_by_ids(self, issue_ids: list[str], chunk_size: int = 50) -> dict[str, LinearIssue]:
+        """Fetch many issues (any state) with one query per chunk, keyed by ID."""
+        ids = list(dict.fromkeys(issue_ids))
+        issues = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            data = self._request(_ISSUES_BY_IDS_QUERY, {'ids': chunk, 'first': len(chunk)})
+            for node in data.get('issues', {}).get('nodes', []):
+                issue = LinearIssue.from_api(node)
+                issues[issue.id] = issue
+        return issues
+
     def get_issues_updated_since(self, since: str, team_id: Optional[str] = None) -> list[LinearIssue]:
         """Get issues updated since a given timestamp."""
         return self.get_issues(
@@ -1030,5 +1085,75 @@ class LinearClient:
         )
 
 
+class _LinearAPI(AsyncAPI):
+    """Linear reports rate limiting as a RATELIMITED GraphQL error, not always a 429."""
+
+    def retryable(self, response: httpx.Response) -> bool:
+        if super().retryable(response):
+            return True
+        if response.status_code != 400:
+            return False
+        try:
+            errors = response.json().get('errors') or []
+        except ValueError:
+            return False
+        return any((e.get('extensions') or {}).get('code') == 'RATELIMITED' for e in errors)
+
+
+class AsyncLinearClient:
+    """Async Linear client for the poller's read paths (shared pool, bounded concurrency)."""
+
+    def __init__(self):
+        self.api = _LinearAPI(
+            config.LINEAR_API_URL,
+            name='Linear',
+            headers={
+                'Content-Type': 'application/json',
+                'Authorization': config.LINEAR_API_KEY,
+            },
+            max_concurrency=config.LINEAR_MAX_CONCURRENCY,
+        )
+
+    async def _request(self, query: str, variables: dict = None) -> dict:
+        """Make a GraphQL request to Linear API."""
+        payload = {'query': query}
+        if variables:
+            payload['variables'] = variables
+        return _graphql_data(await self.api.request_json('POST', json_data=payload))
+
+    async def get_issues(
+        self,
+        team_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        state_type: Optional[str] = None,
+        label_ids: Optional[list[str]] = None,
+        updated_after: Optional[str] = None,
+        include_completed: bool = False,
+        limit: int = 50,
+    ) -> list[LinearIssue]:
+        """Query issues with filters."""
+        query = _issues_query(team_id, project_id, state_type, label_ids, updated_after, include_completed)
+        data = await self._request(query, {'first': limit})
+        return [LinearIssue.from_api(i) for i in data.get('issues', {}).get('nodes', [])]
+
+    async def get_issues_updated_since(self, since: str, team_id: Optional[str] = None) -> list[LinearIssue]:
+        """Get issues updated since a given timestamp."""
+        return await self.get_issues(team_id=team_id, updated_after=since, include_completed=True, limit=100)
+
+    async def get_issues_by_ids(self, issue_ids: list[str], chunk_size: int = 50) -> dict[str, LinearIssue]:
+        """Fetch many issues (any state) keyed by ID, chunks in flight concurrently."""
+        ids = list(dict.fromkeys(issue_ids))
+        chunks = [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+        results = await asyncio.gather(*(
+            self._request(_ISSUES_BY_IDS_QUERY, {'ids': chunk, 'first': len(chunk)}) for chunk in chunks
+        ))
+        issues = {}
+        for data in results:
+            for node in data.get('issues', {}).get('nodes', []):
+                issue = LinearIssue.from_api(node)
+                issues[issue.id] = issue
+        return issues
+
+
 # Module-level singleton
 linear_client = LinearClient()
@@ -1,11 +1,22 @@
-"""Async polling service for continuous Linear ↔ FUB sync."""
+"""Async polling service for continuous Linear ↔ FUB sync.
+
+API reads go through the async clients (one shared connection pool,
+per-API concurrency caps, rate-limit backoff), so independent fetches
+overlap instead of each holding an executor thread. Database work and
+the sync engine's per-item writes still run in a worker thread via
+asyncio.to_thread, and only once the fetched data is in hand.
+"""
 
 import asyncio
 import logging
 import signal
 from datetime import datetime
 
+from src.core.async_http import close_shared_client
+
 from .config import config
+from .fub_client import AsyncFUBClient
+from .linear_client import AsyncLinearClient
 from .sync_engine import sync_engine
 from .db import db
 
@@ -28,14 +39,96 @@ class Poller:
         self._last_fub_poll = None
         self._last_linear_poll = None
 
+        self.fub = AsyncFUBClient()
+        self.linear = AsyncLinearClient()
+
+    async def fub_cycle(self, limit: int = 100) -> int:
+        """One FUB poll: open tasks and completed-task changes fetched concurrently."""
+        since = await asyncio.to_thread(sync_engine.completion_high_water)
+        tasks, updated = await asyncio.gather(
+            self.fub.get_tasks(include_completed=False, limit=limit),
+            self._fub_updated_since(since),
+        )
+        synced = await asyncio.to_thread(sync_engine.apply_fub_changes, tasks)
+        if updated is not None:
+            await self._reconcile_completions(since, updated)
+        return synced
+
+    async def _fub_updated_since(self, since):
+        if not since:
+            return None
+        try:
+            return await self.fub.get_tasks_updated_since(since, include_completed=True)
+        except Exception as e:
+            logger.error(f"Error listing FUB tasks updated since {since}: {e}")
+            return None
+
+    async def _reconcile_completions(self, since: str, tasks: list) -> int:
+        try:
+            changed = await asyncio.to_thread(sync_engine.changed_fub_completions, tasks)
+        except Exception as e:
+            logger.error(f"Error listing FUB tasks updated since {since}: {e}")
+            return 0
+
+        issues = {}
+        if changed:
+            try:
+                issues = await self.linear.get_issues_by_ids([m['linear_issue_id'] for _, m in changed])
+            except Exception as e:
+                logger.error(f"Error fetching Linear issues for completed FUB tasks: {e}")
+                return 0
+
+        return await asyncio.to_thread(sync_engine.apply_fub_completions, since, tasks, changed, issues)
+
+    async def linear_cycle(self, limit: int = 100) -> int:
+        """One Linear poll: every team's issues fetched concurrently, FUB lookups prefetched."""
+        since = await asyncio.to_thread(db.get_state, 'linear_last_poll')
+        team_configs = await asyncio.to_thread(db.get_all_team_configs)
+
+        per_team = await asyncio.gather(*(
+            self.linear.get_issues_updated_since(since=since, team_id=tc['team_id'])
+            if since else self.linear.get_issues(team_id=tc['team_id'], limit=limit)
+            for tc in team_configs
+        ))
+        issues = [issue for team_issues in per_team for issue in team_issues]
+
+        # Failed lookups are left out; apply_linear_changes fetches (and logs) those itself
+        fub_task_ids = await asyncio.to_thread(sync_engine.pending_fub_completions, issues)
+        fetched = await asyncio.gather(*(self.fub.get_task(i) for i in fub_task_ids), return_exceptions=True)
+        fub_tasks = {i: t for i, t in zip(fub_task_ids, fetched) if not isinstance(t, Exception)}
+
+        return await asyncio.to_thread(sync_engine.apply_linear_changes, issues, fub_tasks)
+
+    async def refresh_deals(self) -> int:
+        """Fetch every mapped person's deals concurrently and cache them."""
+        mappings = await asyncio.to_thread(db.get_all_mappings)
+        person_ids = sorted(set(m['fub_person_id'] for m in mappings if m['fub_person_id']))
+
+        results = await asyncio.gather(
+            *(self.fub.get_deals_for_person(pid) for pid in person_ids), return_exceptions=True
+        )
+        deals, failed = [], 0
+        for person_id, result in zip(person_ids, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.warning(f"Deal fetch failed for person {person_id}: {result}")
+            else:
+                deals.extend(result)
+
+        def cache_all():
+            for deal in deals:
+                db.cache_deal(deal)
+
+        await asyncio.to_thread(cache_all)
+        if failed:
+            logger.warning(f"Deal cache refresh: {failed}/{len(person_ids)} people failed")
+        return len(person_ids) - failed
+
     async def poll_fub(self):
         """Poll FUB for task changes."""
         while self.running:
             try:
-                loop = asyncio.get_event_loop()
-                synced = await loop.run_in_executor(
-                    None, sync_engine.poll_fub_changes
-                )
+                synced = await self.fub_cycle()
                 self._fub_synced += synced
                 self._last_fub_poll = datetime.now()
 
@@ -52,10 +145,7 @@ class Poller:
         """Poll Linear for issue changes."""
         while self.running:
             try:
-                loop = asyncio.get_event_loop()
-                synced = await loop.run_in_executor(
-                    None, sync_engine.poll_linear_changes
-                )
+                synced = await self.linear_cycle()
                 self._linear_synced += synced
                 self._last_linear_poll = datetime.now()
 
@@ -70,23 +160,10 @@ class Poller:
 
     async def refresh_deal_cache(self):
         """Periodically refresh deal cache."""
-        from .fub_client import fub_client
-
         while self.running:
             try:
-                # Get all mapped person IDs
-                mappings = db.get_all_mappings()
-                person_ids = set(m['fub_person_id'] for m in mappings if m['fub_person_id'])
-
-                loop = asyncio.get_event_loop()
-                for person_id in person_ids:
-                    deals = await loop.run_in_executor(
-                        None, fub_client.get_deals_for_person, person_id
-                    )
-                    for deal in deals:
-                        db.cache_deal(deal)
-
-                logger.debug(f"Refreshed deal cache for {len(person_ids)} people")
+                refreshed = await self.refresh_deals()
+                logger.debug(f"Refreshed deal cache for {refreshed} people")
 
             except Exception as e:
                 logger.error(f"Deal cache refresh error: {e}")
@@ -132,6 +209,8 @@ class Poller:
             await asyncio.gather(*tasks)
         except asyncio.CancelledError:
             logger.info("Poller tasks cancelled")
+        finally:
+            await close_shared_client()
 
     def stop(self):
         """Stop the poller."""
@@ -469,7 +469,14 @@ class SyncEngine:
 
         # Get incomplete tasks
         tasks = self.fub.get_tasks(include_completed=False, limit=limit)
+        synced = self.apply_fub_changes(tasks)
 
+        # Also check recently completed tasks for completion sync
+        self._sync_completed_fub_tasks()
+        return synced
+
+    def apply_fub_changes(self, tasks: list[FUBTask]) -> int:
+        """Sync already-fetched incomplete FUB tasks to Linear."""
         synced = 0
         for task in tasks:
             try:
@@ -486,31 +493,86 @@ class SyncEngine:
                     status='error',
                 )
 
-        # Also check recently completed tasks for completion sync
-        self._sync_completed_fub_tasks()
-
         logger.debug(f"Synced {synced} tasks from FUB to Linear")
         return synced
 
-    def _sync_completed_fub_tasks(self):
-        """Check mapped FUB tasks that may have been completed."""
-        # Get all mappings where origin is FUB
-        mappings = self.db.get_all_mappings()
-
-        for mapping in mappings:
-            if mapping['origin'] != 'fub':
-                continue
-
+    def _sync_completed_fub_tasks(self) -> int:
+        """Complete Linear issues for FUB-origin tasks completed in FUB.
+
+        Lists FUB tasks updated since the last reconciliation (one paged
+        request), keeps those that are completed and belong to a FUB-origin
+        mapping whose fub_updated_at differs, then fetches only those
+        mappings' Linear issues in bulk. Cost follows the number of changed
+        tasks, not the size of the mapping table.
+        """
+        since = self.completion_high_water()
+        if not since:
+            return 0
+
+        try:
+            tasks = self.fub.get_tasks_updated_since(since, include_completed=True)
+            changed = self.changed_fub_completions(tasks)
+        except Exception as e:
+            logger.error(f"Error listing FUB tasks updated since {since}: {e}")
+            return 0
+
+        issues = {}
+        if changed:
+            try:
+                issues = self.linear.get_issues_by_ids([m['linear_issue_id'] for _, m in changed])
+            except Exception as e:
+                logger.error(f"Error fetching Linear issues for completed FUB tasks: {e}")
+                return 0
+
+        return self.apply_fub_completions(since, tasks, changed, issues)
+
+    def completion_high_water(self) -> Optional[str]:
+        """FUB updated timestamp that completion reconciliation lists from."""
+        return (self.db.get_state('fub_completion_high_water')
+                or self.db.get_oldest_fub_updated_at(origin='fub'))
+
+    def changed_fub_completions(self, tasks: list[FUBTask]) -> list[tuple[FUBTask, dict]]:
+        """(task, mapping) for completed FUB-origin tasks whose version we haven't seen."""
+        mappings = self.db.get_mappings_by_fub_tasks([t.id for t in tasks], origin='fub')
+        return [
+            (task, mappings[task.id]) for task in tasks
+            if task.is_completed and task.id in mappings
+            and mappings[task.id].get('fub_updated_at') != task.updated
+        ]
+
+    def apply_fub_completions(
+        self,
+        since: str,
+        tasks: list[FUBTask],
+        changed: list[tuple[FUBTask, dict]],
+        issues: dict[str, LinearIssue],
+    ) -> int:
+        """Complete the Linear side of changed tasks and advance the high-water mark."""
+        completed = 0
+        failed = False
+        for task, mapping in changed:
             try:
-                task = self.fub.get_task(mapping['fub_task_id'])
-                if task and task.is_completed:
-                    # Check if Linear issue is already completed
-                    issue = self.linear.get_issue(mapping['linear_issue_id'])
-                    if issue and not issue.is_completed:
-                        self._complete_linear_from_fub(task, mapping)
+                issue = issues.get(mapping['linear_issue_id'])
+                if issue and not issue.is_completed:
+                    self._complete_linear_from_fub(task, mapping)
+                    completed += 1
+                else:
+                    # Already done in Linear (or gone); record that we've seen this version
+                    self.db.update_mapping(mapping_id=mapping['id'], fub_updated_at=task.updated)
             except Exception as e:
+                failed = True
                 logger.error(f"Error checking completed FUB task {mapping['fub_task_id']}: {e}")
 
+        # FUB's own timestamps, so the high-water mark isn't subject to local clock skew.
+        # Hold it on failure so the failed tasks are listed again next poll.
+        newest = max((t.updated for t in tasks if t.updated), default=None)
+        if newest and newest > since and not failed:
+            self.db.set_state('fub_completion_high_water', newest)
+
+        logger.debug(f"Completion reconciliation: {len(tasks)} FUB tasks updated since {since}, "
+                     f"{len(changed)} changed, {completed} Linear issues completed")
+        return completed
+
     def poll_linear_changes(self, limit: int = 100) -> int:
         """Poll Linear for issue changes and sync to FUB."""
         logger.debug("Polling Linear for issue changes")
@@ -530,6 +592,24 @@ class SyncEngine:
             ) if since else self.linear.get_issues(team_id=tc['team_id'], limit=limit)
             issues.extend(team_issues)
 
+        return self.apply_linear_changes(issues)
+
+    def pending_fub_completions(self, issues: list[LinearIssue]) -> list[int]:
+        """FUB task IDs apply_linear_changes() will look up, for prefetching."""
+        fub_task_ids = []
+        for issue in issues:
+            if issue.is_completed:
+                mapping = self.db.get_mapping_by_linear(issue.id)
+                if mapping and mapping['origin'] == 'fub':
+                    fub_task_ids.append(mapping['fub_task_id'])
+        return fub_task_ids
+
+    def apply_linear_changes(self, issues: list[LinearIssue], fub_tasks: Optional[dict] = None) -> int:
+        """Sync already-fetched Linear issues to FUB.
+
+        fub_tasks optionally maps FUB task ID -> prefetched FUBTask (or None
+        if gone) for pending_fub_completions(); anything missing is fetched.
+        """
         synced = 0
         for issue in issues:
             # Skip issues that came from FUB (to avoid loops)
@@ -537,7 +617,7 @@ class SyncEngine:
             if mapping and mapping['origin'] == 'fub':
                 # Still check for completion sync
                 if issue.is_completed:
-                    self._sync_completion_to_fub(issue, mapping)
+                    self._sync_completion_to_fub(issue, mapping, fub_tasks)
                 continue
 
             try:
@@ -560,11 +640,14 @@ class SyncEngine:
         logger.debug(f"Synced {synced} issues from Linear to FUB")
         return synced
 
-    def _sync_completion_to_fub(self, issue: LinearIssue, mapping: dict):
+    def _sync_completion_to_fub(self, issue: LinearIssue, mapping: dict, fub_tasks: Optional[dict] = None):
         """Sync completion status to FUB for FUB-originated issues."""
         if issue.is_completed or issue.is_canceled:
             try:
-                task = self.fub.get_task(mapping['fub_task_id'])
+                if fub_tasks is not None and mapping['fub_task_id'] in fub_tasks:
+                    task = fub_tasks[mapping['fub_task_id']]
+                else:
+                    task = self.fub.get_task(mapping['fub_task_id'])
                 if task and not task.is_completed:
                     self._complete_fub_from_linear(issue, mapping)
             except Exception as e:
@@ -37,6 +37,10 @@ class Config:
     TODOIST_POLL_INTERVAL: int = int(os.getenv('TODOIST_POLL_INTERVAL', '30'))
     DEAL_CACHE_REFRESH: int = int(os.getenv('DEAL_CACHE_REFRESH', '300'))
 
+    # Poller HTTP: max in-flight requests per API
+    FUB_MAX_CONCURRENCY: int = int(os.getenv('FUB_MAX_CONCURRENCY', '4'))
+    TODOIST_MAX_CONCURRENCY: int = int(os.getenv('TODOIST_MAX_CONCURRENCY', '4'))
+
     # Database
     DB_PATH: Path = PROJECT_ROOT / 'data' / 'task_sync.db'
 
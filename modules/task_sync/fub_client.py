@@ -10,6 +10,8 @@ from typing import Optional
 
 import httpx
 
+from src.core.async_http import AsyncAPI
+
 from .config import config
 from .models import FUBTask, FUBDeal, FUBPipeline
 
@@ -23,7 +25,8 @@ class FUBClient:
         self.base_url = config.FUB_BASE_URL
         self.api_key = config.FUB_API_KEY
 
-    def _get_headers(self) -> dict:
+    @staticmethod
+    def _get_headers() -> dict:
         """Get request headers."""
         headers = {
             'Content-Type': 'application/json',
@@ -260,5 +263,36 @@ class FUBClient:
         return results
 
 
+class AsyncFUBClient:
+    """Async FUB client for the poller's read paths (shared pool, bounded concurrency)."""
+
+    def __init__(self):
+        self.api = AsyncAPI(
+            config.FUB_BASE_URL,
+            name='FUB',
+            headers=FUBClient._get_headers(),
+            auth=(config.FUB_API_KEY, ''),
+            max_concurrency=config.FUB_MAX_CONCURRENCY,
+        )
+
+    async def get_tasks(
+        self,
+        person_id: Optional[int] = None,
+        updated_after: Optional[datetime] = None,
+        limit: int = 100
+    ) -> list[FUBTask]:
+        """Get tasks, optionally filtered."""
+        params = {'limit': min(limit, 100)}
+
+        if person_id:
+            params['personId'] = person_id
+
+        if updated_after:
+            params['updatedAfter'] = updated_after.isoformat()
+
+        data = await self.api.request_json('GET', 'tasks', params=params)
+        return [FUBTask.from_api(t) for t in data.get('tasks', [])]
+
+
 # Module-level instance
 fub_client = FUBClient()
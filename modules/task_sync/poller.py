@@ -5,6 +5,12 @@ Runs async loops to:
 - Poll FUB for task changes
 - Poll Todoist for changes (dev mode)
 - Refresh deal cache periodically
+
+API reads use the async clients (shared connection pool, per-API
+concurrency caps, rate-limit backoff), so the FUB and Todoist polls
+overlap without each holding an executor thread. Database work and the
+sync engine's per-task writes run via asyncio.to_thread once the
+fetched changes are in hand.
 """
 
 import asyncio
@@ -13,10 +19,13 @@ import signal
 from datetime import datetime, timedelta
 from typing import Optional
 
+from src.core.async_http import close_shared_client
+
 from .config import config
 from .db import db
+from .fub_client import AsyncFUBClient
 from .sync_engine import sync_engine
-from .todoist_client import todoist_client
+from .todoist_client import AsyncTodoistClient
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +50,9 @@ class Poller:
         self._tasks_synced = 0
         self._errors = 0
 
+        self.fub = AsyncFUBClient()
+        self.todoist = AsyncTodoistClient()
+
     def _setup_signal_handlers(self):
         """Setup graceful shutdown handlers."""
         def shutdown_handler(signum, frame):
@@ -50,15 +62,45 @@ class Poller:
         signal.signal(signal.SIGTERM, shutdown_handler)
         signal.signal(signal.SIGINT, shutdown_handler)
 
+    async def fub_cycle(self) -> list[int]:
+        """One FUB poll: fetch changed tasks, then sync them to Todoist."""
+        updated_after = await asyncio.to_thread(sync_engine.fub_poll_since)
+        logger.info(f"Polling FUB for changes since {updated_after}")
+
+        try:
+            tasks = await self.fub.get_tasks(updated_after=updated_after)
+        except Exception as e:
+            logger.error(f"Failed to poll FUB: {e}")
+            return []
+
+        return await asyncio.to_thread(sync_engine.apply_fub_changes, tasks)
+
+    async def todoist_cycle(self, sync_token: str) -> tuple[str, int, int]:
+        """
+        One Todoist incremental sync.
+
+        Returns (next sync token, tasks synced, items changed).
+        """
+        response = await self.todoist.incremental_sync(sync_token=sync_token, resource_types=['items'])
+
+        # Update sync token
+        new_token = response.get('sync_token')
+        if new_token:
+            sync_token = new_token
+            await asyncio.to_thread(db.set_state, 'todoist_sync_token', new_token)
+
+        # Process changed items
+        items = response.get('items', [])
+        synced_count = await asyncio.to_thread(sync_engine.apply_todoist_items, items)
+        return sync_token, synced_count, len(items)
+
     async def poll_fub(self):
         """Poll FUB for task changes."""
         while self.running:
             try:
                 logger.debug(f"Polling FUB (interval: {self.fub_poll_interval}s)")
 
-                # Run sync in thread pool to not block async loop
-                loop = asyncio.get_event_loop()
-                synced = await loop.run_in_executor(None, sync_engine.poll_fub_changes)
+                synced = await self.fub_cycle()
 
                 self._fub_polls += 1
                 self._tasks_synced += len(synced)
@@ -86,48 +128,13 @@ class Poller:
             return
 
         # Get or initialize sync token
-        sync_token = db.get_state('todoist_sync_token') or '*'
+        sync_token = await asyncio.to_thread(db.get_state, 'todoist_sync_token') or '*'
 
         while self.running:
             try:
                 logger.debug(f"Polling Todoist (interval: {self.todoist_poll_interval}s)")
 
-                # Run sync in thread pool
-                loop = asyncio.get_event_loop()
-
-                def do_todoist_sync():
-                    nonlocal sync_token
-                    response = todoist_client.incremental_sync(
-                        sync_token=sync_token,
-                        resource_types=['items']
-                    )
-
-                    # Update sync token
-                    new_token = response.get('sync_token')
-                    if new_token:
-                        sync_token = new_token
-                        db.set_state('todoist_sync_token', new_token)
-
-                    # Process changed items
-                    items = response.get('items', [])
-                    synced_count = 0
-
-                    for item in items:
-                        # Skip deleted items
-                        if item.get('is_deleted'):
-                            continue
-
-                        # Check if we have a mapping for this task
-                        from .models import TodoistTask
-                        todoist_task = TodoistTask.from_api(item)
-
-                        result = sync_engine.sync_todoist_task_to_fub(todoist_task)
-                        if result:
-                            synced_count += 1
-
-                    return synced_count, len(items)
-
-                synced_count, total_items = await loop.run_in_executor(None, do_todoist_sync)
+                sync_token, synced_count, total_items = await self.todoist_cycle(sync_token)
 
                 self._todoist_polls += 1
                 self._tasks_synced += synced_count
@@ -222,6 +229,7 @@ class Poller:
 
         # Wait for tasks to complete
         await asyncio.gather(*tasks, return_exceptions=True)
+        await close_shared_client()
 
         logger.info("Poller stopped")
         logger.info(f"Final stats: {self._fub_polls} FUB polls, {self._todoist_polls} Todoist polls, {self._tasks_synced} synced, {self._errors} errors")
@@ -473,14 +473,7 @@ class SyncEngine:
 
         Returns list of FUB task IDs that were synced.
         """
-        # Get last poll timestamp
-        last_poll = db.get_state('fub_last_poll')
-        if last_poll:
-            updated_after = datetime.fromisoformat(last_poll)
-        else:
-            # First run - sync tasks from last 24 hours
-            updated_after = datetime.now() - timedelta(hours=24)
-
+        updated_after = self.fub_poll_since()
         logger.info(f"Polling FUB for changes since {updated_after}")
 
         # Get changed tasks
@@ -490,6 +483,22 @@ class SyncEngine:
             logger.error(f"Failed to poll FUB: {e}")
             return []
 
+        return self.apply_fub_changes(tasks)
+
+    def fub_poll_since(self) -> datetime:
+        """Timestamp the next FUB poll lists changes from."""
+        last_poll = db.get_state('fub_last_poll')
+        if last_poll:
+            return datetime.fromisoformat(last_poll)
+        # First run - sync tasks from last 24 hours
+        return datetime.now() - timedelta(hours=24)
+
+    def apply_fub_changes(self, tasks: list[FUBTask]) -> list[int]:
+        """
+        Sync already-fetched FUB tasks to Todoist and advance the poll timestamp.
+
+        Returns list of FUB task IDs that were synced.
+        """
         synced = []
         for task in tasks:
             try:
@@ -512,6 +521,23 @@ class SyncEngine:
         logger.info(f"FUB poll complete: {len(tasks)} tasks checked, {len(synced)} synced")
         return synced
 
+    def apply_todoist_items(self, items: list[dict]) -> int:
+        """
+        Sync changed items from a Todoist incremental sync back to FUB.
+
+        Returns number of tasks synced.
+        """
+        synced_count = 0
+        for item in items:
+            # Skip deleted items
+            if item.get('is_deleted'):
+                continue
+
+            if self.sync_todoist_task_to_fub(TodoistTask.from_api(item)):
+                synced_count += 1
+
+        return synced_count
+
     def sync_mapped_task(self, fub_task_id: int) -> dict:
         """
         Sync a specific mapped task (by FUB ID).
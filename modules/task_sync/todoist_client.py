@@ -9,6 +9,8 @@ from typing import Optional
 
 import httpx
 
+from src.core.async_http import AsyncAPI
+
 from .config import config
 from .models import TodoistTask
 
@@ -268,5 +270,25 @@ class TodoistClient:
         return self._sync_request(resource_types=resource_types, sync_token=sync_token)
 
 
+class AsyncTodoistClient:
+    """Async Todoist client for the poller's incremental sync (shared pool, bounded concurrency)."""
+
+    def __init__(self):
+        self.api = AsyncAPI(
+            TodoistClient.BASE_URL,
+            name='Todoist',
+            headers={
+                'Authorization': f'Bearer {config.TODOIST_API_TOKEN}',
+                'Content-Type': 'application/json',
+            },
+            max_concurrency=config.TODOIST_MAX_CONCURRENCY,
+        )
+
+    async def incremental_sync(self, sync_token: str = '*', resource_types: list = None) -> dict:
+        """Perform an incremental sync; see TodoistClient.incremental_sync."""
+        data = {'sync_token': sync_token, 'resource_types': resource_types or ['items']}
+        return await self.api.request_json('POST', 'sync', json_data=data)
+
+
 # Module-level instance
 todoist_client = TodoistClient()
@@ -29,6 +29,8 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from apps.photos import manifest  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 log = logging.getLogger("cleanup-non-wnc")
 
@@ -202,6 +204,7 @@ def quarantine_photos(listings, dry_run=False, hard_delete=False):
             listings_without_files += 1
             continue
 
+        removed = []
         for fname, size in matched:
             src_path = src_dir / fname
             if not dry_run:
@@ -213,8 +216,15 @@ def quarantine_photos(listings, dry_run=False, hard_delete=False):
                 except OSError as e:
                     log.warning("File op failed for %s: %s", src_path, e)
                     continue
+                removed.append(fname)
             files_moved += 1
             bytes_moved += size
+        if removed:
+            # Keep the serving-side photo manifest from listing them
+            try:
+                manifest.forget(src_dir, removed)
+            except OSError as e:
+                log.warning("Manifest update failed for %s: %s", mls_number, e)
 
         if i % progress_every == 0:
             log.info(
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Check, refresh or rebuild the contact_intelligence rollup behind the
+Mission Control briefing.
+
+The FUB sync and event ingest refresh queued contacts after each run. By
+default this prints the rollup's freshness and exits 1 if it is stale
+(scored leads missing a row, lapsed 24h/7d windows, or queued contacts);
+--refresh processes just those, --rebuild recomputes every scored lead.
+
+Usage:
+    python3 scripts/contact_intelligence.py              # status (report only)
+    python3 scripts/contact_intelligence.py --refresh    # queued/expired/missing, then status
+    python3 scripts/contact_intelligence.py --rebuild    # every scored lead, then status
+    python3 scripts/contact_intelligence.py --contact 12345 --contact 67890
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core import contact_intelligence
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check, refresh or rebuild the contact_intelligence rollup')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--refresh', action='store_true', help='Recompute queued, expired and missing contacts')
+    mode.add_argument('--rebuild', action='store_true', help='Recompute every scored lead')
+    mode.add_argument('--contact', action='append', default=[],
+                      help='Recompute only this leads.id or FUB person id (repeatable)')
+    args = parser.parse_args()
+
+    from src.core.pg_adapter import get_db, is_postgres
+    conn = get_db()
+
+    try:
+        if not is_postgres():
+            # Alembic f3a8c5e1d7b2 creates the tables on PostgreSQL
+            contact_intelligence.ensure_tables(conn)
+        started = time.perf_counter()
+        written = None
+        if args.rebuild:
+            written = contact_intelligence.rebuild(conn)
+        elif args.refresh:
+            written = contact_intelligence.refresh(conn)
+        elif args.contact:
+            written = contact_intelligence.refresh(conn, args.contact, sweep=False)
+        if written is not None:
+            conn.commit()
+            print(f"Recomputed {written:,} contacts in {time.perf_counter() - started:.1f}s")
+
+        report = contact_intelligence.status(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    age = report['age_seconds']
+    print(f"{report['contacts']:,} rows; {report['missing']:,} missing, "
+          f"{report['expired']:,} expired, {report['queued']:,} queued")
+    print(f"Last refresh: {report['last_refresh'] or 'never'}"
+          + (f" ({age // 60:,} min ago)" if age is not None else ""))
+
+    return 1 if report['stale'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
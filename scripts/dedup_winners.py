@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Check or rebuild the precomputed cross-MLS dedup flags on listings.
+
+The sync engines keep is_dedup_winner / is_idx_dedup_winner current for
+the address groups they write. Anything else that changes status,
+address_key or idx_opt_in (manual SQL, cleanup scripts) can leave a group
+stale. By default this compares every flag against the live DEDUP_CONDITION
+subquery and exits 1 on any disagreement, --rebuild recomputes them all.
+
+Usage:
+    python3 scripts/dedup_winners.py                # check (report only)
+    python3 scripts/dedup_winners.py --rebuild      # recompute all flags, then check
+    python3 scripts/dedup_winners.py --address-key 3f9a1c0d2b7e4a55
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.listing_service import check_dedup_winners, refresh_dedup_winners
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check or rebuild cross-MLS dedup winner flags')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute every flag before checking')
+    parser.add_argument('--address-key', action='append', default=[],
+                        help='Recompute only this address_key group (repeatable)')
+    parser.add_argument('--samples', type=int, default=20, help='Mismatched rows to print')
+    args = parser.parse_args()
+
+    from src.core.pg_adapter import get_db
+    conn = get_db()
+
+    try:
+        if args.rebuild or args.address_key:
+            updated = refresh_dedup_winners(conn, args.address_key or None)
+            conn.commit()
+            print(f"Recomputed dedup flags on {updated:,} listings")
+
+        report = check_dedup_winners(conn, sample_limit=args.samples)
+    finally:
+        conn.close()
+
+    print(f"Checked {report['checked']:,} listings with an address_key: "
+          f"{report['mismatched']:,} mismatched")
+    for row in report['samples']:
+        print(f"  {row['mls_source']:<18} {row['mls_number']:<14} {row['address_key']}: "
+              f"flag={row['is_dedup_winner']}/{row['is_idx_dedup_winner']} "
+              f"live={row['live_winner']}/{row['live_idx_winner']}")
+
+    return 1 if report['mismatched'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
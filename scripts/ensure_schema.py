@@ -22,6 +22,9 @@ LISTINGS_COLUMNS = {
     'zone': 'INTEGER',
     'photos_local': 'TEXT',
     'photos_refreshed_at': 'TEXT',
+    # Precomputed cross-MLS dedup (listing_service.refresh_dedup_winners)
+    'is_dedup_winner': 'INTEGER NOT NULL DEFAULT 1',
+    'is_idx_dedup_winner': 'INTEGER NOT NULL DEFAULT 1',
 }
 
 SHOWINGS_COLUMNS = {
@@ -94,6 +97,10 @@ def ensure_indexes(conn):
         "CREATE INDEX IF NOT EXISTS idx_listings_county ON listings(county)",
         "CREATE INDEX IF NOT EXISTS idx_listings_city ON listings(city)",
         "CREATE INDEX IF NOT EXISTS idx_listings_list_price ON listings(list_price)",
+        # Cross-MLS dedup: group lookup for refresh_dedup_winners and the
+        # live subquery, plus the public grid's winner filter
+        "CREATE INDEX IF NOT EXISTS idx_listings_dedup_group ON listings(address_key, property_type)",
+        "CREATE INDEX IF NOT EXISTS idx_listings_idx_dedup_winner ON listings(is_idx_dedup_winner, status)",
     ]
     for idx in indexes:
         conn.execute(idx)
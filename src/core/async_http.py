@@ -0,0 +1,185 @@
+"""
+Shared asyncio HTTP plumbing for the sync pollers.
+
+The linear_sync and task_sync pollers used to push blocking client calls
+onto the default executor, one thread per in-flight request. Their async
+clients are built on AsyncAPI instead:
+
+  - One httpx.AsyncClient, and so one keep-alive connection pool, per event
+    loop, shared by every API (FUB, Linear, Todoist).
+  - A per-API semaphore capping in-flight requests, so fanning out over a
+    few hundred people can't flood an API.
+  - Backoff on 429/502/503/504 and refused connections. Retry-After is
+    honoured when the server sends it, otherwise exponential with jitter.
+    A 429 pauses every request to that API, not just the one that got it.
+
+Usage:
+    from src.core.async_http import AsyncAPI, close_shared_client
+
+    api = AsyncAPI('https://api.example.com/v1', name='example', max_concurrency=4)
+    data = await api.request_json('GET', 'things', params={'limit': 100})
+
+    await close_shared_client()  # once, when the loop shuts down
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+import weakref
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+LOW_REMAINING_WARNING = 10
+
+# httpx.AsyncClient connections belong to the loop that opened them
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+
+
+def shared_client() -> httpx.AsyncClient:
+    """The running loop's pooled client, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=POOL_LIMITS)
+        _clients[loop] = client
+    return client
+
+
+async def close_shared_client():
+    """Close the running loop's pooled client, if one was opened."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def retry_after(response: httpx.Response, default: float) -> float:
+    """Seconds to wait from a Retry-After header (delta or HTTP date), else default."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class AsyncAPI:
+    """One remote API: base URL, auth, concurrency cap and backoff policy."""
+
+    def __init__(
+        self,
+        base_url: str,
+        name: str,
+        headers: Optional[dict] = None,
+        auth=None,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.name = name
+        self.headers = headers or {}
+        self.auth = auth
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._resume_at = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def retryable(self, response: httpx.Response) -> bool:
+        """Whether a response means "try again later". Override for APIs that signal it in the body."""
+        return response.status_code in RETRY_STATUSES
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str = '',
+        params: Optional[dict] = None,
+        json_data: Optional[dict] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying while the API says to back off.
+
+        Returns the final response whatever its status; callers decide what
+        an error means. Raises the connection error once retries run out.
+        """
+        url = f"{self.base_url}/{endpoint}" if endpoint else self.base_url
+        attempt = 0
+
+        while True:
+            pause = self._resume_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            async with self._semaphore():
+                try:
+                    response = await shared_client().request(
+                        method,
+                        url,
+                        headers=self.headers,
+                        params=params,
+                        json=json_data,
+                        auth=self.auth,
+                        timeout=self.timeout,
+                    )
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    response, reason = None, type(e).__name__
+                else:
+                    reason = str(response.status_code)
+
+            delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+            if response is not None:
+                remaining = response.headers.get('X-RateLimit-Remaining')
+                if remaining and remaining.isdigit() and int(remaining) < LOW_REMAINING_WARNING:
+                    logger.warning("%s rate limit low: %s remaining", self.name, remaining)
+
+                if attempt >= self.max_retries or not self.retryable(response):
+                    return response
+
+                delay = min(retry_after(response, delay), self.max_backoff)
+                if response.status_code == 429:
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+            delay += random.uniform(0, delay * 0.1)
+            attempt += 1
+            logger.warning("%s %s %s -> %s, retry %d/%d in %.1fs",
+                           self.name, method, endpoint or '/', reason, attempt, self.max_retries, delay)
+            await asyncio.sleep(delay)
+
+    async def request_json(
+        self,
+        method: str,
+        endpoint: str = '',
+        params: Optional[dict] = None,
+        json_data: Optional[dict] = None,
+    ) -> dict:
+        """request(), then raise_for_status() and decode; empty bodies decode to {}."""
+        response = await self.request(method, endpoint, params=params, json_data=json_data)
+        response.raise_for_status()
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
@@ -0,0 +1,455 @@
+"""
+Materialized per-contact rollup behind the Mission Control briefing.
+
+get_morning_briefing_contacts used to compute ~15 correlated subqueries per
+lead row (recent views and favorites, last communication, the next due
+action, intake summary, recent packages, latest heat delta, distinct
+properties viewed) on every dashboard load. This module keeps those values
+in `contact_intelligence`, one row per scored lead, and the read queries
+LEFT JOIN it instead.
+
+Rows are refreshed set-based, a chunk of contacts per grouped query:
+
+  - Writers that change a contact's inputs call `mark_dirty()` in the same
+    transaction (communication/event batches, scoring history, actions,
+    intake forms). Keys may be a leads.id or a FUB person id; both resolve.
+  - `refresh()` recomputes the queued contacts, plus any row whose
+    `expires_at` has passed (a view ageing out of the 24h/7d window, a
+    pending action coming due, a package turning 14 days old) and any
+    scored lead that has no row yet. The FUB sync and event ingest call it
+    after committing their writes.
+  - `rebuild()` recomputes every scored lead and drops orphaned rows
+    (scripts/contact_intelligence.py).
+
+`status()` reports how fresh the table is; each row also carries
+`refreshed_at`. Windowed counts are exact as of the last refresh, so they
+can lag by at most the time between syncs.
+
+Usage:
+    from src.core import contact_intelligence
+
+    contact_intelligence.mark_dirty(conn, ['12345'])
+    contact_intelligence.refresh(conn)
+    conn.commit()
+"""
+
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNK = 500
+VIEW_WINDOW_SHORT = timedelta(hours=24)
+VIEW_WINDOW_LONG = timedelta(days=7)
+PACKAGE_WINDOW = timedelta(days=14)
+
+PROPERTY_EVENT_TYPES = ('property_view', 'property_favorite', 'property_share')
+
+# Created by the buyer-workflow schema, not DREAMSDatabase; a bare SQLite
+# database may not have them.
+OPTIONAL_TABLES = ('intake_forms', 'packages')
+
+# Leads the briefing and call lists can show
+SCOPE_WHERE = "contact_group = 'scored'"
+
+COLUMNS = (
+    'contact_id',
+    'property_views_24h', 'property_views_7d', 'favorites_7d', 'property_view_count',
+    'last_comm_at',
+    'pending_action_due', 'pending_action_desc',
+    'has_intake', 'intake_need_type', 'financing_status', 'pre_approval_amount', 'intake_count',
+    'has_recent_package',
+    'heat_delta',
+    'expires_at', 'refreshed_at',
+)
+
+
+def ensure_tables(conn) -> None:
+    """Create the rollup and its refresh queue.
+
+    Alembic migration f3a8c5e1d7b2 creates them on PostgreSQL.
+    DREAMSDatabase creates them on a fresh SQLite database, and
+    scripts/contact_intelligence.py on an older one. Everything else
+    here assumes the tables exist.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS contact_intelligence ("
+        "contact_id TEXT PRIMARY KEY, "
+        "property_views_24h INTEGER NOT NULL DEFAULT 0, "
+        "property_views_7d INTEGER NOT NULL DEFAULT 0, "
+        "favorites_7d INTEGER NOT NULL DEFAULT 0, "
+        "property_view_count INTEGER NOT NULL DEFAULT 0, "
+        "last_comm_at TEXT, "
+        "pending_action_due TEXT, "
+        "pending_action_desc TEXT, "
+        "has_intake INTEGER NOT NULL DEFAULT 0, "
+        "intake_need_type TEXT, "
+        "financing_status TEXT, "
+        "pre_approval_amount INTEGER, "
+        "intake_count INTEGER NOT NULL DEFAULT 0, "
+        "has_recent_package INTEGER NOT NULL DEFAULT 0, "
+        "heat_delta REAL, "
+        "expires_at TEXT, "
+        "refreshed_at TEXT)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contact_intelligence_expires "
+        "ON contact_intelligence (expires_at)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS contact_intelligence_queue ("
+        "contact_key TEXT PRIMARY KEY, "
+        "queued_at TEXT)"
+    )
+
+
+def _naive(value: Any) -> Optional[datetime]:
+    """Wall-clock datetime from a stored timestamp, ignoring any UTC offset.
+
+    The windows compare occurred_at strings against naive isoformat cutoffs,
+    so expiry has to be computed on the same wall-clock basis.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.fromisoformat(str(value)[:19].replace(' ', 'T'))
+    except ValueError:
+        return None
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _amount(value: Any) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    try:
+        return int(float(str(value).replace(',', '').replace('$', '')))
+    except ValueError:
+        return None
+
+
+def _chunks(items: List, size: int = CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def mark_dirty(conn, contact_keys: Iterable[Any]) -> int:
+    """Queue contacts for the next refresh(). Caller commits.
+
+    Keys are leads.id or FUB person ids; refresh() matches either.
+    """
+    keys = sorted({str(k) for k in contact_keys if k is not None and str(k) != ''})
+    if not keys:
+        return 0
+    stamp = datetime.now().isoformat()
+    for chunk in _chunks(keys):
+        conn.execute(
+            "INSERT INTO contact_intelligence_queue (contact_key, queued_at) "
+            f"VALUES {', '.join(['(?, ?)'] * len(chunk))} "
+            "ON CONFLICT (contact_key) DO UPDATE SET queued_at = excluded.queued_at",
+            [v for key in chunk for v in (key, stamp)],
+        )
+    return len(keys)
+
+
+def _existing_tables(conn, names: Tuple[str, ...]) -> set:
+    placeholders = ', '.join('?' for _ in names)
+    if isinstance(conn, sqlite3.Connection):
+        query = f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})"
+    else:
+        query = (
+            "SELECT table_name FROM information_schema.tables "
+            f"WHERE table_schema = current_schema() AND table_name IN ({placeholders})"
+        )
+    return {row[0] for row in conn.execute(query, list(names)).fetchall()}
+
+
+def _resolve_leads(conn, keys: List[str]) -> Dict[str, Optional[str]]:
+    """leads.id -> fub_id text for scored leads matching keys by id or fub_id."""
+    leads: Dict[str, Optional[str]] = {}
+    for chunk in _chunks(keys):
+        placeholders = ', '.join('?' for _ in chunk)
+        rows = conn.execute(
+            f"SELECT id, fub_id FROM leads WHERE {SCOPE_WHERE} "
+            f"AND (id IN ({placeholders}) OR CAST(fub_id AS TEXT) IN ({placeholders}))",
+            chunk + chunk,
+        ).fetchall()
+        for row in rows:
+            leads[str(row['id'])] = str(row['fub_id']) if row['fub_id'] is not None else None
+    return leads
+
+
+def _compute_chunk(conn, leads: Dict[str, Optional[str]], now: datetime, tables: set) -> List[tuple]:
+    """Rollup rows (in COLUMNS order) for one chunk of leads."""
+    lead_ids = list(leads)
+    fub_ids = sorted({f for f in leads.values() if f})
+    id_ph = ', '.join('?' for _ in lead_ids)
+    cutoff_24h = (now - VIEW_WINDOW_SHORT).isoformat()
+    cutoff_7d = (now - VIEW_WINDOW_LONG).isoformat()
+    today = now.strftime('%Y-%m-%d')
+
+    events: Dict[str, Any] = {}
+    if fub_ids:
+        fub_ph = ', '.join('?' for _ in fub_ids)
+        type_ph = ', '.join('?' for _ in PROPERTY_EVENT_TYPES)
+        rows = conn.execute(f'''
+            SELECT contact_id,
+                   SUM(CASE WHEN event_type = 'property_view' AND occurred_at >= ? THEN 1 ELSE 0 END) AS views_24h,
+                   SUM(CASE WHEN event_type = 'property_view' AND occurred_at >= ? THEN 1 ELSE 0 END) AS views_7d,
+                   SUM(CASE WHEN event_type = 'property_favorite' AND occurred_at >= ? THEN 1 ELSE 0 END) AS favorites_7d,
+                   COUNT(DISTINCT CASE WHEN event_type IN ({type_ph})
+                         THEN COALESCE(property_mls, property_address) END) AS property_view_count,
+                   MIN(CASE WHEN event_type = 'property_view' AND occurred_at >= ?
+                       THEN occurred_at END) AS oldest_24h,
+                   MIN(CASE WHEN event_type IN ('property_view', 'property_favorite') AND occurred_at >= ?
+                       THEN occurred_at END) AS oldest_7d
+            FROM contact_events
+            WHERE contact_id IN ({fub_ph})
+            GROUP BY contact_id
+        ''', [cutoff_24h, cutoff_7d, cutoff_7d, *PROPERTY_EVENT_TYPES, cutoff_24h, cutoff_7d]
+            + fub_ids).fetchall()
+        events = {str(row['contact_id']): row for row in rows}
+
+    last_comm = {
+        str(row['contact_id']): row['last_comm_at']
+        for row in conn.execute(f'''
+            SELECT contact_id, MAX(occurred_at) AS last_comm_at
+            FROM contact_communications
+            WHERE contact_id IN ({id_ph})
+            GROUP BY contact_id
+        ''', lead_ids).fetchall()
+    }
+
+    # Earliest open action due today or before, and the next one coming due
+    due_now: Dict[str, Tuple[str, Any]] = {}
+    due_next: Dict[str, str] = {}
+    for row in conn.execute(f'''
+        SELECT contact_id, due_date, description
+        FROM contact_actions
+        WHERE contact_id IN ({id_ph})
+        AND completed_at IS NULL AND due_date IS NOT NULL
+        ORDER BY due_date ASC, id ASC
+    ''', lead_ids).fetchall():
+        cid, due = str(row['contact_id']), _text(row['due_date'])
+        if due <= today:
+            due_now.setdefault(cid, (due, row['description']))
+        else:
+            due_next.setdefault(cid, due)
+
+    intakes: Dict[str, List] = {}
+    if 'intake_forms' in tables:
+        intake_keys = sorted(set(lead_ids) | set(fub_ids))
+        intake_ph = ', '.join('?' for _ in intake_keys)
+        for row in conn.execute(f'''
+            SELECT lead_id, status, need_type, financing_status, pre_approval_amount
+            FROM intake_forms
+            WHERE lead_id IN ({intake_ph})
+            ORDER BY priority ASC
+        ''', intake_keys).fetchall():
+            intakes.setdefault(str(row['lead_id']), []).append(row)
+
+    last_package: Dict[str, Optional[datetime]] = {}
+    if 'packages' in tables:
+        last_package = {
+            str(row['lead_id']): _naive(row['created_at'])
+            for row in conn.execute(f'''
+                SELECT lead_id, MAX(created_at) AS created_at
+                FROM packages
+                WHERE lead_id IN ({id_ph})
+                GROUP BY lead_id
+            ''', lead_ids).fetchall()
+        }
+
+    heat = {
+        str(row['contact_id']): row['heat_delta']
+        for row in conn.execute(f'''
+            SELECT contact_id, heat_delta FROM (
+                SELECT contact_id, heat_delta,
+                       ROW_NUMBER() OVER (PARTITION BY contact_id
+                                          ORDER BY recorded_at DESC, id DESC) AS rn
+                FROM contact_scoring_history
+                WHERE contact_id IN ({id_ph})
+            ) latest
+            WHERE rn = 1
+        ''', lead_ids).fetchall()
+    }
+
+    stamp = now.isoformat()
+    out = []
+    for lead_id, fub_id in leads.items():
+        expiries = []
+
+        ev = events.get(fub_id) if fub_id else None
+        oldest_24h = _naive(ev['oldest_24h']) if ev else None
+        oldest_7d = _naive(ev['oldest_7d']) if ev else None
+        if oldest_24h:
+            expiries.append(oldest_24h + VIEW_WINDOW_SHORT)
+        if oldest_7d:
+            expiries.append(oldest_7d + VIEW_WINDOW_LONG)
+
+        pending = due_now.get(lead_id)
+        if lead_id in due_next:
+            expiries.append(_naive(due_next[lead_id]))
+
+        own_forms = intakes.get(lead_id, [])
+        active = [f for f in own_forms if f['status'] == 'active']
+        approved = [f for f in active if f['pre_approval_amount'] is not None]
+        intake_count = len(own_forms)
+        if fub_id and fub_id != lead_id:
+            intake_count += len(intakes.get(fub_id, []))
+
+        packaged = last_package.get(lead_id)
+        recent_package = packaged is not None and packaged >= now - PACKAGE_WINDOW
+        if recent_package:
+            expiries.append(packaged + PACKAGE_WINDOW)
+
+        expiries = [e for e in expiries if e is not None]
+        out.append((
+            lead_id,
+            int(ev['views_24h'] or 0) if ev else 0,
+            int(ev['views_7d'] or 0) if ev else 0,
+            int(ev['favorites_7d'] or 0) if ev else 0,
+            int(ev['property_view_count'] or 0) if ev else 0,
+            _text(last_comm.get(lead_id)),
+            pending[0] if pending else None,
+            pending[1] if pending else None,
+            1 if active else 0,
+            active[0]['need_type'] if active else None,
+            active[0]['financing_status'] if active else None,
+            _amount(approved[0]['pre_approval_amount']) if approved else None,
+            intake_count,
+            1 if recent_package else 0,
+            heat.get(lead_id),
+            min(expiries).isoformat() if expiries else None,
+            stamp,
+        ))
+    return out
+
+
+def _write_rows(conn, rows: List[tuple]) -> None:
+    if not rows:
+        return
+    placeholders = ', '.join('?' for _ in COLUMNS)
+    updates = ', '.join(f"{c} = excluded.{c}" for c in COLUMNS[1:])
+    conn.executemany(
+        f"INSERT INTO contact_intelligence ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+        f"ON CONFLICT (contact_id) DO UPDATE SET {updates}",
+        rows,
+    )
+
+
+def _refresh_leads(conn, leads: Dict[str, Optional[str]], now: datetime) -> int:
+    items = sorted(leads.items())
+    tables = _existing_tables(conn, OPTIONAL_TABLES) if items else set()
+    for chunk in _chunks(items):
+        _write_rows(conn, _compute_chunk(conn, dict(chunk), now, tables))
+    return len(items)
+
+
+def refresh(
+    conn,
+    contact_keys: Optional[Iterable[Any]] = None,
+    sweep: bool = True,
+    now: Optional[datetime] = None,
+) -> int:
+    """Recompute contacts in the rollup. Caller commits.
+
+    Always recomputes contact_keys. With sweep (the default) it also drains
+    the queue and picks up expired and missing rows; interactive writers
+    that only need their own contact current pass sweep=False.
+
+    Returns the number of rows written.
+    """
+    now = now or datetime.now()
+
+    queued: List[Tuple[str, Any]] = []
+    if sweep:
+        queued = [(str(row[0]), row[1]) for row in conn.execute(
+            "SELECT contact_key, queued_at FROM contact_intelligence_queue"
+        ).fetchall()]
+    keys = {key for key, _ in queued}
+    if contact_keys is not None:
+        keys.update(str(k) for k in contact_keys if k is not None and str(k) != '')
+
+    leads = _resolve_leads(conn, sorted(keys)) if keys else {}
+    if sweep:
+        for row in conn.execute(f'''
+            SELECT l.id, l.fub_id FROM leads l
+            LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
+            WHERE l.{SCOPE_WHERE}
+            AND (ci.contact_id IS NULL OR ci.expires_at <= ?)
+        ''', [now.isoformat()]).fetchall():
+            leads[str(row['id'])] = str(row['fub_id']) if row['fub_id'] is not None else None
+
+    written = _refresh_leads(conn, leads, now)
+    # A key re-queued while we were computing keeps its newer stamp and stays
+    if queued:
+        conn.executemany(
+            "DELETE FROM contact_intelligence_queue WHERE contact_key = ? AND queued_at = ?",
+            queued,
+        )
+    if sweep and written:
+        logger.info("contact_intelligence: refreshed %d contacts (%d queued)", written, len(queued))
+    return written
+
+
+def rebuild(conn, now: Optional[datetime] = None) -> int:
+    """Recompute every scored lead and drop rows for anyone out of scope. Caller commits."""
+    now = now or datetime.now()
+    leads = {
+        str(row['id']): str(row['fub_id']) if row['fub_id'] is not None else None
+        for row in conn.execute(f"SELECT id, fub_id FROM leads WHERE {SCOPE_WHERE}").fetchall()
+    }
+    conn.execute(f'''
+        DELETE FROM contact_intelligence
+        WHERE contact_id NOT IN (SELECT id FROM leads WHERE {SCOPE_WHERE})
+    ''')
+    conn.execute("DELETE FROM contact_intelligence_queue")
+    written = _refresh_leads(conn, leads, now)
+    logger.info("contact_intelligence: rebuilt %d contacts", written)
+    return written
+
+
+def status(conn, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Freshness of the rollup.
+
+    `stale` is True when any scored lead is missing a row, has a lapsed
+    window, or is queued for refresh.
+    """
+    now = now or datetime.now()
+    row = conn.execute(f'''
+        SELECT COUNT(ci.contact_id) AS contacts,
+               SUM(CASE WHEN ci.contact_id IS NULL THEN 1 ELSE 0 END) AS missing,
+               SUM(CASE WHEN ci.expires_at <= ? THEN 1 ELSE 0 END) AS expired,
+               MIN(ci.refreshed_at) AS oldest_refresh,
+               MAX(ci.refreshed_at) AS last_refresh
+        FROM leads l
+        LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
+        WHERE l.{SCOPE_WHERE}
+    ''', [now.isoformat()]).fetchone()
+    queued = conn.execute("SELECT COUNT(*) FROM contact_intelligence_queue").fetchone()[0]
+
+    result = {
+        'contacts': int(row['contacts'] or 0),
+        'missing': int(row['missing'] or 0),
+        'expired': int(row['expired'] or 0),
+        'queued': int(queued or 0),
+        'oldest_refresh': _text(row['oldest_refresh']),
+        'last_refresh': _text(row['last_refresh']),
+    }
+    last = _naive(result['last_refresh'])
+    result['age_seconds'] = int((now - last).total_seconds()) if last else None
+    result['stale'] = bool(result['missing'] or result['expired'] or result['queued'])
+    return result
@@ -25,7 +25,7 @@ SECTION MAP (grep for the ─── marker):
   Workflows                   get_contact_workflow / update_workflow_stage
   Requirements                get_consolidated_requirements / consolidate
   FUB Users & Assignment      sync_fub_users / update_contact_assignment
-  Automation                  check_automation_cooldown / log_automation_firing
+  Automation                  get_automation_cooldowns / log_automation_firing
   Morning Briefing            get_morning_briefing_contacts / get_overnight_narrative
   Power Hour                  create_power_hour_session / record_disposition
 """
@@ -39,6 +39,7 @@ from contextlib import contextmanager
 import logging
 
 from src.adapters.base_adapter import Lead, Activity, Property, Match
+from src.core import contact_intelligence
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +117,13 @@ class DREAMSDatabase:
             self._apply_migrations(conn)
             conn.commit()
 
+            # Materialized briefing rollup (alembic f3a8c5e1d7b2 on PostgreSQL)
+            contact_intelligence.ensure_tables(conn)
+            # Showing route geocode cache (alembic d5f2b8c6e3a7 on PostgreSQL)
+            from src.core import route_planner
+            route_planner.ensure_tables(conn)
+            conn.commit()
+
             indexes_schema = self._get_indexes_schema()
             conn.executescript(indexes_schema)
             conn.commit()
@@ -274,6 +282,18 @@ class DREAMSDatabase:
                 except sqlite3.OperationalError:
                     pass
 
+        # Email/text detail columns on contact_communications (PRD: ensure_schema.py)
+        cursor = conn.execute("PRAGMA table_info(contact_communications)")
+        existing_comm_cols = {row[1] for row in cursor.fetchall()}
+
+        for col_name in ('email_from', 'email_to', 'subject', 'snippet', 'email_type', 'fub_email_id'):
+            if col_name not in existing_comm_cols:
+                try:
+                    conn.execute(f"ALTER TABLE contact_communications ADD COLUMN {col_name} TEXT")
+                    logger.info(f"Added column {col_name} to contact_communications table")
+                except sqlite3.OperationalError:
+                    pass
+
         # Apply migrations for users table (lead_id link)
         cursor = conn.execute("PRAGMA table_info(users)")
         existing_user_cols = {row[1] for row in cursor.fetchall()}
@@ -929,6 +949,7 @@ class DREAMSDatabase:
         CREATE INDEX IF NOT EXISTS idx_leads_priority ON leads(priority_score DESC);
         CREATE INDEX IF NOT EXISTS idx_leads_fub_id ON leads(fub_id);
         CREATE INDEX IF NOT EXISTS idx_leads_heat ON leads(heat_score DESC);
+        CREATE INDEX IF NOT EXISTS idx_leads_email_lower ON leads(LOWER(email));
         CREATE INDEX IF NOT EXISTS idx_activities_lead ON lead_activities(lead_id);
         CREATE INDEX IF NOT EXISTS idx_activities_type ON lead_activities(activity_type);
         -- Listings indexes
@@ -1045,6 +1066,8 @@ class DREAMSDatabase:
              'Master switch for the automation rules engine'),
             ('rules_agent_email', '', 'string', 'automation',
              'Agent email for rule alert notifications (falls back to AGENT_EMAIL env)'),
+            ('rules_dispatch_workers', '4', 'integer', 'automation',
+             'Rule actions (emails, FUB tasks/notes) sent concurrently'),
             ('rule_activity_burst_enabled', 'true', 'boolean', 'automation',
              'Enable activity burst detection rule'),
             ('rule_activity_burst_threshold', '3', 'integer', 'automation',
@@ -1528,12 +1551,14 @@ class DREAMSDatabase:
             True if deleted, False if not found
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                'DELETE FROM intake_forms WHERE id = ?',
+            row = conn.execute(
+                'DELETE FROM intake_forms WHERE id = ? RETURNING lead_id',
                 (form_id,)
-            )
+            ).fetchone()
+            if row:
+                contact_intelligence.refresh(conn, [row['lead_id']], sweep=False)
             conn.commit()
-            return cursor.rowcount > 0
+            return row is not None
 
     def get_stated_requirements(self, lead_id: str) -> Dict[str, Any]:
         """
@@ -2691,6 +2716,7 @@ class DREAMSDatabase:
                     last_score_recorded_at = ?
                 WHERE id = ?
             ''', (trend_direction, datetime.now().isoformat(), contact_id))
+            contact_intelligence.mark_dirty(conn, [contact_id])
             conn.commit()
 
             return row['id'] if row else None
@@ -2746,6 +2772,107 @@ class DREAMSDatabase:
             ).fetchone()
             return row[0] > 0
 
+    COMMUNICATION_COLUMNS = (
+        'id', 'contact_id', 'comm_type', 'direction', 'occurred_at',
+        'duration_seconds', 'fub_id', 'fub_user_name', 'status',
+        'email_from', 'email_to', 'subject', 'snippet', 'email_type', 'fub_email_id',
+    )
+
+    EVENT_COLUMNS = (
+        'id', 'contact_id', 'event_type', 'occurred_at',
+        'property_address', 'property_price', 'property_mls', 'fub_event_id',
+    )
+
+    # Bound parameters per multi-row INSERT (SQLite allows 32766, Postgres 65535)
+    BATCH_PARAM_LIMIT = 30000
+
+    def _insert_activity_batch(
+        self,
+        conn,
+        table: str,
+        columns: tuple,
+        records: List[Dict[str, Any]],
+        group_column: str,
+    ) -> List[tuple]:
+        """Multi-row INSERT ... ON CONFLICT (id) DO NOTHING.
+
+        Records missing a NOT NULL value are dropped up front so one bad row
+        can't fail the whole batch. Returns (contact_id, group_column value)
+        for each row actually inserted.
+        """
+        required = ('id', 'contact_id', 'occurred_at', group_column)
+        valid = [rec for rec in records if all(rec.get(col) for col in required)]
+        if len(valid) < len(records):
+            logger.debug(f"Skipped {len(records) - len(valid)} {table} records missing required fields")
+        records = valid
+
+        rows_per_statement = max(1, self.BATCH_PARAM_LIMIT // len(columns))
+        row_placeholders = '(' + ', '.join('?' for _ in columns) + ')'
+        inserted = []
+        for start in range(0, len(records), rows_per_statement):
+            chunk = records[start:start + rows_per_statement]
+            params = [rec.get(col) for rec in chunk for col in columns]
+            cursor = conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join([row_placeholders] * len(chunk))} "
+                f"ON CONFLICT (id) DO NOTHING RETURNING contact_id, {group_column}",
+                params,
+            )
+            inserted.extend((row[0], row[1]) for row in cursor.fetchall())
+        return inserted
+
+    @staticmethod
+    def _refresh_lead_totals(conn, total_column: str, table: str, contact_ids: set) -> None:
+        """Recount total_column on leads once per affected contact (grouped UPDATE ... FROM)."""
+        ids = sorted(contact_ids)
+        for start in range(0, len(ids), 1000):
+            chunk = ids[start:start + 1000]
+            placeholders = ', '.join('?' for _ in chunk)
+            conn.execute(
+                f"UPDATE leads SET {total_column} = counts.n "
+                f"FROM (SELECT contact_id, COUNT(*) AS n FROM {table} "
+                f"      WHERE contact_id IN ({placeholders}) GROUP BY contact_id) AS counts "
+                f"WHERE leads.id = counts.contact_id",
+                chunk,
+            )
+
+    def insert_communications_batch(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert communication records in one transaction, skipping existing ids.
+
+        Rows go in as multi-row INSERTs with ON CONFLICT (id) DO NOTHING, and
+        leads.total_communications is recounted once per contact that gained
+        a row, instead of once per record.
+
+        Args:
+            records: Dicts keyed by COMMUNICATION_COLUMNS ('id' is the comm_id)
+
+        Returns:
+            Number of new rows per comm_type, e.g. {'call': 12, 'text': 40}
+        """
+        if not records:
+            return {}
+
+        with self._get_connection() as conn:
+            try:
+                inserted = self._insert_activity_batch(
+                    conn, 'contact_communications', self.COMMUNICATION_COLUMNS, records, 'comm_type'
+                )
+                touched = {contact_id for contact_id, _ in inserted}
+                self._refresh_lead_totals(
+                    conn, 'total_communications', 'contact_communications', touched
+                )
+                contact_intelligence.mark_dirty(conn, touched)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        counts: Dict[str, int] = {}
+        for _, comm_type in inserted:
+            counts[comm_type] = counts.get(comm_type, 0) + 1
+        return counts
+
     def insert_communication(
         self,
         comm_id: str,
@@ -2765,31 +2892,15 @@ class DREAMSDatabase:
         fub_email_id: Optional[str] = None,
     ) -> bool:
         """Insert a communication record if it doesn't already exist."""
-        if self.communication_exists(comm_id):
-            return False
-
-        with self._get_connection() as conn:
-            conn.execute('''
-                INSERT INTO contact_communications
-                (id, contact_id, comm_type, direction, occurred_at,
-                 duration_seconds, fub_id, fub_user_name, status,
-                 email_from, email_to, subject, snippet, email_type, fub_email_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                comm_id, contact_id, comm_type, direction, occurred_at,
-                duration_seconds, fub_id, fub_user_name, status,
-                email_from, email_to, subject, snippet, email_type, fub_email_id
-            ))
-
-            # Update total_communications count on lead
-            conn.execute('''
-                UPDATE leads SET total_communications = (
-                    SELECT COUNT(*) FROM contact_communications WHERE contact_id = ?
-                ) WHERE id = ?
-            ''', (contact_id, contact_id))
-
-            conn.commit()
-            return True
+        inserted = self.insert_communications_batch([{
+            'id': comm_id, 'contact_id': contact_id, 'comm_type': comm_type,
+            'direction': direction, 'occurred_at': occurred_at,
+            'duration_seconds': duration_seconds, 'fub_id': fub_id,
+            'fub_user_name': fub_user_name, 'status': status,
+            'email_from': email_from, 'email_to': email_to, 'subject': subject,
+            'snippet': snippet, 'email_type': email_type, 'fub_email_id': fub_email_id,
+        }])
+        return bool(inserted)
 
     def get_communications(
         self,
@@ -2831,6 +2942,37 @@ class DREAMSDatabase:
             ).fetchone()
             return row[0] > 0
 
+    def insert_events_batch(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert event records in one transaction, skipping existing ids.
+
+        Same approach as insert_communications_batch: multi-row INSERTs with
+        ON CONFLICT (id) DO NOTHING, then one grouped recount of
+        leads.total_events for the contacts that gained a row.
+
+        Args:
+            records: Dicts keyed by EVENT_COLUMNS ('id' is the event_id)
+
+        Returns:
+            Number of new rows
+        """
+        if not records:
+            return 0
+
+        with self._get_connection() as conn:
+            try:
+                inserted = self._insert_activity_batch(
+                    conn, 'contact_events', self.EVENT_COLUMNS, records, 'event_type'
+                )
+                touched = {contact_id for contact_id, _ in inserted}
+                self._refresh_lead_totals(conn, 'total_events', 'contact_events', touched)
+                contact_intelligence.mark_dirty(conn, touched)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return len(inserted)
+
     def insert_event(
         self,
         event_id: str,
@@ -2843,29 +2985,12 @@ class DREAMSDatabase:
         fub_event_id: Optional[str] = None
     ) -> bool:
         """Insert an event record if it doesn't already exist."""
-        if self.event_exists(event_id):
-            return False
-
-        with self._get_connection() as conn:
-            conn.execute('''
-                INSERT INTO contact_events
-                (id, contact_id, event_type, occurred_at,
-                 property_address, property_price, property_mls, fub_event_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event_id, contact_id, event_type, occurred_at,
-                property_address, property_price, property_mls, fub_event_id
-            ))
-
-            # Update total_events count on lead
-            conn.execute('''
-                UPDATE leads SET total_events = (
-                    SELECT COUNT(*) FROM contact_events WHERE contact_id = ?
-                ) WHERE id = ?
-            ''', (contact_id, contact_id))
-
-            conn.commit()
-            return True
+        return self.insert_events_batch([{
+            'id': event_id, 'contact_id': contact_id, 'event_type': event_type,
+            'occurred_at': occurred_at, 'property_address': property_address,
+            'property_price': property_price, 'property_mls': property_mls,
+            'fub_event_id': fub_event_id,
+        }]) > 0
 
     def get_events(
         self,
@@ -3965,10 +4090,9 @@ class DREAMSDatabase:
                     l.fub_id,
                     l.created_at,
                     l.days_since_activity,
-                    CASE WHEN EXISTS (
-                        SELECT 1 FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active'
-                    ) THEN 1 ELSE 0 END as has_intake
+                    COALESCE(ci.has_intake, 0) AS has_intake
                 FROM leads l
+                LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
                 WHERE l.contact_group = 'scored'
                 AND l.stage NOT IN ('Trash', 'Closed', 'Past Client', 'DNC')
             '''
@@ -4017,10 +4141,9 @@ class DREAMSDatabase:
                         l.fub_id,
                         l.created_at,
                         l.days_since_activity,
-                        CASE WHEN EXISTS (
-                            SELECT 1 FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active'
-                        ) THEN 1 ELSE 0 END as has_intake
+                        COALESCE(ci.has_intake, 0) AS has_intake
                     FROM leads l
+                    LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
                     JOIN contact_actions ca ON l.id = ca.contact_id
                     WHERE l.contact_group = 'scored'
                     AND ca.completed_at IS NULL
@@ -4067,10 +4190,9 @@ class DREAMSDatabase:
                         l.calls_inbound,
                         l.avg_price_viewed,
                         l.last_website_visit,
-                        CASE WHEN EXISTS (
-                            SELECT 1 FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active'
-                        ) THEN 1 ELSE 0 END as has_intake
+                        COALESCE(ci.has_intake, 0) AS has_intake
                     FROM leads l
+                    LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
                     WHERE l.contact_group = 'scored'
                     AND l.stage NOT IN ('Trash', 'Closed', 'Past Client', 'DNC', 'Agents/Vendors/Lendors')
                     AND l.properties_viewed >= 10
@@ -4104,10 +4226,9 @@ class DREAMSDatabase:
                         l.calls_outbound,
                         l.calls_inbound,
                         l.avg_price_viewed,
-                        CASE WHEN EXISTS (
-                            SELECT 1 FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active'
-                        ) THEN 1 ELSE 0 END as has_intake
+                        COALESCE(ci.has_intake, 0) AS has_intake
                     FROM leads l
+                    LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
                     WHERE l.contact_group = 'scored'
                     AND l.stage NOT IN ('Trash', 'Closed', 'Past Client', 'DNC', 'Agents/Vendors/Lendors')
                     AND l.heat_score >= 30
@@ -4847,8 +4968,9 @@ class DREAMSDatabase:
                 VALUES (?, ?, ?, ?, ?, ?)
                 RETURNING id
             ''', (contact_id, action_type, description, due_date, priority, created_by))
-            conn.commit()
             row = cursor.fetchone()
+            contact_intelligence.refresh(conn, [contact_id], sweep=False)
+            conn.commit()
             return row['id'] if row else None
 
     def get_contact_actions(
@@ -4901,9 +5023,13 @@ class DREAMSDatabase:
                 UPDATE contact_actions
                 SET completed_at = ?, completed_by = ?
                 WHERE id = ? AND completed_at IS NULL
+                RETURNING contact_id
             ''', (datetime.now().isoformat(), completed_by, action_id))
+            row = cursor.fetchone()
+            if row:
+                contact_intelligence.refresh(conn, [row['contact_id']], sweep=False)
             conn.commit()
-            return cursor.rowcount > 0
+            return row is not None
 
     def get_pending_actions(
         self,
@@ -6577,6 +6703,27 @@ class DREAMSDatabase:
             ''', (rule_name, contact_id)).fetchone()
             return row is not None
 
+    def get_automation_cooldowns(self, rule_names: List[str] = None, now: str = None) -> set:
+        """
+        All (rule_name, contact_id) pairs currently in cooldown, in one query.
+
+        cooldown_until is written with datetime.isoformat(), so it compares
+        as text against `now` in the same format (default: datetime.now()).
+        """
+        now = now or datetime.now().isoformat()
+        params = [now]
+        rule_filter = ''
+        if rule_names:
+            rule_filter = f"AND rule_name IN ({','.join('?' for _ in rule_names)})"
+            params.extend(rule_names)
+
+        with self._get_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT DISTINCT rule_name, contact_id FROM automation_log
+                WHERE cooldown_until > ? {rule_filter}
+            ''', params).fetchall()
+            return {(row['rule_name'], row['contact_id']) for row in rows}
+
     def log_automation_firing(
         self,
         rule_name: str,
@@ -6596,8 +6743,8 @@ class DREAMSDatabase:
                 RETURNING id
             ''', (rule_name, contact_id, contact_name, action_type, action_detail,
                   cooldown_until, 1 if success else 0))
-            conn.commit()
             row = cursor.fetchone()
+            conn.commit()
             return row['id'] if row else None
 
     def get_automation_log(self, limit: int = 50, rule_name: str = None) -> List[Dict[str, Any]]:
@@ -6662,12 +6809,45 @@ class DREAMSDatabase:
 
     # ─── Morning Briefing & Overnight Narrative ───────────────────────────────────
 
+    def refresh_contact_intelligence(self, contact_ids: Optional[List[str]] = None,
+                                     sweep: bool = True) -> int:
+        """
+        Recompute contact_intelligence rows and commit.
+
+        Args:
+            contact_ids: leads.id or FUB person ids to recompute now
+            sweep: Also drain the refresh queue and pick up expired/missing rows
+
+        Returns:
+            Number of rows written
+        """
+        with self._get_connection() as conn:
+            written = contact_intelligence.refresh(conn, contact_ids, sweep=sweep)
+            conn.commit()
+            return written
+
+    def rebuild_contact_intelligence(self) -> int:
+        """Recompute contact_intelligence for every scored lead and commit."""
+        with self._get_connection() as conn:
+            written = contact_intelligence.rebuild(conn)
+            conn.commit()
+            return written
+
+    def get_contact_intelligence_status(self) -> Dict[str, Any]:
+        """Freshness of the contact_intelligence rollup (see contact_intelligence.status)."""
+        with self._get_connection() as conn:
+            result = contact_intelligence.status(conn)
+            conn.commit()
+            return result
+
     def get_morning_briefing_contacts(self, user_id: Optional[int] = None, limit: int = 30) -> List[Dict]:
         """
         Master query returning enriched contacts for the Mission Control briefing.
-        Returns contacts in 3 urgency buckets with subquery-computed fields:
-        property_views_24h, property_views_7d, favorites_7d, last_comm_at,
-        pending_action_due, has_intake, recent_cities, price_range_label, etc.
+        Returns contacts in 3 urgency buckets with rollup fields read from
+        contact_intelligence: property_views_24h, property_views_7d,
+        favorites_7d, last_comm_at, pending_action_due, has_intake, etc.,
+        plus recent_cities and price_range_label. intelligence_refreshed_at
+        is when the contact's rollup row was last computed.
         """
         with self._get_connection() as conn:
             user_filter = ""
@@ -6677,9 +6857,7 @@ class DREAMSDatabase:
                 user_params = [user_id]
 
             now = datetime.now()
-            cutoff_24h = (now - timedelta(hours=24)).isoformat()
             cutoff_7d = (now - timedelta(days=7)).isoformat()
-            today = now.strftime('%Y-%m-%d')
 
             results = conn.execute(f'''
                 SELECT
@@ -6692,86 +6870,41 @@ class DREAMSDatabase:
                     l.intent_repeat_views, l.intent_high_favorites,
                     l.intent_activity_burst, l.intent_sharing, l.intent_signal_count,
                     l.min_price, l.max_price, l.preferred_cities,
-                    -- Subquery: property views in last 24h
-                    (SELECT COUNT(*) FROM contact_events ce
-                     WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
-                     AND ce.event_type = 'property_view'
-                     AND ce.occurred_at >= ?) AS property_views_24h,
-                    -- Subquery: property views in last 7d
-                    (SELECT COUNT(*) FROM contact_events ce
-                     WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
-                     AND ce.event_type = 'property_view'
-                     AND ce.occurred_at >= ?) AS property_views_7d,
-                    -- Subquery: favorites in last 7d
-                    (SELECT COUNT(*) FROM contact_events ce
-                     WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
-                     AND ce.event_type = 'property_favorite'
-                     AND ce.occurred_at >= ?) AS favorites_7d,
-                    -- Subquery: last communication timestamp
-                    (SELECT MAX(cc.occurred_at) FROM contact_communications cc
-                     WHERE cc.contact_id = l.id) AS last_comm_at,
-                    -- Subquery: days since last communication
-                    (SELECT (CURRENT_DATE - MAX(cc.occurred_at)::date)
-                     FROM contact_communications cc
-                     WHERE cc.contact_id = l.id) AS days_since_last_comm,
-                    -- Subquery: pending action due today or before
-                    (SELECT ca.due_date FROM contact_actions ca
-                     WHERE ca.contact_id = l.id
-                     AND ca.completed_at IS NULL
-                     AND ca.due_date <= ?
-                     ORDER BY ca.due_date ASC LIMIT 1) AS pending_action_due,
-                    -- Subquery: pending action description
-                    (SELECT ca.description FROM contact_actions ca
-                     WHERE ca.contact_id = l.id
-                     AND ca.completed_at IS NULL
-                     AND ca.due_date <= ?
-                     ORDER BY ca.due_date ASC LIMIT 1) AS pending_action_desc,
-                    -- Subquery: has active intake form
-                    CASE WHEN EXISTS (
-                        SELECT 1 FROM intake_forms i
-                        WHERE i.lead_id = l.id AND i.status = 'active'
-                    ) THEN 1 ELSE 0 END AS has_intake,
-                    -- Subquery: intake need type
-                    (SELECT i.need_type FROM intake_forms i
-                     WHERE i.lead_id = l.id AND i.status = 'active'
-                     ORDER BY i.priority ASC LIMIT 1) AS intake_need_type,
-                    -- Subquery: has recent package (sent in last 14 days)
-                    CASE WHEN EXISTS (
-                        SELECT 1 FROM packages pk
-                        WHERE pk.lead_id = l.id
-                        AND CAST(pk.created_at AS timestamp) >= CURRENT_TIMESTAMP - INTERVAL '14 days'
-                    ) THEN 1 ELSE 0 END AS has_recent_package,
-                    -- Subquery: financing status from intake
-                    (SELECT i.financing_status FROM intake_forms i
-                     WHERE i.lead_id = l.id AND i.status = 'active'
-                     ORDER BY i.priority ASC LIMIT 1) AS financing_status,
-                    -- Subquery: pre-approval amount from intake
-                    (SELECT i.pre_approval_amount FROM intake_forms i
-                     WHERE i.lead_id = l.id AND i.status = 'active'
-                     AND i.pre_approval_amount IS NOT NULL
-                     ORDER BY i.priority ASC LIMIT 1) AS pre_approval_amount,
-                    -- Subquery: heat delta from most recent scoring history
-                    (SELECT csh.heat_delta FROM contact_scoring_history csh
-                     WHERE csh.contact_id = l.id
-                     ORDER BY csh.recorded_at DESC LIMIT 1) AS heat_delta,
-                    -- Subquery: intake form count
-                    (SELECT COUNT(*) FROM intake_forms
-                     WHERE lead_id = l.id OR lead_id = CAST(l.fub_id AS TEXT)) AS intake_count,
-                    -- Subquery: distinct property view count
-                    (SELECT COUNT(DISTINCT COALESCE(property_mls, property_address))
-                     FROM contact_events
-                     WHERE contact_id = CAST(l.fub_id AS TEXT)
-                     AND event_type IN ('property_view', 'property_favorite', 'property_share')) AS property_view_count
+                    COALESCE(ci.property_views_24h, 0) AS property_views_24h,
+                    COALESCE(ci.property_views_7d, 0) AS property_views_7d,
+                    COALESCE(ci.favorites_7d, 0) AS favorites_7d,
+                    ci.last_comm_at,
+                    ci.pending_action_due,
+                    ci.pending_action_desc,
+                    COALESCE(ci.has_intake, 0) AS has_intake,
+                    ci.intake_need_type,
+                    COALESCE(ci.has_recent_package, 0) AS has_recent_package,
+                    ci.financing_status,
+                    ci.pre_approval_amount,
+                    ci.heat_delta,
+                    COALESCE(ci.intake_count, 0) AS intake_count,
+                    COALESCE(ci.property_view_count, 0) AS property_view_count,
+                    ci.refreshed_at AS intelligence_refreshed_at
                 FROM leads l
+                LEFT JOIN contact_intelligence ci ON ci.contact_id = l.id
                 WHERE l.contact_group = 'scored'
                 AND l.stage NOT IN ('Trash', 'Closed', 'Past Client', 'DNC', 'Agents/Vendors/Lendors')
                 {user_filter}
                 ORDER BY l.priority_score DESC
                 LIMIT ?
-            ''', [cutoff_24h, cutoff_7d, cutoff_7d, today, today] + user_params + [limit]).fetchall()
+            ''', user_params + [limit]).fetchall()
 
             contacts = [dict(row) for row in results]
 
+            # Days since last communication (calendar days, as before)
+            today = now.date()
+            for contact in contacts:
+                last_comm = contact.get('last_comm_at')
+                contact['days_since_last_comm'] = (
+                    (today - datetime.fromisoformat(str(last_comm)[:10]).date()).days
+                    if last_comm else None
+                )
+
             # Batch-fetch recent cities from contact_events + idx_property_cache
             # for all contacts in one query
             if contacts:
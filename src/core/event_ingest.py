@@ -0,0 +1,383 @@
+"""
+Durable queue and batch worker behind POST /api/public/events.
+
+The events endpoint used to do everything inside the web request: a
+listing lookup, a LOWER(email) lead scan, a single-row contact_events
+INSERT with its own commit and a synchronous FUB create_event call, so
+every page view on the public site held a gunicorn worker for a full FUB
+round trip. Now the request only appends a row to `public_event_queue`
+and returns; `drain()` does the rest in the background, a batch at a time:
+
+  - Emails resolve to leads through `LeadEmailCache` (one query for the
+    batch's misses, backed by the idx_leads_email_lower expression index),
+    and listing ids to FUB property objects in one query.
+  - Events for known contacts go into contact_events in one multi-row
+    INSERT, followed by one contact_intelligence refresh, in a single
+    transaction. Unknown emails are still forwarded to FUB (which creates
+    the person) but aren't stored locally, since contact_events needs a
+    contact_id.
+  - FUB forwarding fans out over a small thread pool. Failures stay queued
+    with exponential backoff until MAX_ATTEMPTS; the local row is only
+    written once however many FUB retries it takes.
+
+`status()` reports queue depth and lag for the health endpoint.
+
+Usage:
+    from src.core import event_ingest
+
+    event_ingest.enqueue(conn, 'Viewed Property', email, listing_id='lst_abc123')
+    conn.commit()
+
+    event_ingest.drain(db, fub_adapter)   # background worker
+"""
+
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core import contact_intelligence
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+FUB_WORKERS = 4
+MAX_ATTEMPTS = 8
+RETRY_BASE = timedelta(seconds=30)
+RETRY_MAX = timedelta(hours=1)
+EMAIL_CACHE_TTL = 300.0
+EMAIL_CACHE_MISS_TTL = 30.0   # new leads show up within one FUB sync
+EMAIL_CACHE_SIZE = 50000
+CHUNK = 500                   # rows/keys per IN (...) or multi-row VALUES
+
+FUB_SOURCE = "wncmountain.homes"
+
+QUEUE_COLUMNS = ('id', 'event_type', 'email', 'listing_id', 'page_url', 'page_title', 'occurred_at')
+
+
+def _chunks(items: List, size: int = CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _naive(value: Any) -> Optional[datetime]:
+    """Wall-clock datetime from a stored timestamp, ignoring any UTC offset."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(value)[:19].replace(' ', 'T'))
+    except ValueError:
+        return None
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ensure_tables(conn) -> None:
+    """Create the queue and the LOWER(email) index on leads.
+
+    Alembic migration c3e8a1f5d204 creates them in production; the ingest
+    service runs this once at startup and the enqueue endpoint once per
+    process, for SQLite databases the migrations never touch. drain() and
+    status() assume the objects exist: on Postgres the index check alone
+    takes a SHARE lock on leads.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS public_event_queue ("
+        "id TEXT PRIMARY KEY, "
+        "event_type TEXT NOT NULL, "
+        "email TEXT NOT NULL, "
+        "listing_id TEXT, "
+        "page_url TEXT, "
+        "page_title TEXT, "
+        "occurred_at TEXT NOT NULL, "
+        "stored INTEGER NOT NULL DEFAULT 0, "
+        "attempts INTEGER NOT NULL DEFAULT 0, "
+        "next_attempt_at TEXT, "
+        "last_error TEXT)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_public_event_queue_due "
+        "ON public_event_queue (next_attempt_at, occurred_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_email_lower ON leads (LOWER(email))")
+
+
+def enqueue(
+    conn,
+    event_type: str,
+    email: str,
+    listing_id: Optional[str] = None,
+    page_url: Optional[str] = None,
+    page_title: Optional[str] = None,
+    occurred_at: Optional[datetime] = None,
+) -> str:
+    """Queue one public site event. Caller commits.
+
+    Returns the event id, which becomes the contact_events id.
+    """
+    event_id = f"web_{uuid.uuid4().hex[:12]}"
+    conn.execute(
+        "INSERT INTO public_event_queue "
+        f"({', '.join(QUEUE_COLUMNS)}) VALUES ({', '.join('?' for _ in QUEUE_COLUMNS)})",
+        (event_id, event_type, email.strip().lower(), listing_id, page_url, page_title,
+         (occurred_at or datetime.now()).isoformat()),
+    )
+    return event_id
+
+
+class LeadEmailCache:
+    """Lowercased email -> leads.id, including negative entries, with a TTL."""
+
+    def __init__(self, ttl: float = EMAIL_CACHE_TTL, miss_ttl: float = EMAIL_CACHE_MISS_TTL,
+                 max_size: int = EMAIL_CACHE_SIZE):
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_size = max_size
+        self._entries: Dict[str, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, conn, emails: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Lead id (or None) for each email, querying only the ones not cached."""
+        now = time.monotonic()
+        found: Dict[str, Optional[str]] = {}
+        missing = []
+        for email in set(emails):
+            entry = self._entries.get(email)
+            if entry and entry[1] > now:
+                found[email] = entry[0]
+                self.hits += 1
+            else:
+                missing.append(email)
+        if not missing:
+            return found
+
+        self.misses += len(missing)
+        if len(self._entries) + len(missing) > self.max_size:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+            if len(self._entries) + len(missing) > self.max_size:
+                self._entries.clear()
+
+        resolved: Dict[str, Optional[str]] = {email: None for email in missing}
+        for chunk in _chunks(sorted(missing)):
+            rows = conn.execute(
+                f"SELECT id, LOWER(email) AS email FROM leads "
+                f"WHERE LOWER(email) IN ({', '.join('?' for _ in chunk)}) ORDER BY id",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                # Same pick as the old LIMIT 1 lookup when an email is on two leads
+                if resolved.get(row['email']) is None:
+                    resolved[row['email']] = str(row['id'])
+        for email, lead_id in resolved.items():
+            self._entries[email] = (lead_id, now + (self.ttl if lead_id else self.miss_ttl))
+        found.update(resolved)
+        return found
+
+
+def _fub_property(row) -> Optional[Dict[str, Any]]:
+    """FUB-shaped property object from a listings row."""
+    property_obj: Dict[str, Any] = {}
+    if row['address']:
+        property_obj["street"] = row['address']
+    if row['city']:
+        property_obj["city"] = row['city']
+    if row['state']:
+        property_obj["state"] = row['state']
+    if row['zip'] is not None:
+        property_obj["code"] = str(row['zip'])
+    if row['mls_number']:
+        property_obj["mlsNumber"] = row['mls_number']
+    if row['list_price']:
+        property_obj["price"] = float(row['list_price'])
+    for column, key, cast in (('beds', 'bedrooms', int), ('baths', 'bathrooms', float),
+                              ('sqft', 'area', int), ('acreage', 'lot', float)):
+        if row[column] is not None:
+            try:
+                property_obj[key] = cast(row[column])
+            except (TypeError, ValueError):
+                pass
+    if row['property_type']:
+        property_obj["type"] = row['property_type']
+    return property_obj or None
+
+
+def listing_properties(conn, listing_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """listing id or MLS number -> FUB property object, for the ones found."""
+    keys = sorted({str(k) for k in listing_ids if k})
+    properties: Dict[str, Dict[str, Any]] = {}
+    for chunk in _chunks(keys):
+        placeholders = ', '.join('?' for _ in chunk)
+        rows = conn.execute(
+            f"""
+            SELECT id, address, city, state, zip, mls_number,
+                   list_price, beds, baths, sqft, acreage, property_type
+            FROM listings
+            WHERE id IN ({placeholders}) OR mls_number IN ({placeholders})
+            ORDER BY id
+            """,
+            chunk + chunk,
+        ).fetchall()
+        for row in rows:
+            property_obj = _fub_property(row)
+            if not property_obj:
+                continue
+            # The frontend may pass either; an exact id match wins over an MLS number
+            properties[str(row['id'])] = property_obj
+            if row['mls_number'] and str(row['mls_number']) in chunk:
+                properties.setdefault(str(row['mls_number']), property_obj)
+    return properties
+
+
+def _retry_at(attempts: int, now: datetime) -> str:
+    delay = min(RETRY_BASE * (2 ** (attempts - 1)), RETRY_MAX)
+    return (now + delay).isoformat()
+
+
+def _store(conn, events: List[Dict[str, Any]], contacts: Dict[str, Optional[str]],
+           properties: Dict[str, Dict[str, Any]], now: datetime) -> int:
+    """Write contact_events for the batch's known contacts and mark the rows stored."""
+    rows = []
+    for event in events:
+        contact_id = contacts.get(event['email'])
+        if not contact_id:
+            continue
+        property_obj = properties.get(event['listing_id'] or '') or {}
+        rows.append((event['id'], contact_id, event['event_type'], event['occurred_at'],
+                     property_obj.get('street'), property_obj.get('price'),
+                     property_obj.get('mlsNumber'), now.isoformat()))
+
+    for chunk in _chunks(rows):
+        conn.execute(
+            "INSERT INTO contact_events (id, contact_id, event_type, occurred_at, "
+            "property_address, property_price, property_mls, imported_at) "
+            f"VALUES {', '.join(['(?, ?, ?, ?, ?, ?, ?, ?)'] * len(chunk))} "
+            "ON CONFLICT (id) DO NOTHING",
+            [v for row in chunk for v in row],
+        )
+    touched = sorted({row[1] for row in rows})
+    if touched:
+        contact_intelligence.refresh(conn, touched, sweep=False)
+    conn.executemany("UPDATE public_event_queue SET stored = 1 WHERE id = ?",
+                     [(event['id'],) for event in events])
+    return len(rows)
+
+
+def _forward(fub, event: Dict[str, Any], property_obj: Optional[Dict[str, Any]]):
+    """create_event on a FUBAdapter; returns its AdapterResult (never raises)."""
+    return fub.create_event(
+        event_type=event['event_type'],
+        source=FUB_SOURCE,
+        person=fub.build_person_dict(email=event['email']),
+        property=property_obj,
+        page_url=event['page_url'],
+        page_title=event['page_title'],
+        occurred_at=event['occurred_at'],
+    )
+
+
+def drain(
+    db,
+    fub,
+    batch_size: int = BATCH_SIZE,
+    workers: int = FUB_WORKERS,
+    email_cache: Optional[LeadEmailCache] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Process one batch of due events: store locally, forward to FUB, dequeue.
+
+    Returns counts for the batch; `claimed` below batch_size means the
+    queue has nothing more that's due.
+    """
+    now = now or datetime.now()
+    email_cache = email_cache or LeadEmailCache()
+    stats = {'claimed': 0, 'stored': 0, 'forwarded': 0, 'skipped': 0, 'retrying': 0, 'dropped': 0}
+
+    with db._get_connection() as conn:
+        events = [dict(row) for row in conn.execute(
+            f"SELECT {', '.join(QUEUE_COLUMNS)}, stored, attempts FROM public_event_queue "
+            "WHERE next_attempt_at IS NULL OR next_attempt_at <= ? "
+            "ORDER BY occurred_at LIMIT ?",
+            (now.isoformat(), batch_size),
+        ).fetchall()]
+        stats['claimed'] = len(events)
+        if not events:
+            return stats
+
+        properties = listing_properties(conn, [e['listing_id'] for e in events])
+        unstored = [e for e in events if not e['stored']]
+        if unstored:
+            contacts = email_cache.resolve(conn, [e['email'] for e in unstored])
+            stats['stored'] = _store(conn, unstored, contacts, properties, now)
+            conn.commit()
+
+    def send(event):
+        return _forward(fub, event, properties.get(event['listing_id'] or ''))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(send, events))
+
+    done, retry = [], []
+    for event, result in zip(events, results):
+        if result.ok:
+            done.append((event['id'],))
+            stats['skipped' if result.skipped else 'forwarded'] += 1
+            continue
+        attempts = event['attempts'] + 1
+        if attempts >= MAX_ATTEMPTS:
+            logger.warning("public event %s dropped after %d FUB attempts: %s",
+                           event['id'], attempts, result.error)
+            done.append((event['id'],))
+            stats['dropped'] += 1
+        else:
+            retry.append((attempts, _retry_at(attempts, now), (result.error or '')[:500], event['id']))
+            stats['retrying'] += 1
+
+    with db._get_connection() as conn:
+        if done:
+            conn.executemany("DELETE FROM public_event_queue WHERE id = ?", done)
+        if retry:
+            conn.executemany(
+                "UPDATE public_event_queue SET attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ?",
+                retry,
+            )
+        conn.commit()
+
+    logger.info("public events: %s", ', '.join(f"{k}={v}" for k, v in stats.items() if v))
+    return stats
+
+
+def status(conn, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Queue depth and lag.
+
+    `lag_seconds` is the age of the oldest event still waiting on its first
+    attempt, i.e. how far behind the worker is.
+    """
+    now = now or datetime.now()
+    row = conn.execute('''
+        SELECT COUNT(*) AS depth,
+               SUM(CASE WHEN attempts > 0 THEN 1 ELSE 0 END) AS retrying,
+               SUM(CASE WHEN stored = 0 THEN 1 ELSE 0 END) AS unstored,
+               MIN(CASE WHEN attempts = 0 THEN occurred_at END) AS oldest_new,
+               MIN(occurred_at) AS oldest
+        FROM public_event_queue
+    ''').fetchone()
+    oldest_new = _naive(row['oldest_new'])
+    return {
+        'depth': int(row['depth'] or 0),
+        'retrying': int(row['retrying'] or 0),
+        'unstored': int(row['unstored'] or 0),
+        'oldest_event': _text(row['oldest']),
+        'lag_seconds': max(0, int((now - oldest_new).total_seconds())) if oldest_new else 0,
+    }
@@ -0,0 +1,599 @@
+"""
+Persisted per-person FUB activity aggregates and ingest high-water marks.
+
+fub_to_sheets_v2 used to refetch every call, event, and (one person at a
+time) every text and email on each run, then rebuild per-person stats from
+the full history. This module lets the sync work incrementally:
+
+  - `fub_sync_state` keeps a createdAfter high-water mark per resource
+    (calls, textMessages, emails, events) plus the ids seen inside a short
+    overlap window, so late-indexed items are picked up exactly once.
+  - `fub_person_activity` holds mergeable aggregates per person: counters,
+    latest timestamps, a running price mean/variance, per-property view
+    counts, and the timestamps needed for the 7-day and burst signals.
+
+`accumulate()` folds raw FUB records into aggregates, `apply_deltas()`
+merges a batch into the persisted rows, and `person_stats()` turns
+aggregates into the dict shape build_person_stats has always produced.
+The full-refetch path goes through the same functions, so both modes
+score identically.
+
+Usage:
+    from src.core import fub_activity
+
+    states = fub_activity.load_sync_state(conn)
+    calls, states['calls'] = fub_activity.select_new('calls', fetched, states['calls'])
+    fub_activity.apply_deltas(conn, fub_activity.accumulate(calls, [], [], []))
+    fub_activity.save_sync_state(conn, states)
+    conn.commit()
+"""
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ('calls', 'textMessages', 'emails', 'events')
+
+# Items created this close to the high-water mark are re-requested on the
+# next run and deduplicated by id; FUB occasionally indexes activity a few
+# minutes after its `created` timestamp.
+OVERLAP_MINUTES = int(os.getenv('FUB_INCREMENTAL_OVERLAP_MINUTES', '30'))
+
+RECENT_DAYS = 7          # website_visits_last_7 / properties_viewed_last_7
+BURST_EVENTS = 3         # recent_activity_burst: 3 events ...
+BURST_HOURS = 24         # ... within 24 hours
+LOAD_CHUNK = 500
+
+_COUNTERS = (
+    'calls_inbound', 'calls_outbound',
+    'texts_total', 'texts_inbound',
+    'emails_received', 'emails_sent', 'emails_auto_sent', 'emails_manual_sent',
+    'events_total', 'website_visits', 'properties_viewed',
+    'properties_favorited', 'properties_shared',
+)
+
+
+def ensure_tables(conn) -> None:
+    """Create fub_sync_state and fub_person_activity.
+
+    Alembic migration a7d3f9b2c4e6 creates them on PostgreSQL; the
+    fub-to-sheets ingest runs this once per sync on SQLite. Everything
+    else here assumes the tables exist.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS fub_sync_state ("
+        "resource TEXT PRIMARY KEY, "
+        "high_water TEXT, "
+        "recent_ids TEXT, "
+        "items_applied INTEGER NOT NULL DEFAULT 0, "
+        "updated_at TEXT)"
+    )
+    counters = ', '.join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in _COUNTERS)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS fub_person_activity ("
+        "person_id TEXT PRIMARY KEY, "
+        f"{counters}, "
+        "last_inbound_at TEXT, "
+        "last_website_visit TEXT, "
+        "price_count INTEGER NOT NULL DEFAULT 0, "
+        "price_mean REAL, "
+        "price_m2 REAL, "
+        "property_views TEXT, "    # JSON {property_id: views}
+        "recent_visits TEXT, "     # JSON [iso, ...] within RECENT_DAYS
+        "recent_views TEXT, "      # JSON [iso, ...] within RECENT_DAYS
+        "latest_events TEXT, "     # JSON [iso, ...] newest BURST_EVENTS
+        "updated_at TEXT)"
+    )
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a FUB timestamp to an aware UTC datetime (None if unparseable)."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            dt = None
+            for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+                try:
+                    dt = datetime.strptime(str(value), fmt)
+                    break
+                except ValueError:
+                    continue
+            if dt is None:
+                return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _event_kind(event: Dict) -> str:
+    """FUB event type normalized the way the scorer compares it ("viewed_property")."""
+    return (event.get('type') or '').lower().replace(' ', '_')
+
+
+def email_person_id(email: Dict) -> Optional[str]:
+    related = email.get('relatedPeople') or []
+    if not related:
+        return None
+    pid = related[0].get('personId')
+    return str(pid) if pid else None
+
+
+def item_timestamp(resource: str, item: Dict) -> Any:
+    """Raw creation timestamp for an item of the given resource."""
+    if resource == 'calls':
+        return item.get('created') or item.get('timestamp')
+    if resource == 'textMessages':
+        return item.get('created') or item.get('sent')
+    if resource == 'emails':
+        return item.get('created') or item.get('date')
+    return item.get('created')
+
+
+# ---------------------------------------------------------------------------
+# Aggregates
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PersonActivity:
+    """Mergeable activity aggregate for one FUB person."""
+
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(_COUNTERS, 0))
+    last_inbound_at: Optional[str] = None
+    last_website_visit: Optional[datetime] = None
+    price_count: int = 0
+    price_mean: float = 0.0
+    price_m2: float = 0.0
+    property_views: Dict[str, int] = field(default_factory=dict)
+    recent_visits: List[datetime] = field(default_factory=list)
+    recent_views: List[datetime] = field(default_factory=list)
+    latest_events: List[datetime] = field(default_factory=list)
+
+    def note_inbound(self, ts: Any) -> None:
+        # Compared as strings, matching how FUB formats every channel's timestamps
+        if ts and (self.last_inbound_at is None or str(ts) > self.last_inbound_at):
+            self.last_inbound_at = str(ts)
+
+    def add_price(self, price: float) -> None:
+        self.price_count += 1
+        delta = price - self.price_mean
+        self.price_mean += delta / self.price_count
+        self.price_m2 += delta * (price - self.price_mean)
+
+    def merge(self, other: 'PersonActivity', now: datetime) -> None:
+        for key, value in other.counts.items():
+            self.counts[key] += value
+        self.note_inbound(other.last_inbound_at)
+        if other.last_website_visit and (
+            self.last_website_visit is None or other.last_website_visit > self.last_website_visit
+        ):
+            self.last_website_visit = other.last_website_visit
+
+        # Chan et al. parallel merge of count/mean/M2
+        if other.price_count:
+            n = self.price_count + other.price_count
+            delta = other.price_mean - self.price_mean
+            self.price_m2 += other.price_m2 + delta * delta * self.price_count * other.price_count / n
+            self.price_mean += delta * other.price_count / n
+            self.price_count = n
+
+        for prop, views in other.property_views.items():
+            self.property_views[prop] = self.property_views.get(prop, 0) + views
+        self.recent_visits.extend(other.recent_visits)
+        self.recent_views.extend(other.recent_views)
+        self.latest_events.extend(other.latest_events)
+        self.trim(now)
+
+    def trim(self, now: datetime) -> None:
+        cutoff = now - timedelta(days=RECENT_DAYS)
+        self.recent_visits = sorted(t for t in self.recent_visits if t >= cutoff)
+        self.recent_views = sorted(t for t in self.recent_views if t >= cutoff)
+        self.latest_events = sorted(self.latest_events, reverse=True)[:BURST_EVENTS]
+
+    # -- persistence ------------------------------------------------------
+
+    _COLUMNS = _COUNTERS + (
+        'last_inbound_at', 'last_website_visit', 'price_count', 'price_mean',
+        'price_m2', 'property_views', 'recent_visits', 'recent_views', 'latest_events',
+    )
+
+    def to_row(self) -> tuple:
+        def times(values):
+            return json.dumps([t.isoformat() for t in values])
+
+        return tuple(self.counts[c] for c in _COUNTERS) + (
+            self.last_inbound_at,
+            self.last_website_visit.isoformat() if self.last_website_visit else None,
+            self.price_count,
+            self.price_mean if self.price_count else None,
+            self.price_m2 if self.price_count else None,
+            json.dumps(self.property_views) if self.property_views else None,
+            times(self.recent_visits),
+            times(self.recent_views),
+            times(self.latest_events),
+        )
+
+    @classmethod
+    def from_row(cls, row) -> 'PersonActivity':
+        def times(raw):
+            return [t for t in (parse_timestamp(v) for v in json.loads(raw or '[]')) if t]
+
+        return cls(
+            counts={c: row[c] or 0 for c in _COUNTERS},
+            last_inbound_at=row['last_inbound_at'],
+            last_website_visit=parse_timestamp(row['last_website_visit']),
+            price_count=row['price_count'] or 0,
+            price_mean=row['price_mean'] or 0.0,
+            price_m2=row['price_m2'] or 0.0,
+            property_views=json.loads(row['property_views'] or '{}'),
+            recent_visits=times(row['recent_visits']),
+            recent_views=times(row['recent_views']),
+            latest_events=times(row['latest_events']),
+        )
+
+
+def accumulate(
+    calls: Iterable[Dict],
+    texts: Iterable[Dict],
+    emails: Iterable[Dict],
+    events: Iterable[Dict],
+    now: Optional[datetime] = None,
+) -> Dict[str, PersonActivity]:
+    """Fold raw FUB records into per-person aggregates (keyed by str person id).
+
+    Records that appear more than once in the same batch (an email fetched
+    once per related person, say) are counted once.
+    """
+    now = now or datetime.now(timezone.utc)
+    people: Dict[str, PersonActivity] = {}
+
+    def person(pid) -> PersonActivity:
+        pid = str(pid)
+        agg = people.get(pid)
+        if agg is None:
+            agg = people[pid] = PersonActivity()
+        return agg
+
+    def unique(items):
+        seen = set()
+        for item in items or ():
+            item_id = item.get('id')
+            if item_id is not None:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+            yield item
+
+    for call in unique(calls):
+        pid = call.get('personId')
+        if not pid:
+            continue
+        # FUB uses 'isIncoming' not 'direction'
+        is_incoming = call.get('isIncoming')
+        if is_incoming is True:
+            agg = person(pid)
+            agg.counts['calls_inbound'] += 1
+            agg.note_inbound(item_timestamp('calls', call))
+        elif is_incoming is False:
+            person(pid).counts['calls_outbound'] += 1
+
+    for text in unique(texts):
+        pid = text.get('personId')
+        if not pid:
+            continue
+        agg = person(pid)
+        agg.counts['texts_total'] += 1
+        direction = (text.get('direction') or '').lower()
+        if text.get('isIncoming') is True or direction == 'inbound':
+            agg.counts['texts_inbound'] += 1
+            agg.note_inbound(item_timestamp('textMessages', text))
+
+    for email in unique(emails):
+        pid = email_person_id(email)
+        if not pid:
+            continue
+        # FUB uses status: 'Sent' for outbound, 'Received' for inbound
+        status = (email.get('status') or '').lower()
+        if status == 'received':
+            agg = person(pid)
+            agg.counts['emails_received'] += 1
+            agg.note_inbound(item_timestamp('emails', email))
+        elif status == 'sent':
+            agg = person(pid)
+            agg.counts['emails_sent'] += 1
+            if email.get('campaignOrigin') or email.get('actionPlanId'):
+                agg.counts['emails_auto_sent'] += 1
+            else:
+                agg.counts['emails_manual_sent'] += 1
+
+    for event in unique(events):
+        pid = event.get('personId')
+        if not pid:
+            continue
+        agg = person(pid)
+        agg.counts['events_total'] += 1
+        kind = _event_kind(event)
+        event_time = parse_timestamp(event.get('created'))
+        if event_time:
+            agg.latest_events.append(event_time)
+
+        if kind == 'visited_website':
+            agg.counts['website_visits'] += 1
+            if event_time:
+                agg.recent_visits.append(event_time)
+                if agg.last_website_visit is None or event_time > agg.last_website_visit:
+                    agg.last_website_visit = event_time
+
+        elif kind == 'viewed_property':
+            agg.counts['properties_viewed'] += 1
+            if event_time:
+                agg.recent_views.append(event_time)
+            prop = event.get('property')
+            if isinstance(prop, dict):
+                if prop.get('id'):
+                    key = str(prop['id'])
+                    agg.property_views[key] = agg.property_views.get(key, 0) + 1
+                if prop.get('price'):
+                    try:
+                        agg.add_price(float(prop['price']))
+                    except (TypeError, ValueError):
+                        pass
+
+        elif kind == 'saved_property':
+            agg.counts['properties_favorited'] += 1
+
+        elif kind == 'saved_property_search':
+            agg.counts['properties_shared'] += 1
+
+    for agg in people.values():
+        agg.trim(now)
+    return people
+
+
+def person_stats(
+    activity: Dict[str, PersonActivity],
+    excluded_pids: Optional[Set[str]] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, Dict]:
+    """Per-person stats dicts (build_person_stats shape) from aggregates.
+
+    Website/event-derived fields are left at their defaults for
+    excluded_pids; calls, texts and emails still count for them since those
+    are real interactions, not cookie-based attribution.
+    """
+    now = now or datetime.now(timezone.utc)
+    week_ago = now - timedelta(days=RECENT_DAYS)
+    excluded_pids = excluded_pids or set()
+    stats: Dict[str, Dict] = {}
+
+    for pid, agg in activity.items():
+        c = agg.counts
+        data = {
+            'calls_outbound': c['calls_outbound'],
+            'calls_inbound': c['calls_inbound'],
+            'texts_total': c['texts_total'],
+            'texts_inbound': c['texts_inbound'],
+            'emails_received': c['emails_received'],
+            'emails_sent': c['emails_sent'],
+            'emails_auto_sent': c['emails_auto_sent'],
+            'emails_manual_sent': c['emails_manual_sent'],
+            'website_visits': 0,
+            'website_visits_last_7': 0,
+            'properties_viewed': 0,
+            'properties_viewed_last_7': 0,
+            'properties_favorited': 0,
+            'properties_shared': 0,
+            'last_website_visit': None,
+            'last_inbound_at': agg.last_inbound_at,
+            'avg_price_viewed': None,
+            'price_view_std_dev': 0.0,
+            'repeat_property_views': False,
+            'max_property_view_count': 0,
+            'high_favorite_count': False,
+            'recent_activity_burst': False,
+            'active_property_sharing': False,
+        }
+
+        if pid not in excluded_pids:
+            data['website_visits'] = c['website_visits']
+            data['website_visits_last_7'] = sum(1 for t in agg.recent_visits if t >= week_ago)
+            data['properties_viewed'] = c['properties_viewed']
+            data['properties_viewed_last_7'] = sum(1 for t in agg.recent_views if t >= week_ago)
+            data['properties_favorited'] = c['properties_favorited']
+            data['properties_shared'] = c['properties_shared']
+            if agg.last_website_visit:
+                data['last_website_visit'] = agg.last_website_visit.isoformat()
+            if agg.price_count:
+                data['avg_price_viewed'] = agg.price_mean
+                if agg.price_count > 1:
+                    data['price_view_std_dev'] = math.sqrt(max(agg.price_m2, 0.0) / agg.price_count)
+
+            max_views = max(agg.property_views.values()) if agg.property_views else 0
+            data['repeat_property_views'] = max_views >= 2
+            data['max_property_view_count'] = max_views
+            data['high_favorite_count'] = c['properties_favorited'] >= 3
+            latest = agg.latest_events
+            if len(latest) >= BURST_EVENTS:
+                span = latest[0] - latest[BURST_EVENTS - 1]
+                data['recent_activity_burst'] = span <= timedelta(hours=BURST_HOURS)
+            data['active_property_sharing'] = c['properties_shared'] >= 2
+
+        stats[pid] = data
+    return stats
+
+
+def load_activity(conn, person_ids: Optional[Iterable[str]] = None) -> Dict[str, PersonActivity]:
+    """Persisted aggregates for person_ids (all rows when None)."""
+    columns = ', '.join(('person_id',) + PersonActivity._COLUMNS)
+    if person_ids is None:
+        rows = conn.execute(f"SELECT {columns} FROM fub_person_activity").fetchall()
+    else:
+        ids = sorted({str(p) for p in person_ids})
+        rows = []
+        for start in range(0, len(ids), LOAD_CHUNK):
+            chunk = ids[start:start + LOAD_CHUNK]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows.extend(conn.execute(
+                f"SELECT {columns} FROM fub_person_activity WHERE person_id IN ({placeholders})",
+                chunk,
+            ).fetchall())
+    return {row['person_id']: PersonActivity.from_row(row) for row in rows}
+
+
+def _write_activity(conn, activity: Dict[str, PersonActivity], now: datetime) -> None:
+    columns = ('person_id',) + PersonActivity._COLUMNS + ('updated_at',)
+    placeholders = ', '.join('?' for _ in columns)
+    updates = ', '.join(f"{c} = excluded.{c}" for c in columns[1:])
+    stamp = now.isoformat()
+    conn.executemany(
+        f"INSERT INTO fub_person_activity ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT (person_id) DO UPDATE SET {updates}",
+        [(pid,) + agg.to_row() + (stamp,) for pid, agg in activity.items()],
+    )
+
+
+def apply_deltas(conn, deltas: Dict[str, PersonActivity], now: Optional[datetime] = None) -> int:
+    """Merge a batch of aggregates into fub_person_activity. Caller commits.
+
+    Only the people in deltas are read and rewritten. Returns that count.
+    """
+    if not deltas:
+        return 0
+    now = now or datetime.now(timezone.utc)
+    current = load_activity(conn, deltas.keys())
+    for pid, delta in deltas.items():
+        agg = current.get(pid)
+        if agg is None:
+            current[pid] = delta
+        else:
+            agg.merge(delta, now)
+    _write_activity(conn, current, now)
+    return len(current)
+
+
+def replace_all(conn, activity: Dict[str, PersonActivity], now: Optional[datetime] = None) -> int:
+    """Replace every persisted aggregate (full-refetch runs). Caller commits."""
+    now = now or datetime.now(timezone.utc)
+    conn.execute("DELETE FROM fub_person_activity")
+    _write_activity(conn, activity, now)
+    return len(activity)
+
+
+def active_event_person_ids(conn) -> Set[str]:
+    """People with at least one recorded website event."""
+    rows = conn.execute(
+        "SELECT person_id FROM fub_person_activity WHERE events_total > 0"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+# ---------------------------------------------------------------------------
+# High-water marks
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SyncState:
+    """createdAfter high-water mark for one FUB resource."""
+
+    resource: str
+    high_water: Optional[datetime] = None
+    recent_ids: Dict[str, str] = field(default_factory=dict)  # id -> created iso
+    items_applied: int = 0
+
+    def created_after(self) -> Optional[str]:
+        """Value for the createdAfter query param (None = no mark yet)."""
+        if self.high_water is None:
+            return None
+        since = self.high_water - timedelta(minutes=OVERLAP_MINUTES)
+        return since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def load_sync_state(conn) -> Dict[str, SyncState]:
+    states = {r: SyncState(r) for r in RESOURCES}
+    for row in conn.execute(
+        "SELECT resource, high_water, recent_ids, items_applied FROM fub_sync_state"
+    ).fetchall():
+        if row['resource'] in states:
+            states[row['resource']] = SyncState(
+                resource=row['resource'],
+                high_water=parse_timestamp(row['high_water']),
+                recent_ids=json.loads(row['recent_ids'] or '{}'),
+                items_applied=row['items_applied'] or 0,
+            )
+    return states
+
+
+def save_sync_state(conn, states: Dict[str, SyncState]) -> None:
+    """Persist high-water marks. Caller commits (with the matching deltas)."""
+    now = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        "INSERT INTO fub_sync_state (resource, high_water, recent_ids, items_applied, updated_at) "
+        "VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (resource) DO UPDATE SET high_water = excluded.high_water, "
+        "recent_ids = excluded.recent_ids, items_applied = excluded.items_applied, "
+        "updated_at = excluded.updated_at",
+        [
+            (s.resource, s.high_water.isoformat() if s.high_water else None,
+             json.dumps(s.recent_ids), s.items_applied, now)
+            for s in states.values()
+        ],
+    )
+
+
+def select_new(resource: str, items: List[Dict], state: SyncState) -> Tuple[List[Dict], SyncState]:
+    """Split fetched items into the ones not yet applied, and the advanced state.
+
+    An item is new when it was created after the high-water mark, or inside
+    the overlap window with an id not seen before. Items with no parseable
+    timestamp are skipped once a mark exists (they can't be placed).
+    """
+    high_water = state.high_water
+    floor = high_water - timedelta(minutes=OVERLAP_MINUTES) if high_water else None
+    seen = dict(state.recent_ids)
+    fresh: List[Dict] = []
+    new_high = high_water
+    skipped_undated = 0
+
+    for item in items:
+        created = parse_timestamp(item_timestamp(resource, item))
+        item_id = str(item['id']) if item.get('id') is not None else None
+        if floor is not None:
+            if created is None:
+                skipped_undated += 1
+                continue
+            if created <= floor:
+                continue
+            if item_id is not None and item_id in seen:
+                continue
+            if item_id is None and created <= high_water:
+                continue
+        fresh.append(item)
+        if created is not None:
+            if item_id is not None:
+                seen[item_id] = created.isoformat()
+            if new_high is None or created > new_high:
+                new_high = created
+
+    if new_high is not None:
+        cutoff = new_high - timedelta(minutes=OVERLAP_MINUTES)
+        seen = {i: c for i, c in seen.items() if parse_timestamp(c) > cutoff}
+
+    if skipped_undated:
+        logger.debug("%s: skipped %d items without a timestamp", resource, skipped_undated)
+    return fresh, SyncState(resource, new_high, seen, state.items_applied + len(fresh))
+
+
+def mark_all_applied(resource: str, items: List[Dict]) -> SyncState:
+    """State for a resource whose complete history was just applied."""
+    _, state = select_new(resource, items, SyncState(resource))
+    return state
@@ -13,11 +13,14 @@ Usage:
     result = service.search_listings(filters)
 """
 
+import base64
 import json
 import logging
 import os
 import re
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -108,6 +111,169 @@ DEDUP_CONDITION = (
     ")))"
 )
 
+# IDX-scoped variant: only IDX-visible rows can knock a listing out.
+IDX_DEDUP_CONDITION = DEDUP_CONDITION.replace(
+    "AND dup.id != listings.id",
+    "AND dup.id != listings.id AND dup.idx_opt_in = 1"
+)
+
+# The correlated subquery above runs per candidate row, twice per search
+# page (count + select). The sync engines instead precompute its result
+# into is_dedup_winner / is_idx_dedup_winner whenever a listing's
+# address_key group changes (see refresh_dedup_winners), and reads filter
+# on the flag. DREAMS_DEDUP_MODE=live falls back to the subquery, e.g.
+# before the migration has been backfilled.
+DEDUP_MODE = os.getenv('DREAMS_DEDUP_MODE', 'flag').lower()
+
+# address_keys per refresh statement (keeps the IN list well under
+# SQLite's bound-parameter limit).
+DEDUP_REFRESH_CHUNK = 500
+
+
+def dedup_condition(idx_only: bool = False, mode: Optional[str] = None) -> str:
+    """WHERE fragment that keeps only cross-MLS dedup winners.
+
+    Args:
+        idx_only: scope dedup to IDX-visible rows (public site)
+        mode: 'flag' (precomputed columns) or 'live' (correlated subquery);
+            defaults to DEDUP_MODE
+    """
+    if (mode or DEDUP_MODE) == 'live':
+        return IDX_DEDUP_CONDITION if idx_only else DEDUP_CONDITION
+    column = 'is_idx_dedup_winner' if idx_only else 'is_dedup_winner'
+    # New rows default to 1 until their group is refreshed, and a listing
+    # without an address_key can never be a duplicate.
+    return f"(address_key IS NULL OR {column} = 1)"
+
+
+def _dedup_refresh_sql(where: str = "") -> str:
+    winner = f"CASE WHEN {DEDUP_CONDITION} THEN 1 ELSE 0 END"
+    idx_winner = f"CASE WHEN {IDX_DEDUP_CONDITION} THEN 1 ELSE 0 END"
+    # Only touch rows whose flags actually change; most groups are stable
+    # from one sync to the next, and rewriting them is pure WAL churn.
+    changed = (
+        f"(is_dedup_winner IS DISTINCT FROM {winner} "
+        f"OR is_idx_dedup_winner IS DISTINCT FROM {idx_winner})"
+    )
+    where = f"{where} AND {changed}" if where else f" WHERE {changed}"
+    return (
+        "UPDATE listings SET "
+        f"is_dedup_winner = {winner}, "
+        f"is_idx_dedup_winner = {idx_winner}"
+        f"{where}"
+    )
+
+
+def refresh_dedup_winners(conn, address_keys=None) -> int:
+    """Recompute the dedup winner flags for the given address_key groups.
+
+    Call after any write that can change a group's winner: insert, or a
+    change to address_key (pass both old and new keys), property_type,
+    status, mls_source, idx_opt_in or updated_at. With address_keys=None
+    every row is recomputed (full rebuild). Does not commit.
+
+    Returns the number of rows whose flags changed.
+    """
+    if address_keys is None:
+        cursor = conn.execute(_dedup_refresh_sql())
+        return max(cursor.rowcount, 0)
+
+    keys = sorted({k for k in address_keys if k})
+    updated = 0
+    for i in range(0, len(keys), DEDUP_REFRESH_CHUNK):
+        chunk = keys[i:i + DEDUP_REFRESH_CHUNK]
+        placeholders = ', '.join(['?' for _ in chunk])
+        cursor = conn.execute(
+            _dedup_refresh_sql(f" WHERE address_key IN ({placeholders})"), chunk
+        )
+        updated += max(cursor.rowcount, 0)
+    return updated
+
+
+class DedupTracker:
+    """address_key groups a sync has written since its last dedup refresh.
+
+    Sync engines track() every listing write and refresh() at their
+    commit points, outside any per-row savepoint.
+    """
+
+    def __init__(self):
+        self.keys: set = set()
+
+    def add(self, address_key: Optional[str]) -> None:
+        if address_key:
+            self.keys.add(address_key)
+
+    def track(self, existing: Optional[Dict], listing: Dict) -> None:
+        """Queue both the old and new address_key groups of a written row."""
+        self.add((existing or {}).get('address_key'))
+        self.add(listing.get('address_key'))
+
+    def refresh(self, conn) -> int:
+        """refresh_dedup_winners() for the tracked groups; does not commit.
+
+        Isolated in its own savepoint so a failure (e.g. the flag columns
+        not migrated yet) leaves the listing writes intact;
+        scripts/dedup_winners.py reports anything missed.
+        """
+        if not self.keys:
+            return 0
+        keys, self.keys = self.keys, set()
+        try:
+            conn.execute("SAVEPOINT dedup_refresh")
+            updated = refresh_dedup_winners(conn, keys)
+            conn.execute("RELEASE SAVEPOINT dedup_refresh")
+            return updated
+        except Exception as e:
+            logger.warning(f"Dedup winner refresh failed for {len(keys)} address keys: {e}")
+            try:
+                conn.execute("ROLLBACK TO SAVEPOINT dedup_refresh")
+                conn.execute("RELEASE SAVEPOINT dedup_refresh")
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            return 0
+
+
+def check_dedup_winners(conn, sample_limit: int = 20) -> Dict[str, Any]:
+    """Compare the precomputed winner flags against the live subquery.
+
+    Returns a dict with the number of keyed listings checked, the number
+    whose flags disagree with DEDUP_CONDITION / IDX_DEDUP_CONDITION, and
+    up to sample_limit of the disagreeing rows.
+    """
+    live = (
+        "SELECT id, mls_number, mls_source, address_key, "
+        "is_dedup_winner, is_idx_dedup_winner, "
+        f"CASE WHEN {DEDUP_CONDITION} THEN 1 ELSE 0 END AS live_winner, "
+        f"CASE WHEN {IDX_DEDUP_CONDITION} THEN 1 ELSE 0 END AS live_idx_winner "
+        "FROM listings WHERE address_key IS NOT NULL"
+    )
+    mismatch = (
+        "is_dedup_winner IS NULL OR is_idx_dedup_winner IS NULL "
+        "OR is_dedup_winner != live_winner "
+        "OR is_idx_dedup_winner != live_idx_winner"
+    )
+    checked = conn.execute(
+        "SELECT COUNT(*) FROM listings WHERE address_key IS NOT NULL"
+    ).fetchone()[0]
+    mismatched = conn.execute(
+        f"SELECT COUNT(*) FROM ({live}) checked WHERE {mismatch}"
+    ).fetchone()[0]
+    samples = conn.execute(
+        f"SELECT * FROM ({live}) checked WHERE {mismatch} "
+        f"ORDER BY address_key LIMIT ?",
+        [sample_limit]
+    ).fetchall() if mismatched else []
+
+    return {
+        'checked': checked,
+        'mismatched': mismatched,
+        'samples': [dict(row) for row in samples],
+    }
+
 
 # ---------------------------------------------------------------------------
 # Filter dataclass
@@ -200,6 +366,8 @@ class SearchResult:
     total: int
     page: int
     limit: int
+    # Opaque keyset token for the page after this one (None on the last page)
+    next_cursor: Optional[str] = None
 
     @property
     def pages(self) -> int:
@@ -252,6 +420,91 @@ def _photo_dir_entries(photos_dir: Path) -> set:
     return names
 
 
+# Total-count cache for paginated search. Every page request used to re-run
+# a full COUNT(*) over the same WHERE clause; the count barely moves between
+# syncs, so it is served from memory for a short TTL. The key is the built
+# WHERE clause plus its params, i.e. the normalized filter set.
+_COUNT_CACHE: dict = {}
+_COUNT_CACHE_TTL_SECONDS = float(os.getenv('DREAMS_COUNT_CACHE_TTL', '30'))
+_COUNT_CACHE_MAX_ENTRIES = 1024
+_COUNT_CACHE_LOCK = threading.Lock()
+
+
+def _cached_count(conn, where_clause: str, params: list) -> int:
+    """COUNT(*) of listings matching where_clause, with a short TTL cache."""
+    key = (where_clause, tuple(params))
+    now = time.monotonic()
+    entry = _COUNT_CACHE.get(key)
+    if entry and (now - entry[0]) < _COUNT_CACHE_TTL_SECONDS:
+        return entry[1]
+
+    total = conn.execute(
+        f"SELECT COUNT(*) FROM listings WHERE {where_clause}", params
+    ).fetchone()[0]
+
+    with _COUNT_CACHE_LOCK:
+        if len(_COUNT_CACHE) >= _COUNT_CACHE_MAX_ENTRIES:
+            expired = [k for k, (ts, _) in _COUNT_CACHE.items()
+                       if (now - ts) >= _COUNT_CACHE_TTL_SECONDS]
+            for k in expired or list(_COUNT_CACHE)[:_COUNT_CACHE_MAX_ENTRIES // 4]:
+                _COUNT_CACHE.pop(k, None)
+        _COUNT_CACHE[key] = (now, total)
+    return total
+
+
+def invalidate_count_cache() -> None:
+    """Drop all cached search totals."""
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE.clear()
+
+
+# ---------------------------------------------------------------------------
+# Keyset (cursor) pagination
+# ---------------------------------------------------------------------------
+#
+# A cursor is the (sort value, id) of the last row on a page, plus the sort
+# it belongs to, as URL-safe base64 JSON. Clients treat it as opaque. The
+# next page is "rows after that key in ORDER BY col IS NULL, col, id" — an
+# index range scan instead of reading and discarding OFFSET rows.
+
+def encode_cursor(sort_col: str, sort_dir: str, value: Any, listing_id: str) -> str:
+    """Build an opaque cursor pointing just past (value, listing_id)."""
+    payload = json.dumps([sort_col, sort_dir, value, listing_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple:
+    """Parse a cursor into (sort_col, sort_dir, value, listing_id).
+
+    Raises ValueError for anything that was not produced by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        sort_col, sort_dir, value, listing_id = json.loads(raw)
+    except Exception:
+        raise ValueError('Malformed cursor')
+    if (sort_col not in ALLOWED_SORT_COLUMNS or sort_dir not in ('ASC', 'DESC')
+            or not isinstance(listing_id, str)
+            or isinstance(value, (dict, list))):
+        raise ValueError('Malformed cursor')
+    return sort_col, sort_dir, value, listing_id
+
+
+def _keyset_condition(sort_col: str, sort_dir: str, value: Any, listing_id: str) -> tuple:
+    """WHERE fragment selecting rows after (value, listing_id).
+
+    Mirrors the search ORDER BY: non-NULL sort values first in sort_dir,
+    NULLs last, ties broken by id in the same direction.
+    """
+    op = '>' if sort_dir == 'ASC' else '<'
+    if value is None:
+        return f"({sort_col} IS NULL AND id {op} ?)", [listing_id]
+    return (
+        f"({sort_col} {op} ? OR ({sort_col} = ? AND id {op} ?) OR {sort_col} IS NULL)",
+        [value, value, listing_id],
+    )
+
+
 def invalidate_photo_dir_cache(photos_dir: Optional[Path] = None) -> None:
     """Clear the photo-directory cache. Call after bulk downloads."""
     if photos_dir is None:
@@ -260,17 +513,63 @@ def invalidate_photo_dir_cache(photos_dir: Optional[Path] = None) -> None:
         _PHOTO_DIR_CACHE.pop(str(photos_dir), None)
 
 
-def _find_local_primary(mls: str, photos_dir: Path) -> str | None:
-    """Find the primary photo file on disk, return local URL or None."""
+def _local_photo_files(mls: str, photos_dir: Path) -> Dict[int, str]:
+    """{array position: filename} of a listing's photos on disk.
+
+    Read from the photo directory's manifest (apps/photos/manifest) once
+    it exists; a listing it has no entries for has no photos. Directories
+    without a manifest are matched against a scan of the directory.
+    """
+    from apps.photos import manifest as photo_manifest
+
+    files = photo_manifest.for_directory(photos_dir).files(mls)
+    if files is not None:
+        return files
+
     entries = _photo_dir_entries(photos_dir)
+    files = {}
     for ext in ('.jpg', '.jpeg', '.png', '.webp'):
-        name = f"{mls}{ext}"
-        if name in entries:
-            return f"/api/public/photos/{photos_dir.name}/{name}"
+        if f"{mls}{ext}" in entries:
+            files[0] = f"{mls}{ext}"
+            break
+
+    # Scan up to _99 with early termination after 5 consecutive misses.
+    consecutive_misses = 0
+    for idx in range(1, 100):
+        suffix = f"_{idx:02d}"
+        found = False
+        for ext in ('.jpg', '.jpeg', '.png', '.webp'):
+            name = f"{mls}{suffix}{ext}"
+            if name in entries:
+                files[idx] = name
+                found = True
+                consecutive_misses = 0
+                break
+        if not found:
+            consecutive_misses += 1
+            if consecutive_misses >= 5:
+                break
+    return files
+
+
+def _find_local_primary(mls: str, photos_dir: Path) -> str | None:
+    """Find the primary photo file on disk, return local URL or None."""
+    name = _local_photo_files(mls, photos_dir).get(0)
+    if name:
+        return f"/api/public/photos/{photos_dir.name}/{name}"
     return None
 
 
-def localize_photo(listing: dict, on_demand: bool = False) -> None:
+def _sized(url: Optional[str], size: Optional[str]) -> Optional[str]:
+    """Request a resized variant of a local photo (see apps/photos/derivatives)."""
+    if not url or not size or not url.startswith('/api/public/photos/') or '?' in url:
+        return url
+    return f"{url}?size={size}"
+
+
+def localize_photo(listing: dict, on_demand: bool = False,
+                   primary_size: Optional[str] = None,
+                   gallery_size: Optional[str] = None) -> None:
     """Merge local photo files with the DB's CDN URL array, position by position.
 
     For each index of the `photos` array, prefer a local file on disk
@@ -291,6 +590,9 @@ def localize_photo(listing: dict, on_demand: bool = False) -> None:
         on_demand: If True and we have zero local files on a Canopy
             listing, fetch+download via the throttled API (detail
             pages only, not bulk lists).
+        primary_size: Size class ('thumb', 'card', 'hero', 'pdf') for the
+            local primary_photo URL; None serves the original.
+        gallery_size: Size class for local URLs in the photos array.
     """
     mls, photos_dir = _resolve_photos_dir(listing)
     if not mls or not photos_dir:
@@ -301,32 +603,13 @@ def localize_photo(listing: dict, on_demand: bool = False) -> None:
     cdn_photos = list(original_photos) if isinstance(original_photos, list) else []
 
     dir_name = photos_dir.name
-    entries = _photo_dir_entries(photos_dir)
 
     # Map array-position → local URL (where a local file exists on disk).
-    local_at: Dict[int, str] = {}
-
-    local_primary = _find_local_primary(mls, photos_dir)
-    if local_primary:
-        local_at[0] = local_primary
-
-    # Scan up to _99 with early termination after 5 consecutive misses.
     # Missing positions silently fall back to the CDN URL at that index.
-    consecutive_misses = 0
-    for idx in range(1, 100):
-        suffix = f"_{idx:02d}"
-        found = False
-        for ext in ('.jpg', '.jpeg', '.png', '.webp'):
-            name = f"{mls}{suffix}{ext}"
-            if name in entries:
-                local_at[idx] = f"/api/public/photos/{dir_name}/{name}"
-                found = True
-                consecutive_misses = 0
-                break
-        if not found:
-            consecutive_misses += 1
-            if consecutive_misses >= 5:
-                break
+    local_at: Dict[int, str] = {
+        idx: f"/api/public/photos/{dir_name}/{name}"
+        for idx, name in _local_photo_files(mls, photos_dir).items()
+    }
 
     # Zero local files + Canopy + detail-page → try one throttled API pull.
     if not local_at:
@@ -335,8 +618,8 @@ def localize_photo(listing: dict, on_demand: bool = False) -> None:
         if is_canopy and on_demand:
             fetched = _fetch_and_download_photos_from_api(mls, photos_dir)
             if fetched:
-                listing['primary_photo'] = fetched[0]
-                listing['photos'] = fetched
+                listing['primary_photo'] = _sized(fetched[0], primary_size)
+                listing['photos'] = [_sized(url, gallery_size) for url in fetched]
                 return
         # Otherwise fall through; CDN URLs on the listing are left intact.
         return
@@ -354,11 +637,11 @@ def localize_photo(listing: dict, on_demand: bool = False) -> None:
         merged = [local_at[i] for i in sorted(local_at)]
 
     if isinstance(original_photos, list):
-        listing['photos'] = merged
+        listing['photos'] = [_sized(url, gallery_size) for url in merged]
 
     # Primary photo: prefer local, else the DB's existing value.
     if 0 in local_at:
-        listing['primary_photo'] = local_at[0]
+        listing['primary_photo'] = _sized(local_at[0], primary_size)
 
 
 def _fetch_and_download_photos_from_api(mls: str, photos_dir: Path) -> List[str]:
@@ -371,6 +654,7 @@ def _fetch_and_download_photos_from_api(mls: str, photos_dir: Path) -> List[str]
     try:
         import requests as req
         from urllib.parse import urlparse
+        from apps.photos import storage as photo_storage
         from src.core.mlsgrid_throttle import get_throttle
 
         token = os.getenv('MLSGRID_TOKEN')
@@ -378,7 +662,7 @@ def _fetch_and_download_photos_from_api(mls: str, photos_dir: Path) -> List[str]
             return []
 
         throttle = get_throttle()
-        throttle.wait()
+        throttle.wait(priority='interactive')
 
         headers = {
             'Authorization': f'Bearer {token}',
@@ -437,15 +721,12 @@ def _fetch_and_download_photos_from_api(mls: str, photos_dir: Path) -> List[str]
                 continue
 
             try:
-                resp = req.get(photo_url, timeout=30, stream=True)
+                resp = req.get(photo_url, timeout=30)
                 resp.raise_for_status()
-                with open(filepath, 'wb') as f:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                if filepath.stat().st_size > 0:
+                if resp.content:
+                    photo_storage.save_atomic(photos_dir, filename, resp.content,
+                                              media_key=urlparse(photo_url).path or None)
                     local_urls.append(f"/api/public/photos/{dir_name}/{filename}")
-                else:
-                    filepath.unlink(missing_ok=True)
             except Exception as e:
                 logger.debug(f"CDN download failed for {mls} [{idx}]: {e}")
 
@@ -479,6 +760,7 @@ def _download_photo_url(mls: str, url: str, photos_dir: Path) -> Optional[str]:
     try:
         import requests as req
         from urllib.parse import urlparse
+        from apps.photos import storage as photo_storage
 
         path_lower = urlparse(url).path.lower()
         ext = '.png' if path_lower.endswith('.png') else '.webp' if path_lower.endswith('.webp') else '.jpg'
@@ -489,16 +771,12 @@ def _download_photo_url(mls: str, url: str, photos_dir: Path) -> Optional[str]:
             return f"/api/public/photos/{photos_dir.name}/{filename}"
 
         photos_dir.mkdir(parents=True, exist_ok=True)
-        resp = req.get(url, timeout=5, stream=True)
+        resp = req.get(url, timeout=5)
         resp.raise_for_status()
-        with open(filepath, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        if filepath.stat().st_size > 0:
+        if resp.content:
+            photo_storage.save_atomic(photos_dir, filename, resp.content,
+                                      media_key=urlparse(url).path or None)
             return f"/api/public/photos/{photos_dir.name}/{filename}"
-        else:
-            filepath.unlink(missing_ok=True)
     except Exception as e:
         logger.debug(f"Photo download failed for {mls}: {e}")
     return None
@@ -813,7 +1091,8 @@ class ListingService:
     def search_listings(self, filters: ListingFilters, fields: Optional[List[str]] = None,
                         sort: str = 'list_date', order: str = 'desc',
                         page: int = 1, limit: int = 24,
-                        dedup: bool = True) -> SearchResult:
+                        dedup: bool = True,
+                        cursor: Optional[str] = None) -> SearchResult:
         """Search listings with filtering, sorting, pagination, and dedup.
 
         Args:
@@ -821,64 +1100,86 @@ class ListingService:
             fields: columns to SELECT (None = all columns)
             sort: sort column name (must be in ALLOWED_SORT_COLUMNS)
             order: 'asc' or 'desc'
-            page: 1-based page number
+            page: 1-based page number (ignored when cursor is given)
             limit: results per page (capped at 500)
             dedup: whether to apply cross-MLS dedup
+            cursor: next_cursor from a previous result; pages by keyset
+                instead of OFFSET. The cursor's sort/order take precedence.
 
         Returns:
             SearchResult with listings, total count, and pagination info
+
+        Raises:
+            ValueError: if cursor is malformed
         """
+        keyset = decode_cursor(cursor) if cursor else None
+
         with self._get_connection() as conn:
             conditions, params = self._build_conditions(filters)
 
             # Add dedup condition
             if dedup:
-                # For IDX-filtered queries, scope the dedup subquery to IDX too
-                if filters.require_idx:
-                    dedup_cond = DEDUP_CONDITION.replace(
-                        "AND dup.id != listings.id",
-                        "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-                    )
-                else:
-                    dedup_cond = DEDUP_CONDITION
-                conditions.append(dedup_cond)
+                # For IDX-filtered queries, scope the dedup to IDX too
+                conditions.append(dedup_condition(filters.require_idx))
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-            # Count
-            count_sql = f"SELECT COUNT(*) FROM listings WHERE {where_clause}"
-            total = conn.execute(count_sql, params).fetchone()[0]
+            # Count (cached per normalized filter set)
+            total = _cached_count(conn, where_clause, params)
 
             # Sort (whitelist-validated)
-            sort_col = sort if sort in ALLOWED_SORT_COLUMNS else 'list_date'
-            sort_dir = 'ASC' if order.upper() == 'ASC' else 'DESC'
+            if keyset:
+                sort_col, sort_dir = keyset[0], keyset[1]
+            else:
+                sort_col = sort if sort in ALLOWED_SORT_COLUMNS else 'list_date'
+                sort_dir = 'ASC' if order.upper() == 'ASC' else 'DESC'
 
             # Pagination
             page = max(1, page)
             limit = min(500, max(1, limit))
             offset = (page - 1) * limit
 
-            # Build SELECT
+            # Build SELECT. The sort column and id are needed to build the
+            # next cursor even when the caller didn't ask for them.
+            extra_fields = []
             if fields:
-                fields_str = ", ".join(fields)
+                extra_fields = [f for f in (sort_col, 'id') if f not in fields]
+                fields_str = ", ".join(list(fields) + extra_fields)
             else:
                 fields_str = "*"
 
-            # Use NULLS LAST behavior for sort
+            if keyset:
+                keyset_sql, keyset_params = _keyset_condition(*keyset)
+                where_clause = f"{where_clause} AND {keyset_sql}"
+                params = params + keyset_params
+                paging_sql, paging_params = "LIMIT ?", [limit + 1]
+            else:
+                paging_sql, paging_params = "LIMIT ? OFFSET ?", [limit + 1, offset]
+
+            # Use NULLS LAST behavior for sort; id makes the order total so
+            # neither OFFSET nor keyset pages can skip or repeat rows.
             query = (
                 f"SELECT {fields_str} FROM listings "
                 f"WHERE {where_clause} "
-                f"ORDER BY {sort_col} IS NULL, {sort_col} {sort_dir} "
-                f"LIMIT ? OFFSET ?"
+                f"ORDER BY {sort_col} IS NULL, {sort_col} {sort_dir}, id {sort_dir} "
+                f"{paging_sql}"
             )
-            rows = conn.execute(query, params + [limit, offset]).fetchall()
+            rows = conn.execute(query, params + paging_params).fetchall()
+
+            listings = [row_to_dict(row) for row in rows[:limit]]
 
-            listings = [row_to_dict(row) for row in rows]
+            next_cursor = None
+            if len(rows) > limit:
+                last = listings[-1]
+                next_cursor = encode_cursor(sort_col, sort_dir, last.get(sort_col), last['id'])
+            for listing in listings:
+                for f in extra_fields:
+                    listing.pop(f, None)
 
             # Post-process: compute DOM and localize photos
             for listing in listings:
                 listing['days_on_market'] = compute_dom(listing)
-                localize_photo(listing)
+                localize_photo(listing, primary_size='card')
                 listing['mls_display_name'] = MLS_DISPLAY_NAMES.get(
                     listing.get('mls_source'), listing.get('mls_source')
                 )
@@ -889,6 +1190,7 @@ class ListingService:
                 total=total,
                 page=page,
                 limit=limit,
+                next_cursor=next_cursor,
             )
 
     def get_listing(self, listing_id: str, fields: Optional[List[str]] = None,
@@ -929,7 +1231,7 @@ class ListingService:
 
             listing = row_to_dict(row)
             listing['days_on_market'] = compute_dom(listing)
-            localize_photo(listing)
+            localize_photo(listing, primary_size='hero', gallery_size='hero')
             listing['mls_display_name'] = MLS_DISPLAY_NAMES.get(
                 listing.get('mls_source'), listing.get('mls_source')
             )
@@ -987,14 +1289,7 @@ class ListingService:
             conditions.append("longitude IS NOT NULL")
 
             # Dedup
-            if filters.require_idx:
-                dedup_cond = DEDUP_CONDITION.replace(
-                    "AND dup.id != listings.id",
-                    "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-                )
-            else:
-                dedup_cond = DEDUP_CONDITION
-            conditions.append(dedup_cond)
+            conditions.append(dedup_condition(filters.require_idx))
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
             fields_str = ", ".join(fields) if fields else "*"
@@ -1010,11 +1305,30 @@ class ListingService:
             listings = []
             for row in rows:
                 d = dict(row)
-                localize_photo(d)
+                localize_photo(d, primary_size='thumb')
                 listings.append(d)
 
             return listings
 
+    def matching_ids(self, filters: ListingFilters, dedup: bool = True) -> frozenset:
+        """IDs of geocoded listings matching filters.
+
+        Same WHERE clause as get_map_markers but only the id column, for
+        intersecting with the in-memory map index (src/core/map_index.py).
+        """
+        with self._get_connection() as conn:
+            conditions, params = self._build_conditions(filters)
+            conditions.append("latitude IS NOT NULL")
+            conditions.append("longitude IS NOT NULL")
+            if dedup:
+                conditions.append(dedup_condition(filters.require_idx))
+
+            where_clause = " AND ".join(conditions)
+            rows = conn.execute(
+                f"SELECT id FROM listings WHERE {where_clause}", params
+            ).fetchall()
+            return frozenset(row[0] for row in rows)
+
     def count_listings(self, filters: ListingFilters, dedup: bool = True) -> int:
         """Count listings matching filters.
 
@@ -1029,14 +1343,7 @@ class ListingService:
             conditions, params = self._build_conditions(filters)
 
             if dedup:
-                if filters.require_idx:
-                    dedup_cond = DEDUP_CONDITION.replace(
-                        "AND dup.id != listings.id",
-                        "AND dup.id != listings.id AND dup.idx_opt_in = 1"
-                    )
-                else:
-                    dedup_cond = DEDUP_CONDITION
-                conditions.append(dedup_cond)
+                conditions.append(dedup_condition(filters.require_idx))
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
             count_sql = f"SELECT COUNT(*) FROM listings WHERE {where_clause}"
@@ -0,0 +1,291 @@
+"""In-memory spatial index and clustering for the public map.
+
+`/listings/map` used to run the full filtered query on every pan and ship
+up to 2,000 marker objects, each run through localize_photo. This module
+keeps every geocoded, address-displayable listing in memory, bucketed
+into a fixed lat/lng grid, and answers (filters, bbox, zoom) requests by:
+
+  1. Resolving the filter set to a set of listing ids with one id-only
+     query (ListingService.matching_ids), cached per filter set until the
+     sync generation moves.
+  2. Walking only the grid cells that overlap the bbox.
+  3. Clustering the hits in Web Mercator pixel space for the zoom level
+     (points stay individual from CLUSTER_MAX_ZOOM up).
+
+The index follows the sync generation from src/core/response_cache.py:
+when it moves, only rows with updated_at at or past the last high-water mark
+are re-read and re-bucketed. A full reload runs every
+FULL_REBUILD_SECONDS to drop deleted rows and pick up photo changes made
+by writers that don't touch updated_at.
+
+Responses are columnar (one array per field) rather than one object per
+marker, which keeps the full inventory to a few hundred KB.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields carried per point, in payload column order.
+POINT_FIELDS = (
+    'id', 'mls_number', 'status', 'list_price', 'address', 'city',
+    'beds', 'baths', 'sqft', 'property_type', 'primary_photo',
+)
+
+GRID_DEGREES = 0.1              # spatial index cell (~11 km at WNC latitudes)
+TILE_SIZE = 256                 # Web Mercator pixels per tile
+CLUSTER_RADIUS_PX = int(os.getenv('DREAMS_MAP_CLUSTER_RADIUS_PX', '60'))
+CLUSTER_MAX_ZOOM = int(os.getenv('DREAMS_MAP_CLUSTER_MAX_ZOOM', '15'))
+FULL_REBUILD_SECONDS = float(os.getenv('DREAMS_MAP_FULL_REBUILD_SECONDS', '3600'))
+ID_SET_CACHE_ENTRIES = 32
+COORD_DECIMALS = 5              # ~1 m; trims payload size
+
+
+def _mercator(lat: float, lng: float) -> Tuple[float, float]:
+    """Normalized Web Mercator (x, y) in [0, 1]."""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    sin = math.sin(math.radians(lat))
+    x = (lng + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    return x, y
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return int(math.floor(lng / GRID_DEGREES)), int(math.floor(lat / GRID_DEGREES))
+
+
+class _Snapshot:
+    """Immutable view of the index; swapped atomically on refresh."""
+
+    __slots__ = ('points', 'grid', 'generation', 'high_water', 'built_at')
+
+    def __init__(self, points: Dict[str, tuple], generation: int,
+                 high_water: Optional[str], built_at: float):
+        # id -> (lat, lng, merc_x, merc_y, values in POINT_FIELDS order)
+        self.points = points
+        self.generation = generation
+        self.high_water = high_water
+        self.built_at = built_at
+        grid: Dict[Tuple[int, int], List[str]] = {}
+        for listing_id, point in points.items():
+            grid.setdefault(_cell(point[0], point[1]), []).append(listing_id)
+        self.grid = grid
+
+
+class MapIndex:
+    """Grid-bucketed marker index over the listings table."""
+
+    def __init__(self, service):
+        self.service = service
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._id_sets: "OrderedDict[tuple, frozenset]" = OrderedDict()
+        self._id_lock = threading.Lock()
+
+    # -- loading ----------------------------------------------------------
+
+    def _load_rows(self, since: Optional[str]) -> list:
+        from src.core.listing_service import localize_photo
+
+        # An incremental read must also see rows that just lost their
+        # coordinates or address display, so it can drop them. It starts
+        # at the high-water second itself: a writer can commit a row
+        # stamped in that second after we read it, and re-reading the
+        # rest is harmless since points are keyed by id.
+        query = (
+            f"SELECT {', '.join(POINT_FIELDS)}, latitude, longitude, "
+            "idx_address_display, mls_source, updated_at FROM listings"
+        )
+        params: list = []
+        if since:
+            query += " WHERE updated_at >= ?"
+            params.append(since)
+        else:
+            query += (
+                " WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+                " AND idx_address_display = 1"
+            )
+
+        with self.service._get_connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+        for row in rows:
+            localize_photo(row, primary_size='thumb')
+        return rows
+
+    @staticmethod
+    def _to_point(row: dict) -> tuple:
+        lat, lng = float(row['latitude']), float(row['longitude'])
+        mx, my = _mercator(lat, lng)
+        return (lat, lng, mx, my, tuple(row.get(f) for f in POINT_FIELDS))
+
+    def refresh(self, force: bool = False) -> _Snapshot:
+        """Bring the index up to the current sync generation."""
+        from src.core.response_cache import current_sync_generation
+
+        generation = current_sync_generation()
+        snap = self._snapshot
+        now = time.monotonic()
+        full = force or snap is None or (now - snap.built_at) >= FULL_REBUILD_SECONDS
+        if not full and snap.generation == generation:
+            return snap
+
+        with self._lock:
+            snap = self._snapshot
+            if not force and snap is not None and snap.generation == generation \
+                    and (now - snap.built_at) < FULL_REBUILD_SECONDS:
+                return snap  # another thread refreshed while we waited
+
+            started = time.monotonic()
+            if full:
+                rows = self._load_rows(since=None)
+                points: Dict[str, tuple] = {}
+                built_at = now
+            else:
+                rows = self._load_rows(since=snap.high_water)
+                points = dict(snap.points)
+                built_at = snap.built_at
+
+            high_water = snap.high_water if (snap is not None and not full) else None
+            for row in rows:
+                try:
+                    if not row.get('idx_address_display'):
+                        raise ValueError('address withheld')
+                    points[row['id']] = self._to_point(row)
+                except (TypeError, ValueError):
+                    points.pop(row['id'], None)
+                updated = row.get('updated_at')
+                if updated is not None:
+                    updated = str(updated)
+                    if high_water is None or updated > high_water:
+                        high_water = updated
+
+            self._snapshot = _Snapshot(points, generation, high_water, built_at)
+            with self._id_lock:
+                self._id_sets.clear()
+            logger.info(
+                "Map index %s: %d rows read, %d points, %.2fs",
+                'rebuilt' if full else 'updated', len(rows), len(points),
+                time.monotonic() - started,
+            )
+            return self._snapshot
+
+    # -- querying ---------------------------------------------------------
+
+    def _matching_ids(self, filters, generation: int) -> frozenset:
+        key = (generation, repr(filters))
+        with self._id_lock:
+            ids = self._id_sets.get(key)
+            if ids is not None:
+                self._id_sets.move_to_end(key)
+                return ids
+        ids = self.service.matching_ids(filters)
+        with self._id_lock:
+            self._id_sets[key] = ids
+            while len(self._id_sets) > ID_SET_CACHE_ENTRIES:
+                self._id_sets.popitem(last=False)
+        return ids
+
+    def query(self, filters, bbox: Optional[Tuple[float, float, float, float]],
+              zoom: int) -> Dict[str, Any]:
+        """Clusters and points for filters inside bbox (west, south, east, north)."""
+        snap = self.refresh()
+        ids = self._matching_ids(filters, snap.generation)
+
+        if bbox is None:
+            candidates = [i for i in ids if i in snap.points]
+        else:
+            west, south, east, north = bbox
+            x0, y0 = _cell(south, west)
+            x1, y1 = _cell(north, east)
+            candidates = []
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    for listing_id in snap.grid.get((cx, cy), ()):
+                        if listing_id not in ids:
+                            continue
+                        lat, lng = snap.points[listing_id][:2]
+                        if south <= lat <= north and west <= lng <= east:
+                            candidates.append(listing_id)
+
+        if zoom >= CLUSTER_MAX_ZOOM:
+            singles, clusters = candidates, []
+        else:
+            singles, clusters = self._cluster(snap, candidates, zoom)
+
+        price_idx = POINT_FIELDS.index('list_price')
+        points = {f: [] for f in POINT_FIELDS}
+        points['lat'], points['lng'] = [], []
+        for listing_id in sorted(singles, key=lambda i: -(snap.points[i][4][price_idx] or 0)):
+            lat, lng, _, _, values = snap.points[listing_id]
+            points['lat'].append(round(lat, COORD_DECIMALS))
+            points['lng'].append(round(lng, COORD_DECIMALS))
+            for field, value in zip(POINT_FIELDS, values):
+                points[field].append(value)
+
+        return {
+            'zoom': zoom,
+            'count': len(candidates),
+            'clusters': {
+                'lat': [c[0] for c in clusters],
+                'lng': [c[1] for c in clusters],
+                'count': [c[2] for c in clusters],
+                'min_price': [c[3] for c in clusters],
+                'max_price': [c[4] for c in clusters],
+            },
+            'points': points,
+            'generation': snap.generation,
+        }
+
+    @staticmethod
+    def _cluster(snap: _Snapshot, candidates: List[str], zoom: int) -> tuple:
+        """Greedy grid clustering in Mercator pixel space."""
+        scale = TILE_SIZE * (2 ** zoom) / CLUSTER_RADIUS_PX
+        price_idx = POINT_FIELDS.index('list_price')
+        buckets: Dict[Tuple[int, int], List[str]] = {}
+        for listing_id in candidates:
+            mx, my = snap.points[listing_id][2:4]
+            buckets.setdefault((int(mx * scale), int(my * scale)), []).append(listing_id)
+
+        singles, clusters = [], []
+        for members in buckets.values():
+            if len(members) == 1:
+                singles.append(members[0])
+                continue
+            lat_sum = lng_sum = 0.0
+            prices = []
+            for listing_id in members:
+                lat, lng, _, _, values = snap.points[listing_id]
+                lat_sum += lat
+                lng_sum += lng
+                if values[price_idx] is not None:
+                    prices.append(values[price_idx])
+            clusters.append((
+                round(lat_sum / len(members), COORD_DECIMALS),
+                round(lng_sum / len(members), COORD_DECIMALS),
+                len(members),
+                min(prices) if prices else None,
+                max(prices) if prices else None,
+            ))
+        return singles, clusters
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        if snap is None:
+            return {'built': False}
+        return {
+            'built': True,
+            'points': len(snap.points),
+            'cells': len(snap.grid),
+            'generation': snap.generation,
+            'high_water': snap.high_water,
+            'age_seconds': round(time.monotonic() - snap.built_at, 1),
+            'cached_filter_sets': len(self._id_sets),
+        }
@@ -2,7 +2,7 @@
 Central MLS Grid API Rate Limiter
 
 ALL MLS Grid API access MUST go through this throttle.
-Enforces MLS Grid limits across all processes using a shared lock file.
+Enforces MLS Grid limits across all processes using a shared state file.
 
 Limits (from MLS Grid policy):
   - Warning:    2 RPS, 7,200/hr, 3,072 MB/hr, 40,000/day, 40 GB/day
@@ -14,6 +14,19 @@ Our targets (stay well under warning thresholds):
   - Max 20,000 requests per rolling 24 hours
   - Check suspension status before any batch operation
 
+State lives in a small fixed-size file mapped into every process: a header
+(next free send slot, last request, pause deadline) and a ring of 1,440
+per-minute request counters with running hourly/daily totals. Handing out a
+request slot touches a handful of fields under a brief flock, so the cost no
+longer grows with the number of requests made in the last day.
+
+Requests have a priority class:
+  - 'interactive': on-demand fetches a user is waiting on (detail pages).
+    Takes the next slot straight away and may use the full hourly/daily caps.
+  - 'bulk' (default): syncs and backfills. Holds back while another request
+    is already queued, so an interactive fetch never waits behind a backlog,
+    and stops at BULK_SHARE of the caps to leave room for interactive use.
+
 Usage:
     from src.core.mlsgrid_throttle import get_throttle
 
@@ -22,6 +35,8 @@ Usage:
     response = session.get(...)
     throttle.record()  # log the request
 
+    throttle.wait(priority='interactive')  # user-facing, jumps the bulk queue
+
     # Before batch operations:
     if not throttle.can_start_batch(estimated_requests=500):
         print("Too close to limits, aborting")
@@ -30,117 +45,213 @@ Usage:
 import fcntl
 import json
 import logging
+import mmap
 import os
+import struct
+import threading
 import time
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-STATE_FILE = PROJECT_ROOT / 'data' / '.mlsgrid_throttle.json'
-LOCK_FILE = PROJECT_ROOT / 'data' / '.mlsgrid_throttle.lock'
+STATE_FILE = PROJECT_ROOT / 'data' / '.mlsgrid_throttle.bin'
+LEGACY_STATE_FILE = PROJECT_ROOT / 'data' / '.mlsgrid_throttle.json'
 
 # Our conservative limits (well under MLS Grid warning thresholds)
 MIN_REQUEST_INTERVAL = 3.0    # seconds between requests (~0.33 RPS, extra margin after suspension)
 MAX_REQUESTS_PER_HOUR = 3000
 MAX_REQUESTS_PER_DAY = 20000
 BATCH_HEADROOM = 0.7          # only start a batch if under 70% of limits
+BULK_SHARE = 0.9              # bulk traffic leaves the last 10% of each cap to interactive fetches
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BULK = 'bulk'
+
+HOUR_MINUTES = 60
+DAY_MINUTES = 1440
+
+# magic, version, next_slot, last_request, paused_until, head_minute, hourly, daily
+_HEADER = struct.Struct('<4sIdddqII')
+_COUNTER = struct.Struct('<I')
+_MAGIC = b'MLST'
+_VERSION = 1
+_FILE_SIZE = _HEADER.size + DAY_MINUTES * _COUNTER.size
+
+
+class _Counters:
+    """The mapped state: header fields plus the per-minute ring, read and written in place."""
+
+    def __init__(self, buf):
+        self.buf = buf
+        (_, _, self.next_slot, self.last_request, self.paused_until,
+         self.head_minute, self.hourly, self.daily) = _HEADER.unpack_from(buf, 0)
+
+    def save(self):
+        _HEADER.pack_into(self.buf, 0, _MAGIC, _VERSION, self.next_slot, self.last_request,
+                          self.paused_until, self.head_minute, self.hourly, self.daily)
+
+    def __getitem__(self, minute):
+        return _COUNTER.unpack_from(self.buf, _HEADER.size + (minute % DAY_MINUTES) * _COUNTER.size)[0]
+
+    def __setitem__(self, minute, count):
+        _COUNTER.pack_into(self.buf, _HEADER.size + (minute % DAY_MINUTES) * _COUNTER.size, count)
+
+    def advance(self, now):
+        """Roll the windows forward to now's minute, expiring the counters that fell out."""
+        minute = int(now // 60)
+        steps = minute - self.head_minute
+        if steps <= 0:
+            return
+        if steps >= DAY_MINUTES:
+            self.buf[_HEADER.size:] = bytes(DAY_MINUTES * _COUNTER.size)
+            self.hourly = self.daily = 0
+        else:
+            if steps >= HOUR_MINUTES:
+                self.hourly = 0
+            for m in range(self.head_minute + 1, minute + 1):
+                if steps < HOUR_MINUTES:
+                    self.hourly -= self[m - HOUR_MINUTES]
+                # Bucket m last held minute m - 1440, which just left the day window
+                self.daily -= self[m]
+                self[m] = 0
+        self.head_minute = minute
+
+    def count(self, now, n=1):
+        minute = int(now // 60)
+        self[minute] = self[minute] + n
+        self.hourly += n
+        self.daily += n
+
+    def hourly_frees_at(self, now):
+        """When the oldest request still in the hourly window drops out of it."""
+        minute = int(now // 60)
+        for m in range(minute - HOUR_MINUTES + 1, minute + 1):
+            if self[m]:
+                return (m + HOUR_MINUTES) * 60
+        return now
 
 
 class MLSGridThrottle:
     """Process-safe rate limiter for MLS Grid API."""
 
-    def __init__(self):
-        self._lock_fd = None
-        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-    def _acquire_lock(self):
-        self._lock_fd = open(LOCK_FILE, 'w')
-        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
-
-    def _release_lock(self):
-        if self._lock_fd:
-            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
-            self._lock_fd.close()
-            self._lock_fd = None
-
-    def _load_state(self):
-        try:
-            if STATE_FILE.exists():
-                return json.loads(STATE_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            pass
-        return {'requests': [], 'last_request': 0}
-
-    def _save_state(self, state):
-        try:
-            STATE_FILE.write_text(json.dumps(state))
-        except OSError as e:
-            logger.warning(f"Could not save throttle state: {e}")
-
-    def _prune_old_requests(self, state):
-        """Remove request timestamps older than 24 hours."""
-        cutoff = time.time() - 86400
-        state['requests'] = [t for t in state['requests'] if t > cutoff]
-        return state
-
-    def _requests_in_window(self, state, seconds):
-        """Count requests in the last N seconds."""
-        cutoff = time.time() - seconds
-        return sum(1 for t in state['requests'] if t > cutoff)
-
-    def wait(self):
-        """Block until it's safe to make a request. Call before each API request."""
-        self._acquire_lock()
+    def __init__(self, state_file=None, legacy_state_file=None):
+        self.state_file = Path(state_file or STATE_FILE)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        # flock is held per open file, so threads sharing this one also need a mutex
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                fresh = os.fstat(self._fd).st_size < _FILE_SIZE
+                if fresh:
+                    os.ftruncate(self._fd, _FILE_SIZE)
+                self._map = mmap.mmap(self._fd, _FILE_SIZE)
+                if fresh or _HEADER.unpack_from(self._map, 0)[:2] != (_MAGIC, _VERSION):
+                    self._initialize(Path(legacy_state_file or LEGACY_STATE_FILE))
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _initialize(self, legacy_state_file):
+        """Zero the state, carrying over the last day's requests from the old JSON log."""
+        self._map[:] = bytes(_FILE_SIZE)
+        now = time.time()
+        state = _Counters(self._map)
+        state.head_minute = int(now // 60)
         try:
-            state = self._load_state()
-            state = self._prune_old_requests(state)
-
-            # Enforce minimum interval
-            now = time.time()
-            last = state.get('last_request', 0)
-            elapsed = now - last
-            if elapsed < MIN_REQUEST_INTERVAL:
-                wait_time = MIN_REQUEST_INTERVAL - elapsed
-                self._release_lock()
-                time.sleep(wait_time)
-                self._acquire_lock()
-                state = self._load_state()
-
-            # Check hourly limit
-            hourly = self._requests_in_window(state, 3600)
-            if hourly >= MAX_REQUESTS_PER_HOUR:
-                wait_until = min(t for t in state['requests'] if t > time.time() - 3600) + 3600
-                wait_secs = max(0, wait_until - time.time())
-                logger.warning(f"Hourly limit reached ({hourly}/{MAX_REQUESTS_PER_HOUR}). Waiting {wait_secs:.0f}s")
-                self._release_lock()
-                time.sleep(wait_secs + 1)
-                self._acquire_lock()
-
-            # Check daily limit
-            daily = self._requests_in_window(state, 86400)
-            if daily >= MAX_REQUESTS_PER_DAY:
-                logger.error(f"Daily limit reached ({daily}/{MAX_REQUESTS_PER_DAY}). Aborting.")
-                self._release_lock()
-                raise RuntimeError("MLS Grid daily request limit reached. Try again tomorrow.")
-
-        finally:
-            if self._lock_fd:
-                self._release_lock()
+            legacy = json.loads(legacy_state_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            legacy = None
+        if legacy:
+            requests = [t for t in legacy.get('requests', [])
+                        if state.head_minute - DAY_MINUTES < t // 60 <= state.head_minute]
+            for t in requests:
+                state[int(t // 60)] += 1
+            minute = state.head_minute
+            state.hourly = sum(state[m] for m in range(minute - HOUR_MINUTES + 1, minute + 1))
+            state.daily = len(requests)
+            state.last_request = legacy.get('last_request', 0)
+            state.next_slot = state.last_request + MIN_REQUEST_INTERVAL
+            logger.info(f"Imported {len(requests)} requests from {legacy_state_file.name}")
+        state.save()
+
+    @contextmanager
+    def _locked(self):
+        """The shared counters, rolled forward to now, held under the cross-process lock."""
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                state = _Counters(self._map)
+                state.advance(time.time())
+                yield state
+                state.save()
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def wait(self, priority=PRIORITY_BULK):
+        """Block until it's safe to make a request. Call before each API request.
+
+        Reserves this request's send slot and counts it against the hourly
+        and daily caps. Raises RuntimeError once the daily cap for the
+        priority class is reached or while MLS Grid has us paused.
+        """
+        if priority not in (PRIORITY_INTERACTIVE, PRIORITY_BULK):
+            raise ValueError(f"Unknown MLS Grid throttle priority: {priority}")
+        share = 1.0 if priority == PRIORITY_INTERACTIVE else BULK_SHARE
+        hourly_cap = int(MAX_REQUESTS_PER_HOUR * share)
+        daily_cap = int(MAX_REQUESTS_PER_DAY * share)
+
+        while True:
+            with self._locked() as state:
+                now = time.time()
+                if state.paused_until > now and priority == PRIORITY_INTERACTIVE:
+                    # Nobody should sit on a page load through a pause; bulk callers queue behind it
+                    until = datetime.fromtimestamp(state.paused_until).strftime('%H:%M:%S')
+                    raise RuntimeError(f"MLS Grid requests paused until {until} after a rate limit response.")
+
+                if state.daily >= daily_cap:
+                    logger.error(f"Daily limit reached ({state.daily}/{daily_cap} {priority}). Aborting.")
+                    raise RuntimeError("MLS Grid daily request limit reached. Try again tomorrow.")
+
+                if state.hourly >= hourly_cap:
+                    wait_secs = max(0, state.hourly_frees_at(now) - now)
+                    logger.warning(
+                        f"Hourly limit reached ({state.hourly}/{hourly_cap} {priority}). Waiting {wait_secs:.0f}s")
+                    wait_secs += 1
+                    slot = None
+                elif priority == PRIORITY_BULK and state.next_slot > now + MIN_REQUEST_INTERVAL:
+                    # Someone is already queued; let any interactive fetch in ahead of us
+                    wait_secs = state.next_slot - MIN_REQUEST_INTERVAL - now
+                    slot = None
+                else:
+                    slot = max(now, state.next_slot)
+                    state.next_slot = slot + MIN_REQUEST_INTERVAL
+                    state.count(now)
+                    wait_secs = slot - now
+
+            if wait_secs > 0:
+                time.sleep(wait_secs)
+            if slot is not None:
+                return
 
     def record(self):
-        """Record that a request was made. Call after each API request."""
-        self._acquire_lock()
-        try:
-            state = self._load_state()
-            now = time.time()
-            state['requests'].append(now)
-            state['last_request'] = now
-            state = self._prune_old_requests(state)
-            self._save_state(state)
-        finally:
-            self._release_lock()
+        """Record that a request was made. Call after each API request.
+
+        The request was already counted when wait() handed out its slot;
+        this only stamps the time for get_status().
+        """
+        with self._locked() as state:
+            state.last_request = time.time()
+
+    def pause(self, seconds):
+        """Hold every process's requests for `seconds`, e.g. on a 429 from MLS Grid."""
+        with self._locked() as state:
+            until = time.time() + seconds
+            state.paused_until = max(state.paused_until, until)
+            state.next_slot = max(state.next_slot, until)
 
     def can_start_batch(self, estimated_requests):
         """Check if a batch operation is safe to start.
@@ -148,64 +259,60 @@ class MLSGridThrottle:
         Returns True only if we have enough headroom for the estimated
         number of requests without hitting limits.
         """
-        self._acquire_lock()
-        try:
-            state = self._load_state()
-            state = self._prune_old_requests(state)
-
-            hourly = self._requests_in_window(state, 3600)
-            daily = self._requests_in_window(state, 86400)
+        with self._locked() as state:
+            hourly, daily, paused_until = state.hourly, state.daily, state.paused_until
 
-            hourly_remaining = MAX_REQUESTS_PER_HOUR - hourly
-            daily_remaining = MAX_REQUESTS_PER_DAY - daily
+        hourly_remaining = MAX_REQUESTS_PER_HOUR - hourly
+        daily_remaining = MAX_REQUESTS_PER_DAY - daily
 
-            hourly_ok = estimated_requests < (MAX_REQUESTS_PER_HOUR * BATCH_HEADROOM - hourly)
-            daily_ok = estimated_requests < (MAX_REQUESTS_PER_DAY * BATCH_HEADROOM - daily)
+        hourly_ok = estimated_requests < (MAX_REQUESTS_PER_HOUR * BATCH_HEADROOM - hourly)
+        daily_ok = estimated_requests < (MAX_REQUESTS_PER_DAY * BATCH_HEADROOM - daily)
+        not_paused = paused_until <= time.time()
 
-            logger.info(
-                f"Batch check: {estimated_requests} requests needed. "
-                f"Hourly: {hourly}/{MAX_REQUESTS_PER_HOUR} used ({hourly_remaining} remaining). "
-                f"Daily: {daily}/{MAX_REQUESTS_PER_DAY} used ({daily_remaining} remaining)."
-            )
+        logger.info(
+            f"Batch check: {estimated_requests} requests needed. "
+            f"Hourly: {hourly}/{MAX_REQUESTS_PER_HOUR} used ({hourly_remaining} remaining). "
+            f"Daily: {daily}/{MAX_REQUESTS_PER_DAY} used ({daily_remaining} remaining)."
+        )
 
-            if not hourly_ok:
-                logger.warning(f"Batch rejected: would exceed hourly headroom")
-            if not daily_ok:
-                logger.warning(f"Batch rejected: would exceed daily headroom")
+        if not hourly_ok:
+            logger.warning("Batch rejected: would exceed hourly headroom")
+        if not daily_ok:
+            logger.warning("Batch rejected: would exceed daily headroom")
+        if not not_paused:
+            logger.warning("Batch rejected: requests are paused after a rate limit response")
 
-            return hourly_ok and daily_ok
-        finally:
-            self._release_lock()
+        return hourly_ok and daily_ok and not_paused
 
     def get_status(self):
         """Return current usage stats."""
-        self._acquire_lock()
-        try:
-            state = self._load_state()
-            state = self._prune_old_requests(state)
-            hourly = self._requests_in_window(state, 3600)
-            daily = self._requests_in_window(state, 86400)
-            last = state.get('last_request', 0)
-            last_str = datetime.fromtimestamp(last).strftime('%H:%M:%S') if last else 'never'
-            return {
-                'hourly_requests': hourly,
-                'hourly_limit': MAX_REQUESTS_PER_HOUR,
-                'daily_requests': daily,
-                'daily_limit': MAX_REQUESTS_PER_DAY,
-                'last_request': last_str,
-                'rps_limit': 1.0 / MIN_REQUEST_INTERVAL,
-            }
-        finally:
-            self._release_lock()
+        with self._locked() as state:
+            hourly, daily = state.hourly, state.daily
+            last, paused_until = state.last_request, state.paused_until
+        last_str = datetime.fromtimestamp(last).strftime('%H:%M:%S') if last else 'never'
+        return {
+            'hourly_requests': hourly,
+            'hourly_limit': MAX_REQUESTS_PER_HOUR,
+            'daily_requests': daily,
+            'daily_limit': MAX_REQUESTS_PER_DAY,
+            'last_request': last_str,
+            'rps_limit': 1.0 / MIN_REQUEST_INTERVAL,
+            'paused_until': (datetime.fromtimestamp(paused_until).strftime('%H:%M:%S')
+                             if paused_until > time.time() else None),
+        }
 
     def reset(self):
         """Clear all state. Use after confirmed suspension clears."""
-        self._acquire_lock()
-        try:
-            self._save_state({'requests': [], 'last_request': 0})
-            logger.info("Throttle state reset.")
-        finally:
-            self._release_lock()
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[:] = bytes(_FILE_SIZE)
+                state = _Counters(self._map)
+                state.head_minute = int(time.time() // 60)
+                state.save()
+                logger.info("Throttle state reset.")
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
 
 
 # Singleton
@@ -83,3 +83,30 @@ def capture_exception(exc: BaseException) -> None:
         sentry_sdk.capture_exception(exc)
     except Exception:
         pass
+
+
+def pool_health() -> dict:
+    """PostgreSQL pool metrics with a coarse status, for health endpoints.
+
+    status is "saturated" while every connection is checked out or a
+    request is queued for one, "ok" otherwise, and "not_initialized"
+    before the first checkout in this process. When Sentry is active the
+    snapshot is also attached as event context, so a pool-exhaustion
+    error arrives with the occupancy that caused it.
+    """
+    from src.core.pg_adapter import pool_stats
+
+    stats = pool_stats()
+    if not stats:
+        return {"status": "not_initialized"}
+
+    saturated = stats["in_use"] >= stats["maxconn"] or stats["waiting"] > 0
+    stats["status"] = "saturated" if saturated else "ok"
+
+    if _initialized:
+        try:
+            import sentry_sdk
+            sentry_sdk.set_context("db_pool", stats)
+        except Exception:
+            pass
+    return stats
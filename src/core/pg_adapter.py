@@ -24,11 +24,15 @@ When DATABASE_URL is not set, falls back to sqlite3 so DEV keeps working.
 from __future__ import annotations
 
 import logging
+import itertools
 import os
 import re
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +86,147 @@ def active_backend() -> str:
     return "postgres" if is_postgres() else "sqlite"
 
 
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+#
+# Sizing and behaviour come from the environment so each service can be
+# tuned without a code change:
+#
+#   DREAMS_PG_POOL_MIN      connections opened eagerly (default 2)
+#   DREAMS_PG_POOL_MAX      hard cap per process (default 5)
+#   DREAMS_PG_POOL_TIMEOUT  seconds getconn() waits for a free connection
+#                           before raising PoolError (default 10). The stock
+#                           ThreadedConnectionPool raises immediately, which
+#                           turned every slow report query into 500s for
+#                           concurrent requests.
+#   DREAMS_PG_POOL_PIN      1 = the Flask apps open a pin scope per request,
+#                           so every get_connection() in that request shares
+#                           one pooled connection (see pin_thread_connection).
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets.
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0, 5.0)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, os.getenv(name))
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, os.getenv(name))
+        return default
+
+
+def pool_config() -> Dict[str, Any]:
+    """Pool settings resolved from the environment."""
+    maxconn = max(_env_int("DREAMS_PG_POOL_MAX", 5), 1)
+    return {
+        "minconn": min(max(_env_int("DREAMS_PG_POOL_MIN", 2), 0), maxconn),
+        "maxconn": maxconn,
+        "timeout": max(_env_float("DREAMS_PG_POOL_TIMEOUT", 10.0), 0.0),
+        "pin": os.getenv("DREAMS_PG_POOL_PIN", "").strip().lower() in ("1", "true", "yes"),
+    }
+
+
+_PoolBase = psycopg2.pool.ThreadedConnectionPool if _PG_AVAILABLE else object
+
+
+class InstrumentedPool(_PoolBase):
+    """
+    ThreadedConnectionPool that waits (up to `timeout`) for a free
+    connection instead of failing fast, and records checkout metrics.
+
+    A semaphore sized to maxconn gates getconn(); putconn() releases it.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float = 10.0, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.exhausted = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def getconn(self, key=None):
+        start = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self.exhausted += 1
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._metrics_lock:
+                    self.waiting -= 1
+            if not acquired:
+                with self._metrics_lock:
+                    self.timeouts += 1
+                raise psycopg2.pool.PoolError(
+                    f"connection pool exhausted: no connection free after {self.timeout:.1f}s "
+                    f"(maxconn={self.maxconn})"
+                )
+        waited = time.monotonic() - start
+
+        try:
+            conn = super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if waited < bound:
+                    self.wait_histogram[i] += 1
+                    break
+            else:
+                self.wait_histogram[-1] += 1
+        return conn
+
+    def putconn(self, conn, key=None, close=False):
+        super().putconn(conn, key=key, close=close)
+        try:
+            self._slots.release()
+        except ValueError:
+            pass  # more releases than acquires; never block on bookkeeping
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and checkout-wait metrics."""
+        with self._lock:
+            in_use = len(self._used)
+            idle = len(self._pool)
+        with self._metrics_lock:
+            labels = [f"lt_{int(b * 1000)}ms" for b in WAIT_BUCKETS] + [f"ge_{int(WAIT_BUCKETS[-1] * 1000)}ms"]
+            return {
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "timeout_s": self.timeout,
+                "in_use": in_use,
+                "idle": idle,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+            }
+
+
 def _get_pool():
     """Get or create the connection pool."""
     global _pool
@@ -89,18 +234,131 @@ def _get_pool():
         url = _get_database_url()
         if not url:
             raise RuntimeError("DATABASE_URL not set")
-        _pool = psycopg2.pool.ThreadedConnectionPool(
-            minconn=2,
-            maxconn=5,
+        cfg = pool_config()
+        _pool = InstrumentedPool(
+            minconn=cfg["minconn"],
+            maxconn=cfg["maxconn"],
             dsn=url,
+            timeout=cfg["timeout"],
+        )
+        logger.info(
+            "PostgreSQL connection pool created (min=%d, max=%d, timeout=%.1fs, pin=%s)",
+            cfg["minconn"], cfg["maxconn"], cfg["timeout"], cfg["pin"],
         )
-        logger.info("PostgreSQL connection pool created (min=2, max=5)")
     return _pool
 
 
+def pool_stats() -> Dict[str, Any]:
+    """Pool metrics for health checks. Empty dict if no pool exists yet."""
+    if _pool is None or not hasattr(_pool, "stats"):
+        return {}
+    out = _pool.stats()
+    out["pinned"] = _pinned_count
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Request/thread connection affinity
+# ---------------------------------------------------------------------------
+
+_thread_state = threading.local()
+_pinned_count = 0
+_pinned_lock = threading.Lock()
+
+
+class _PinnedConnection:
+    """One pooled connection shared by every wrapper opened in a pin scope."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.refs = 0
+        self.released = False
+
+
+def _adjust_pinned(delta: int) -> None:
+    global _pinned_count
+    with _pinned_lock:
+        _pinned_count += delta
+
+
+def _return_pinned(pin: _PinnedConnection) -> None:
+    try:
+        pin.conn.rollback()
+    except Exception:
+        pass
+    try:
+        _get_pool().putconn(pin.conn)
+    except Exception:
+        try:
+            pin.conn.close()
+        except Exception:
+            pass
+    _adjust_pinned(-1)
+
+
+def pin_thread_connection() -> None:
+    """Start a pin scope on this thread.
+
+    Until unpin_thread_connection() is called, get_connection() on this
+    thread reuses a single pooled connection (checked out lazily on first
+    use) instead of doing a getconn/putconn per query helper. Intended for
+    Flask before_request/teardown_request hooks. No-op without Postgres.
+    """
+    if not is_postgres():
+        return
+    _thread_state.pin_scope = True
+
+
+def unpin_thread_connection() -> None:
+    """End this thread's pin scope and return its connection to the pool.
+
+    If wrappers from the scope are still open, the connection goes back
+    when the last of them is closed.
+    """
+    _thread_state.pin_scope = False
+    pin = getattr(_thread_state, "pinned", None)
+    _thread_state.pinned = None
+    if pin is None:
+        return
+    pin.released = True
+    if pin.refs <= 0:
+        _return_pinned(pin)
+
+
+@contextmanager
+def pinned_connection():
+    """Context manager form of pin_thread_connection/unpin_thread_connection."""
+    pin_thread_connection()
+    try:
+        yield
+    finally:
+        unpin_thread_connection()
+
+
+# Rows fetched per round trip by streaming iteration (stream()/iter_rows()).
+STREAM_BATCH_SIZE = 1000
+
+_stream_ids = itertools.count(1)
+
+
+def _result_columns(description) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Column names for a result set, computed once and shared by its rows.
+
+    Returns (names, keys): names in SELECT order (duplicates included, so
+    zip() lines up with the value tuple) and keys de-duplicated in first-seen
+    order, which is what integer indexing resolves against.
+    """
+    names = tuple(col[0] for col in description or ())
+    return names, tuple(dict.fromkeys(names))
+
+
 class PgCursorWrapper:
     """
     Wraps a psycopg2 cursor to return dict-like rows (matching sqlite3.Row behavior).
+
+    The underlying cursor returns plain tuples; each row is turned into a
+    DictRow that shares the result set's column tuple, so a row costs one
+    dict rather than a RealDictRow plus a DictRow plus a keys list.
     """
 
     def __init__(self, cursor):
@@ -108,18 +366,23 @@ class PgCursorWrapper:
         self.description = cursor.description
         self.rowcount = cursor.rowcount
         self.lastrowid = None
+        self._names, self._keys = _result_columns(cursor.description)
+
+    def _row(self, values) -> "DictRow":
+        return DictRow.from_values(self._names, self._keys, values)
 
     def fetchone(self) -> Optional[Dict[str, Any]]:
         row = self._cursor.fetchone()
         if row is None:
             return None
-        # RealDictRow is already dict-like, but convert to regular dict
-        # so it supports both dict[key] and tuple indexing
-        return DictRow(row)
+        return self._row(row)
+
+    def fetchmany(self, size: int = STREAM_BATCH_SIZE) -> List[Dict[str, Any]]:
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
 
     def fetchall(self) -> List[Dict[str, Any]]:
         rows = self._cursor.fetchall()
-        return [DictRow(r) for r in rows]
+        return [self._row(r) for r in rows]
 
     def __iter__(self):
         return self
@@ -128,18 +391,30 @@ class PgCursorWrapper:
         row = self._cursor.fetchone()
         if row is None:
             raise StopIteration
-        return DictRow(row)
+        return self._row(row)
 
 
 class DictRow(dict):
     """
     Dict that also supports integer indexing (like sqlite3.Row).
     This is needed because some code does `row[0]` while other code does `row['id']`.
+
+    Rows built by PgCursorWrapper share one keys tuple per result set.
     """
 
+    __slots__ = ('_keys',)
+
     def __init__(self, mapping):
         super().__init__(mapping)
-        self._keys = list(mapping.keys())
+        self._keys = tuple(mapping.keys())
+
+    @classmethod
+    def from_values(cls, names: Tuple[str, ...], keys: Tuple[str, ...], values) -> "DictRow":
+        """Build a row from a value tuple without copying the column list."""
+        row = dict.__new__(cls)
+        dict.__init__(row, zip(names, values))
+        row._keys = keys
+        return row
 
     def __getitem__(self, key):
         if isinstance(key, int):
@@ -147,40 +422,41 @@ class DictRow(dict):
         return super().__getitem__(key)
 
 
-# Regex to translate ? placeholders to %s, but NOT inside quoted strings
-# This handles: "INSERT INTO t (a, b) VALUES (?, ?)" → "INSERT INTO t (a, b) VALUES (%s, %s)"
-# It skips ? inside single-quoted strings like "WHERE name = 'what?'"
+# Tokenizer for placeholder translation. One pass over the query matches
+# either a single-quoted literal (with '' escapes; an unterminated literal
+# runs to the end of the string), a bare ?, or a bare %. Everything else is
+# copied through untouched by re.sub.
+_PLACEHOLDER_TOKEN_RE = re.compile(r"'(?:[^']|'')*'?|[?%]")
+
+# Distinct query texts kept in the translation cache. The static SQL in
+# DREAMSDatabase and ListingService is a few hundred strings; dynamically
+# built queries (IN lists, optional filters) churn through the remainder.
+PLACEHOLDER_CACHE_SIZE = 2048
+
+
+def _translate_token(match: "re.Match[str]") -> str:
+    token = match.group(0)
+    if token == '?':
+        return '%s'
+    # '%' on its own, or a quoted literal. psycopg2 interprets % in the
+    # entire query string, including inside SQL string literals, so all %
+    # must be doubled.
+    return token.replace('%', '%%')
+
+
+@lru_cache(maxsize=PLACEHOLDER_CACHE_SIZE)
 def _translate_placeholders(query: str) -> str:
     """Translate sqlite3 ? placeholders to psycopg2 %s placeholders.
 
     Handles:
+    - ? inside single-quoted literals like "WHERE name = 'what?'" is left alone
     - '' (escaped single quote inside a string literal) without toggling in_quote
     - % in LIKE patterns (escaped to %% for psycopg2)
+
+    Results are memoized per query text (bounded LRU), so the long static
+    queries issued on every request are only tokenized once per process.
     """
-    result = []
-    in_quote = False
-    i = 0
-    while i < len(query):
-        ch = query[i]
-        if ch == "'":
-            if in_quote and i + 1 < len(query) and query[i + 1] == "'":
-                # Escaped single quote inside a string literal — emit both, stay in quote
-                result.append("''")
-                i += 2
-                continue
-            in_quote = not in_quote
-            result.append(ch)
-        elif ch == '?' and not in_quote:
-            result.append('%s')
-        elif ch == '%':
-            # psycopg2 interprets % in the entire query string, including inside
-            # SQL string literals. All % must be doubled.
-            result.append('%%')
-        else:
-            result.append(ch)
-        i += 1
-
-    return ''.join(result)
+    return _PLACEHOLDER_TOKEN_RE.sub(_translate_token, query)
 
 
 class PgConnectionWrapper:
@@ -188,9 +464,10 @@ class PgConnectionWrapper:
     Wraps a psycopg2 connection to provide a sqlite3-compatible interface.
     """
 
-    def __init__(self, conn):
+    def __init__(self, conn, pin: Optional[_PinnedConnection] = None):
         self._conn = conn
         self._cursor = None
+        self._pin = pin
 
     def execute(self, query: str, params: Any = None) -> PgCursorWrapper:
         """Execute a query with sqlite3-style ? placeholders."""
@@ -208,7 +485,7 @@ class PgConnectionWrapper:
         if isinstance(params, list):
             params = tuple(params)
 
-        cursor = self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor = self._conn.cursor()
         try:
             cursor.execute(pg_query, params)
         except Exception:
@@ -220,12 +497,48 @@ class PgConnectionWrapper:
         self._cursor = wrapper
         return wrapper
 
-    def executemany(self, query: str, params_list: Sequence) -> None:
-        """Execute a query with multiple parameter sets."""
+    def stream(
+        self,
+        query: str,
+        params: Any = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        withhold: bool = False,
+    ) -> Iterator["DictRow"]:
+        """Iterate a large result through a server-side (named) cursor.
+
+        The cursor is declared when stream() is called; rows are then pulled
+        batch_size at a time with fetchmany, so peak memory is one batch
+        instead of the whole result. A named cursor lives inside the current
+        transaction: pass withhold=True if the caller commits on this
+        connection while still iterating, and commit once right after
+        stream() returns, since a rollback before the first commit drops
+        even a WITH HOLD cursor.
+        """
+        pg_query = _translate_placeholders(query)
+        if isinstance(params, list):
+            params = tuple(params)
+
+        cursor = self._conn.cursor(name=f"dreams_stream_{next(_stream_ids)}", withhold=withhold)
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(pg_query, params)
+        except Exception:
+            logger.debug("Failed query: %s", pg_query[:200])
+            _close_quietly(cursor)
+            raise
+        return _stream_rows(cursor, batch_size)
+
+    def executemany(self, query: str, params_list: Sequence, page_size: int = 100) -> None:
+        """Execute a query with multiple parameter sets.
+
+        Uses psycopg2.extras.execute_batch, which joins up to page_size
+        statements into a single round trip. cursor.executemany would send
+        one network round trip per parameter set.
+        """
         pg_query = _translate_placeholders(query)
         cursor = self._conn.cursor()
         params_as_tuples = [tuple(p) if isinstance(p, list) else p for p in params_list]
-        cursor.executemany(pg_query, params_as_tuples)
+        psycopg2.extras.execute_batch(cursor, pg_query, params_as_tuples, page_size=page_size)
 
     def executescript(self, script: str) -> None:
         """Execute multiple SQL statements (PostgreSQL equivalent of sqlite3.executescript)."""
@@ -240,6 +553,20 @@ class PgConnectionWrapper:
 
     def close(self) -> None:
         """Return connection to pool instead of closing."""
+        if self._pin is not None:
+            # Shared pinned connection: only the last wrapper rolls back,
+            # and it stays checked out until the pin scope ends.
+            pin, self._pin = self._pin, None
+            pin.refs -= 1
+            if pin.refs <= 0:
+                if pin.released:
+                    _return_pinned(pin)
+                else:
+                    try:
+                        pin.conn.rollback()
+                    except Exception:
+                        pass
+            return
         try:
             self._conn.rollback()  # Cancel any uncommitted transaction
         except Exception:
@@ -280,8 +607,77 @@ class PgConnectionWrapper:
         return False
 
 
+def _close_quietly(cursor) -> None:
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+def _stream_rows(cursor, batch_size: int) -> Iterator[DictRow]:
+    """DictRows from an executed named cursor; closes it when done."""
+    try:
+        names = keys = None
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            if names is None:
+                # Named cursors only have a description after the first fetch.
+                names, keys = _result_columns(cursor.description)
+            for values in batch:
+                yield DictRow.from_values(names, keys, values)
+    finally:
+        _close_quietly(cursor)
+
+
+def _fetch_batches(cursor, batch_size: int) -> Iterator[Any]:
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        yield from batch
+
+
+def iter_rows(
+    conn,
+    query: str,
+    params: Any = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+    withhold: bool = False,
+) -> Iterator[Any]:
+    """Stream query results from either backend without materializing them.
+
+    The query runs before this returns; rows are fetched as the iterator
+    is consumed. On a PgConnectionWrapper this uses a server-side cursor
+    (see PgConnectionWrapper.stream). On sqlite3 (test isolation mode) it
+    falls back to execute() + fetchmany(), which sqlite3 already evaluates
+    lazily.
+    """
+    if isinstance(conn, PgConnectionWrapper):
+        return conn.stream(query, params, batch_size=batch_size, withhold=withhold)
+
+    cursor = conn.execute(query, params if params is not None else ())
+    return _fetch_batches(cursor, batch_size)
+
+
 def get_connection() -> PgConnectionWrapper:
-    """Get a PostgreSQL connection from the pool, wrapped for sqlite3 compatibility."""
+    """Get a PostgreSQL connection from the pool, wrapped for sqlite3 compatibility.
+
+    Inside a pin scope (pin_thread_connection) every call on the thread
+    shares the same pooled connection.
+    """
+    if getattr(_thread_state, "pin_scope", False):
+        pin = getattr(_thread_state, "pinned", None)
+        if pin is None:
+            conn = _get_pool().getconn()
+            conn.autocommit = False
+            pin = _PinnedConnection(conn)
+            _thread_state.pinned = pin
+            _adjust_pinned(1)
+        pin.refs += 1
+        return PgConnectionWrapper(pin.conn, pin=pin)
+
     pool = _get_pool()
     conn = pool.getconn()
     conn.autocommit = False
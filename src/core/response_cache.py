@@ -0,0 +1,216 @@
+"""In-process response cache for read-heavy public API endpoints.
+
+Listing data only changes when a sync run commits, yet the public search,
+map, stats and areas endpoints recomputed everything from PostgreSQL on
+every hit. This module provides:
+
+  - A sync generation counter in the `sync_generation` table. The Navica,
+    MLS Grid and Hive sync engines call `bump_sync_generation()` after a
+    run commits; API workers poll it (at most every DREAMS_CACHE_GENERATION_POLL
+    seconds) and treat any change as "every cached response is stale".
+  - `ResponseCache`, a thread-safe LRU bounded by entry count and total
+    body bytes, with hit/miss/eviction counters. Entries also expire after
+    DREAMS_RESPONSE_CACHE_TTL seconds so writers that don't bump the
+    generation (gallery backfill, admin edits) are picked up eventually.
+
+ETags are derived from the generation and a hash of the body, so a client
+revalidating with If-None-Match gets a 304 until the data actually changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("DREAMS_RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("DREAMS_RESPONSE_CACHE_MAX_MB", "64")) * 1024 * 1024
+RESPONSE_CACHE_TTL = float(os.getenv("DREAMS_RESPONSE_CACHE_TTL", "300"))
+GENERATION_POLL_SECONDS = float(os.getenv("DREAMS_CACHE_GENERATION_POLL", "2"))
+
+DEFAULT_SCOPE = "listings"
+
+
+# ---------------------------------------------------------------------------
+# Sync generation counter
+# ---------------------------------------------------------------------------
+
+def bump_sync_generation(conn, scope: str = DEFAULT_SCOPE) -> None:
+    """Advance the generation for scope. Caller commits.
+
+    Call after the writes it covers have been committed (or in the same
+    transaction as the last of them), never before. The sync_generation
+    table is created by migration e9b4d2a6c8f1. A failed bump is logged
+    and rolled back to its own savepoint so it never costs the caller its
+    writes; cached responses then expire after RESPONSE_CACHE_TTL.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        conn.execute("SAVEPOINT sync_generation_bump")
+        cursor = conn.execute(
+            "UPDATE sync_generation SET generation = generation + 1, updated_at = ? "
+            "WHERE scope = ?",
+            [now, scope],
+        )
+        if cursor.rowcount == 0:
+            conn.execute(
+                "INSERT INTO sync_generation (scope, generation, updated_at) VALUES (?, 1, ?)",
+                [scope, now],
+            )
+        conn.execute("RELEASE SAVEPOINT sync_generation_bump")
+    except Exception as e:
+        logger.warning("sync_generation bump failed for %s: %s", scope, e)
+        try:
+            conn.execute("ROLLBACK TO SAVEPOINT sync_generation_bump")
+            conn.execute("RELEASE SAVEPOINT sync_generation_bump")
+        except Exception:
+            pass
+
+
+_generation_lock = threading.Lock()
+_generation_seen: Dict[str, Tuple[float, int]] = {}
+
+
+def current_sync_generation(scope: str = DEFAULT_SCOPE) -> int:
+    """Latest generation for scope, re-read at most every GENERATION_POLL_SECONDS.
+
+    Returns 0 when the table doesn't exist yet (no sync has bumped it).
+    """
+    now = time.monotonic()
+    seen = _generation_seen.get(scope)
+    if seen and (now - seen[0]) < GENERATION_POLL_SECONDS:
+        return seen[1]
+
+    from src.core.pg_adapter import get_db
+    generation = seen[1] if seen else 0
+    conn = None
+    try:
+        conn = get_db()
+        row = conn.execute(
+            "SELECT generation FROM sync_generation WHERE scope = ?", [scope]
+        ).fetchone()
+        generation = row[0] if row else 0
+    except Exception as e:
+        logger.debug("sync_generation read failed: %s", e)
+        if conn is not None:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    with _generation_lock:
+        _generation_seen[scope] = (now, generation)
+    return generation
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+def make_etag(generation: int, body: bytes) -> str:
+    """Strong ETag for a response body at a given sync generation."""
+    return f'"g{generation}-{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+class CachedResponse:
+    __slots__ = ("generation", "body", "status", "mimetype", "etag", "stored_at")
+
+    def __init__(self, generation: int, body: bytes, status: int, mimetype: str):
+        self.generation = generation
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.etag = make_etag(generation, body)
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered response bodies, bounded by count and bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = RESPONSE_CACHE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, generation: int) -> Optional[CachedResponse]:
+        """Return the entry for key if it belongs to generation and hasn't expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.generation != generation or (time.monotonic() - entry.stored_at) >= self.ttl:
+                self._drop(key)
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
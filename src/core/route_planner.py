@@ -0,0 +1,419 @@
+"""
+Showing tour route planning and a shared geocode cache.
+
+The buyer-workflow "Optimize route" button used to run a greedy
+nearest-neighbor walk from whichever property happened to be first,
+recomputing haversine distances inside an O(n^2) Python loop with
+list.remove, ignoring the meeting point, and writing one UPDATE per stop.
+The dashboard's CSV route planner sent every address-only stop to the
+browser without coordinates, so each upload was geocoded again.
+
+plan_route() now:
+
+  1. Builds the full pairwise distance matrix in one numpy pass.
+  2. Starts from the meeting point (or, without one, from whichever stop
+     gives the shortest nearest-neighbor tour) and builds a tour.
+  3. Improves it with 2-opt (segment reversal) and Or-opt (moving runs of
+     1-3 stops, optionally reversed). The neighborhood is a precomputed
+     array of position permutations, so each pass scores every neighbor
+     with a few array operations and takes the best, until none improves.
+  4. Schedules the tour with per-stop durations. With time windows the
+     search minimizes late minutes first and miles second.
+
+The tour is open: it ends at the last stop, so the drive home doesn't
+shape the order. 30+ stop tours plan in well under a second.
+
+geocode() resolves (address, city, state) through the geocode_cache table,
+keyed by normalize_address(), and only calls the geocoder for addresses it
+hasn't seen. Failed lookups are cached too and retried after
+GEOCODE_MISS_TTL.
+
+Usage:
+    from src.core import route_planner
+
+    plan = route_planner.plan_route(
+        [(35.37, -83.22), (35.31, -83.18), ...],
+        start=(35.43, -83.45),
+        durations=[30, 45, ...],
+        windows=[(None, 660), (600, None), ...],   # minutes since midnight
+        start_minute=540,
+    )
+    plan.order, plan.arrivals, plan.total_distance
+
+    coords = route_planner.geocode(conn, [('39 Red Bud Ln', 'Sylva', 'NC')],
+                                   geocoder=spatial.geocode_address)
+    conn.commit()
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3959.0
+DEFAULT_SPEED_MPH = 30.0        # mountain roads
+DEFAULT_STOP_MINUTES = 30
+OR_OPT_SEGMENTS = (1, 2, 3)
+MAX_PASSES = 500
+GEOCODE_MISS_TTL = timedelta(days=7)
+GEOCODE_LOOKUP_CHUNK = 500
+
+_EPS = 1e-9
+
+LatLng = Tuple[float, float]
+Window = Tuple[Optional[float], Optional[float]]
+
+_ABBREVIATIONS = {
+    'street': 'st', 'road': 'rd', 'drive': 'dr', 'lane': 'ln', 'avenue': 'ave',
+    'court': 'ct', 'circle': 'cir', 'place': 'pl', 'trail': 'trl', 'terrace': 'ter',
+    'boulevard': 'blvd', 'parkway': 'pkwy', 'highway': 'hwy', 'mountain': 'mtn',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+}
+
+
+# =============================================================================
+# Route planning
+# =============================================================================
+
+@dataclass
+class RoutePlan:
+    """A planned tour. List positions follow `order`, not input indices."""
+    order: List[int]            # input stop indices in visiting order
+    legs: List[float]           # miles driven to reach each stop
+    arrivals: List[float]       # minute each visit starts (after any wait)
+    departures: List[float]     # minute each visit ends
+    total_distance: float       # miles, start through last stop
+    drive_minutes: float
+    late_minutes: float         # total minutes past window closes
+
+    @property
+    def end_minute(self) -> float:
+        return self.departures[-1] if self.departures else 0.0
+
+
+def distance_matrix(points: Sequence[LatLng]) -> np.ndarray:
+    """Pairwise haversine distances in miles, as an (n, n) array."""
+    coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+    lat = coords[:, :1]
+    lng = coords[:, 1:]
+    a = (np.sin((lat - lat.T) / 2) ** 2
+         + np.cos(lat) * np.cos(lat.T) * np.sin((lng - lng.T) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def plan_route(
+    points: Sequence[LatLng],
+    start: Optional[LatLng] = None,
+    durations: Optional[Sequence[float]] = None,
+    windows: Optional[Sequence[Optional[Window]]] = None,
+    start_minute: float = 0.0,
+    speed_mph: float = DEFAULT_SPEED_MPH,
+) -> RoutePlan:
+    """
+    Order stops to minimize driving, starting from `start` if given.
+
+    Args:
+        points: (lat, lng) per stop
+        start: Meeting point; without one the tour may start at any stop
+        durations: Minutes spent at each stop (default DEFAULT_STOP_MINUTES)
+        windows: Per stop (earliest, latest) visit start, on the same clock
+            as start_minute; None or a None bound means unconstrained
+        start_minute: Departure time from the start
+        speed_mph: Average driving speed for the schedule
+
+    Returns:
+        RoutePlan
+    """
+    n = len(points)
+    if n == 0:
+        return RoutePlan([], [], [], [], 0.0, 0.0, 0.0)
+
+    # Node n is the depot: the meeting point, or a free start that is zero
+    # miles from every stop.
+    depot = n
+    dist = distance_matrix(list(points) + [start or points[0]])
+    if start is None:
+        dist[depot, :] = 0.0
+        dist[:, depot] = 0.0
+    # Search cost: the return to the depot is free, which turns the open
+    # path into a closed tour that 2-opt/Or-opt can work on directly.
+    cost = dist.copy()
+    cost[:, depot] = 0.0
+
+    durations = np.array(
+        [DEFAULT_STOP_MINUTES if d is None else float(d)
+         for d in (durations if durations is not None else [None] * n)] + [0.0])
+    earliest = np.full(n + 1, -np.inf)
+    latest = np.full(n + 1, np.inf)
+    for i, window in enumerate(windows or []):
+        if window:
+            if window[0] is not None:
+                earliest[i] = window[0]
+            if window[1] is not None:
+                latest[i] = window[1]
+    timed = bool(np.isfinite(earliest).any() or np.isfinite(latest).any())
+
+    schedule = _Scheduler(dist, durations, earliest, latest, start_minute, speed_mph)
+    tour = _initial_tour(cost, depot, anywhere=start is None)
+    tour = _improve(tour, cost, schedule if timed else None)
+    return schedule.plan(tour)
+
+
+def _tour_length(tour: np.ndarray, cost: np.ndarray) -> float:
+    return float(cost[tour, np.roll(tour, -1)].sum())
+
+
+def _nearest_neighbor(cost: np.ndarray, depot: int, first: Optional[int] = None) -> np.ndarray:
+    unvisited = np.ones(len(cost), dtype=bool)
+    unvisited[depot] = False
+    tour = [depot]
+    current = depot
+    if first is not None:
+        unvisited[first] = False
+        tour.append(first)
+        current = first
+    while unvisited.any():
+        current = int(np.where(unvisited, cost[current], np.inf).argmin())
+        unvisited[current] = False
+        tour.append(current)
+    return np.array(tour)
+
+
+def _initial_tour(cost: np.ndarray, depot: int, anywhere: bool) -> np.ndarray:
+    if not anywhere:
+        return _nearest_neighbor(cost, depot)
+    tours = [_nearest_neighbor(cost, depot, first) for first in range(depot)]
+    return min(tours, key=lambda t: _tour_length(t, cost))
+
+
+@lru_cache(maxsize=64)
+def _neighborhood(m: int) -> np.ndarray:
+    """
+    Every 2-opt and Or-opt move on an m-node tour, as position permutations.
+
+    Row r maps positions of the current tour to a neighbor: tour[moves[r]].
+    Position 0 (the depot) never moves. Moves depend only on the tour size,
+    so each pass builds and scores all neighbors with a few array operations.
+    """
+    pos = np.arange(m)
+    rows = []
+    # 2-opt: reverse positions i..j
+    for i in range(1, m - 1):
+        for j in range(i + 1, m):
+            row = pos.copy()
+            row[i:j + 1] = pos[i:j + 1][::-1]
+            rows.append(row)
+    # Or-opt: move the run at i..i+length-1 after rest[k], forward or reversed
+    for length in OR_OPT_SEGMENTS:
+        if length >= m - 1:
+            break
+        for i in range(1, m - length + 1):
+            seg = pos[i:i + length]
+            rest = np.concatenate([pos[:i], pos[i + length:]])
+            for k in range(len(rest)):
+                for run in (seg, seg[::-1]):
+                    if k == i - 1 and run is seg:
+                        continue        # back where it was
+                    if length == 1 and run is not seg:
+                        continue        # reversing one stop is a no-op
+                    rows.append(np.concatenate([rest[:k + 1], run, rest[k + 1:]]))
+    if not rows:
+        return np.empty((0, m), dtype=int)
+    return np.unique(np.array(rows), axis=0)
+
+
+def _improve(tour: np.ndarray, cost: np.ndarray, schedule: Optional['_Scheduler']) -> np.ndarray:
+    """
+    Best-improvement local search over _neighborhood().
+
+    Untimed tours minimize miles. Timed tours minimize late minutes first and
+    miles second, so no accepted move ever makes the schedule later.
+    """
+    moves = _neighborhood(len(tour))
+    if not len(moves):
+        return tour
+    length = _tour_length(tour, cost)
+    late = schedule.lateness(tour[None, :])[0] if schedule else 0.0
+    for _ in range(MAX_PASSES):
+        candidates = tour[moves]
+        lengths = cost[candidates, np.roll(candidates, -1, axis=1)].sum(axis=1)
+        if schedule is None:
+            best = int(lengths.argmin())
+            if lengths[best] >= length - _EPS:
+                break
+        else:
+            lates = schedule.lateness(candidates)
+            better = (lates < late - _EPS) | ((lates <= late + _EPS) & (lengths < length - _EPS))
+            if not better.any():
+                break
+            idx = np.flatnonzero(better)
+            best = int(idx[np.lexsort((lengths[idx], np.round(lates[idx], 6)))[0]])
+            late = lates[best]
+        tour, length = candidates[best], lengths[best]
+    return tour
+
+
+class _Scheduler:
+    """Walks tours with drive times, waits and stop durations."""
+
+    def __init__(self, dist, durations, earliest, latest, start_minute, speed_mph):
+        self.dist = dist
+        self.minutes = dist * (60.0 / speed_mph)
+        self.durations = durations
+        self.earliest = earliest
+        self.latest = latest
+        self.start_minute = start_minute
+
+    def _walk(self, tours: np.ndarray):
+        """Visit start/end minutes and total lateness for a (k, m) batch of tours."""
+        k, m = tours.shape
+        clock = np.full(k, float(self.start_minute))
+        late = np.zeros(k)
+        arrivals = np.zeros((k, m - 1))
+        departures = np.zeros((k, m - 1))
+        prev = tours[:, 0]
+        for p in range(1, m):
+            node = tours[:, p]
+            clock = np.maximum(clock + self.minutes[prev, node], self.earliest[node])
+            late += np.maximum(0.0, clock - self.latest[node])
+            arrivals[:, p - 1] = clock
+            clock = clock + self.durations[node]
+            departures[:, p - 1] = clock
+            prev = node
+        return arrivals, departures, late
+
+    def lateness(self, tours: np.ndarray) -> np.ndarray:
+        return self._walk(tours)[2]
+
+    def plan(self, tour: np.ndarray) -> RoutePlan:
+        arrivals, departures, late = self._walk(tour[None, :])
+        legs = self.dist[tour[:-1], tour[1:]]
+        return RoutePlan(
+            order=[int(node) for node in tour[1:]],
+            legs=[float(x) for x in legs],
+            arrivals=[float(x) for x in arrivals[0]],
+            departures=[float(x) for x in departures[0]],
+            total_distance=float(legs.sum()),
+            drive_minutes=float(self.minutes[tour[:-1], tour[1:]].sum()),
+            late_minutes=float(late[0]),
+        )
+
+
+# =============================================================================
+# Geocode cache
+# =============================================================================
+
+def ensure_tables(conn) -> None:
+    """Create geocode_cache.
+
+    Alembic migration d5f2b8c6e3a7 creates it on PostgreSQL, and
+    DREAMSDatabase on a fresh SQLite database. geocode() assumes it
+    exists.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS geocode_cache ("
+        "address_key TEXT PRIMARY KEY, "
+        "latitude REAL, "
+        "longitude REAL, "
+        "source TEXT, "
+        "geocoded_at TEXT NOT NULL)"
+    )
+
+
+def normalize_address(address: str, city: str = '', state: str = 'NC') -> str:
+    """
+    Cache key for an address: lowercase, punctuation stripped, common
+    street-type and direction words abbreviated, so "39 Red Bud Lane, Sylva"
+    and "39 RED BUD LN., sylva" share one entry.
+    """
+    parts = []
+    for part in (address, city, state or 'NC'):
+        words = re.sub(r"[^\w\s]", " ", (part or '').lower()).split()
+        parts.append(' '.join(_ABBREVIATIONS.get(w, w) for w in words))
+    return '|'.join(parts)
+
+
+def geocoder_for(service) -> Callable[[str, str, str], Optional[LatLng]]:
+    """geocode() callback for a SpatialDataService that raises on request failures."""
+    def lookup(address: str, city: str, state: str) -> Optional[LatLng]:
+        return service.geocode_address(address, city, state, raise_errors=True)
+    return lookup
+
+
+def geocode(
+    conn,
+    addresses: Iterable[Tuple[str, str, str]],
+    geocoder: Optional[Callable[[str, str, str], Optional[LatLng]]] = None,
+    source: str = 'addressnc',
+    now: Optional[datetime] = None,
+) -> Dict[str, Optional[LatLng]]:
+    """
+    Resolve (address, city, state) triples to (lat, lng), cache first.
+
+    Cache misses go to `geocoder` one at a time and are written back in one
+    statement; the caller commits. Without a geocoder only cached entries
+    are returned. Addresses the geocoder couldn't place map to None (and are
+    cached as misses for GEOCODE_MISS_TTL); addresses never looked up are
+    absent. The geocoder must raise when the lookup itself fails, or an
+    outage is cached as a week of misses; see geocoder_for().
+
+    Returns:
+        Dict keyed by normalize_address()
+    """
+    now = now or datetime.now()
+    wanted = {}
+    for address, city, state in addresses:
+        if address:
+            wanted.setdefault(normalize_address(address, city, state), (address, city or '', state or 'NC'))
+    if not wanted:
+        return {}
+
+    results: Dict[str, Optional[LatLng]] = {}
+    retry_before = (now - GEOCODE_MISS_TTL).isoformat()
+    keys = list(wanted)
+    for offset in range(0, len(keys), GEOCODE_LOOKUP_CHUNK):
+        chunk = keys[offset:offset + GEOCODE_LOOKUP_CHUNK]
+        rows = conn.execute(
+            f"SELECT address_key, latitude, longitude, geocoded_at FROM geocode_cache "
+            f"WHERE address_key IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall()
+        for row in rows:
+            if row['latitude'] is not None and row['longitude'] is not None:
+                results[row['address_key']] = (row['latitude'], row['longitude'])
+            elif row['geocoded_at'] >= retry_before:
+                results[row['address_key']] = None
+
+    misses = [key for key in keys if key not in results]
+    if not misses or geocoder is None:
+        return results
+
+    fresh = []
+    for key in misses:
+        address, city, state = wanted[key]
+        try:
+            coords = geocoder(address, city, state)
+        except Exception as e:
+            # Not cached: a transport error says nothing about the address
+            logger.warning("Geocode failed for %s: %s", key, e)
+            continue
+        results[key] = tuple(coords) if coords else None
+        fresh.append((key, coords[0] if coords else None, coords[1] if coords else None,
+                      source, now.isoformat()))
+    if fresh:
+        conn.executemany(
+            "INSERT INTO geocode_cache (address_key, latitude, longitude, source, geocoded_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(address_key) DO UPDATE SET latitude = excluded.latitude, "
+            "longitude = excluded.longitude, source = excluded.source, "
+            "geocoded_at = excluded.geocoded_at",
+            fresh,
+        )
+    logger.debug("Geocode cache: %d hits, %d looked up", len(keys) - len(misses), len(fresh))
+    return results
@@ -257,8 +257,13 @@ class SpatialDataService:
             time.sleep(self.rate_limit_delay - elapsed)
         self._last_request_time = time.time()
 
-    def _make_request(self, url: str, params: Dict, timeout: int = 30) -> Optional[Dict]:
-        """Make HTTP request with error handling."""
+    def _make_request(self, url: str, params: Dict, timeout: int = 30,
+                      raise_errors: bool = False) -> Optional[Dict]:
+        """Make HTTP request with error handling.
+
+        With raise_errors, transport failures and non-JSON responses are
+        re-raised instead of returned as None.
+        """
         self._rate_limit()
 
         try:
@@ -267,9 +272,13 @@ class SpatialDataService:
             return response.json()
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request failed: {url} - {e}")
+            if raise_errors:
+                raise
             return None
         except ValueError as e:
             logger.warning(f"Invalid JSON response: {url} - {e}")
+            if raise_errors:
+                raise
             return None
 
     def query_flood_zone(self, lat: float, lon: float) -> Optional[FloodZoneResult]:
@@ -503,7 +512,8 @@ class SpatialDataService:
 
         return result
 
-    def geocode_address(self, address: str, city: str = None, state: str = 'NC') -> Optional[Tuple[float, float]]:
+    def geocode_address(self, address: str, city: str = None, state: str = 'NC',
+                        raise_errors: bool = False) -> Optional[Tuple[float, float]]:
         """
         Geocode an address using NC AddressNC service.
 
@@ -511,6 +521,9 @@ class SpatialDataService:
             address: Street address
             city: City name (optional)
             state: State (default NC)
+            raise_errors: Raise on request failure instead of returning None,
+                so callers that cache misses can tell "no match" from
+                "service unreachable"
 
         Returns:
             (latitude, longitude) tuple or None
@@ -528,7 +541,7 @@ class SpatialDataService:
             'maxLocations': 1
         }
 
-        data = self._make_request(GEOCODE_URL, params)
+        data = self._make_request(GEOCODE_URL, params, raise_errors=raise_errors)
 
         if not data:
             return None
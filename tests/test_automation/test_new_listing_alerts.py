@@ -0,0 +1,231 @@
+"""
+Tests for the indexed buyer matcher in apps/automation/new_listing_alerts.
+
+Run: python3 -m pytest tests/test_automation/test_new_listing_alerts.py -v
+"""
+
+import random
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from apps.automation.new_listing_alerts import calculate_match_score, match_buyers
+
+COUNTIES = ['Macon', 'Jackson', 'Swain', 'Haywood', 'Buncombe', 'Cherokee', 'Clay', 'Graham']
+CITIES = ['Franklin', 'Highlands', 'Sylva', 'Cashiers', 'Bryson City', 'Waynesville',
+          'Asheville', 'Murphy', 'Hayesville', 'Robbinsville', 'Dillsboro', 'Cullowhee']
+VIEWS = ['Mountain', 'Long Range', 'Lake']
+
+
+def legacy_calculate_match_score(property: Dict[str, Any], buyer: Dict[str, Any]) -> Tuple[int, List[str]]:
+    """
+    The pre-index calculate_match_score, kept as a reference.
+
+    Args:
+        property: Property dictionary
+        buyer: Buyer dictionary with requirements
+
+    Returns:
+        Tuple of (match_score, list of matching criteria)
+    """
+    score = 0
+    max_score = 0
+    matching_criteria = []
+
+    # Price match (30 points)
+    max_score += 30
+    if buyer.get('price_min') or buyer.get('price_max'):
+        price = property.get('price', 0)
+        price_min = buyer.get('price_min') or 0
+        price_max = buyer.get('price_max') or float('inf')
+
+        if price_min <= price <= price_max:
+            score += 30
+            matching_criteria.append('Price in range')
+        elif price < price_min * 0.9:
+            score += 15  # Under budget is okay
+            matching_criteria.append('Under budget')
+        elif price <= price_max * 1.1:
+            score += 10  # Slightly over is acceptable
+    else:
+        score += 15  # No price requirement, give partial credit
+
+    # Beds match (20 points)
+    max_score += 20
+    if buyer.get('beds_min'):
+        if property.get('beds', 0) >= buyer['beds_min']:
+            score += 20
+            matching_criteria.append(f"{property['beds']}+ beds")
+        elif property.get('beds', 0) == buyer['beds_min'] - 1:
+            score += 10  # One less bed might work
+    else:
+        score += 10  # No requirement
+
+    # Baths match (10 points)
+    max_score += 10
+    if buyer.get('baths_min'):
+        if property.get('baths', 0) >= buyer['baths_min']:
+            score += 10
+            matching_criteria.append(f"{property['baths']}+ baths")
+    else:
+        score += 5
+
+    # Location match (20 points)
+    max_score += 20
+    property_county = property.get('county', '').lower()
+    property_city = property.get('city', '').lower()
+
+    buyer_counties = [c.lower() for c in buyer.get('counties', [])]
+    buyer_cities = [c.lower() for c in buyer.get('cities', [])]
+
+    if buyer_counties or buyer_cities:
+        if property_county in buyer_counties:
+            score += 20
+            matching_criteria.append(f"{property.get('county')} county")
+        elif property_city in buyer_cities:
+            score += 20
+            matching_criteria.append(f"{property.get('city')}")
+        elif not buyer_counties and not buyer_cities:
+            score += 10  # No location requirement
+    else:
+        score += 10
+
+    # Size match (10 points)
+    max_score += 10
+    if buyer.get('sqft_min'):
+        if property.get('sqft', 0) >= buyer['sqft_min']:
+            score += 10
+            matching_criteria.append(f"{property['sqft']:,} sqft")
+    else:
+        score += 5
+
+    # Acreage match (10 points)
+    max_score += 10
+    if buyer.get('acreage_min'):
+        if property.get('acreage', 0) >= buyer['acreage_min']:
+            score += 10
+            matching_criteria.append(f"{property['acreage']} acres")
+    else:
+        score += 5
+
+    # Views bonus (optional but nice)
+    buyer_views = buyer.get('views_required', [])
+    property_views = property.get('views', '') or ''
+    if buyer_views and property_views:
+        for view in buyer_views:
+            if view.lower() in property_views.lower():
+                matching_criteria.append(f"{view} views")
+                break
+
+    # Water features bonus
+    buyer_water = buyer.get('water_features', [])
+    property_water = property.get('water_features', '') or ''
+    if buyer_water and property_water:
+        for water in buyer_water:
+            if water.lower() in property_water.lower():
+                matching_criteria.append(f"{water}")
+                break
+
+    # Normalize to 0-100
+    final_score = int((score / max_score) * 100) if max_score > 0 else 0
+
+    return final_score, matching_criteria
+
+
+def legacy_match(listings: List[Dict], buyers: List[Dict], threshold: int,
+                 is_alerted, is_price_drop: bool = False) -> Dict[str, Dict]:
+    """The pre-index match_listings_to_buyers / match_price_drops_to_buyers loop."""
+    matches = {}
+    for buyer in buyers:
+        buyer_matches = []
+        for listing in listings:
+            if is_alerted(buyer['id'], listing['id']):
+                continue
+            score, criteria = legacy_calculate_match_score(listing, buyer)
+            if score >= threshold:
+                match = listing.copy()
+                match['match_score'] = score
+                match['matching_features'] = ', '.join(criteria)
+                match['is_price_drop'] = is_price_drop
+                buyer_matches.append(match)
+        if buyer_matches:
+            sort_key = 'drop_pct' if is_price_drop else 'match_score'
+            buyer_matches.sort(key=lambda x: x[sort_key], reverse=True)
+            matches[buyer['id']] = {'buyer': buyer, 'properties': buyer_matches}
+    return matches
+
+
+def synthetic(buyers: int, listings: int, seed: int = 42) -> Tuple[List[Dict], List[Dict]]:
+    rng = random.Random(seed)
+
+    def maybe(value, p=0.7):
+        return value if rng.random() < p else None
+
+    buyer_rows = []
+    for i in range(buyers):
+        low = rng.randint(1, 8) * 50000
+        buyer_rows.append({
+            'id': f"buyer-{i}",
+            'price_min': maybe(low),
+            'price_max': maybe(low + rng.randint(1, 6) * 50000),
+            'beds_min': maybe(rng.randint(1, 4)),
+            'baths_min': maybe(rng.randint(1, 3), 0.5),
+            'sqft_min': maybe(rng.randint(8, 25) * 100, 0.4),
+            'acreage_min': maybe(rng.choice([0.5, 1, 2, 5]), 0.3),
+            'counties': rng.sample(COUNTIES, rng.randint(0, 2)),
+            'cities': rng.sample(CITIES, rng.randint(0, 2)) if rng.random() < 0.4 else [],
+            'views_required': rng.sample(VIEWS, rng.randint(0, 1)),
+            'water_features': [],
+        })
+
+    listing_rows = []
+    for i in range(listings):
+        listing_rows.append({
+            'id': f"lst-{i}",
+            'address': f"{i} Main St",
+            'county': rng.choice(COUNTIES),
+            'city': rng.choice(CITIES),
+            'price': rng.randint(10, 120) * 10000,
+            'beds': rng.randint(1, 5),
+            'baths': rng.randint(1, 4),
+            'sqft': rng.randint(6, 40) * 100,
+            'acreage': round(rng.uniform(0.1, 10), 2),
+            'views': rng.choice(['', 'Mountain', 'Long Range, Mountain']),
+            'drop_pct': round(rng.uniform(5, 20), 1),
+        })
+    return buyer_rows, listing_rows
+
+
+def prior_alerts(buyers: List[Dict], listings: List[Dict], count: int, seed: int = 7) -> set:
+    rng = random.Random(seed)
+    return {(rng.choice(buyers)['id'], rng.choice(listings)['id']) for _ in range(count)}
+
+
+
+def test_calculate_match_score_unchanged():
+    buyers, listings = synthetic(buyers=200, listings=100, seed=5)
+    rng = random.Random(5)
+    for _ in range(3000):
+        buyer, listing = rng.choice(buyers), rng.choice(listings)
+        assert calculate_match_score(listing, buyer) == legacy_calculate_match_score(listing, buyer)
+
+
+@pytest.mark.parametrize('threshold', [0, 30, 45, 50, 55, 60, 70, 80, 90, 100])
+def test_indexed_match_equals_nested_loop(threshold):
+    buyers, listings = synthetic(buyers=300, listings=80, seed=threshold)
+    alerted = prior_alerts(buyers, listings, count=500)
+
+    expected = legacy_match(listings, buyers, threshold, lambda c, p: (c, p) in alerted)
+    assert match_buyers(listings, buyers, threshold, alerted) == expected
+
+    expected = legacy_match(listings, buyers, threshold, lambda c, p: (c, p) in alerted,
+                            is_price_drop=True)
+    assert match_buyers(listings, buyers, threshold, alerted, is_price_drop=True) == expected
+
+
+def test_listing_with_missing_fields_is_scored_not_fatal():
+    buyer = {'id': 'b1', 'price_min': 200000, 'price_max': 400000, 'beds_min': 3,
+             'counties': ['Macon'], 'cities': [], 'views_required': [], 'water_features': []}
+    listing = {'id': 'l1', 'county': None, 'city': None, 'price': None, 'beds': None}
+    matches = match_buyers([listing], [buyer], threshold=0, alerted=set())
+    assert matches['b1']['properties'][0]['match_score'] == 30  # under budget + no-requirement credit
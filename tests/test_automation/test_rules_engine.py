@@ -0,0 +1,290 @@
+"""
+Tests for the shared-snapshot rules pass in apps/automation/rules_engine.
+
+Run: python3 -m pytest tests/test_automation/test_rules_engine.py -v
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from apps.automation.rules_engine import RuleEngine
+
+STAGES = ['Lead', 'Lead', 'Nurture', 'Active Client', 'trash', 'past_client', None]
+TRENDS = ['warming', 'cooling', 'stable', None]
+RULE_NAMES = ['activity_burst', 'going_cold', 'hot_lead', 'warming_lead', 'new_lead']
+
+
+def _ago(now: datetime, minutes: int) -> str:
+    # Half-minute offsets keep every timestamp clear of a rule's exact cutoff
+    return (now - timedelta(minutes=minutes, seconds=30)).replace(tzinfo=None).isoformat()
+
+
+def seed(db, leads: int, seed: int = 42, now: datetime = None):
+    """Fill leads, contact_events, contact_scoring_history and automation_log."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    lead_rows, events, history, cooldowns = [], [], [], []
+
+    for i in range(leads):
+        lead_id = f"lead-{i}"
+        lead_rows.append((
+            lead_id, f"Lead{i}", rng.choice(['Smith', None]),
+            str(50000 + i) if rng.random() < 0.8 else None,
+            rng.choice(STAGES), 'seeded',
+            round(rng.random() * 100, 1),
+            rng.choice([None] + list(range(0, 60))),
+            rng.choice(TRENDS),
+            _ago(now, rng.randint(0, 60 * 24 * 60)),
+        ))
+        for e in range(rng.choice([0, 0, 0, 1, 2, 4, 6])):
+            events.append((f"{lead_id}-e{e}", lead_id, 'website_visit', _ago(now, rng.randint(0, 60 * 24 * 3))))
+        for h in range(rng.choice([0, 1, 3])):
+            history.append((lead_id, _ago(now, 60 * 24 * h + rng.randint(0, 60)),
+                            round(rng.random() * 100, 1), rng.randint(-30, 30)))
+        if rng.random() < 0.05:
+            cooldowns.append((rng.choice(RULE_NAMES), lead_id, f"Lead{i}", 'fub_task', 'seeded',
+                              (datetime.now() + timedelta(hours=rng.choice([-5, 5]))).isoformat()))
+
+    with db._get_connection() as conn:
+        conn.executemany('''
+            INSERT INTO leads (id, first_name, last_name, fub_id, stage, source,
+                               heat_score, days_since_activity, score_trend, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', lead_rows)
+        conn.executemany(
+            "INSERT INTO contact_events (id, contact_id, event_type, occurred_at) VALUES (?, ?, ?, ?)", events)
+        conn.executemany(
+            "INSERT INTO contact_scoring_history (contact_id, recorded_at, heat_score, heat_delta) "
+            "VALUES (?, ?, ?, ?)", history)
+        conn.executemany(
+            "INSERT INTO automation_log (rule_name, contact_id, contact_name, action_type, action_detail, "
+            "cooldown_until) VALUES (?, ?, ?, ?, ?, ?)", cooldowns)
+        conn.commit()
+
+
+def legacy_rule_rows(conn, rule_name: str, settings: dict, now: datetime):
+    """The rule module's original query, with parameter cutoffs for NOW()/INTERVAL."""
+    name = "l.first_name || ' ' || COALESCE(l.last_name, '') as contact_name"
+    if rule_name == 'activity_burst':
+        return conn.execute(f'''
+            SELECT l.id as contact_id, {name}, l.fub_id, COUNT(e.id) as event_count
+            FROM contact_events e
+            JOIN leads l ON e.contact_id = l.id
+            WHERE e.occurred_at >= ?
+              AND l.stage NOT IN ('trash', 'past_client')
+            GROUP BY e.contact_id, l.id, l.first_name, l.last_name, l.fub_id
+            HAVING COUNT(e.id) >= ?
+            ORDER BY event_count DESC
+        ''', ((now - timedelta(days=1)).replace(tzinfo=None).isoformat(),
+              settings.get('rule_activity_burst_threshold', 3))).fetchall()
+    if rule_name == 'going_cold':
+        return conn.execute(f'''
+            SELECT l.id as contact_id, {name}, l.fub_id, l.days_since_activity, l.heat_score
+            FROM leads l
+            WHERE l.stage NOT IN ('trash', 'past_client')
+              AND l.days_since_activity >= ?
+              AND l.id IN (SELECT contact_id FROM contact_scoring_history WHERE heat_score >= ?)
+            ORDER BY l.days_since_activity DESC
+        ''', (settings.get('rule_going_cold_days', 14), settings.get('rule_going_cold_min_heat', 30))).fetchall()
+    if rule_name == 'hot_lead':
+        return conn.execute(f'''
+            SELECT l.id as contact_id, {name}, l.fub_id, l.heat_score, l.priority_score
+            FROM leads l
+            WHERE l.heat_score >= ?
+              AND l.stage NOT IN ('trash', 'past_client')
+            ORDER BY l.heat_score DESC
+        ''', (settings.get('rule_hot_lead_threshold', 70),)).fetchall()
+    if rule_name == 'warming_lead':
+        return conn.execute(f'''
+            SELECT l.id as contact_id, {name}, l.fub_id, l.heat_score, h.heat_delta
+            FROM leads l
+            JOIN (
+                SELECT contact_id, heat_delta, trend_direction,
+                       ROW_NUMBER() OVER (PARTITION BY contact_id ORDER BY recorded_at DESC) as rn
+                FROM contact_scoring_history
+            ) h ON l.id = h.contact_id AND h.rn = 1
+            WHERE l.score_trend = 'warming'
+              AND h.heat_delta >= ?
+              AND l.stage NOT IN ('trash', 'past_client')
+            ORDER BY h.heat_delta DESC
+        ''', (settings.get('rule_warming_lead_min_delta', 15),)).fetchall()
+    if rule_name == 'new_lead':
+        since = now - timedelta(hours=settings.get('rule_new_lead_hours', 24))
+        return conn.execute(f'''
+            SELECT l.id as contact_id, {name}, l.fub_id, l.source, l.created_at
+            FROM leads l
+            WHERE l.stage = 'Lead'
+              AND l.created_at >= ?
+            ORDER BY l.created_at DESC
+        ''', (since.replace(tzinfo=None).isoformat(),)).fetchall()
+    raise ValueError(rule_name)
+
+
+def legacy_actions(rule_name: str, row, settings: dict) -> list:
+    """(contact, action, detail) tuples the rule module built from one row."""
+    name = row['contact_name'].strip()
+    if rule_name == 'activity_burst':
+        actions = [(name, 'email_agent', f"{name} had {row['event_count']} events in the last 24 hours")]
+        return actions + ([(name, 'fub_task', 'Call - Activity Burst')] if row['fub_id'] else [])
+    if rule_name == 'going_cold':
+        return [(name, 'fub_task', 'Follow Up - Going Cold')] if row['fub_id'] else []
+    if rule_name == 'hot_lead':
+        threshold = settings.get('rule_hot_lead_threshold', 70)
+        actions = [(name, 'email_agent', f"{name} has heat score {row['heat_score']:.0f} (threshold: {threshold})")]
+        return actions + ([(name, 'fub_task', 'Call - Hot Lead')] if row['fub_id'] else [])
+    if rule_name == 'warming_lead':
+        return [(name, 'email_agent',
+                 f"{name} is warming up — heat delta +{row['heat_delta']:.0f} (score: {row['heat_score']:.0f})")]
+    if rule_name == 'new_lead':
+        return [(name, 'fub_task', 'Call - New Lead')] if row['fub_id'] else []
+    raise ValueError(rule_name)
+
+
+def legacy_pass(db, settings: dict, now: datetime = None):
+    """
+    Every rule's own scan, then one cooldown query per firing.
+
+    Returns:
+        ({rule_name: sorted (contact, action, detail)}, queries run)
+    """
+    now = now or datetime.now(timezone.utc)
+    fired = {}
+    queries = 0
+    with db._get_connection() as conn:
+        for rule_name in RULE_NAMES:
+            actions = []
+            queries += 1
+            for row in legacy_rule_rows(conn, rule_name, settings, now):
+                for action in legacy_actions(rule_name, row, settings):
+                    queries += 1
+                    blocked = conn.execute('''
+                        SELECT 1 FROM automation_log
+                        WHERE rule_name = ? AND contact_id = ? AND cooldown_until > ?
+                        LIMIT 1
+                    ''', (rule_name, row['contact_id'], datetime.now().isoformat())).fetchone()
+                    if not blocked:
+                        actions.append(action)
+            fired[rule_name] = sorted(actions)
+    return fired, queries
+
+
+def engine_pass(engine) -> dict:
+    results = engine.evaluate_all()
+    return {
+        rule_name: sorted((d['contact'], d['action'], d['detail']) for d in result.get('details', []))
+        for rule_name, result in results['rules'].items()
+    }
+
+
+@pytest.mark.parametrize('seed_value', [1, 2])
+def test_snapshot_pass_fires_same_actions_as_per_rule_scans(test_db, seed_value):
+    seed(test_db, leads=2000, seed=seed_value)
+    engine = RuleEngine(test_db, dry_run=True)
+    expected, _ = legacy_pass(test_db, engine._get_settings())
+    assert engine_pass(engine) == expected
+    assert sum(len(actions) for actions in expected.values()) > 100
+
+
+def count_queries(db) -> list:
+    """Route db's connections through a statement counter; returns the running [count]."""
+    count = [0]
+    get_connection = db._get_connection
+
+    def tally(statement):
+        if statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'):
+            count[0] += 1
+
+    @contextmanager
+    def counted():
+        with get_connection() as conn:
+            conn.set_trace_callback(tally)
+            yield conn
+
+    db._get_connection = counted
+    return count
+
+
+@pytest.mark.slow
+def test_dry_run_benchmark_over_50k_leads(test_db, capsys):
+    """Per-rule scans vs the shared snapshot on a synthetic 50k-lead table.
+
+    SQLite runs in-process, so it hides the per-query round trip that
+    dominates the legacy path on Postgres; the query counts carry over.
+    Skip with -m "not slow".
+    """
+    leads = 50000
+    started = time.perf_counter()
+    seed(test_db, leads)
+    seeded_s = time.perf_counter() - started
+
+    engine = RuleEngine(test_db, dry_run=True)
+    settings = engine._get_settings()
+    queries = count_queries(test_db)
+
+    started = time.perf_counter()
+    legacy, _ = legacy_pass(test_db, settings)
+    legacy_s, legacy_queries = time.perf_counter() - started, queries[0]
+
+    queries[0] = 0
+    started = time.perf_counter()
+    snapshot = engine_pass(engine)
+    snapshot_s, snapshot_queries = time.perf_counter() - started, queries[0]
+
+    with capsys.disabled():
+        print(f"\nrules pass over {leads:,} leads (seeded in {seeded_s:.1f}s, SQLite, dry run)")
+        print(f"  legacy    {legacy_s:8.3f}s   {legacy_queries:>7,} queries")
+        print(f"  snapshot  {snapshot_s:8.3f}s   {snapshot_queries:>7,} queries "
+              f"({legacy_s / snapshot_s:.1f}x)")
+        for rule_name in RULE_NAMES:
+            print(f"    {rule_name:<15} {len(snapshot[rule_name]):>6,} actions")
+
+    assert snapshot == legacy
+    assert snapshot_queries < 10 < legacy_queries
+
+
+class FakeFUB:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.tasks = []
+
+    def create_task(self, person_id, name, task_type, priority=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+            self.tasks.append((person_id, name))
+        return {'id': len(self.tasks)}
+
+
+def test_live_dispatch_is_bounded_timed_and_logged(test_db, monkeypatch):
+    seed(test_db, leads=150, seed=3)
+    monkeypatch.setattr(RuleEngine, '_send_agent_email', lambda self, rule_name, firing, settings: True)
+    fub = FakeFUB()
+    engine = RuleEngine(test_db, fub_client=fub)
+    engine._settings_cache = {'rules_dispatch_workers': 3}
+
+    results = engine.evaluate_all()
+    actions = results['total_actions']
+    assert actions == results['total_firings'] > 0
+    assert 1 < fub.peak <= 3
+
+    hot = results['rules']['hot_lead']
+    assert hot['timing']['fub_task']['count'] == sum(1 for d in hot['details'] if d['action'] == 'fub_task')
+    assert all(d['elapsed_ms'] >= 0 for d in hot['details'])
+
+    with test_db._get_connection() as conn:
+        logged = conn.execute(
+            "SELECT COUNT(*) FROM automation_log WHERE action_detail != 'seeded'").fetchone()[0]
+    assert logged == actions
+
+    # Everything that fired is now in cooldown
+    assert engine.evaluate_all()['total_firings'] == 0
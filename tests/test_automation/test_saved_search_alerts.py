@@ -0,0 +1,235 @@
+"""
+Tests for the one-scan saved search matcher in apps/automation/saved_search_alerts.
+
+Run: python3 -m pytest tests/test_automation/test_saved_search_alerts.py -v
+"""
+
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.automation import saved_search_alerts
+
+NOW = datetime(2026, 3, 10, 8, 0)
+COUNTIES = ['Macon', 'Jackson', 'Swain', 'Haywood', 'Buncombe', 'Cherokee']
+CITIES = ['Franklin', 'Highlands', 'Sylva', 'Cashiers', 'Bryson City', 'Waynesville', 'Asheville']
+TYPES = ['Residential', 'Land', 'Condo', 'Commercial']
+SUBDIVISIONS = ['Laurel Ridge', 'Bear Creek', 'Cowee Valley', None]
+REMARKS = ['Long range mountain views', 'Creek frontage', 'Updated kitchen', 'Cabin with porch', None]
+SCHEMA = '''
+    CREATE TABLE listings (
+        id TEXT PRIMARY KEY, address TEXT, city TEXT, state TEXT, county TEXT,
+        list_price INTEGER, beds INTEGER, baths REAL, sqft INTEGER, acreage REAL,
+        primary_photo TEXT, mls_number TEXT, property_type TEXT, days_on_market INTEGER,
+        status TEXT, subdivision TEXT, public_remarks TEXT, idx_opt_in INTEGER,
+        created_at TEXT, updated_at TEXT
+    );
+    CREATE TABLE saved_searches (
+        id TEXT PRIMARY KEY, user_id TEXT, name TEXT, filters_json TEXT,
+        alert_frequency TEXT, last_alerted_at TEXT, created_at TEXT
+    );
+'''
+
+
+def legacy_match_search_to_listings(conn, filters: dict, since: str | None = None, limit: int = 20) -> list[dict]:
+    """The pre-scan match_search_to_listings query, kept as a reference."""
+    conditions = ["idx_opt_in = 1"]
+    params = []
+
+    status = filters.get('status', 'ACTIVE')
+    if status:
+        conditions.append("UPPER(status) = UPPER(?)")
+        params.append(status)
+
+    city = filters.get('city')
+    if city:
+        conditions.append("LOWER(city) = LOWER(?)")
+        params.append(city)
+
+    county = filters.get('county')
+    if county:
+        conditions.append("LOWER(county) = LOWER(?)")
+        params.append(county)
+
+    for key, clause, coerce in (('min_price', "list_price >= ?", int), ('max_price', "list_price <= ?", int),
+                                ('min_beds', "beds >= ?", int), ('min_baths', "baths >= ?", float),
+                                ('min_sqft', "sqft >= ?", int), ('min_acreage', "acreage >= ?", float)):
+        value = filters.get(key)
+        if value is not None:
+            try:
+                params.append(coerce(value))
+                conditions.append(clause)
+            except (ValueError, TypeError):
+                pass
+
+    property_type = filters.get('property_type')
+    if property_type:
+        conditions.append("property_type = ?")
+        params.append(property_type)
+
+    q = filters.get('q')
+    if q:
+        conditions.append(
+            "(address LIKE ? OR city LIKE ? OR county LIKE ? "
+            "OR subdivision LIKE ? OR public_remarks LIKE ? OR mls_number LIKE ?)"
+        )
+        params.extend([f"%{q}%"] * 6)
+
+    if since:
+        conditions.append("(created_at > ? OR updated_at > ?)")
+        params.extend([since, since])
+
+    params.append(limit)
+    rows = conn.execute(f"""
+        SELECT id, address, city, state, county, list_price, beds, baths,
+               sqft, acreage, primary_photo, mls_number, property_type,
+               days_on_market, status
+        FROM listings
+        WHERE {' AND '.join(conditions)}
+        ORDER BY created_at DESC
+        LIMIT ?
+    """, params).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _stamp(rng, max_days):
+    return (NOW - timedelta(seconds=rng.randint(0, max_days * 86400))).isoformat()
+
+
+def synthetic(searches: int, listings: int, seed: int = 42):
+    """Listing rows and saved search rows, as the tables hold them."""
+    rng = random.Random(seed)
+    listing_rows = []
+    created = set()
+    for i in range(listings):
+        # Distinct created_at so ORDER BY created_at DESC has no ties to break
+        stamp = _stamp(rng, 120)
+        while stamp in created:
+            stamp = _stamp(rng, 120)
+        created.add(stamp)
+        listing_rows.append({
+            'id': f"L{i}",
+            'address': f"{rng.randint(1, 9999)} {rng.choice(['Ridge', 'Creek', 'Laurel', 'Cove'])} Rd",
+            'city': rng.choice(CITIES + [c.upper() for c in CITIES[:2]] + [None]),
+            'state': 'NC',
+            'county': rng.choice(COUNTIES + [None]),
+            'list_price': rng.choice([None] + [rng.randint(5, 150) * 10000] * 8),
+            'beds': rng.choice([None, 1, 2, 3, 4, 5]),
+            'baths': rng.choice([None, 1.0, 1.5, 2.0, 2.5, 3.0]),
+            'sqft': rng.choice([None, rng.randint(600, 4500)]),
+            'acreage': rng.choice([None, round(rng.random() * 20, 2)]),
+            'primary_photo': f"https://photos.example/{i}.jpg",
+            'mls_number': str(4000000 + i),
+            'property_type': rng.choice(TYPES),
+            'days_on_market': rng.randint(0, 300),
+            'status': rng.choice(['ACTIVE'] * 6 + ['Active', 'PENDING', 'SOLD', None]),
+            'subdivision': rng.choice(SUBDIVISIONS),
+            'public_remarks': rng.choice(REMARKS),
+            'idx_opt_in': rng.choice([1] * 9 + [0]),
+            'created_at': stamp,
+            'updated_at': rng.choice([None, stamp, _stamp(rng, 10)]),
+        })
+
+    search_rows = []
+    for i in range(searches):
+        filters = {}
+        if rng.random() < 0.5:
+            filters['city'] = rng.choice(CITIES).lower()
+        elif rng.random() < 0.6:
+            filters['county'] = rng.choice(COUNTIES)
+        if rng.random() < 0.6:
+            filters['min_price'] = rng.randint(5, 60) * 10000
+        if rng.random() < 0.6:
+            filters['max_price'] = rng.choice([rng.randint(20, 150) * 10000, 'any'])
+        for key, values in (('min_beds', [2, 3, 4]), ('min_baths', [1.5, 2, '2.5']),
+                            ('min_sqft', [1000, 2000]), ('min_acreage', [0.5, 2, 5]),
+                            ('property_type', TYPES), ('q', ['creek', 'Laurel', 'view', '40001', 'ridge_rd']),
+                            ('status', ['Pending', '', 'active'])):
+            if rng.random() < 0.2:
+                filters[key] = rng.choice(values)
+        search_rows.append({
+            'id': f"S{i}",
+            'user_id': f"U{i % 97}",
+            'name': f"Search {i}",
+            'filters_json': json.dumps(filters) if rng.random() < 0.98 else '{not json',
+            'alert_frequency': 'daily',
+            'last_alerted_at': rng.choice([None, _stamp(rng, 2), _stamp(rng, 8)]),
+            'created_at': _stamp(rng, 200),
+        })
+    return listing_rows, search_rows
+
+
+def seed(conn, listing_rows, search_rows):
+    conn.executescript(SCHEMA)
+    for table, rows in (('listings', listing_rows), ('saved_searches', search_rows)):
+        columns = list(rows[0])
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(row[c] for c in columns) for row in rows],
+        )
+    conn.commit()
+
+
+
+@pytest.fixture
+def connect(tmp_path, monkeypatch):
+    path = str(tmp_path / 'alerts.db')
+
+    def connect():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(saved_search_alerts, '_get_db', connect)
+    return connect
+
+
+@pytest.mark.parametrize('seed_value', [1, 2, 3])
+def test_one_scan_equals_query_per_search(connect, seed_value):
+    listing_rows, search_rows = synthetic(searches=300, listings=1500, seed=seed_value)
+    conn = connect()
+    seed(conn, listing_rows, search_rows)
+
+    expected = {
+        s['id']: legacy_match_search_to_listings(
+            conn, saved_search_alerts.parse_filters(s), since=s['last_alerted_at'] or s['created_at'])
+        for s in search_rows
+    }
+    conn.close()
+
+    assert saved_search_alerts.match_searches(search_rows) == expected
+
+
+def test_process_alerts_bulk_updates_only_handled_searches(connect, monkeypatch):
+    listing_rows, _ = synthetic(searches=1, listings=200, seed=9)
+    recent = (NOW - timedelta(days=30)).isoformat()
+    searches = [
+        {'id': 'sent', 'filters_json': json.dumps({'status': ''})},
+        {'id': 'failed', 'filters_json': json.dumps({'status': ''})},
+        {'id': 'empty', 'filters_json': json.dumps({'city': 'Nowhere'})},
+    ]
+    search_rows = [dict(s, user_id=s['id'], name=s['id'], alert_frequency='daily',
+                        last_alerted_at=None, created_at=recent) for s in searches]
+    conn = connect()
+    seed(conn, listing_rows, search_rows)
+    conn.execute("CREATE TABLE users (id TEXT PRIMARY KEY, name TEXT, email TEXT)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                     [(s['id'], s['id'], f"{s['id']}@example.com") for s in searches])
+    conn.commit()
+    conn.close()
+
+    sent = []
+    monkeypatch.setattr(saved_search_alerts, 'send_search_alert',
+                        lambda email, name, search, listings: sent.append(search['id']) or search['id'] == 'sent')
+
+    assert saved_search_alerts.process_alerts('daily') == 1
+    assert sorted(sent) == ['failed', 'sent']
+
+    conn = connect()
+    stamps = dict(conn.execute("SELECT id, last_alerted_at FROM saved_searches").fetchall())
+    conn.close()
+    assert stamps['sent'] and stamps['sent'] == stamps['empty']
+    assert stamps['failed'] is None
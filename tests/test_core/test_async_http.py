@@ -0,0 +1,203 @@
+"""
+Tests for src/core/async_http and the linear_sync async clients, run
+against a local stub HTTP server.
+
+Run: python3 -m pytest tests/test_core/test_async_http.py -v
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from modules.linear_sync.fub_client import AsyncFUBClient, FUBClient
+from modules.linear_sync.linear_client import AsyncLinearClient, LinearClient
+from src.core.async_http import AsyncAPI, close_shared_client, retry_after, shared_client
+
+
+class Stub:
+    """Routes every request to `handle(method, path, query, body) -> (status, headers, payload)`."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+
+@pytest.fixture
+def stub():
+    holder = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            s = holder['stub']
+            url = urlparse(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            with s.lock:
+                s.requests.append((self.command, url.path, body))
+                s.active += 1
+                s.peak = max(s.peak, s.active)
+            try:
+                status, headers, payload = s.handle(self.command, url.path, parse_qs(url.query), body)
+            finally:
+                with s.lock:
+                    s.active -= 1
+            raw = json.dumps(payload).encode()
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        do_GET = do_POST = _serve
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    def make(handle):
+        holder['stub'] = Stub(handle)
+        holder['stub'].url = f"http://127.0.0.1:{server.server_address[1]}"
+        return holder['stub']
+
+    yield make
+    server.shutdown()
+    server.server_close()
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_shared_client()
+    return asyncio.run(main())
+
+
+def test_backs_off_on_429_then_succeeds(stub):
+    calls = []
+
+    def handle(method, path, query, body):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            return 429, {'Retry-After': '0.05'}, {'error': 'slow down'}
+        return 200, {}, {'ok': True}
+
+    s = stub(handle)
+    api = AsyncAPI(s.url, name='stub', backoff=0)
+    assert run(api.request_json('GET', 'things')) == {'ok': True}
+    assert len(calls) == 3
+    assert calls[2] - calls[0] >= 0.1
+
+
+def test_gives_back_error_response_once_retries_run_out(stub):
+    s = stub(lambda *a: (503, {}, {'error': 'down'}))
+    api = AsyncAPI(s.url, name='stub', max_retries=2, backoff=0)
+    with pytest.raises(httpx.HTTPStatusError):
+        run(api.request_json('GET', 'things'))
+    assert len(s.requests) == 3
+
+
+def test_concurrency_is_capped_per_api(stub):
+    def handle(method, path, query, body):
+        time.sleep(0.05)
+        return 200, {}, {'path': path}
+
+    s = stub(handle)
+    api = AsyncAPI(s.url, name='stub', max_concurrency=3)
+
+    async def fan_out():
+        return await asyncio.gather(*(api.request_json('GET', f'item/{i}') for i in range(12)))
+
+    results = run(fan_out())
+    assert [r['path'] for r in results] == [f'/item/{i}' for i in range(12)]
+    assert 1 < s.peak <= 3
+
+
+def test_apis_share_one_pool_per_loop():
+    async def clients():
+        first = shared_client()
+        same = shared_client() is first
+        await close_shared_client()
+        return first, same, shared_client() is not first
+
+    first, same, reopened = run(clients())
+    assert same and reopened and first.is_closed
+
+
+def test_retry_after_parsing():
+    assert retry_after(httpx.Response(429, headers={'Retry-After': '3'}), 1.0) == 3.0
+    assert retry_after(httpx.Response(429, headers={'Retry-After': 'soon'}), 1.0) == 1.0
+    assert retry_after(httpx.Response(429), 2.0) == 2.0
+
+
+def test_refused_connection_raises_after_retries():
+    api = AsyncAPI('http://127.0.0.1:9', name='closed', max_retries=1, backoff=0)
+    with pytest.raises(httpx.ConnectError):
+        run(api.request('GET', 'things'))
+
+
+def _fub_task(i):
+    return {'id': i, 'personId': 100 + i, 'name': f"Task {i}", 'type': 'Call',
+            'isCompleted': i % 2 == 0, 'updated': f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z"}
+
+
+def test_fub_client_pages_like_the_sync_client(stub):
+    def handle(method, path, query, body):
+        offset, limit = int(query['offset'][0]), int(query['limit'][0])
+        since = query['updatedAfter'][0]
+        tasks = [t for t in map(_fub_task, range(230)) if t['updated'] > since]
+        return 200, {}, {'tasks': tasks[offset:offset + limit]}
+
+    s = stub(handle)
+    since = '2026-01-01T00:00:30Z'
+
+    sync = FUBClient()
+    sync.base_url = s.url
+    expected = sync.get_tasks_updated_since(since, page_size=100)
+
+    client = AsyncFUBClient()
+    client.api.base_url = s.url
+    assert run(client.get_tasks_updated_since(since, page_size=100)) == expected
+    assert len(expected) == 199
+
+
+def test_linear_client_matches_sync_client_and_waits_out_ratelimit(stub):
+    limited = threading.Semaphore(1)
+
+    def handle(method, path, query, body):
+        if limited.acquire(blocking=False):
+            return 400, {}, {'errors': [{'message': 'Rate limit exceeded',
+                                         'extensions': {'code': 'RATELIMITED'}}]}
+        nodes = [{'id': i, 'identifier': f"DEV-{i}", 'title': i,
+                  'state': {'id': 's', 'name': 'Done', 'type': 'completed'}}
+                 for i in body['variables']['ids']]
+        return 200, {}, {'data': {'issues': {'nodes': nodes}}}
+
+    s = stub(handle)
+    ids = [f"issue-{i}" for i in range(120)]
+
+    client = AsyncLinearClient()
+    client.api.base_url = s.url
+    client.api.backoff = 0
+    issues = run(client.get_issues_by_ids(ids + ids[:5], chunk_size=50))
+
+    sync = LinearClient()
+    sync.api_url = s.url
+    assert issues == sync.get_issues_by_ids(ids, chunk_size=50)
+    assert sorted(issues) == sorted(ids)
+    # 3 chunks, plus the one request that was rate limited
+    assert len(s.requests) == 3 + 1 + 3
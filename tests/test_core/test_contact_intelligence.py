@@ -0,0 +1,178 @@
+"""
+Tests for the contact_intelligence rollup behind the Mission Control briefing.
+
+Run: python3 -m pytest tests/test_core/test_contact_intelligence.py -v
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core import contact_intelligence
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+# The per-row subqueries get_morning_briefing_contacts used to run, minus the
+# Postgres-only days_since_last_comm / INTERVAL expressions.
+REFERENCE_SQL = '''
+    SELECT l.id AS contact_id,
+        (SELECT COUNT(*) FROM contact_events ce WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
+         AND ce.event_type = 'property_view' AND ce.occurred_at >= :c24) AS property_views_24h,
+        (SELECT COUNT(*) FROM contact_events ce WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
+         AND ce.event_type = 'property_view' AND ce.occurred_at >= :c7) AS property_views_7d,
+        (SELECT COUNT(*) FROM contact_events ce WHERE ce.contact_id = CAST(l.fub_id AS TEXT)
+         AND ce.event_type = 'property_favorite' AND ce.occurred_at >= :c7) AS favorites_7d,
+        (SELECT COUNT(DISTINCT COALESCE(property_mls, property_address)) FROM contact_events
+         WHERE contact_id = CAST(l.fub_id AS TEXT)
+         AND event_type IN ('property_view', 'property_favorite', 'property_share')) AS property_view_count,
+        (SELECT MAX(cc.occurred_at) FROM contact_communications cc
+         WHERE cc.contact_id = l.id) AS last_comm_at,
+        (SELECT ca.due_date FROM contact_actions ca WHERE ca.contact_id = l.id
+         AND ca.completed_at IS NULL AND ca.due_date <= :today
+         ORDER BY ca.due_date ASC, ca.id ASC LIMIT 1) AS pending_action_due,
+        (SELECT ca.description FROM contact_actions ca WHERE ca.contact_id = l.id
+         AND ca.completed_at IS NULL AND ca.due_date <= :today
+         ORDER BY ca.due_date ASC, ca.id ASC LIMIT 1) AS pending_action_desc,
+        CASE WHEN EXISTS (SELECT 1 FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active')
+             THEN 1 ELSE 0 END AS has_intake,
+        (SELECT i.need_type FROM intake_forms i WHERE i.lead_id = l.id AND i.status = 'active'
+         ORDER BY i.priority ASC LIMIT 1) AS intake_need_type,
+        (SELECT COUNT(*) FROM intake_forms
+         WHERE lead_id = l.id OR lead_id = CAST(l.fub_id AS TEXT)) AS intake_count,
+        CASE WHEN EXISTS (SELECT 1 FROM packages pk WHERE pk.lead_id = l.id AND pk.created_at >= :c14)
+             THEN 1 ELSE 0 END AS has_recent_package,
+        (SELECT csh.heat_delta FROM contact_scoring_history csh WHERE csh.contact_id = l.id
+         ORDER BY csh.recorded_at DESC LIMIT 1) AS heat_delta
+    FROM leads l
+    WHERE l.contact_group = 'scored'
+    ORDER BY l.id
+'''
+
+CHECKED = ('property_views_24h', 'property_views_7d', 'favorites_7d', 'property_view_count',
+           'last_comm_at', 'pending_action_due', 'pending_action_desc', 'has_intake',
+           'intake_need_type', 'intake_count', 'has_recent_package', 'heat_delta')
+
+
+def _stamp(delta):
+    return (NOW - delta).isoformat()
+
+
+@pytest.fixture
+def db(test_db):
+    with test_db._get_connection() as conn:
+        conn.executescript('''
+            CREATE TABLE intake_forms (id TEXT PRIMARY KEY, lead_id TEXT, need_type TEXT,
+                status TEXT, priority INTEGER, financing_status TEXT, pre_approval_amount INTEGER);
+            CREATE TABLE packages (id TEXT PRIMARY KEY, lead_id TEXT, created_at TEXT);
+            CREATE TABLE IF NOT EXISTS idx_property_cache (mls_number TEXT PRIMARY KEY, city TEXT);
+        ''')
+        conn.commit()
+    return test_db
+
+
+def _seed(db, seed=11, contacts=30):
+    rng = random.Random(seed)
+    with db._get_connection() as conn:
+        for n in range(contacts):
+            conn.execute(
+                "INSERT INTO leads (id, fub_id, first_name, source, contact_group, stage, priority_score) "
+                "VALUES (?, ?, 'Test', 'test', ?, 'Lead', ?)",
+                (f"lead-{n}", str(1000 + n), 'scored' if n % 7 else 'warm_pond', rng.random() * 100),
+            )
+            fub = str(1000 + n)
+            for e in range(rng.randint(0, 12)):
+                conn.execute(
+                    "INSERT INTO contact_events (id, contact_id, event_type, occurred_at, property_mls) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (f"e{n}-{e}", fub,
+                     rng.choice(['property_view', 'property_favorite', 'property_share', 'website_visit']),
+                     _stamp(timedelta(hours=rng.randint(1, 24 * 12))), str(rng.randint(1, 6))),
+                )
+            for c in range(rng.randint(0, 3)):
+                conn.execute(
+                    "INSERT INTO contact_communications (id, contact_id, comm_type, direction, occurred_at) "
+                    "VALUES (?, ?, 'call', 'outbound', ?)",
+                    (f"c{n}-{c}", f"lead-{n}", _stamp(timedelta(days=rng.randint(0, 30)))),
+                )
+            for a in range(rng.randint(0, 3)):
+                conn.execute(
+                    "INSERT INTO contact_actions (contact_id, action_type, description, due_date, completed_at) "
+                    "VALUES (?, 'call', ?, ?, ?)",
+                    (f"lead-{n}", f"action {a}",
+                     (NOW + timedelta(days=rng.randint(-5, 5))).strftime('%Y-%m-%d'),
+                     NOW.isoformat() if rng.random() < 0.3 else None),
+                )
+            for i in range(rng.randint(0, 2)):
+                conn.execute(
+                    "INSERT INTO intake_forms VALUES (?, ?, ?, ?, ?, 'pre_approved', ?)",
+                    (f"i{n}-{i}", rng.choice([f"lead-{n}", fub]), rng.choice(['primary_home', 'str']),
+                     rng.choice(['active', 'paused']), i + 1, rng.choice([None, 350000])),
+                )
+            if rng.random() < 0.4:
+                conn.execute("INSERT INTO packages VALUES (?, ?, ?)",
+                             (f"p{n}", f"lead-{n}", _stamp(timedelta(days=rng.randint(0, 30)))))
+            for h in range(rng.randint(0, 3)):
+                conn.execute(
+                    "INSERT INTO contact_scoring_history (contact_id, recorded_at, heat_delta) VALUES (?, ?, ?)",
+                    (f"lead-{n}", _stamp(timedelta(days=h)), rng.randint(-20, 20)),
+                )
+        conn.commit()
+
+
+def _reference(conn, now):
+    rows = conn.execute(REFERENCE_SQL, {
+        'c24': (now - timedelta(hours=24)).isoformat(),
+        'c7': (now - timedelta(days=7)).isoformat(),
+        'c14': (now - timedelta(days=14)).isoformat(),
+        'today': now.strftime('%Y-%m-%d'),
+    }).fetchall()
+    return {r['contact_id']: {k: r[k] for k in CHECKED} for r in rows}
+
+
+def _rollup(conn):
+    rows = conn.execute("SELECT * FROM contact_intelligence ORDER BY contact_id").fetchall()
+    return {r['contact_id']: {k: r[k] for k in CHECKED} for r in rows}
+
+
+def test_rebuild_matches_correlated_subqueries(db):
+    _seed(db)
+    with db._get_connection() as conn:
+        assert contact_intelligence.rebuild(conn, now=NOW) == 25
+        conn.commit()
+        assert _rollup(conn) == _reference(conn, NOW)
+
+
+def test_refresh_picks_up_queued_and_expired_rows(db):
+    _seed(db)
+    with db._get_connection() as conn:
+        contact_intelligence.rebuild(conn, now=NOW)
+        conn.commit()
+
+    # New events go through the batch path, which queues the contact
+    db.insert_events_batch([{'id': 'new-1', 'contact_id': '1001', 'event_type': 'property_view',
+                             'occurred_at': _stamp(timedelta(minutes=5)), 'property_mls': '99'}])
+    later = NOW + timedelta(hours=30)
+    with db._get_connection() as conn:
+        status = contact_intelligence.status(conn, now=NOW)
+        assert status['queued'] == 1 and status['stale']
+
+        # 30h on, yesterday's views have aged out of the 24h window
+        contact_intelligence.refresh(conn, now=later)
+        conn.commit()
+        assert _rollup(conn) == _reference(conn, later)
+        status = contact_intelligence.status(conn, now=later)
+        assert status['queued'] == 0 and status['expired'] == 0 and not status['stale']
+
+
+def test_briefing_reads_rollup(db):
+    _seed(db)
+    db.refresh_contact_intelligence()
+    db.add_contact_action('lead-1', 'call', description='Call back', due_date='2000-01-01')
+
+    contacts = {c['id']: c for c in db.get_morning_briefing_contacts(limit=100)}
+    assert contacts['lead-1']['pending_action_due'] == '2000-01-01'
+    assert contacts['lead-1']['pending_action_desc'] == 'Call back'
+    assert all(c['intelligence_refreshed_at'] for c in contacts.values())
+    for c in contacts.values():
+        assert (c['days_since_last_comm'] is None) == (c['last_comm_at'] is None)
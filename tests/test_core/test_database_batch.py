@@ -0,0 +1,207 @@
+"""
+Tests for DREAMSDatabase batched communication/event inserts.
+
+Run: python3 -m pytest tests/test_core/test_database_batch.py -v
+"""
+
+import random
+import time
+
+import pytest
+
+from src.core.database import DREAMSDatabase
+
+
+def legacy_insert_communication(db, rec) -> bool:
+    """The pre-batch DREAMSDatabase.insert_communication, kept as a reference."""
+    with db._get_connection() as conn:
+        row = conn.execute(
+            'SELECT COUNT(*) FROM contact_communications WHERE id = ?', (rec['id'],)
+        ).fetchone()
+        if row[0] > 0:
+            return False
+
+    with db._get_connection() as conn:
+        conn.execute('''
+            INSERT INTO contact_communications
+            (id, contact_id, comm_type, direction, occurred_at,
+             duration_seconds, fub_id, fub_user_name, status,
+             email_from, email_to, subject, snippet, email_type, fub_email_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', tuple(rec.get(c) for c in db.COMMUNICATION_COLUMNS))
+        conn.execute('''
+            UPDATE leads SET total_communications = (
+                SELECT COUNT(*) FROM contact_communications WHERE contact_id = ?
+            ) WHERE id = ?
+        ''', (rec['contact_id'], rec['contact_id']))
+        conn.commit()
+        return True
+
+
+def legacy_insert_event(db, rec) -> bool:
+    """The pre-batch DREAMSDatabase.insert_event, kept as a reference."""
+    with db._get_connection() as conn:
+        row = conn.execute(
+            'SELECT COUNT(*) FROM contact_events WHERE id = ?', (rec['id'],)
+        ).fetchone()
+        if row[0] > 0:
+            return False
+
+    with db._get_connection() as conn:
+        conn.execute('''
+            INSERT INTO contact_events
+            (id, contact_id, event_type, occurred_at,
+             property_address, property_price, property_mls, fub_event_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', tuple(rec.get(c) for c in db.EVENT_COLUMNS))
+        conn.execute('''
+            UPDATE leads SET total_events = (
+                SELECT COUNT(*) FROM contact_events WHERE contact_id = ?
+            ) WHERE id = ?
+        ''', (rec['contact_id'], rec['contact_id']))
+        conn.commit()
+        return True
+
+
+def synthetic_records(contacts, records, seed):
+    rng = random.Random(seed)
+    ids = [f"t_{i}" for i in range(contacts)]
+    comms, events = [], []
+    for i in range(records):
+        comm_type = rng.choice(['call', 'text', 'email'])
+        comms.append({
+            'id': f"t_{comm_type}_{i}",
+            'contact_id': rng.choice(ids),
+            'comm_type': comm_type,
+            'direction': rng.choice(['inbound', 'outbound']),
+            'occurred_at': f"2026-03-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            'fub_id': str(i),
+            'status': 'delivered',
+            'snippet': 'x' * rng.randint(0, 200) or None,
+        })
+        events.append({
+            'id': f"t_evt_{i}",
+            'contact_id': rng.choice(ids),
+            'event_type': rng.choice(['website_visit', 'property_view', 'property_favorite']),
+            'occurred_at': f"2026-03-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            'property_price': rng.randint(2, 9) * 100000,
+            'property_mls': str(rng.randint(100000, 999999)),
+            'fub_event_id': str(i),
+        })
+    return ids, comms, events
+
+
+def seed_leads(db, ids):
+    with db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO leads (id, first_name, source) VALUES (?, 'Test', 'test')",
+            [(i,) for i in ids],
+        )
+        conn.commit()
+
+
+def snapshot(db):
+    with db._get_connection() as conn:
+        comms = conn.execute(
+            "SELECT id, contact_id, comm_type FROM contact_communications ORDER BY id"
+        ).fetchall()
+        events = conn.execute(
+            "SELECT id, contact_id, event_type FROM contact_events ORDER BY id"
+        ).fetchall()
+        totals = conn.execute(
+            "SELECT id, total_communications, total_events FROM leads ORDER BY id"
+        ).fetchall()
+    return ([tuple(r[i] for i in range(3)) for r in comms],
+            [tuple(r[i] for i in range(3)) for r in events],
+            [tuple(r[i] for i in range(3)) for r in totals])
+
+
+def test_batch_matches_per_row_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    ids, comms, events = synthetic_records(contacts=20, records=150, seed=3)
+
+    legacy = DREAMSDatabase(str(tmp_path / "legacy.db"))
+    seed_leads(legacy, ids)
+    for rec in comms:
+        legacy_insert_communication(legacy, rec)
+    for rec in events:
+        legacy_insert_event(legacy, rec)
+
+    batch = DREAMSDatabase(str(tmp_path / "batch.db"))
+    seed_leads(batch, ids)
+    counts = batch.insert_communications_batch(comms)
+    assert sum(counts.values()) == len(comms)
+    assert batch.insert_events_batch(events) == len(events)
+
+    assert snapshot(batch) == snapshot(legacy)
+
+
+def test_batch_skips_existing_and_invalid_rows(test_db):
+    seed_leads(test_db, ["t_1"])
+    rec = {"id": "t_call_1", "contact_id": "t_1", "comm_type": "call",
+           "direction": "inbound", "occurred_at": "2026-03-01T10:00:00Z"}
+
+    assert test_db.insert_communication(
+        comm_id=rec["id"], contact_id="t_1", comm_type="call",
+        direction="inbound", occurred_at=rec["occurred_at"],
+    )
+    counts = test_db.insert_communications_batch([
+        rec,                                               # already stored
+        dict(rec, id="t_text_2", comm_type="text"),
+        dict(rec, id="t_text_2", comm_type="text"),        # duplicate in batch
+        dict(rec, id="t_text_3", occurred_at=None),        # NOT NULL column missing
+    ])
+    assert counts == {"text": 1}
+
+    with test_db._get_connection() as conn:
+        total = conn.execute("SELECT total_communications FROM leads WHERE id = 't_1'").fetchone()[0]
+    assert total == 2
+    assert test_db.insert_events_batch([]) == 0
+
+
+def _timed_writes(db, ids, comms, events, batched):
+    """Seconds to write every record new, then again as all duplicates."""
+    seed_leads(db, ids)
+    timings = {}
+    for label in ('new', 'duplicate'):
+        started = time.perf_counter()
+        if batched:
+            db.insert_communications_batch(comms)
+            db.insert_events_batch(events)
+        else:
+            for rec in comms:
+                legacy_insert_communication(db, rec)
+            for rec in events:
+                legacy_insert_event(db, rec)
+        timings[label] = time.perf_counter() - started
+    return timings
+
+
+@pytest.mark.slow
+def test_per_record_cost_benchmark(monkeypatch, tmp_path, capsys):
+    """Per-record cost of the per-row path vs the batch path, new and re-synced.
+
+    SQLite runs in-process, so this understates the per-row path's cost on
+    Postgres, where every check, insert, recount and commit is a round trip.
+    Skip with -m "not slow".
+    """
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    ids, comms, events = synthetic_records(contacts=300, records=1000, seed=42)
+    total = len(comms) + len(events)
+
+    results, snapshots = {}, {}
+    for name, batched in (("legacy", False), ("batch", True)):
+        db = DREAMSDatabase(str(tmp_path / f"{name}.db"))
+        results[name] = _timed_writes(db, ids, comms, events, batched)
+        snapshots[name] = snapshot(db)
+
+    with capsys.disabled():
+        print(f"\n{total:,} records ({len(comms):,} communications + {len(events):,} events), "
+              f"{len(ids):,} contacts, SQLite")
+        print(f"  {'path':<8} {'new (us/rec)':>14} {'dup (us/rec)':>14}")
+        for name, t in results.items():
+            print(f"  {name:<8} {t['new'] / total * 1e6:>14.1f} {t['duplicate'] / total * 1e6:>14.1f}")
+        print(f"  speedup: {results['legacy']['new'] / results['batch']['new']:.1f}x new, "
+              f"{results['legacy']['duplicate'] / results['batch']['duplicate']:.1f}x duplicate")
+
+    assert snapshots["batch"] == snapshots["legacy"]
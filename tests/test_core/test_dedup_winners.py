@@ -0,0 +1,76 @@
+"""
+Tests for the precomputed cross-MLS dedup flags in src/core/listing_service.
+
+Run: python3 -m pytest tests/test_core/test_dedup_winners.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from src.core import listing_service
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE listings ("
+        "id INTEGER PRIMARY KEY, mls_number TEXT, mls_source TEXT, address_key TEXT, "
+        "property_type TEXT, status TEXT, idx_opt_in INTEGER DEFAULT 1, updated_at TEXT, "
+        "list_price INTEGER, captured_at TEXT, gallery_status TEXT, "
+        "is_dedup_winner INTEGER DEFAULT 1, is_idx_dedup_winner INTEGER DEFAULT 1)"
+    )
+    yield conn
+    conn.close()
+
+
+def _add(conn, mls_number, source, key, updated_at="2026-01-01"):
+    conn.execute(
+        "INSERT INTO listings (mls_number, mls_source, address_key, property_type, status, updated_at) "
+        "VALUES (?, ?, ?, 'Residential', 'ACTIVE', ?)",
+        [mls_number, source, key, updated_at],
+    )
+
+
+def _winners(conn):
+    return {row["mls_number"]: row["is_dedup_winner"] for row in
+            conn.execute("SELECT mls_number, is_dedup_winner FROM listings")}
+
+
+def test_refresh_only_rewrites_rows_whose_flags_change(conn):
+    _add(conn, "NAV1", "NavicaMLS", "1 main st|sylva")
+    _add(conn, "CAR1", "CanopyMLS", "1 main st|sylva")
+    _add(conn, "CAR2", "CanopyMLS", "9 oak ln|sylva")
+
+    assert listing_service.refresh_dedup_winners(conn) == 1
+    assert _winners(conn) == {"NAV1": 1, "CAR1": 0, "CAR2": 1}
+    # Nothing changed since, so nothing is rewritten
+    assert listing_service.refresh_dedup_winners(conn) == 0
+    assert listing_service.refresh_dedup_winners(conn, ["1 main st|sylva", "9 oak ln|sylva"]) == 0
+
+    conn.execute("UPDATE listings SET status = 'SOLD' WHERE mls_number = 'NAV1'")
+    assert listing_service.refresh_dedup_winners(conn, ["1 main st|sylva"]) == 1
+    assert _winners(conn)["CAR1"] == 1
+
+
+def test_hive_sync_refreshes_the_groups_it_writes(conn):
+    from apps.hive.sync_engine import HiveSyncEngine
+
+    engine = HiveSyncEngine.__new__(HiveSyncEngine)
+    engine.mls_source = "MountainLakesMLS"
+    engine._dedup = listing_service.DedupTracker()
+
+    _add(conn, "CAR1", "CanopyMLS", "1 main st|sylva")
+    listing = {"mls_number": "ML1", "mls_source": "MountainLakesMLS", "address_key": "1 main st|sylva",
+               "property_type": "Residential", "status": "ACTIVE"}
+    assert engine._upsert_listing(conn, dict(listing)) == "created"
+    engine._dedup.refresh(conn)
+    assert _winners(conn) == {"CAR1": 0, "ML1": 1}
+
+    # DeletedInSource soft-deletes the winner; the Canopy copy takes over
+    assert engine._upsert_listing(conn, dict(listing), raw_prop={"DeletedInSource": True}) == "deleted"
+    engine._dedup.refresh(conn)
+    assert _winners(conn)["CAR1"] == 1
+    assert engine._dedup.keys == set()
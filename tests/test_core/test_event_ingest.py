@@ -0,0 +1,138 @@
+"""
+Tests for the public event queue and batch worker in src/core/event_ingest.
+
+Run: python3 -m pytest tests/test_core/test_event_ingest.py -v
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.integrations._base import AdapterResult
+from apps.integrations.fub import FUBAdapter
+from src.core import event_ingest
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+class FakeFUB:
+    """Records create_event calls; `fail` is a set of emails to reject."""
+
+    build_person_dict = staticmethod(FUBAdapter.build_person_dict)
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    def create_event(self, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+            self.calls.append(kwargs)
+        email = kwargs['person']['emails'][0]['value']
+        if email in self.fail:
+            return AdapterResult.failure("boom", error_code="FUB_API_ERROR")
+        return AdapterResult.success(data={'id': len(self.calls)})
+
+
+@pytest.fixture
+def seeded(test_db):
+    with test_db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO leads (id, first_name, email) VALUES (?, ?, ?)",
+            [('lead-1', 'Jane', 'Jane@Example.com'), ('lead-2', 'Sam', 'sam@example.com')],
+        )
+        conn.execute(
+            "INSERT INTO listings (id, mls_number, address, city, state, zip, list_price, beds, baths, "
+            "status, mls_source) VALUES ('lst_1', 'CAN100', '1 Ridge Rd', 'Sylva', 'NC', '28779', "
+            "450000, 3, 2.5, 'ACTIVE', 'Canopy')"
+        )
+        event_ingest.ensure_tables(conn)
+        conn.commit()
+    return test_db
+
+
+def _enqueue(db, *events):
+    with db._get_connection() as conn:
+        ids = [event_ingest.enqueue(conn, *event, occurred_at=NOW - timedelta(minutes=5)) for event in events]
+        conn.commit()
+    return ids
+
+
+def test_drain_stores_known_contacts_and_forwards_everything(seeded):
+    ids = _enqueue(
+        seeded,
+        ('Viewed Property', 'jane@example.com', 'lst_1'),
+        ('Viewed Property', 'SAM@example.com', 'CAN100'),
+        ('Visited Website', 'stranger@example.com'),
+    )
+    fub = FakeFUB()
+    stats = event_ingest.drain(seeded, fub, workers=3, now=NOW)
+    assert stats == {'claimed': 3, 'stored': 2, 'forwarded': 3, 'skipped': 0, 'retrying': 0, 'dropped': 0}
+
+    with seeded._get_connection() as conn:
+        rows = {r['id']: dict(r) for r in conn.execute("SELECT * FROM contact_events").fetchall()}
+        assert conn.execute("SELECT COUNT(*) FROM public_event_queue").fetchone()[0] == 0
+    assert set(rows) == set(ids[:2])
+    assert rows[ids[0]]['contact_id'] == 'lead-1'
+    assert rows[ids[1]]['property_mls'] == 'CAN100'
+    assert rows[ids[1]]['property_address'] == '1 Ridge Rd'
+
+    by_email = {c['person']['emails'][0]['value']: c for c in fub.calls}
+    assert by_email['jane@example.com']['property']['price'] == 450000.0
+    assert by_email['stranger@example.com']['property'] is None
+    assert by_email['sam@example.com']['occurred_at'] == (NOW - timedelta(minutes=5)).isoformat()
+
+
+def test_failed_forwards_back_off_without_storing_twice(seeded, monkeypatch):
+    monkeypatch.setattr(event_ingest, 'MAX_ATTEMPTS', 3)
+    _enqueue(seeded, ('Viewed Property', 'jane@example.com', 'lst_1'))
+    fub = FakeFUB(fail={'jane@example.com'})
+
+    assert event_ingest.drain(seeded, fub, now=NOW)['retrying'] == 1
+    # Not due again until the backoff passes
+    assert event_ingest.drain(seeded, fub, now=NOW + timedelta(seconds=10))['claimed'] == 0
+    with seeded._get_connection() as conn:
+        status = event_ingest.status(conn, now=NOW)
+    assert (status['depth'], status['retrying'], status['unstored']) == (1, 1, 0)
+
+    assert event_ingest.drain(seeded, fub, now=NOW + timedelta(seconds=31))['retrying'] == 1
+    assert event_ingest.drain(seeded, fub, now=NOW + timedelta(minutes=5))['dropped'] == 1
+    with seeded._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM contact_events").fetchone()[0] == 1
+        assert event_ingest.status(conn)['depth'] == 0
+    assert len(fub.calls) == 3
+
+
+def test_status_reports_depth_and_lag(seeded):
+    _enqueue(seeded, ('Viewed Page', 'jane@example.com'), ('Viewed Page', 'sam@example.com'))
+    with seeded._get_connection() as conn:
+        status = event_ingest.status(conn, now=NOW)
+    assert status['depth'] == 2
+    assert status['lag_seconds'] == 300
+
+
+def test_email_cache_queries_only_misses(seeded):
+    cache = event_ingest.LeadEmailCache()
+    with seeded._get_connection() as conn:
+        assert cache.resolve(conn, ['jane@example.com', 'nobody@example.com']) == {
+            'jane@example.com': 'lead-1', 'nobody@example.com': None}
+        conn.execute("UPDATE leads SET email = 'moved@example.com' WHERE id = 'lead-1'")
+        assert cache.resolve(conn, ['jane@example.com'])['jane@example.com'] == 'lead-1'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_batch_size_bounds_claims_and_pool_bounds_concurrency(seeded):
+    _enqueue(seeded, *[('Viewed Page', f"user{i}@example.com") for i in range(25)])
+    fub = FakeFUB()
+    assert event_ingest.drain(seeded, fub, batch_size=10, workers=4, now=NOW)['claimed'] == 10
+    assert 1 < fub.peak <= 4
+    assert event_ingest.drain(seeded, fub, batch_size=100, now=NOW)['claimed'] == 15
@@ -0,0 +1,140 @@
+"""
+Tests for src/core/fub_activity incremental aggregates and high-water marks.
+
+Run: python3 -m pytest tests/test_core/test_fub_activity.py -v
+"""
+
+import math
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core import fub_activity
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+EVENT_TYPES = ['Visited Website', 'Viewed Property', 'Saved Property', 'Saved Property Search', 'Registration']
+
+
+def _stamp(minutes_ago):
+    return (NOW - timedelta(minutes=minutes_ago)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _history(seed=7, n=400):
+    rng = random.Random(seed)
+    pids = [str(i) for i in range(25)]
+
+    def ts():
+        return _stamp(rng.randint(0, 60 * 24 * 20))
+
+    calls = [{'id': i, 'personId': rng.choice(pids), 'isIncoming': rng.choice([True, False]),
+              'created': ts()} for i in range(n)]
+    texts = [{'id': i, 'personId': rng.choice(pids), 'isIncoming': rng.random() < 0.4,
+              'created': ts()} for i in range(n)]
+    emails = [{'id': i, 'relatedPeople': [{'personId': rng.choice(pids)}],
+               'status': rng.choice(['Sent', 'Received']), 'campaignOrigin': rng.choice(['', 'FUB/Beacon']),
+               'created': ts()} for i in range(n)]
+    events = [{'id': i, 'personId': rng.choice(pids), 'type': rng.choice(EVENT_TYPES), 'created': ts(),
+               'property': {'id': rng.randint(1, 6), 'price': rng.randint(2, 9) * 100000}}
+              for i in range(n * 3)]
+    return calls, texts, emails, events
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    fub_activity.ensure_tables(conn)
+    yield conn
+    conn.close()
+
+
+def _assert_same_stats(expected, actual):
+    assert expected.keys() == actual.keys()
+    for pid, stats in expected.items():
+        for key, value in stats.items():
+            if isinstance(value, float):
+                assert actual[pid][key] == pytest.approx(value, rel=1e-9), (pid, key)
+            else:
+                assert actual[pid][key] == value, (pid, key)
+
+
+def test_incremental_batches_match_full_rebuild(conn):
+    calls, texts, emails, events = _history()
+    full = fub_activity.person_stats(fub_activity.accumulate(calls, texts, emails, events, now=NOW),
+                                     excluded_pids={'3'}, now=NOW)
+
+    # Apply the same history as three runs, split by creation time
+    def window(items, lo, hi):
+        return [i for i in items if lo <= i['created'] < hi]
+
+    cuts = ['', _stamp(60 * 24 * 12), _stamp(60 * 24 * 2), '~']
+    for lo, hi in zip(cuts, cuts[1:]):
+        deltas = fub_activity.accumulate(
+            window(calls, lo, hi), window(texts, lo, hi), window(emails, lo, hi),
+            window(events, lo, hi), now=NOW,
+        )
+        fub_activity.apply_deltas(conn, deltas, now=NOW)
+        conn.commit()
+
+    stored = fub_activity.load_activity(conn)
+    _assert_same_stats(full, fub_activity.person_stats(stored, excluded_pids={'3'}, now=NOW))
+
+
+def test_person_stats_signals():
+    events = [
+        {'id': 1, 'personId': 9, 'type': 'Viewed Property', 'created': _stamp(10),
+         'property': {'id': 'A', 'price': 300000}},
+        {'id': 2, 'personId': 9, 'type': 'Viewed Property', 'created': _stamp(20),
+         'property': {'id': 'A', 'price': 500000}},
+        {'id': 3, 'personId': 9, 'type': 'Visited Website', 'created': _stamp(60 * 24 * 10)},
+        {'id': 3, 'personId': 9, 'type': 'Visited Website', 'created': _stamp(60 * 24 * 10)},  # duplicate
+    ]
+    stats = fub_activity.person_stats(fub_activity.accumulate([], [], [], events, now=NOW), now=NOW)['9']
+    assert stats['properties_viewed'] == 2 and stats['properties_viewed_last_7'] == 2
+    assert stats['website_visits'] == 1 and stats['website_visits_last_7'] == 0
+    assert stats['repeat_property_views'] and stats['max_property_view_count'] == 2
+    assert stats['avg_price_viewed'] == 400000
+    assert math.isclose(stats['price_view_std_dev'], 100000)
+    assert stats['recent_activity_burst'] is False  # third-newest event is 10 days old
+
+    excluded = fub_activity.person_stats(fub_activity.accumulate([], [], [], events, now=NOW),
+                                         excluded_pids={'9'}, now=NOW)['9']
+    assert excluded['properties_viewed'] == 0 and excluded['avg_price_viewed'] is None
+
+
+def test_select_new_dedupes_overlap_and_keeps_late_arrivals():
+    state = fub_activity.mark_all_applied('calls', [
+        {'id': 1, 'created': _stamp(120)},
+        {'id': 2, 'created': _stamp(5)},
+    ])
+    assert state.high_water == NOW - timedelta(minutes=5)
+    assert state.created_after() == _stamp(5 + fub_activity.OVERLAP_MINUTES)
+
+    refetched = [
+        {'id': 2, 'created': _stamp(5)},   # already applied, inside the overlap
+        {'id': 3, 'created': _stamp(8)},   # indexed late, inside the overlap
+        {'id': 4, 'created': _stamp(1)},   # new
+    ]
+    fresh, state = fub_activity.select_new('calls', refetched, state)
+    assert [i['id'] for i in fresh] == [3, 4]
+    assert state.high_water == NOW - timedelta(minutes=1)
+
+    fresh, _ = fub_activity.select_new('calls', refetched, state)
+    assert fresh == []
+
+
+def test_sync_state_round_trip(conn):
+    states = fub_activity.load_sync_state(conn)
+    assert set(states) == set(fub_activity.RESOURCES)
+    assert all(s.high_water is None for s in states.values())
+
+    states['events'] = fub_activity.mark_all_applied('events', [{'id': 'e1', 'created': _stamp(3)}])
+    fub_activity.save_sync_state(conn, states)
+    conn.commit()
+
+    loaded = fub_activity.load_sync_state(conn)
+    assert loaded['events'].high_water == NOW - timedelta(minutes=3)
+    assert loaded['events'].recent_ids == {'e1': (NOW - timedelta(minutes=3)).isoformat()}
+    assert loaded['calls'].high_water is None
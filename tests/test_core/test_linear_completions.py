@@ -0,0 +1,182 @@
+"""
+Tests for FUB -> Linear completion reconciliation in modules/linear_sync.
+
+Run: python3 -m pytest tests/test_core/test_linear_completions.py -v
+"""
+
+import pytest
+
+from modules.linear_sync.fub_client import FUBClient
+from modules.linear_sync.models import FUBTask, LinearIssue
+
+
+class _Conn:
+    """Lets modules.linear_sync.db build its singleton without a database."""
+
+    def executescript(self, sql):
+        pass
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self):
+        self.state = {}
+        self.mappings = {}
+
+    def add(self, task_id, fub_updated_at, origin='fub'):
+        self.mappings[task_id] = {'id': task_id, 'fub_task_id': task_id, 'linear_issue_id': f"issue-{task_id}",
+                                  'origin': origin, 'fub_updated_at': fub_updated_at}
+
+    def get_state(self, key):
+        return self.state.get(key)
+
+    def set_state(self, key, value):
+        self.state[key] = value
+
+    def get_oldest_fub_updated_at(self, origin='fub'):
+        return min((m['fub_updated_at'] for m in self.mappings.values() if m['origin'] == origin), default=None)
+
+    def get_mappings_by_fub_tasks(self, fub_task_ids, origin=None):
+        return {i: dict(self.mappings[i]) for i in fub_task_ids
+                if i in self.mappings and (origin is None or self.mappings[i]['origin'] == origin)}
+
+    def update_mapping(self, mapping_id, sync_status=None, linear_updated_at=None, fub_updated_at=None):
+        if fub_updated_at is not None:
+            self.mappings[mapping_id]['fub_updated_at'] = fub_updated_at
+
+    def log_sync(self, **kwargs):
+        pass
+
+
+class FakeLinear:
+    def __init__(self, done=(), broken=()):
+        self.done = set(done)
+        self.broken = set(broken)
+        self.completed = []
+
+    def get_issues_by_ids(self, ids):
+        return {i: LinearIssue(id=i, identifier=i, title=i,
+                               state_type='completed' if i in self.done else 'started') for i in ids}
+
+    def complete_issue(self, issue_id):
+        if issue_id in self.broken:
+            raise RuntimeError('Linear is down')
+        self.completed.append(issue_id)
+        return LinearIssue(id=issue_id, identifier=issue_id, title=issue_id,
+                           state_type='completed', updated_at='2026-02-01T00:00:00Z')
+
+
+def _stamp(i):
+    return f"2026-01-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z"
+
+
+def _task(i, completed=True, updated=None):
+    return FUBTask(id=i, person_id=100 + i, name=f"Task {i}", type='Call',
+                   is_completed=completed, updated=updated or _stamp(i))
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    from src.core import pg_adapter
+    monkeypatch.setattr(pg_adapter, 'get_db', lambda *args: _Conn())
+    from modules.linear_sync.sync_engine import SyncEngine
+
+    engine = SyncEngine.__new__(SyncEngine)
+    engine.db = FakeDB()
+    engine.linear = FakeLinear()
+    return engine
+
+
+def test_only_changed_completed_fub_origin_tasks_are_applied(engine):
+    since = _stamp(0)
+    engine.db.add(1, since)                     # completed since we last looked
+    engine.db.add(2, _stamp(2))                 # this version already seen
+    engine.db.add(3, since)                     # still open in FUB
+    engine.db.add(4, since, origin='linear')    # Linear-origin: handled elsewhere
+    engine.db.add(5, since)                     # completed, Linear side already done
+    tasks = [_task(1), _task(2), _task(3, completed=False), _task(4), _task(5), _task(6)]
+
+    changed = engine.changed_fub_completions(tasks)
+    assert [t.id for t, _ in changed] == [1, 5]
+
+    engine.linear.done = {'issue-5'}
+    issues = engine.linear.get_issues_by_ids([m['linear_issue_id'] for _, m in changed])
+    assert engine.apply_fub_completions(since, tasks, changed, issues) == 1
+    assert engine.linear.completed == ['issue-1']
+    assert engine.db.mappings[5]['fub_updated_at'] == _stamp(5)
+    assert engine.db.state['fub_completion_high_water'] == _stamp(6)
+    # A second pass over the same listing finds nothing new
+    assert engine.changed_fub_completions(tasks) == []
+
+
+def test_high_water_mark_holds_when_a_completion_fails(engine):
+    since = _stamp(0)
+    for i in (1, 2):
+        engine.db.add(i, since)
+    engine.linear.broken = {'issue-2'}
+    tasks = [_task(1), _task(2)]
+    changed = engine.changed_fub_completions(tasks)
+
+    assert engine.apply_fub_completions(since, tasks, changed, engine.linear.get_issues_by_ids(
+        [m['linear_issue_id'] for _, m in changed])) == 1
+    assert 'fub_completion_high_water' not in engine.db.state
+    # Next poll lists both again; only the failed one is still pending
+    assert [t.id for t, _ in engine.changed_fub_completions(tasks)] == [2]
+
+
+def _paged_fub(tasks, ordered=True, max_pages=50):
+    """FUBClient whose task listing is served from `tasks` like the API pages it."""
+    client = FUBClient()
+    calls = []
+    list_tasks = client.get_tasks_updated_since
+
+    def request(method, endpoint, params=None, json_data=None):
+        calls.append(dict(params))
+        rows = [t for t in tasks if t['updated'] > params['updatedAfter']]
+        if ordered and params.get('sort') == 'updated':
+            rows.sort(key=lambda t: t['updated'])
+        offset, limit = params['offset'], params['limit']
+        return {'tasks': rows[offset:offset + limit]}
+
+    client._request = request
+    client.calls = calls
+    client.get_tasks_updated_since = lambda since, include_completed=True, page_size=10: list_tasks(
+        since, include_completed, page_size=page_size, max_pages=max_pages)
+    return client
+
+
+def test_truncated_listing_only_advances_past_fully_listed_tasks(engine):
+    # 95 completed tasks, stored newest first, with a run of ties on the
+    # timestamp where the page cap lands
+    raw = [{'id': i, 'personId': i, 'name': 'T', 'type': 'Call', 'isCompleted': True,
+            'updated': _stamp(41 if 38 <= i <= 44 else i)} for i in range(95, 0, -1)]
+    for row in raw:
+        engine.db.add(row['id'], _stamp(0))
+    engine.fub = _paged_fub(raw, max_pages=4)
+
+    first = engine._sync_completed_fub_tasks()
+    assert engine.fub.calls[0]['sort'] == 'updated'
+    # 40 listed, cut inside the run of ties at _stamp(41): those wait for the next poll
+    assert first == 37
+    assert engine.db.state['fub_completion_high_water'] == _stamp(37)
+
+    polls = 1
+    while engine._sync_completed_fub_tasks():
+        polls += 1
+    assert sorted(engine.linear.completed) == sorted(f"issue-{i}" for i in range(1, 96))
+    assert engine.db.state['fub_completion_high_water'] == _stamp(95)
+    assert polls == 3
+
+
+def test_truncated_listing_out_of_order_is_not_used(caplog):
+    raw = [{'id': i, 'updated': _stamp(i)} for i in range(29, 0, -1)]
+    client = _paged_fub(raw, ordered=False, max_pages=2)
+    assert client.get_tasks_updated_since(_stamp(0), page_size=5) == []
+    assert 'not returned in updated order' in caplog.text
+    # Untruncated listings don't depend on the order
+    assert len(client.get_tasks_updated_since(_stamp(0), page_size=50)) == 29
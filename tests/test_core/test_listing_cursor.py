@@ -0,0 +1,133 @@
+"""
+Tests for keyset (cursor) pagination in src/core/listing_service.search_listings.
+
+Run: python3 -m pytest tests/test_core/test_listing_cursor.py -v
+"""
+
+import base64
+import json
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from src.core import listing_service
+from src.core.listing_service import (
+    ALLOWED_SORT_COLUMNS, ListingFilters, ListingService, decode_cursor, encode_cursor,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'apps' / 'property-api'))
+
+SCHEMA = (
+    "CREATE TABLE listings ("
+    "id TEXT PRIMARY KEY, mls_number TEXT, mls_source TEXT, status TEXT, list_price INTEGER, "
+    "list_date TEXT, days_on_market INTEGER, beds INTEGER, baths REAL, sqft INTEGER, acreage REAL, "
+    "elevation_feet INTEGER, view_potential INTEGER, year_built INTEGER, updated_at TEXT, "
+    "city TEXT, sold_date TEXT, sold_price INTEGER, address TEXT, county TEXT, captured_at TEXT, "
+    "state TEXT DEFAULT 'NC', zone INTEGER DEFAULT 1, property_type TEXT DEFAULT 'Residential', "
+    "primary_photo TEXT, photos TEXT, idx_opt_in INTEGER DEFAULT 1, gallery_status TEXT DEFAULT 'ready', "
+    "address_key TEXT, is_dedup_winner INTEGER DEFAULT 1, is_idx_dedup_winner INTEGER DEFAULT 1)"
+)
+
+
+def _value(rng, column):
+    """A value from a small domain, so every sort column has runs of ties and NULLs."""
+    if rng.random() < 0.15:
+        return None
+    if column in ('city', 'county', 'status', 'address'):
+        return rng.choice(['Sylva', 'Franklin', 'Bryson City', 'ACTIVE'])
+    if column in ('list_date', 'updated_at', 'sold_date', 'captured_at'):
+        return f"2026-0{rng.randint(1, 3)}-1{rng.randint(0, 2)}"
+    if column in ('baths', 'acreage'):
+        return rng.choice([1.0, 1.5, 2.5])
+    if column == 'mls_number':
+        return f"M{rng.randint(1, 4)}"
+    return rng.randint(1, 4) * 100
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    listing_service.invalidate_count_cache()
+    path = tmp_path / "cursor.db"
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    rng = random.Random(5)
+    columns = sorted(ALLOWED_SORT_COLUMNS)
+    for i in range(61):
+        row = {c: _value(rng, c) for c in columns}
+        row.update(id=f"L{rng.randint(0, 10 ** 6):07d}-{i}", mls_source='TestMLS')
+        conn.execute(
+            f"INSERT INTO listings ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+    conn.commit()
+    conn.close()
+    yield ListingService(str(path))
+    listing_service.invalidate_count_cache()
+
+
+@pytest.mark.parametrize("sort_col", sorted(ALLOWED_SORT_COLUMNS))
+@pytest.mark.parametrize("sort_dir", ['ASC', 'DESC'])
+def test_cursor_round_trip(sort_col, sort_dir):
+    for value in (350000, 2.5, '2026-03-01', "O'Brien Rd / #2+", None, 0, ''):
+        token = encode_cursor(sort_col, sort_dir, value, 'lst_123')
+        assert not set(token) & set('=+/')
+        assert decode_cursor(token) == (sort_col, sort_dir, value, 'lst_123')
+
+
+def _pages(service, sort_col, order, limit, use_cursor):
+    ids, page, cursor = [], 1, None
+    while True:
+        result = service.search_listings(ListingFilters(), fields=['id'], sort=sort_col, order=order,
+                                         page=page, limit=limit, dedup=False, cursor=cursor)
+        ids.extend(row['id'] for row in result.listings)
+        if use_cursor:
+            cursor = result.next_cursor
+            if cursor is None:
+                return ids
+        else:
+            if page >= result.pages:
+                return ids
+            page += 1
+
+
+@pytest.mark.parametrize("order", ['asc', 'desc'])
+def test_cursor_pages_match_offset_pages_with_ties(service, order):
+    for sort_col in sorted(ALLOWED_SORT_COLUMNS):
+        by_offset = _pages(service, sort_col, order, 7, use_cursor=False)
+        by_cursor = _pages(service, sort_col, order, 7, use_cursor=True)
+        assert by_cursor == by_offset, sort_col
+        assert len(set(by_cursor)) == len(by_cursor) == 61, sort_col
+
+
+@pytest.mark.parametrize("token", [
+    'not-a-cursor',
+    base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+    encode_cursor('list_price', 'ASC', 1, 'x')[:12],
+    base64.urlsafe_b64encode(json.dumps(['password', 'ASC', 1, 'x']).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['list_price', 'SIDEWAYS', 1, 'x']).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['list_price', 'ASC', 1, 7]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['list_price', 'ASC', {'$gt': 1}, 'x']).encode()).decode(),
+])
+def test_malformed_cursor_is_rejected(service, token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+    with pytest.raises(ValueError):
+        service.search_listings(ListingFilters(), cursor=token)
+
+
+def test_malformed_cursor_returns_400(monkeypatch):
+    import routes.public as public
+
+    monkeypatch.setenv('DREAMS_RESPONSE_CACHE', '0')
+    app = Flask(__name__)
+    app.register_blueprint(public.public_bp, url_prefix='/api/public')
+
+    response = app.test_client().get('/api/public/listings?cursor=not-a-cursor')
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'INVALID_CURSOR'
@@ -0,0 +1,150 @@
+"""
+Tests for the in-memory map grid index in src/core/map_index.
+
+Run: python3 -m pytest tests/test_core/test_map_index.py -v
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from src.core import map_index, response_cache
+from src.core.listing_service import ListingFilters, ListingService
+
+SCHEMA = (
+    "CREATE TABLE listings ("
+    "id TEXT PRIMARY KEY, mls_number TEXT, mls_source TEXT, status TEXT, "
+    "list_price INTEGER, address TEXT, city TEXT, state TEXT DEFAULT 'NC', zone INTEGER DEFAULT 1, "
+    "beds INTEGER, baths REAL, sqft INTEGER, property_type TEXT DEFAULT 'Residential', "
+    "primary_photo TEXT, latitude REAL, longitude REAL, idx_address_display INTEGER DEFAULT 1, "
+    "idx_opt_in INTEGER DEFAULT 1, gallery_status TEXT DEFAULT 'ready', address_key TEXT, "
+    "is_dedup_winner INTEGER DEFAULT 1, is_idx_dedup_winner INTEGER DEFAULT 1, updated_at TEXT)"
+)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    path = tmp_path / "map.db"
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    generation = [1]
+    monkeypatch.setattr(response_cache, "current_sync_generation",
+                        lambda scope=response_cache.DEFAULT_SCOPE: generation[0])
+    yield conn, ListingService(str(path)), generation
+    conn.close()
+
+
+def _add(conn, listing_id, lat, lng, price=300000, updated_at="2026-10-01 12:00:00", **extra):
+    row = dict(id=listing_id, mls_number=listing_id, mls_source="TestMLS", status="ACTIVE",
+               list_price=price, city="Sylva", latitude=lat, longitude=lng, updated_at=updated_at)
+    row.update(extra)
+    conn.execute(
+        f"INSERT OR REPLACE INTO listings ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+        list(row.values()),
+    )
+    conn.commit()
+
+
+def _ids(result):
+    return sorted(result["points"]["id"])
+
+
+def test_bbox_edges_and_grid_lines_are_inclusive(db):
+    conn, service, _ = db
+    step = map_index.GRID_DEGREES
+    # Points sitting exactly on grid lines and on the bbox edges, either
+    # side of zero and at a corner shared by four cells.
+    points = {
+        "on_west": (35.25, -83.0), "on_east": (35.25, -82.7),
+        "on_south": (35.2, -82.85), "on_north": (35.5, -82.85),
+        "corner": (35.3, -82.8), "inside": (35.33, -82.77),
+        "outside_w": (35.25, -83.0 - 1e-9), "outside_n": (35.5 + 1e-9, -82.85),
+        "zero": (0.0, 0.0), "neg_edge": (-step, -step),
+    }
+    for listing_id, (lat, lng) in points.items():
+        _add(conn, listing_id, lat, lng)
+
+    index = map_index.MapIndex(service)
+    zoom = map_index.CLUSTER_MAX_ZOOM
+    result = index.query(ListingFilters(), (-83.0, 35.2, -82.7, 35.5), zoom)
+    assert _ids(result) == ["corner", "inside", "on_east", "on_north", "on_south", "on_west"]
+    assert result["count"] == 6
+
+    assert _ids(index.query(ListingFilters(), (-step, -step, 0.0, 0.0), zoom)) == ["neg_edge", "zero"]
+    # A degenerate box on a grid corner still finds the point there
+    assert _ids(index.query(ListingFilters(), (-82.8, 35.3, -82.8, 35.3), zoom)) == ["corner"]
+
+    # Every point lands in the cell that the bbox walk covers for it
+    snap = index.refresh()
+    for listing_id, (lat, lng) in points.items():
+        assert listing_id in snap.grid[map_index._cell(lat, lng)]
+
+
+def test_incremental_refresh_continues_from_high_water_without_gaps(db):
+    conn, service, generation = db
+    for i in range(5):
+        _add(conn, f"L{i}", 35.3 + i * 0.01, -83.1, updated_at=f"2026-10-01 12:00:0{i}")
+    index = map_index.MapIndex(service)
+    assert sorted(index.refresh().points) == ["L0", "L1", "L2", "L3", "L4"]
+    assert index.refresh().high_water == "2026-10-01 12:00:04"
+
+    # A second writer commits a row stamped in the same second as the
+    # high-water mark, plus later rows: one new, one moved, one withheld.
+    _add(conn, "L5", 35.4, -83.2, updated_at="2026-10-01 12:00:04")
+    _add(conn, "L6", 35.41, -83.2, updated_at="2026-10-01 12:00:05")
+    _add(conn, "L1", 35.9, -82.1, updated_at="2026-10-01 12:00:06")
+    _add(conn, "L2", 35.32, -83.1, updated_at="2026-10-01 12:00:06", idx_address_display=0)
+    generation[0] += 1
+
+    snap = index.refresh()
+    assert sorted(snap.points) == ["L0", "L1", "L3", "L4", "L5", "L6"]
+    assert snap.high_water == "2026-10-01 12:00:06"
+    assert snap.points["L1"][:2] == (35.9, -82.1)
+    cells = [i for ids in snap.grid.values() for i in ids]
+    assert sorted(cells) == sorted(snap.points)      # each point in exactly one cell
+
+    # Re-reading the boundary second again changes nothing
+    generation[0] += 1
+    again = index.refresh()
+    assert again.points == snap.points and again.high_water == snap.high_water
+
+
+def test_matches_unindexed_map_query(db):
+    conn, service, _ = db
+    rng = random.Random(9)
+    for i in range(400):
+        _add(conn, f"P{i:03d}", round(rng.uniform(34.9, 36.2), 5), round(rng.uniform(-84.3, -81.9), 5),
+             price=rng.randint(1, 20) * 50000, city=rng.choice(["Sylva", "Bryson City", "Asheville"]),
+             status=rng.choice(["ACTIVE", "PENDING"]), beds=rng.randint(1, 5),
+             idx_address_display=int(rng.random() > 0.1), updated_at=f"2026-10-01 12:{i // 60:02d}:{i % 60:02d}")
+    _add(conn, "NO_COORDS", None, None)
+
+    index = map_index.MapIndex(service)
+    zoom = map_index.CLUSTER_MAX_ZOOM
+    fields = ["id", "latitude", "longitude", "list_price", "idx_address_display"]
+    for filters, bbox in [
+        (ListingFilters(), None),
+        (ListingFilters(status="ACTIVE", min_beds=3), (-83.6, 35.1, -82.4, 35.8)),
+        (ListingFilters(city="Sylva,Asheville", max_price=500000), (-84.0, 35.0, -83.0, 36.0)),
+        (ListingFilters(require_idx=True, zone="1"), (-82.95, 35.55, -82.35, 35.95)),
+    ]:
+        expected = [
+            m for m in service.get_map_markers(filters, fields=fields, max_results=10000)
+            if m["idx_address_display"] and (
+                bbox is None or (bbox[1] <= m["latitude"] <= bbox[3] and bbox[0] <= m["longitude"] <= bbox[2]))
+        ]
+        result = index.query(filters, bbox, zoom)
+        assert _ids(result) == sorted(m["id"] for m in expected)
+        assert result["count"] == len(expected)
+        points = result["points"]
+        assert sorted(zip(points["id"], points["lat"], points["lng"], points["list_price"])) == sorted(
+            (m["id"], m["latitude"], m["longitude"], m["list_price"]) for m in expected)
+        # Points come back most expensive first, like the unindexed query
+        assert points["list_price"] == sorted(points["list_price"], reverse=True)
+
+        # Clustering regroups the same hits without losing or adding any
+        clustered = index.query(filters, bbox, 8)
+        assert len(clustered["points"]["id"]) + sum(clustered["clusters"]["count"]) == len(expected)
@@ -0,0 +1,160 @@
+"""
+Tests for the shared-memory MLS Grid throttle in src/core/mlsgrid_throttle.
+
+Run: python3 -m pytest tests/test_core/test_mlsgrid_throttle.py -v
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from src.core import mlsgrid_throttle
+from src.core.mlsgrid_throttle import MLSGridThrottle
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() just moves the clock on."""
+
+    def __init__(self, now=1_800_000_000.0):
+        self.now = now
+        self.slept = []
+        self.frozen = False
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if not self.frozen:
+            self.slept.append(seconds)
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mlsgrid_throttle, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def throttle(tmp_path, clock):
+    return MLSGridThrottle(tmp_path / 'throttle.bin', tmp_path / 'missing.json')
+
+
+def test_requests_are_spaced_by_min_interval(throttle, clock):
+    start = clock.now
+    for _ in range(4):
+        throttle.wait()
+        throttle.record()
+    assert clock.now - start == pytest.approx(3 * mlsgrid_throttle.MIN_REQUEST_INTERVAL)
+    status = throttle.get_status()
+    assert status['hourly_requests'] == status['daily_requests'] == 4
+
+
+def test_windows_roll_forward(throttle, clock):
+    for _ in range(5):
+        throttle.wait()
+    clock.now += 61 * 60
+    throttle.wait()
+    status = throttle.get_status()
+    assert (status['hourly_requests'], status['daily_requests']) == (1, 6)
+    clock.now += 24 * 3600
+    assert throttle.get_status()['daily_requests'] == 0
+
+
+def test_hourly_cap_waits_for_oldest_minute_to_expire(throttle, clock, monkeypatch):
+    monkeypatch.setattr(mlsgrid_throttle, 'MIN_REQUEST_INTERVAL', 0.001)
+    monkeypatch.setattr(mlsgrid_throttle, 'MAX_REQUESTS_PER_HOUR', 10)
+    first = clock.now
+    for _ in range(10):
+        throttle.wait(priority='interactive')
+    throttle.wait(priority='interactive')
+    assert clock.now >= (first // 60 + 60) * 60
+    assert throttle.get_status()['hourly_requests'] == 1
+
+
+def test_bulk_leaves_headroom_for_interactive(throttle, monkeypatch):
+    monkeypatch.setattr(mlsgrid_throttle, 'MIN_REQUEST_INTERVAL', 0.001)
+    monkeypatch.setattr(mlsgrid_throttle, 'MAX_REQUESTS_PER_DAY', 10)
+    for _ in range(9):
+        throttle.wait()
+    with pytest.raises(RuntimeError, match='daily'):
+        throttle.wait()
+    throttle.wait(priority='interactive')
+    with pytest.raises(RuntimeError, match='daily'):
+        throttle.wait(priority='interactive')
+    with pytest.raises(ValueError):
+        throttle.wait(priority='urgent')
+
+
+def test_bulk_yields_queue_to_interactive(throttle, clock):
+    # Three callers elsewhere reserve slots and are still asleep waiting for them
+    clock.frozen = True
+    for _ in range(3):
+        throttle.wait(priority='interactive')
+    clock.frozen = False
+
+    # Bulk holds off until only one request is queued ahead, then takes the next slot
+    throttle.wait()
+    assert clock.slept == [6.0, 3.0]
+    # Whereas an interactive fetch reserves straight away
+    throttle.wait(priority='interactive')
+    assert clock.slept[2:] == [3.0]
+
+
+def test_pause_blocks_interactive_and_delays_bulk(throttle, clock):
+    throttle.pause(120)
+    assert not throttle.can_start_batch(10)
+    assert throttle.get_status()['paused_until'] is not None
+    with pytest.raises(RuntimeError, match='paused'):
+        throttle.wait(priority='interactive')
+    start = clock.now
+    throttle.wait()
+    assert clock.now - start >= 120
+    assert throttle.can_start_batch(10)
+
+
+def test_can_start_batch_and_reset(throttle, monkeypatch):
+    monkeypatch.setattr(mlsgrid_throttle, 'MIN_REQUEST_INTERVAL', 0.001)
+    monkeypatch.setattr(mlsgrid_throttle, 'MAX_REQUESTS_PER_HOUR', 100)
+    for _ in range(60):
+        throttle.wait()
+    assert throttle.can_start_batch(5)
+    assert not throttle.can_start_batch(15)
+    throttle.reset()
+    assert throttle.get_status()['hourly_requests'] == 0
+    assert throttle.can_start_batch(15)
+
+
+def test_imports_legacy_json_log(tmp_path, clock):
+    legacy = tmp_path / 'legacy.json'
+    now = clock.now
+    legacy.write_text(json.dumps({
+        'requests': [now - 90000, now - 7200, now - 1800, now - 60, now - 2],
+        'last_request': now - 2,
+    }))
+    throttle = MLSGridThrottle(tmp_path / 'throttle.bin', legacy)
+    status = throttle.get_status()
+    assert (status['hourly_requests'], status['daily_requests']) == (3, 4)
+    throttle.wait()
+    assert clock.slept == [pytest.approx(mlsgrid_throttle.MIN_REQUEST_INTERVAL - 2)]
+
+
+def _hammer(path, n):
+    mlsgrid_throttle.MIN_REQUEST_INTERVAL = 0.0
+    throttle = MLSGridThrottle(path, path.with_suffix('.json'))
+    for _ in range(n):
+        throttle.wait()
+
+
+def test_counts_are_exact_across_processes(tmp_path):
+    path = tmp_path / 'throttle.bin'
+    ctx = multiprocessing.get_context('fork')
+    workers = [ctx.Process(target=_hammer, args=(path, 200)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(30)
+    assert all(w.exitcode == 0 for w in workers)
+    assert MLSGridThrottle(path, path.with_suffix('.json')).get_status()['daily_requests'] == 800
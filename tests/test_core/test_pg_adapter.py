@@ -0,0 +1,232 @@
+"""
+Tests for src/core/pg_adapter placeholder translation and row streaming.
+
+Run: python3 -m pytest tests/test_core/test_pg_adapter.py -v
+"""
+
+import ast
+import random
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.pg_adapter import DictRow, PgConnectionWrapper, _translate_placeholders, iter_rows
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SQL_SOURCES = [
+    PROJECT_ROOT / 'src' / 'core' / 'database.py',
+    PROJECT_ROOT / 'src' / 'core' / 'listing_service.py',
+]
+SQL_RE = re.compile(r'\b(SELECT|INSERT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+
+def legacy_translate(query: str) -> str:
+    """The pre-cache char-by-char translator, kept as a reference."""
+    result = []
+    in_quote = False
+    i = 0
+    while i < len(query):
+        ch = query[i]
+        if ch == "'":
+            if in_quote and i + 1 < len(query) and query[i + 1] == "'":
+                result.append("''")
+                i += 2
+                continue
+            in_quote = not in_quote
+            result.append(ch)
+        elif ch == '?' and not in_quote:
+            result.append('%s')
+        elif ch == '%':
+            result.append('%%')
+        else:
+            result.append(ch)
+        i += 1
+
+    return ''.join(result)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT * FROM t WHERE a = ? AND b = ?", "SELECT * FROM t WHERE a = %s AND b = %s"),
+    ("SELECT * FROM t WHERE name = 'what?' AND id = ?", "SELECT * FROM t WHERE name = 'what?' AND id = %s"),
+    ("SELECT 'it''s ?' , ?", "SELECT 'it''s ?' , %s"),
+    ("WHERE city LIKE '%ville%' AND zip LIKE ?", "WHERE city LIKE '%%ville%%' AND zip LIKE %s"),
+    ("SELECT '' , ?", "SELECT '' , %s"),
+    ("SELECT 'unterminated ?", "SELECT 'unterminated ?"),
+    ("", ""),
+])
+def test_translate_placeholders(query, expected):
+    assert _translate_placeholders(query) == expected
+
+
+def test_matches_legacy_translator_on_random_queries():
+    rng = random.Random(1234)
+    alphabet = "ab ?%'\n"
+    for _ in range(2000):
+        query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert _translate_placeholders(query) == legacy_translate(query), repr(query)
+
+
+def test_translation_is_cached():
+    _translate_placeholders.cache_clear()
+    _translate_placeholders("SELECT ? FROM cache_probe")
+    _translate_placeholders("SELECT ? FROM cache_probe")
+    assert _translate_placeholders.cache_info().hits == 1
+
+
+def collect_queries() -> list:
+    """Every SQL-looking string constant in SQL_SOURCES, plus runtime search shapes."""
+    queries = []
+    for path in SQL_SOURCES:
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                if SQL_RE.search(node.value) and len(node.value) > 20:
+                    queries.append(node.value)
+
+    # Search queries are assembled at runtime around DEDUP_CONDITION; add
+    # representative shapes so the long correlated subquery is measured.
+    from src.core.listing_service import DEDUP_CONDITION
+    base = "SELECT * FROM listings l WHERE l.idx_opt_in = 1 AND l.status = ? AND l.city LIKE '%ville%'"
+    queries.append(f"{base} AND {DEDUP_CONDITION} ORDER BY l.list_date DESC LIMIT ? OFFSET ?")
+    queries.append(f"SELECT COUNT(*) as cnt FROM listings l WHERE l.status = ? AND {DEDUP_CONDITION}")
+    return queries
+
+
+@pytest.mark.slow
+def test_translation_benchmark_over_real_queries(capsys):
+    """Old vs new translation cost over the queries in database.py and listing_service.py.
+
+    legacy is the char-by-char loop, regex the tokenizer run on a cache
+    miss, cached the production call (an LRU hit). Skip with -m "not slow".
+    """
+    queries = collect_queries()
+    assert len(queries) > 50
+    assert [_translate_placeholders(q) for q in queries] == [legacy_translate(q) for q in queries]
+
+    rounds = 20
+    calls = len(queries) * rounds
+
+    def time_it(fn):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for q in queries:
+                fn(q)
+        return time.perf_counter() - started
+
+    legacy_s = time_it(legacy_translate)
+    regex_s = time_it(_translate_placeholders.__wrapped__)
+    _translate_placeholders.cache_clear()
+    cached_s = time_it(_translate_placeholders)
+
+    with capsys.disabled():
+        print(f"\n{len(queries)} queries, {sum(len(q) for q in queries):,} characters, {rounds} rounds")
+        print(f"  {'translator':<10} {'total':>10} {'per call':>12} {'speedup':>9}")
+        for name, secs in (('legacy', legacy_s), ('regex', regex_s), ('cached', cached_s)):
+            print(f"  {name:<10} {secs * 1000:>8.1f}ms {secs / calls * 1e6:>10.2f}us {legacy_s / secs:>8.1f}x")
+
+    assert cached_s < legacy_s
+
+
+class _NamedCursor:
+    """psycopg2 named-cursor stand-in: description appears after the first fetch."""
+
+    def __init__(self, raw, name, withhold):
+        self.raw = raw
+        self.name = name
+        self.withhold = withhold
+        self.description = None
+        self.closed = False
+        self._rows = list(raw.rows)
+
+    def execute(self, query, params=None):
+        self.raw.log.append(('execute', query, params))
+        if self.raw.fail:
+            raise RuntimeError('syntax error')
+
+    def fetchmany(self, size):
+        self.raw.log.append(('fetchmany', size))
+        self.description = [(c,) for c in self.raw.columns]
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class _RawConn:
+    def __init__(self, rows, columns=('id', 'name'), fail=False):
+        self.rows = rows
+        self.columns = columns
+        self.fail = fail
+        self.log = []
+        self.cursors = []
+
+    def cursor(self, name=None, withhold=False):
+        cursor = _NamedCursor(self, name, withhold)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def test_dict_row_from_values():
+    names = ('id', 'name', 'id')
+    keys = tuple(dict.fromkeys(names))
+    first = DictRow.from_values(names, keys, (1, 'a', 2))
+    second = DictRow.from_values(names, keys, (3, 'b', 4))
+
+    # Duplicate columns resolve like dict(zip()): the last one wins
+    assert first == {'id': 2, 'name': 'a'}
+    assert (first[0], first[1], first['name']) == (2, 'a', 'a')
+    assert first._keys is second._keys is keys
+    assert first == DictRow({'id': 2, 'name': 'a'})
+    with pytest.raises(IndexError):
+        first[2]
+
+
+def test_stream_declares_the_cursor_before_iteration():
+    raw = _RawConn([(i, f"n{i}") for i in range(5)])
+    rows = PgConnectionWrapper(raw).stream(
+        "SELECT id, name FROM t WHERE a = ? AND b LIKE 'x%'", [1], batch_size=2, withhold=True)
+
+    # Declared already, so a commit here makes the WITH HOLD cursor safe
+    cursor, = raw.cursors
+    assert cursor.name.startswith('dreams_stream_') and cursor.withhold and cursor.itersize == 2
+    assert raw.log == [('execute', "SELECT id, name FROM t WHERE a = %s AND b LIKE 'x%%'", (1,))]
+
+    result = list(rows)
+    assert [r['id'] for r in result] == [0, 1, 2, 3, 4]
+    assert result[3][1] == 'n3' and isinstance(result[3], DictRow)
+    assert [entry[1] for entry in raw.log[1:]] == [2, 2, 2, 2]
+    assert cursor.closed
+
+
+def test_stream_closes_the_cursor_when_abandoned_or_failed():
+    raw = _RawConn([(i, 'x') for i in range(5)])
+    rows = PgConnectionWrapper(raw).stream("SELECT id, name FROM t", batch_size=2)
+    assert next(rows)['id'] == 0
+    rows.close()
+    assert raw.cursors[0].closed
+    assert [entry[0] for entry in raw.log] == ['execute', 'fetchmany']
+
+    broken = _RawConn([], fail=True)
+    with pytest.raises(RuntimeError):
+        PgConnectionWrapper(broken).stream("SELECT nope")
+    assert broken.cursors[0].closed
+
+
+def test_iter_rows_on_either_backend():
+    raw = _RawConn([(i, 'x') for i in range(3)])
+    assert [r['id'] for r in iter_rows(PgConnectionWrapper(raw), "SELECT id, name FROM t", batch_size=2)] == [0, 1, 2]
+    assert raw.cursors[0].closed
+
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(7)])
+    assert [r['id'] for r in iter_rows(conn, "SELECT id FROM t WHERE id >= ? ORDER BY id", [2], batch_size=3)] == [
+        2, 3, 4, 5, 6]
+    # The query runs when iter_rows is called, not on first iteration
+    with pytest.raises(sqlite3.OperationalError):
+        iter_rows(conn, "SELECT id FROM missing")
+    conn.close()
@@ -0,0 +1,189 @@
+"""
+Tests for the pg_adapter connection pool, request pinning and /health/db/pool,
+run against a fake psycopg2 connection factory.
+
+Run: python3 -m pytest tests/test_core/test_pg_pool.py -v
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import pytest
+from flask import Flask
+
+from src.core import pg_adapter
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'apps' / 'property-api'))
+
+
+class _Info:
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.autocommit = True
+        self.info = _Info()
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    """psycopg2.connect replacement; set .fail to make the next connect raise."""
+    def factory(*args, **kwargs):
+        if factory.fail:
+            factory.fail = False
+            raise psycopg2.OperationalError('could not connect')
+        factory.made.append(FakeConn())
+        return factory.made[-1]
+
+    factory.made = []
+    factory.fail = False
+    monkeypatch.setattr(psycopg2, 'connect', factory)
+    return factory
+
+
+@pytest.fixture
+def pool(connect, monkeypatch):
+    """A 2-connection pool installed as the process pool, Postgres mode on."""
+    pool = pg_adapter.InstrumentedPool(0, 2, timeout=0.05)
+    monkeypatch.setattr(pg_adapter, '_pool', pool)
+    monkeypatch.setattr(pg_adapter, '_pinned_count', 0)
+    monkeypatch.setattr(pg_adapter, 'is_postgres', lambda: True)
+    monkeypatch.setattr(pg_adapter, 'active_backend', lambda: 'postgres')
+    yield pool
+    pg_adapter.unpin_thread_connection()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.001)
+
+
+def test_checkout_times_out_when_every_connection_is_in_use(pool):
+    a, b = pool.getconn(), pool.getconn()
+    started = time.monotonic()
+    with pytest.raises(psycopg2.pool.PoolError, match='no connection free'):
+        pool.getconn()
+    assert time.monotonic() - started >= 0.05
+
+    stats = pool.stats()
+    assert (stats['in_use'], stats['checkouts'], stats['exhausted'], stats['timeouts'], stats['waiting']) == (
+        2, 2, 1, 1, 0)
+    pool.putconn(a)
+    pool.putconn(b)
+    assert pool.stats()['in_use'] == 0
+
+
+def test_waiting_checkout_gets_the_next_returned_connection(pool):
+    pool.timeout = 5.0
+    a, b = pool.getconn(), pool.getconn()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    _wait_for(lambda: pool.waiting == 1)
+    assert pool.stats()['waiting'] == 1
+
+    time.sleep(0.02)
+    pool.putconn(a)
+    waiter.join(2)
+    assert len(got) == 1 and pool.stats()['in_use'] == 2
+
+    stats = pool.stats()
+    assert (stats['checkouts'], stats['exhausted'], stats['timeouts'], stats['waiting']) == (3, 1, 0, 0)
+    assert stats['wait_max_ms'] >= 20
+    assert sum(stats['wait_histogram'].values()) == 3
+    assert stats['wait_histogram']['lt_1ms'] >= 2
+    pool.putconn(b)
+    pool.putconn(got[0])
+
+
+def test_failed_connect_gives_its_slot_back(pool, connect):
+    connect.fail = True
+    with pytest.raises(psycopg2.OperationalError):
+        pool.getconn()
+    # Both slots are still free: neither checkout waits
+    pool.getconn(), pool.getconn()
+    assert pool.stats()['exhausted'] == 0 and pool.stats()['checkouts'] == 2
+
+
+def test_pin_scope_shares_one_connection_until_the_last_wrapper_closes(pool):
+    with pg_adapter.pinned_connection():
+        first, second = pg_adapter.get_connection(), pg_adapter.get_connection()
+        assert first._conn is second._conn
+        assert pool.stats()['in_use'] == 1 and pg_adapter.pool_stats()['pinned'] == 1
+
+        second.close()
+        assert first._conn.rollbacks == 0
+        # The last open wrapper rolls back but keeps the connection for the scope
+        first.close()
+        assert first._conn.rollbacks == 1 and pool.stats()['in_use'] == 1
+
+        late = pg_adapter.get_connection()
+        assert late._conn is first._conn
+
+        # Other threads pin their own connection
+        seen = []
+
+        def request_on_another_thread():
+            with pg_adapter.pinned_connection():
+                conn = pg_adapter.get_connection()
+                seen.append((conn._conn, pool.stats()['in_use'], pg_adapter.pool_stats()['pinned']))
+                conn.close()
+
+        worker = threading.Thread(target=request_on_another_thread)
+        worker.start()
+        worker.join(2)
+        assert seen[0][0] is not first._conn and seen[0][1:] == (2, 2)
+        assert pool.stats()['in_use'] == 1
+
+    # Scope ended while `late` is open: the connection goes back when it closes
+    assert pool.stats()['in_use'] == 1 and pg_adapter.pool_stats()['pinned'] == 1
+    late.close()
+    assert pool.stats()['in_use'] == 0 and pg_adapter.pool_stats()['pinned'] == 0
+    assert first._conn.rollbacks == 2
+
+    # Outside a scope every wrapper checks out and returns its own
+    plain = pg_adapter.get_connection()
+    assert plain._conn is not first._conn and pool.stats()['in_use'] == 1
+    plain.close()
+    assert pool.stats()['in_use'] == 0 and pg_adapter.pool_stats()['pinned'] == 0
+
+
+def test_health_db_pool_reports_occupancy(pool, monkeypatch):
+    from routes.health import health_bp
+
+    monkeypatch.setenv('DREAMS_PG_POOL_MAX', '2')
+    app = Flask(__name__)
+    app.register_blueprint(health_bp)
+    client = app.test_client()
+
+    a, b = pool.getconn(), pool.getconn()
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+    body = client.get('/health/db/pool').get_json()
+    assert body['backend'] == 'postgres' and body['config']['maxconn'] == 2
+    assert body['pool']['status'] == 'saturated'
+    assert (body['pool']['in_use'], body['pool']['exhausted'], body['pool']['timeouts']) == (2, 1, 1)
+
+    pool.putconn(a)
+    pool.putconn(b)
+    assert client.get('/health/db/pool').get_json()['pool']['status'] == 'ok'
+
+    monkeypatch.setattr(pg_adapter, 'active_backend', lambda: 'sqlite')
+    assert client.get('/health/db/pool').get_json() == {'backend': 'sqlite', 'pool': None}
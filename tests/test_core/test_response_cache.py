@@ -0,0 +1,175 @@
+"""
+Tests for the sync generation counter and response LRU in
+src/core/response_cache, and the public API's _cached_public wrapper.
+
+Run: python3 -m pytest tests/test_core/test_response_cache.py -v
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask, jsonify
+
+from src.core import response_cache
+from src.core.response_cache import CachedResponse, ResponseCache
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'apps' / 'property-api'))
+
+
+def test_bump_counts_per_scope():
+    conn = sqlite3.connect(":memory:")
+    # As created by migration e9b4d2a6c8f1
+    conn.execute("CREATE TABLE sync_generation (scope TEXT PRIMARY KEY, "
+                 "generation INTEGER NOT NULL DEFAULT 0, updated_at TEXT)")
+    response_cache.bump_sync_generation(conn)
+    response_cache.bump_sync_generation(conn)
+    response_cache.bump_sync_generation(conn, scope="agents")
+    rows = dict(conn.execute("SELECT scope, generation FROM sync_generation"))
+    assert rows == {"listings": 2, "agents": 1}
+
+
+def test_bump_without_table_keeps_the_callers_writes():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE listings (id INTEGER)")
+    conn.execute("INSERT INTO listings VALUES (1)")
+    response_cache.bump_sync_generation(conn)
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0] == 1
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _entry(body, generation=1):
+    return CachedResponse(generation, body, 200, 'application/json')
+
+
+def test_lru_evicts_least_recently_used_by_count():
+    cache = ResponseCache(max_entries=2, max_bytes=1000, ttl=60)
+    cache.put('a', _entry(b'A'))
+    cache.put('b', _entry(b'B'))
+    assert cache.get('a', 1).body == b'A'      # a is now the most recent
+    cache.put('c', _entry(b'C'))
+    assert cache.get('b', 1) is None
+    assert [cache.get(k, 1).body for k in ('a', 'c')] == [b'A', b'C']
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions'], stats['hits'], stats['misses']) == (2, 1, 3, 1)
+
+
+def test_byte_budget_evicts_oldest_and_skips_oversized_bodies():
+    cache = ResponseCache(max_entries=100, max_bytes=10, ttl=60)
+    cache.put('a', _entry(b'1234'))
+    cache.put('b', _entry(b'5678'))
+    cache.put('c', _entry(b'90ab'))
+    assert cache.get('a', 1) is None and cache.stats()['bytes'] == 8
+
+    # Replacing a key frees its old body first
+    cache.put('b', _entry(b'xy'))
+    assert cache.stats()['bytes'] == 6 and cache.stats()['evictions'] == 1
+
+    cache.put('huge', _entry(b'x' * 11))
+    assert cache.get('huge', 1) is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=30)
+    cache.put('a', _entry(b'A'))
+    clock.now += 29.9
+    assert cache.get('a', 1) is not None
+    clock.now += 0.1
+    assert cache.get('a', 1) is None
+    assert cache.stats()['stale'] == 1 and cache.stats()['entries'] == 0
+
+
+def test_generation_change_invalidates():
+    cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=60)
+    old = _entry(b'A', generation=1)
+    cache.put('a', old)
+    assert cache.get('a', 2) is None
+    assert cache.stats()['stale'] == 1 and cache.stats()['bytes'] == 0
+    # Same body at a new generation gets a new ETag
+    assert _entry(b'A', generation=2).etag != old.etag
+
+
+@pytest.fixture
+def public_app(monkeypatch):
+    import routes.public as public
+
+    generation = [1]
+    calls = []
+    monkeypatch.setattr(public, '_response_cache', ResponseCache(max_entries=10, max_bytes=10000, ttl=60))
+    monkeypatch.setattr(public, 'current_sync_generation', lambda: generation[0])
+    monkeypatch.delenv('DREAMS_RESPONSE_CACHE', raising=False)
+
+    app = Flask(__name__)
+
+    @app.route('/public/stats')
+    @public._cached_public
+    def stats():
+        calls.append(generation[0])
+        return jsonify({'generation': generation[0], 'calls': len(calls)})
+
+    @app.route('/public/missing')
+    @public._cached_public
+    def missing():
+        calls.append('missing')
+        return jsonify({'error': 'not found'}), 404
+
+    return app.test_client(), generation, calls
+
+
+def test_cached_public_serves_hits_and_304s(public_app):
+    client, generation, calls = public_app
+
+    first = client.get('/public/stats?b=2&a=1')
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'public, no-cache'
+
+    # Argument order doesn't split the cache
+    again = client.get('/public/stats?a=1&b=2')
+    assert again.headers['X-Cache'] == 'HIT' and again.data == first.data and again.headers['ETag'] == etag
+
+    revalidated = client.get('/public/stats?a=1&b=2', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.data == b''
+    assert revalidated.headers['X-Cache'] == 'HIT' and revalidated.headers['ETag'] == etag
+    assert calls == [1]
+
+    # A sync commits: the old ETag no longer matches and the view runs again
+    generation[0] = 2
+    fresh = client.get('/public/stats?a=1&b=2', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.headers['X-Cache'] == 'MISS'
+    assert fresh.headers['ETag'] != etag and fresh.get_json()['generation'] == 2
+    assert client.get('/public/stats?a=1&b=2', headers={'If-None-Match': fresh.headers['ETag']}).status_code == 304
+    assert calls == [1, 2]
+
+
+def test_cached_public_skips_errors_and_can_be_disabled(public_app, monkeypatch):
+    client, _, calls = public_app
+
+    for _ in range(2):
+        response = client.get('/public/missing')
+        assert response.status_code == 404 and 'X-Cache' not in response.headers
+    assert calls == ['missing', 'missing']
+
+    monkeypatch.setenv('DREAMS_RESPONSE_CACHE', '0')
+    for _ in range(2):
+        assert 'X-Cache' not in client.get('/public/stats').headers
+    assert calls[2:] == [1, 1]
@@ -0,0 +1,162 @@
+"""
+Tests for showing route planning and the geocode cache in src/core/route_planner.
+
+Run: python3 -m pytest tests/test_core/test_route_planner.py -v
+"""
+
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.core import route_planner
+
+SYLVA = (35.3734, -83.2260)
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+def _random_stops(n, seed):
+    rng = random.Random(seed)
+    return [(35.2 + rng.random() * 0.4, -83.5 + rng.random() * 0.5) for _ in range(n)]
+
+
+def _path_length(points, order, start):
+    dist = route_planner.distance_matrix([start] + list(points))
+    path = [0] + [i + 1 for i in order]
+    return sum(dist[a, b] for a, b in zip(path, path[1:]))
+
+
+def test_distance_matrix_matches_scalar_haversine():
+    from math import radians, sin, cos, sqrt, atan2
+
+    def haversine(lat1, lon1, lat2, lon2):
+        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+        a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        return 3959 * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    points = _random_stops(6, seed=1)
+    dist = route_planner.distance_matrix(points)
+    assert np.allclose(np.diag(dist), 0)
+    for (i, a), (j, b) in itertools.product(enumerate(points), repeat=2):
+        assert dist[i, j] == pytest.approx(haversine(*a, *b))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_small_tours_are_optimal_from_the_meeting_point(seed):
+    points = _random_stops(7, seed)
+    plan = route_planner.plan_route(points, start=SYLVA)
+    best = min(_path_length(points, order, SYLVA) for order in itertools.permutations(range(7)))
+    assert sorted(plan.order) == list(range(7))
+    assert plan.total_distance == pytest.approx(_path_length(points, plan.order, SYLVA))
+    assert plan.total_distance <= best * 1.02
+    assert plan.legs[0] == pytest.approx(route_planner.distance_matrix([SYLVA, points[plan.order[0]]])[0, 1])
+
+
+def test_meeting_point_decides_where_the_tour_starts():
+    west, middle, east = (35.40, -83.50), (35.40, -83.30), (35.40, -83.10)
+    assert route_planner.plan_route([middle, east, west], start=(35.40, -83.60)).order == [2, 0, 1]
+    assert route_planner.plan_route([middle, east, west], start=(35.40, -83.00)).order == [1, 0, 2]
+    # Without one the tour starts at an end of the line, not at stop 0
+    assert route_planner.plan_route([middle, east, west]).order in ([2, 0, 1], [1, 0, 2])
+
+
+def test_schedule_uses_durations_and_windows():
+    west, middle, east = (35.40, -83.50), (35.40, -83.30), (35.40, -83.10)
+    start = (35.40, -83.60)
+    untimed = route_planner.plan_route([west, middle, east], start=start,
+                                       durations=[15, 45, 30], start_minute=540)
+    assert untimed.order == [0, 1, 2]
+    assert untimed.late_minutes == 0
+    drive = route_planner.DEFAULT_SPEED_MPH
+    first_leg = untimed.legs[0] / drive * 60
+    assert untimed.arrivals[0] == pytest.approx(540 + first_leg)
+    assert untimed.departures[0] == pytest.approx(untimed.arrivals[0] + 15)
+    assert untimed.arrivals[1] == pytest.approx(untimed.departures[0] + untimed.legs[1] / drive * 60)
+
+    # East must be seen by 10:00, so it goes first despite the extra miles
+    timed = route_planner.plan_route([west, middle, east], start=start, durations=[15, 45, 30],
+                                     windows=[None, None, (None, 600)], start_minute=540)
+    assert timed.order[0] == 2
+    assert timed.late_minutes == 0
+    assert timed.total_distance > untimed.total_distance
+
+    # A stop that can't open before 11:00 waits rather than arriving early
+    waited = route_planner.plan_route([west], start=start, windows=[(660, None)], start_minute=540)
+    assert waited.arrivals == [660]
+
+
+def test_thirty_plus_stop_tours_plan_interactively():
+    points = _random_stops(40, seed=7)
+    windows = [(None, 600 + 30 * i) if i % 5 == 0 else None for i in range(40)]
+    route_planner.plan_route(points[:5], start=SYLVA)   # warm numpy
+
+    began = time.perf_counter()
+    plan = route_planner.plan_route(points, start=SYLVA)
+    timed = route_planner.plan_route(points, start=SYLVA, durations=[5] * 40,
+                                     windows=windows, start_minute=540)
+    elapsed = time.perf_counter() - began
+
+    assert elapsed < 3.0
+    assert sorted(plan.order) == sorted(timed.order) == list(range(40))
+    # Local search beats the plain nearest-neighbor walk it starts from
+    dist = route_planner.distance_matrix(points + [SYLVA])
+    nn = route_planner._nearest_neighbor(dist, 40)
+    assert plan.total_distance < sum(dist[a, b] for a, b in zip(nn, nn[1:]))
+
+
+def test_normalize_address_folds_common_variants():
+    key = route_planner.normalize_address('39 Red Bud Lane', 'Sylva', 'NC')
+    assert route_planner.normalize_address('39 RED BUD LN.', 'sylva', '') == key
+    assert route_planner.normalize_address('39 Red Bud Ln', 'Dillsboro', 'NC') != key
+
+
+def test_geocode_cache_only_looks_up_new_addresses(test_db):
+    calls = []
+
+    def geocoder(address, city, state):
+        calls.append(address)
+        return None if 'Nowhere' in address else (35.1, -83.1)
+
+    lookups = [('39 Red Bud Lane', 'Sylva', 'NC'), ('1 Nowhere Rd', 'Sylva', 'NC')]
+    with test_db._get_connection() as conn:
+        first = route_planner.geocode(conn, lookups, geocoder=geocoder, now=NOW)
+        conn.commit()
+        again = route_planner.geocode(conn, [('39 Red Bud Ln.', 'sylva', 'NC')] + lookups[1:],
+                                      geocoder=geocoder, now=NOW + timedelta(days=1))
+        cached_only = route_planner.geocode(conn, [('5 Main St', 'Franklin', 'NC')])
+        # Misses are retried once they age out
+        route_planner.geocode(conn, lookups, geocoder=geocoder,
+                              now=NOW + route_planner.GEOCODE_MISS_TTL + timedelta(days=1))
+
+    key = route_planner.normalize_address(*lookups[0])
+    assert first == again == {key: (35.1, -83.1), route_planner.normalize_address(*lookups[1]): None}
+    assert cached_only == {}
+    assert calls == ['39 Red Bud Lane', '1 Nowhere Rd', '1 Nowhere Rd']
+
+
+def test_geocode_errors_are_not_cached(test_db):
+    def broken(address, city, state):
+        raise ConnectionError('down')
+
+    with test_db._get_connection() as conn:
+        assert route_planner.geocode(conn, [('39 Red Bud Ln', 'Sylva', 'NC')], geocoder=broken) == {}
+        assert conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0] == 0
+
+
+def test_spatial_service_outages_are_not_cached_as_misses(test_db, monkeypatch):
+    import requests
+    from src.services.spatial_data_service import SpatialDataService
+
+    service = SpatialDataService(rate_limit_delay=0)
+    monkeypatch.setattr(service.session, 'get',
+                        lambda *a, **kw: (_ for _ in ()).throw(requests.ConnectionError('down')))
+    lookup = [('39 Red Bud Ln', 'Sylva', 'NC')]
+
+    with test_db._get_connection() as conn:
+        assert route_planner.geocode(conn, lookup, geocoder=route_planner.geocoder_for(service)) == {}
+        assert conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0] == 0
+    # The plain method still swallows the error for its other callers
+    assert service.geocode_address(*lookup[0]) is None
@@ -0,0 +1,131 @@
+"""
+Integration tests for POST /api/properties/batch.
+
+Run: python3 -m pytest tests/test_integration/test_properties_batch.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'apps' / 'property-api'))
+
+from routes import properties as properties_routes  # noqa: E402
+
+
+@pytest.fixture
+def client(test_db, test_db_path, monkeypatch):
+    monkeypatch.setenv('DREAMS_DB_PATH', str(test_db_path))
+    app = Flask(__name__)
+    app.register_blueprint(properties_routes.properties_bp, url_prefix='/api')
+    with test_db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO listings (id, mls_number, redfin_id, address, city, status, mls_source) "
+            "VALUES (?, ?, ?, ?, ?, 'ACTIVE', 'Canopy')",
+            [('existing-mls', 'CAN1', None, '1 Old Rd', 'Sylva'),
+             ('existing-redfin', None, 'RF9', '9 Creek Ln', 'Dillsboro'),
+             ('existing-addr', None, None, '5 Main St', 'Franklin')],
+        )
+        conn.commit()
+    return app.test_client()
+
+
+def _rows(test_db):
+    with test_db._get_connection() as conn:
+        return {r['id']: dict(r) for r in conn.execute("SELECT * FROM listings").fetchall()}
+
+
+def test_batch_resolves_existing_and_writes_everything(client, test_db):
+    payload = {'properties': [
+        {'address': '1 Old Road', 'mls_number': 'CAN1', 'beds': 4, 'status': 'pending'},
+        {'address': 'elsewhere', 'redfin_id': 'RF9', 'source': 'redfin', 'url': 'https://redfin/x'},
+        {'address': '5 MAIN ST', 'city': 'franklin', 'sqft': 1500},
+        {'address': '7 New Way', 'city': 'Cullowhee', 'mls_number': 'CAN7', 'photo_urls': ['a', 'b']},
+        {'address': '7 New Way', 'city': 'Cullowhee', 'beds': 2},
+        {'city': 'No Address'},
+        'not an object',
+    ]}
+    resp = client.post('/api/properties/batch', json=payload)
+    body = resp.get_json()
+    assert resp.status_code == 200
+    data = body['data']
+    assert not body['success']
+    assert (data['created'], data['updated'], data['failed']) == (1, 4, 2)
+    assert [r['index'] for r in data['errors']] == [5, 6]
+    assert set(data['timing_ms']) == {'validate', 'resolve', 'write', 'total'}
+
+    results = data['results']
+    assert [r.get('id') for r in results[:3]] == ['existing-mls', 'existing-redfin', 'existing-addr']
+    assert results[3]['created'] and results[4]['id'] == results[3]['id'] and not results[4]['created']
+
+    rows = _rows(test_db)
+    assert len(rows) == 4
+    assert rows['existing-mls']['beds'] == 4 and rows['existing-mls']['status'] == 'Pending'
+    assert rows['existing-redfin']['redfin_url'] == 'https://redfin/x'
+    assert rows['existing-addr']['sqft'] == 1500
+    new = rows[results[3]['id']]
+    assert (new['mls_number'], new['beds']) == ('CAN7', 2)
+
+
+def test_later_items_match_every_key_of_rows_created_earlier(client, test_db):
+    payload = {'properties': [
+        {'address': '3 Ridge Rd', 'city': 'Webster', 'zillow_id': 'Z3', 'redfin_id': 'RF3'},
+        {'address': '3 RIDGE RD'},                                 # address only, no city
+        {'address': 'somewhere', 'source': 'zillow', 'source_id': 'Z3'},
+        {'address': 'elsewhere', 'redfin_id': 'RF3', 'beds': 5},
+    ]}
+    data = client.post('/api/properties/batch', json=payload).get_json()['data']
+    assert (data['created'], data['updated'], data['failed']) == (1, 3, 0)
+    assert len({r['id'] for r in data['results']}) == 1
+    assert len(_rows(test_db)) == 4
+
+
+def test_batch_matches_single_endpoint_rows(client, test_db):
+    prop = {'address': '12 Laurel Ln', 'city': 'Bryson City', 'mls_number': 'CAN12', 'beds': 3,
+            'baths': 2, 'status': 'for sale', 'source': 'zillow', 'source_id': 'Z12', 'url': 'https://z/12'}
+    single_id = client.post('/api/properties', json=prop).get_json()['data']['id']
+    single = _rows(test_db)[single_id]
+
+    batch = client.post('/api/properties/batch', json={'properties': [prop]}).get_json()['data']
+    assert batch['results'] == [{'index': 0, 'id': single_id, 'created': False}]
+    after = _rows(test_db)[single_id]
+    assert {k: v for k, v in after.items() if k != 'updated_at'} == \
+        {k: v for k, v in single.items() if k != 'updated_at'}
+
+
+def test_bad_row_only_fails_itself(client, test_db, monkeypatch):
+    real = properties_routes.build_property_data
+
+    def poisoned(data, *args):
+        row = real(data, *args)
+        if data.get('mls_number') == 'BAD':
+            row['beds'] = {'not': 'bindable'}
+        return row
+
+    monkeypatch.setattr(properties_routes, 'build_property_data', poisoned)
+    payload = {'properties': [{'address': f"{i} Batch Rd", 'mls_number': 'BAD' if i == 1 else f"B{i}"}
+                              for i in range(3)]}
+    data = client.post('/api/properties/batch', json=payload).get_json()['data']
+    assert (data['created'], data['failed']) == (2, 1)
+    assert data['errors'] == [{'index': 1, 'error': 'Failed to save property'}]
+    assert len(_rows(test_db)) == 5
+
+
+def test_rejects_bad_envelopes(client, monkeypatch):
+    assert client.post('/api/properties/batch', json={'items': []}).status_code == 400
+    monkeypatch.setattr(properties_routes, 'MAX_BATCH_SIZE', 2)
+    resp = client.post('/api/properties/batch', json={'properties': [{'address': 'x'}] * 3})
+    assert resp.status_code == 413
+
+
+def test_thousands_of_items_in_one_request(client, test_db):
+    payload = {'properties': [{'address': f"{i} Bulk St", 'city': 'Sylva', 'mls_number': f"BULK{i}"}
+                              for i in range(3000)]}
+    data = client.post('/api/properties/batch', json=payload).get_json()['data']
+    assert (data['created'], data['failed']) == (3000, 0)
+    again = client.post('/api/properties/batch', json=payload).get_json()['data']
+    assert (again['created'], again['updated']) == (0, 3000)
+    assert len(_rows(test_db)) == 3003
@@ -158,7 +158,9 @@ def app_with_test_db(monkeypatch, tmp_path):
         gallery_status TEXT DEFAULT 'pending',
         gallery_priority INTEGER DEFAULT 0,
         zone INTEGER DEFAULT 1,
-        address_key TEXT
+        address_key TEXT,
+        is_dedup_winner INTEGER NOT NULL DEFAULT 1,
+        is_idx_dedup_winner INTEGER NOT NULL DEFAULT 1
     )''')
 
     conn.execute('''CREATE TABLE property_packages (
@@ -0,0 +1,79 @@
+"""
+Tests for background page prefetching in apps/navica/client.
+
+Run: python3 -m pytest tests/test_navica/test_client_prefetch.py -v
+"""
+
+import threading
+import time
+
+import pytest
+
+from apps.navica.client import NavicaAPIError, NavicaClient, prefetch_pages
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == 'navica-prefetch']
+
+
+def _wait_for_producers_to_exit(timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while _prefetch_threads():
+        assert time.monotonic() < deadline, 'prefetch thread still running'
+        time.sleep(0.01)
+
+
+def test_producer_error_reaches_the_consumer():
+    error = NavicaAPIError('API request failed: upstream 502')
+
+    def pages():
+        yield [1]
+        yield [2]
+        raise error
+
+    received = []
+    with pytest.raises(NavicaAPIError) as raised:
+        for page in prefetch_pages(pages()):
+            received.append(page)
+    assert raised.value is error
+    # Pages fetched before the failure are all delivered first
+    assert received == [[1], [2]]
+    _wait_for_producers_to_exit()
+
+
+def test_stopping_early_ends_the_producer():
+    pulled = []
+
+    def endless():
+        while True:
+            pulled.append(len(pulled))
+            yield [len(pulled)]
+
+    stream = prefetch_pages(endless(), depth=1)
+    assert next(stream) == [1]
+    assert _prefetch_threads()
+    stream.close()
+    _wait_for_producers_to_exit()
+    # One page consumed, one buffered, at most one more in flight
+    assert len(pulled) <= 3
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_property_pages_truncates_to_max_records(prefetch):
+    client = NavicaClient(token='test', request_delay=0)
+    requests = []
+
+    def get(endpoint, params=None):
+        requests.append((endpoint, dict(params)))
+        offset, limit = int(params['offset']), int(params['limit'])
+        bundle = [{'ListingId': str(i)} for i in range(offset, min(offset + limit, 1000))]
+        return {'success': True, 'bundle': bundle, 'total': 1000}
+
+    client.get = get
+    pages = list(client.iter_property_pages(status='Active', max_records=450, prefetch=prefetch))
+
+    assert [len(page) for page in pages] == [200, 200, 50]
+    assert [r['ListingId'] for page in pages for r in page] == [str(i) for i in range(450)]
+    assert [params['offset'] for _, params in requests] == ['0', '200', '400']
+    assert all(endpoint == '/listing' and params['StandardStatus'] == 'Active' for endpoint, params in requests)
+    _wait_for_producers_to_exit()
@@ -0,0 +1,80 @@
+"""
+Tests for batched listing writes in apps/navica/sync_engine.
+
+Run: python3 -m pytest tests/test_navica/test_sync_batch.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from apps.navica.sync_engine import NavicaSyncEngine
+
+SCHEMA = (
+    "CREATE TABLE listings ("
+    "id TEXT PRIMARY KEY, mls_source TEXT, mls_number TEXT, status TEXT, "
+    "list_price INTEGER CHECK (list_price >= 0), address TEXT, address_key TEXT, "
+    "property_type TEXT, city TEXT, county TEXT, modification_timestamp TEXT, listing_key TEXT, "
+    "photos TEXT, primary_photo TEXT, photo_count INTEGER, "
+    "gallery_status TEXT, captured_at TEXT, updated_at TEXT, "
+    "UNIQUE (mls_source, mls_number))"
+)
+
+
+def _stats():
+    return {'created': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
+
+
+def _listing(n, price=300000, **extra):
+    listing = {'id': f"nav_{n}", 'mls_source': 'NavicaMLS', 'mls_number': f"N{n}", 'status': 'ACTIVE',
+               'list_price': price, 'address': f"{n} Main St", 'property_type': 'Residential'}
+    listing.update(extra)
+    return listing
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    path = tmp_path / 'navica.db'
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+    engine = NavicaSyncEngine(db_path=str(path))
+    conn = engine._get_connection()
+    yield engine, conn
+    conn.close()
+
+
+def _prices(conn):
+    return dict(conn.execute("SELECT mls_number, list_price FROM listings").fetchall())
+
+
+def test_batch_writes_set_based(engine):
+    engine, conn = engine
+    engine._flush_batch(conn, [_listing(1)], _stats())
+    conn.commit()
+
+    stats = _stats()
+    engine._flush_batch(conn, [_listing(1, price=289000), _listing(2), _listing(3, mls_number=None)], stats)
+    conn.commit()
+    assert stats == {'created': 1, 'updated': 1, 'skipped': 1, 'errors': 0}
+    assert _prices(conn) == {'N1': 289000, 'N2': 300000}
+
+
+def test_one_bad_row_fails_alone(engine):
+    engine, conn = engine
+    engine._flush_batch(conn, [_listing(1)], _stats())
+    conn.commit()
+
+    stats = _stats()
+    batch = [_listing(1, price=279000), _listing(2), _listing(3, price=-1), _listing(4), _listing(5)]
+    # Savepoints nest inside an open transaction, as they always do on PostgreSQL
+    conn.execute("BEGIN")
+    engine._flush_batch(conn, batch, stats)
+    conn.commit()
+
+    assert stats == {'created': 3, 'updated': 1, 'skipped': 0, 'errors': 1}
+    assert _prices(conn) == {'N1': 279000, 'N2': 300000, 'N4': 300000, 'N5': 300000}
+    # The failed set-based attempt left nothing half-written behind
+    assert conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0] == 4
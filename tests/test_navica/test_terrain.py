@@ -0,0 +1,133 @@
+"""
+Tests for apps/navica/terrain against a synthetic DEM.
+
+Run: python3 -m pytest tests/test_navica/test_terrain.py -v
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from apps.navica import terrain
+from apps.navica.enrich_views import BEARINGS, calculate_view_potential
+from apps.navica.terrain import TerrainSampler, offset_points, view_potential_scores
+
+# 0.01° cells covering lon -84..-83, lat 35..36; elevation (m) is a plane
+# rising east and north so bilinear interpolation is exact.
+XLL, YLL, CELL, N = -84.0, 35.0, 0.01, 100
+
+
+def _plane(lat, lon):
+    return 500.0 + 1000.0 * (lon - XLL) + 2000.0 * (lat - YLL)
+
+
+@pytest.fixture
+def dem_dir(tmp_path):
+    rows = np.arange(N)
+    cols = np.arange(N)
+    lat_centers = YLL + (N - rows - 0.5) * CELL
+    lon_centers = XLL + (cols + 0.5) * CELL
+    grid = _plane(lat_centers[:, None], lon_centers[None, :]).astype('<f4')
+    grid[0, 0] = -9999  # one nodata cell in the NW corner
+
+    grid.tofile(tmp_path / 'synthetic.flt')
+    (tmp_path / 'synthetic.hdr').write_text(
+        f"ncols {N}\nnrows {N}\nxllcorner {XLL}\nyllcorner {YLL}\n"
+        f"cellsize {CELL}\nNODATA_value -9999\nbyteorder LSBFIRST\n"
+    )
+    return tmp_path
+
+
+def _no_http(lat, lon):
+    raise AssertionError(f"unexpected EPQS call for ({lat}, {lon})")
+
+
+def test_dem_bilinear_sampling(dem_dir, tmp_path):
+    sampler = TerrainSampler(dem_dir=dem_dir, cache_path=tmp_path / 'cache.db', epqs=_no_http)
+    lats = np.array([35.2, 35.555, 35.9])
+    lons = np.array([-83.9, -83.4321, -83.1])
+    feet = sampler.elevations(lats, lons)
+    expected = _plane(lats, lons) * terrain.METERS_TO_FEET
+    np.testing.assert_allclose(feet, expected, rtol=1e-5)
+    assert sampler.stats['dem'] == 3
+    sampler.close()
+
+
+def test_nodata_and_out_of_coverage_fall_back_to_cache_then_epqs(dem_dir, tmp_path):
+    calls = []
+
+    def fake_epqs(lat, lon):
+        calls.append((lat, lon))
+        return 1234.0
+
+    cache = tmp_path / 'cache.db'
+    sampler = TerrainSampler(dem_dir=dem_dir, cache_path=cache, epqs=fake_epqs, workers=2)
+    # NW corner touches the nodata cell; the second point is off the tile.
+    feet = sampler.elevations([35.999, 40.0], [-83.999, -80.0])
+    assert feet.tolist() == [1234.0, 1234.0]
+    assert len(calls) == 2
+    sampler.close()
+
+    # Second run is served from the on-disk cache.
+    sampler = TerrainSampler(dem_dir=None, cache_path=cache, epqs=_no_http)
+    assert sampler.elevations([40.0], [-80.0]).tolist() == [1234.0]
+    assert sampler.stats['cache'] == 1
+    sampler.close()
+
+
+def test_transient_epqs_failures_are_not_cached(tmp_path):
+    def failing(lat, lon):
+        raise terrain.EpqsError('timeout')
+
+    cache = tmp_path / 'cache.db'
+    sampler = TerrainSampler(dem_dir=None, cache_path=cache, epqs=failing)
+    assert np.isnan(sampler.elevations([36.0], [-82.0])).all()
+    sampler.close()
+
+    sampler = TerrainSampler(dem_dir=None, cache_path=cache, epqs=lambda lat, lon: 900.0)
+    assert sampler.elevations([36.0], [-82.0]).tolist() == [900.0]
+    sampler.close()
+
+
+def _scalar_offset(lat, lon, bearing_deg, distance_km):
+    d = distance_km / 6371.0
+    lat_r, lon_r, brg_r = math.radians(lat), math.radians(lon), math.radians(bearing_deg)
+    new_lat = math.asin(math.sin(lat_r) * math.cos(d) + math.cos(lat_r) * math.sin(d) * math.cos(brg_r))
+    new_lon = lon_r + math.atan2(
+        math.sin(brg_r) * math.sin(d) * math.cos(lat_r),
+        math.cos(d) - math.sin(lat_r) * math.sin(new_lat),
+    )
+    return math.degrees(new_lat), math.degrees(new_lon)
+
+
+def test_offset_points_match_scalar_formula():
+    lats, lons = [35.1, 35.6], [-83.2, -82.7]
+    pt_lats, pt_lons = offset_points(lats, lons, BEARINGS, 1.0)
+    assert pt_lats.shape == (2, len(BEARINGS))
+    for i, (lat, lon) in enumerate(zip(lats, lons)):
+        for j, bearing in enumerate(BEARINGS):
+            exp_lat, exp_lon = _scalar_offset(lat, lon, bearing, 1.0)
+            assert pt_lats[i, j] == pytest.approx(exp_lat, abs=1e-12)
+            assert pt_lons[i, j] == pytest.approx(exp_lon, abs=1e-12)
+
+
+def test_vectorized_scores_match_scalar_scoring():
+    rng = random.Random(42)
+    listing, surrounding = [], []
+    for _ in range(500):
+        base = rng.uniform(1500, 5000)
+        listing.append(base)
+        surrounding.append([
+            None if rng.random() < 0.15 else base + rng.uniform(-700, 700)
+            for _ in BEARINGS
+        ])
+
+    arr = np.array([[np.nan if e is None else e for e in row] for row in surrounding])
+    scores = view_potential_scores(listing, arr, min_valid=4)
+    for score, elev, row in zip(scores, listing, surrounding):
+        if sum(e is not None for e in row) < 4:
+            assert score == 0
+        else:
+            assert score == calculate_view_potential(elev, row)
@@ -0,0 +1,131 @@
+"""
+Tests for resized photo variants in apps/photos/derivatives.
+
+Run: python3 -m pytest tests/test_photos/test_derivatives.py -v
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from apps.photos import derivatives  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _jpeg(width, height, quality=95):
+    # Gradients plus noise, so it compresses like a photo rather than a flat fill
+    img = Image.merge("RGB", [
+        Image.linear_gradient("L").resize((width, height)),
+        Image.radial_gradient("L").resize((width, height)),
+        Image.effect_noise((width, height), 40),
+    ])
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+@pytest.fixture
+def derived_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(derivatives, "DERIVED_DIR", str(tmp_path / "derived"))
+    derivatives._digests.clear()
+    return tmp_path / "derived"
+
+
+@pytest.fixture
+def original(tmp_path):
+    path = tmp_path / "mlsgrid" / "CAR100.jpg"
+    path.parent.mkdir()
+    path.write_bytes(_jpeg(2400, 1600))
+    return path
+
+
+def test_render_fits_size_class_and_keeps_aspect():
+    data = _jpeg(2400, 1600)
+    for size, (edge, _quality) in derivatives.SIZE_CLASSES.items():
+        for fmt in derivatives.FORMATS:
+            with Image.open(io.BytesIO(derivatives.render(data, size, fmt))) as img:
+                assert img.size == (edge, round(edge * 2 / 3))
+                assert img.format == ("WEBP" if fmt == "webp" else "JPEG")
+    assert len(derivatives.render(data, "card")) < len(data) / 5
+
+
+def test_small_originals_are_not_upscaled_or_inflated():
+    data = _jpeg(200, 150, quality=40)
+    assert derivatives.render(data, "hero") == data
+    with Image.open(io.BytesIO(derivatives.render(data, "thumb", "webp"))) as img:
+        assert img.size == (200, 150)
+    assert derivatives.render(b"not an image", "card") is None
+
+
+def test_variants_are_sharded_by_content_hash(derived_dir, original):
+    path = derivatives.get_derivative(original, "card", "webp")
+    digest = derivatives.content_hash(original.read_bytes())
+    assert path == derived_dir / digest[:2] / digest[2:4] / f"{digest}_card.webp"
+    assert path.exists()
+
+    # Same bytes under another name share the variant
+    copy = original.with_name("CAR100_01.jpg")
+    copy.write_bytes(original.read_bytes())
+    assert derivatives.get_derivative(copy, "card", "webp") == path
+
+    # New bytes at the same name get a new one
+    original.write_bytes(_jpeg(1800, 1200))
+    assert derivatives.get_derivative(original, "card", "webp") != path
+
+
+def test_warm_lookups_do_not_reread_the_original(derived_dir, original, monkeypatch):
+    first = derivatives.get_derivative(original, "thumb")
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail(f"read {self}"))
+    assert derivatives.get_derivative(original, "thumb") == first
+
+
+def test_unknown_size_or_unwritable_cache_falls_back(derived_dir, original, monkeypatch):
+    assert derivatives.get_derivative(original, "poster") is None
+    monkeypatch.setattr(derivatives, "DERIVED_DIR", "/proc/no-such-dir")
+    assert derivatives.get_derivative(original, "card") is None
+
+
+def test_download_writes_primary_variants(derived_dir, tmp_path, monkeypatch):
+    from apps.photos import manager, storage
+
+    data = _jpeg(1600, 1200)
+    monkeypatch.setattr(storage, "get_source_dir", lambda source: tmp_path)
+    monkeypatch.setattr(manager.downloader, "download_photo", lambda url: data)
+    result = manager.download_for_listing("CAR200", ["https://cdn/a.jpg", "https://cdn/b.jpg"])
+
+    assert result.primary_downloaded and result.gallery_downloaded == 1
+    digest = derivatives.content_hash(data)
+    written = sorted(p.name for p in derived_dir.rglob("*") if p.is_file())
+    assert written == sorted(f"{digest}_{size}{ext}" for size in derivatives.EAGER_SIZES
+                             for ext in (".jpg", ".webp"))
+
+
+def test_serve_photo_returns_variant_for_size_class(derived_dir, original, monkeypatch):
+    from flask import Flask
+
+    sys.path.insert(0, str(PROJECT_ROOT / "apps" / "property-api"))
+    from routes import public
+
+    monkeypatch.setitem(public.PHOTOS_DIRS, "mlsgrid", original.parent)
+    app = Flask(__name__)
+    app.register_blueprint(public.public_bp, url_prefix="/api/public")
+    client = app.test_client()
+
+    full = client.get("/api/public/photos/mlsgrid/CAR100.jpg")
+    card = client.get("/api/public/photos/mlsgrid/CAR100.jpg?size=card")
+    webp = client.get("/api/public/photos/mlsgrid/CAR100.jpg?size=card",
+                      headers={"Accept": "image/avif,image/webp,*/*"})
+    assert full.data == original.read_bytes()
+    assert card.mimetype == "image/jpeg" and len(card.data) < len(full.data) / 5
+    assert webp.mimetype == "image/webp" and webp.headers["Vary"] == "Accept"
+    assert "immutable" in full.headers["Cache-Control"] and "immutable" in card.headers["Cache-Control"]
+    # Unknown size classes serve the original, but not for a year
+    fallback = client.get("/api/public/photos/mlsgrid/CAR100.jpg?size=huge")
+    assert fallback.data == full.data
+    assert fallback.headers["Cache-Control"] == "public, max-age=300"
@@ -0,0 +1,54 @@
+"""
+Tests for the photo fill pass in apps/photos/manager.
+
+Run: python3 -m pytest tests/test_photos/test_manager.py -v
+"""
+
+import sqlite3
+
+from apps.photos import manager
+from src.core import pg_adapter
+
+SCHEMA = (
+    "CREATE TABLE listings ("
+    "mls_number TEXT PRIMARY KEY, mls_source TEXT, status TEXT, county TEXT, list_date TEXT, "
+    "primary_photo TEXT, photos TEXT, photo_count INTEGER, photo_verified_at TEXT, gallery_status TEXT)"
+)
+
+
+def test_photo_fill_failed_row_keeps_the_rest_of_its_batch(tmp_path, monkeypatch):
+    path = tmp_path / "photos.db"
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.executemany(
+        "INSERT INTO listings (mls_number, mls_source, status, county, list_date, gallery_status) "
+        "VALUES (?, 'CanopyMLS', 'ACTIVE', 'Jackson', ?, 'pending')",
+        [(f"CAR{i}", f"2026-10-{10 - i:02d}") for i in range(5)],
+    )
+    # One listing whose write fails midway through the first commit batch
+    conn.execute(
+        "CREATE TRIGGER reject BEFORE UPDATE ON listings WHEN NEW.mls_number = 'CAR2' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    )
+    conn.commit()
+    conn.close()
+
+    def get_db():
+        # Rows shaped like the PostgreSQL wrapper's, which the fill pass reads with .get()
+        db = sqlite3.connect(path)
+        db.row_factory = lambda cursor, row: pg_adapter.DictRow(
+            {c[0]: v for c, v in zip(cursor.description, row)})
+        return db
+
+    monkeypatch.setattr(pg_adapter, "get_db", get_db)
+    monkeypatch.setattr(manager.storage, "primary_exists", lambda source, mls: True)
+    monkeypatch.setattr(manager.storage, "gallery_urls",
+                        lambda source, mls: [f"/api/public/photos/canopy/{mls}.jpg"])
+
+    report = manager.run_photo_fill("CanopyMLS")
+
+    assert report.total_checked == 5
+    conn = sqlite3.connect(path)
+    status = dict(conn.execute("SELECT mls_number, gallery_status FROM listings"))
+    conn.close()
+    assert status == {"CAR0": "ready", "CAR1": "ready", "CAR2": "pending", "CAR3": "ready", "CAR4": "ready"}
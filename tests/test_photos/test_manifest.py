@@ -0,0 +1,200 @@
+"""
+Tests for the per-source photo manifest in apps/photos/manifest.
+
+Run: python3 -m pytest tests/test_photos/test_manifest.py -v
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from apps.photos import manifest, storage
+
+
+@pytest.fixture
+def photos(tmp_path, monkeypatch):
+    d = tmp_path / "mlsgrid"
+    d.mkdir()
+    monkeypatch.setattr(storage, "get_source_dir", lambda source: d)
+    monkeypatch.setattr(manifest, "REFRESH_SECONDS", 0)
+    manifest._manifests.clear()
+    return d
+
+
+def _write(d, name, data=b"x" * 200):
+    (d / name).write_bytes(data)
+
+
+def test_parse_filename():
+    assert manifest.parse_filename("CAR1.jpg") == ("CAR1", 0)
+    assert manifest.parse_filename("CAR1_07.webp") == ("CAR1", 7)
+    assert manifest.parse_filename("CAR_X_1_12.png") == ("CAR_X_1", 12)
+    assert manifest.parse_filename(".manifest.jsonl") is None
+    assert manifest.parse_filename("CAR1.jpg.tmp") is None
+
+
+def test_without_manifest_storage_probes_disk(photos):
+    for name in ("CAR1.png", "CAR1_01.jpg", "CAR1_02.jpg"):
+        _write(photos, name)
+    assert storage.primary_url("CanopyMLS", "CAR1") == "/api/public/photos/mlsgrid/CAR1.png"
+    assert storage.gallery_urls("CanopyMLS", "CAR1") == [
+        "/api/public/photos/mlsgrid/CAR1.png",
+        "/api/public/photos/mlsgrid/CAR1_01.jpg",
+        "/api/public/photos/mlsgrid/CAR1_02.jpg",
+    ]
+    # Writers don't start a manifest on their own
+    storage.save_atomic(photos, "CAR2.jpg", b"y" * 200)
+    assert not (photos / manifest.MANIFEST_NAME).exists()
+
+
+def test_lookups_come_from_manifest_not_disk(photos, monkeypatch):
+    for name in ("CAR1.jpg", "CAR1_01.jpg", "CAR1_01.webp", "CAR1_03.jpg", "CAR9.jpg"):
+        _write(photos, name)
+    assert manifest.rebuild(photos) == 5
+
+    monkeypatch.setattr(Path, "exists", lambda self: pytest.fail(f"probed {self}"))
+    # Gaps are kept, and .jpg wins over .webp at the same position
+    assert storage.gallery_urls("CanopyMLS", "CAR1") == [
+        "/api/public/photos/mlsgrid/CAR1.jpg",
+        "/api/public/photos/mlsgrid/CAR1_01.jpg",
+        "/api/public/photos/mlsgrid/CAR1_03.jpg",
+    ]
+    assert storage.primary_exists("CanopyMLS", "CAR9")
+
+
+def test_save_atomic_appends_and_readers_follow(photos):
+    manifest.rebuild(photos)
+    reader = manifest.for_directory(photos)
+    assert reader.files("CAR5") == {}
+
+    storage.save_atomic(photos, "CAR5.jpg", b"a" * 300, media_key="/media/abc.jpg")
+    storage.save_atomic(photos, "CAR5_01.jpg", b"b" * 300)
+    assert reader.files("CAR5") == {0: "CAR5.jpg", 1: "CAR5_01.jpg"}
+    entry = reader.entry("CAR5.jpg")
+    st = (photos / "CAR5.jpg").stat()
+    assert (entry.size, entry.mtime_ns) == (300, st.st_mtime_ns)
+    assert entry.hash == manifest.content_hash(b"a" * 300)
+    assert entry.media_key == "/media/abc.jpg"
+
+    manifest.forget(photos, ["CAR5_01.jpg"])
+    assert reader.files("CAR5") == {0: "CAR5.jpg"}
+    # Files that aren't photo names aren't tracked
+    storage.save_atomic(photos, "notes.txt", b"z")
+    assert reader.snapshot().keys() == {"CAR5.jpg"}
+
+
+def test_reader_ignores_a_half_written_line(photos):
+    manifest.rebuild(photos)
+    reader = manifest.for_directory(photos)
+    with open(photos / manifest.MANIFEST_NAME, "a") as f:
+        f.write('{"op":"put","f":"CAR7.jpg","s":1,"t":1')
+    assert reader.files("CAR7") == {}
+    with open(photos / manifest.MANIFEST_NAME, "a") as f:
+        f.write(',"h":null,"k":null}\n')
+    assert reader.files("CAR7") == {0: "CAR7.jpg"}
+
+
+def test_concurrent_writers_keep_every_line(photos):
+    manifest.rebuild(photos)
+
+    def worker(n):
+        for i in range(1, 21):
+            storage.save_atomic(photos, f"CAR{n}_{i:02d}.jpg", bytes([n]) * 150)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reader = manifest.for_directory(photos)
+    assert all(len(reader.files(f"CAR{n}")) == 20 for n in range(8))
+    assert manifest.verify(photos).ok
+
+
+def test_verify_and_rebuild_repair_drift(photos):
+    _write(photos, "CAR1.jpg")
+    _write(photos, "CAR1_01.jpg")
+    report = manifest.verify(photos)
+    assert not report.has_manifest and not report.ok
+    assert report.untracked == ["CAR1.jpg", "CAR1_01.jpg"]
+
+    manifest.rebuild(photos)
+    assert manifest.verify(photos).ok
+
+    os.unlink(photos / "CAR1_01.jpg")            # deleted behind our back
+    _write(photos, "CAR2.jpg")                   # written outside save_atomic
+    _write(photos, "CAR1.jpg", b"q" * 999)       # replaced in place
+    report = manifest.verify(photos)
+    assert (report.missing, report.untracked, report.changed) == (
+        ["CAR1_01.jpg"], ["CAR2.jpg"], ["CAR1.jpg"])
+    assert manifest.main(["verify", "--source", "mlsgrid"]) == 1
+
+    reader = manifest.for_directory(photos)
+    reader.files("CAR1")                          # load the pre-rebuild journal
+    manifest.rebuild(photos)
+    assert manifest.main(["verify", "--source", "mlsgrid", "--hash"]) == 0
+    assert reader.files("CAR1") == {0: "CAR1.jpg"}
+    assert reader.entry("CAR1.jpg").hash == manifest.content_hash(b"q" * 999)
+
+
+def test_rebuild_keeps_media_keys_and_skips_unchanged_hashes(photos, monkeypatch):
+    manifest.rebuild(photos)
+    storage.save_atomic(photos, "CAR3.jpg", b"c" * 400, media_key="/m/3.jpg")
+    monkeypatch.setattr(manifest, "_hash_file", lambda path: pytest.fail(f"re-hashed {path}"))
+    manifest.rebuild(photos)
+    assert manifest.for_directory(photos).entry("CAR3.jpg").media_key == "/m/3.jpg"
+
+
+def test_listing_service_reads_manifest(photos):
+    from src.core import listing_service
+
+    for name in ("CAR1.jpg", "CAR1_01.jpg", "CAR1_09.jpg"):
+        _write(photos, name)
+    manifest.rebuild(photos)
+    # Position 9 is past the disk scan's 5-miss cutoff but in the manifest
+    assert listing_service._local_photo_files("CAR1", photos) == {
+        0: "CAR1.jpg", 1: "CAR1_01.jpg", 9: "CAR1_09.jpg"}
+    assert listing_service._find_local_primary("CAR1", photos) == "/api/public/photos/mlsgrid/CAR1.jpg"
+
+
+def test_manifest_is_authoritative_once_built(photos, monkeypatch):
+    from src.core import listing_service
+
+    _write(photos, "CAR1.jpg")
+    manifest.rebuild(photos)
+    _write(photos, "CAR8.jpg")                   # written outside save_atomic
+    listing_service.invalidate_photo_dir_cache(photos)
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "exists", lambda self: pytest.fail(f"probed {self}"))
+        m.setattr(listing_service, "_photo_dir_entries", lambda d: pytest.fail(f"scanned {d}"))
+        assert not storage.primary_exists("CanopyMLS", "CAR404")
+        assert storage.gallery_urls("CanopyMLS", "CAR8") == []
+        assert listing_service._local_photo_files("CAR404", photos) == {}
+
+    # verify reports the stray file and rebuild brings it in
+    assert manifest.verify(photos).untracked == ["CAR8.jpg"]
+    manifest.rebuild(photos)
+    assert storage.gallery_urls("CanopyMLS", "CAR8") == ["/api/public/photos/mlsgrid/CAR8.jpg"]
+
+
+def test_on_demand_downloads_are_recorded(photos, monkeypatch):
+    import requests
+    from src.core import listing_service
+
+    class Response:
+        content = b"p" * 500
+
+        def raise_for_status(self):
+            pass
+
+    manifest.rebuild(photos)
+    monkeypatch.setattr(requests, "get", lambda url, timeout: Response())
+    url = listing_service._download_photo_url("CAR6", "https://cdn.example/m/6.jpg?sig=x", photos)
+
+    assert url == "/api/public/photos/mlsgrid/CAR6.jpg"
+    assert manifest.for_directory(photos).entry("CAR6.jpg").media_key == "/m/6.jpg"
+    assert not list(photos.glob("*.tmp"))